@@ -0,0 +1,269 @@
+/ Waffle plant controller for python3 -m factory.plant (see factory/plant/bridge.py).
+/ Device 050 is the plant mailbox: WRO (6504) sends command words, SKI/RDI
+/ (6501/6502) read event words, SEL/RDR (6505/6506) read plant registers.
+/ Devices 051 and 052 hold the plate temperatures of irons 0-7 and 8-15.
+/
+/ The main loop handles events (eject and refill cooked irons, retry jammed
+/ ejects, start the batter pump when the tank runs low), holds every iron
+/ between 195 and 205 C and keeps cold storage at -18 C. This emulator's
+/ group 2 CLA acts before the skip test, so skips never share a word with CLA.
+
+*0040
+PSEND,  SEND
+PSERVE, SERVE
+PREADT, READT
+PEVENT, EVENTS
+PTHERM, THERMO
+PRETRY, RETRY
+PCOLD,  COLD
+
+M16,    7760            / -16
+BELTON, 3001            / CMD_BELT 1
+PUMPON, 2401            / CMD_PUMP 1
+COMPON, 3401            / CMD_COMPRESSOR 1
+COMPOF, 3400            / CMD_COMPRESSOR 0
+HEATON, 0400            / CMD_HEAT_ON
+HEATOF, 1000            / CMD_HEAT_OFF
+FILLC,  1400            / CMD_FILL
+EJECTC, 2000            / CMD_EJECT
+C377,   0377
+C7400,  7400
+NCOOK,  7400            / -(EV_COOKED << 8)
+NBURNT, 7000            / -(EV_BURNT << 8)
+NLOW,   5400            / -(EV_TANK_LOW << 8)
+NJAM,   5000            / -(EV_JAM << 8)
+C10,    0010
+C7,     0007
+C2,     0002
+C18,    0022            / 18
+N195,   7475            / -195
+N205,   7463            / -205
+HEATP,  HEATST
+PENDP,  PEND
+
+COUNT,  0
+IRON,   0
+EVWORD, 0
+EVOP,   0
+EVARG,  0
+PTR,    0
+SIRON,  0
+TCOUNT, 0
+TIRON,  0
+TEMP,   0
+TPTR,   0
+RIRON,  0
+RCOUNT, 0
+RIRON2, 0
+RPTR,   0
+COMPST, 0
+
+*0200
+START,  CLA CLL
+        TAD     BELTON
+        JMS I   PSEND
+        TAD     M16             / pour batter into every iron
+        DCA     COUNT
+        DCA     IRON
+FILLUP, TAD     IRON
+        TAD     FILLC
+        JMS I   PSEND
+        ISZ     IRON
+        ISZ     COUNT
+        JMP     FILLUP
+LOOP,   JMS I   PEVENT
+        JMS I   PTHERM
+        JMS I   PRETRY
+        JMS I   PCOLD
+        JMP     LOOP
+
+/ SEND: queue the command word in AC; returns with AC clear.
+*0400
+SEND,   0
+SWAIT,  IOT     6503            / SKO: room in the outbound ring?
+        JMP     SWAIT
+        IOT     6504            / WRO
+        CLA
+        JMP I   SEND
+
+/ SERVE: eject the iron in AC onto the belt and pour new batter.
+SERVE,  0
+        DCA     SIRON
+        TAD     SIRON
+        TAD     EJECTC
+        JMS     SEND
+        TAD     SIRON
+        TAD     FILLC
+        JMS     SEND
+        JMP I   SERVE
+
+/ READT: plate temperature of the iron in AC.
+READT,  0
+        DCA     RIRON
+        TAD     RIRON
+        AND     C10
+        SZA
+        JMP     RBANKB
+        TAD     RIRON
+        IOT     6515            / SEL on 051
+        IOT     6516            / RDR
+        JMP I   READT
+RBANKB, CLA
+        TAD     RIRON
+        AND     C7
+        IOT     6525            / SEL on 052
+        IOT     6526            / RDR
+        JMP I   READT
+
+/ EVENTS: handle every event word waiting in the mailbox.
+*0600
+EVENTS, 0
+EVNEXT, CLA
+        IOT     6501            / SKI
+        JMP I   EVENTS
+        IOT     6502            / RDI
+        DCA     EVWORD
+        TAD     EVWORD
+        AND     C377
+        DCA     EVARG
+        TAD     EVWORD
+        AND     C7400
+        DCA     EVOP
+        TAD     EVOP
+        TAD     NCOOK
+        SNA
+        JMP     EVDONE
+        CLA
+        TAD     EVOP
+        TAD     NBURNT
+        SNA
+        JMP     EVDONE          / burnt: clear the iron anyway, packaging rejects it
+        CLA
+        TAD     EVOP
+        TAD     NJAM
+        SNA
+        JMP     EVJAM
+        CLA
+        TAD     EVOP
+        TAD     NLOW
+        SNA
+        JMP     EVLOW
+        JMP     EVNEXT
+EVDONE, CLA
+        TAD     EVARG
+        JMS I   PSERVE
+        JMP     EVNEXT
+EVJAM,  CLA
+        TAD     PENDP
+        TAD     EVARG
+        DCA     PTR
+        CLA IAC
+        DCA I   PTR
+        JMP     EVNEXT
+EVLOW,  CLA
+        TAD     PUMPON
+        JMS I   PSEND
+        JMP     EVNEXT
+
+/ THERMO: bang-bang control of every iron between 195 and 205 C.
+*1000
+THERMO, 0
+        TAD     M16
+        DCA     TCOUNT
+        DCA     TIRON
+TNEXT,  TAD     TIRON
+        JMS I   PREADT
+        DCA     TEMP
+        TAD     HEATP
+        TAD     TIRON
+        DCA     TPTR
+        TAD I   TPTR
+        SZA                     / heater off?
+        JMP     TON
+        CLA
+        TAD     TEMP
+        TAD     N195
+        SMA                     / below 195: switch on
+        JMP     TSKIP
+        CLA IAC
+        DCA I   TPTR
+        TAD     TIRON
+        TAD     HEATON
+        JMS I   PSEND
+        JMP     TSKIP
+TON,    CLA
+        TAD     TEMP
+        TAD     N205
+        SPA                     / 205 or above: switch off
+        JMP     TSKIP
+        CLA
+        DCA I   TPTR
+        TAD     TIRON
+        TAD     HEATOF
+        JMS I   PSEND
+TSKIP,  CLA
+        ISZ     TIRON
+        ISZ     TCOUNT
+        JMP     TNEXT
+        JMP I   THERMO
+
+/ RETRY: once the loading slot is free, eject one iron whose eject jammed.
+*1200
+RETRY,  0
+        CLA IAC
+        IOT     6505            / SEL register 1: belt occupancy
+        IOT     6506
+        SPA                     / bit 11 clear: loading slot free
+        JMP I   RETRY
+        CLA
+        TAD     M16
+        DCA     RCOUNT
+        DCA     RIRON2
+RNEXT,  TAD     PENDP
+        TAD     RIRON2
+        DCA     RPTR
+        TAD I   RPTR
+        SNA
+        JMP     RSKIP
+        CLA
+        DCA I   RPTR
+        TAD     RIRON2
+        JMS I   PSERVE
+        JMP I   RETRY
+RSKIP,  CLA
+        ISZ     RIRON2
+        ISZ     RCOUNT
+        JMP     RNEXT
+        JMP I   RETRY
+
+/ COLD: run the compressor while storage is warmer than -18 C.
+COLD,   0
+        CLA
+        TAD     C2
+        IOT     6505            / SEL register 2: storage temperature
+        IOT     6506
+        TAD     C18
+        SMA SZA                 / -18 or colder: skip
+        JMP     CWARM
+        CLA
+        TAD     COMPST
+        SNA
+        JMP I   COLD
+        CLA
+        DCA     COMPST
+        TAD     COMPOF
+        JMS I   PSEND
+        JMP I   COLD
+CWARM,  CLA
+        TAD     COMPST
+        SZA
+        JMP I   COLD
+        CLA IAC
+        DCA     COMPST
+        TAD     COMPON
+        JMS I   PSEND
+        JMP I   COLD
+
+*1400
+HEATST, 0;0;0;0;0;0;0;0;0;0;0;0;0;0;0;0
+PEND,   0;0;0;0;0;0;0;0;0;0;0;0;0;0;0;0
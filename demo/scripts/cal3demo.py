@@ -3,7 +3,7 @@
 demo/scripts/cal3demo.py
 
 Upload demo/cal3.srec to the webdp8 server, set the PDP-8 switch register (S),
-run the program in chunks until HALT is observed, fetch the line-printer output,
+run the program on the server until HALT is observed, fetch the line-printer output,
 clean ANSI escapes, and save it to a file.
 
 Defaults:
@@ -15,7 +15,7 @@ Defaults:
 This script uses the web wrapper endpoints created in tools/webdp8.py:
   POST /loader  (multipart file upload)
   PUT  /switch  (json {"val": <decimal>})
-  GET  /trace   (params: start, cycles)
+  POST /run     (json {"start", "cycles", "timeout"})
   GET  /output/printer
 
 """
@@ -24,7 +24,6 @@ import argparse
 import os
 import re
 import sys
-import time
 
 try:
     import requests
@@ -49,20 +48,17 @@ def set_switch(server_url, year):
     return resp.json()
 
 
-def run_until_halt(server_url, start='0100', cycles=1024, max_iter=20, delay=0.01):
-    url = server_url.rstrip('/') + '/trace'
-    for i in range(max_iter):
-        print(f"Trace iter {i+1}/{max_iter}...", flush=True)
-        resp = requests.get(url, params={'start': start, 'cycles': cycles}, timeout=60)
-        resp.raise_for_status()
-        j = resp.json()
-        halted = bool(j.get('halted'))
-        steps = len(j.get('steps', []))
-        print(f" -> halted={halted} steps={steps}")
-        if halted:
-            return j
-        time.sleep(delay)
-    raise RuntimeError(f"No HALT after {max_iter} iterations (start={start}, cycles={cycles})")
+def run_until_halt(server_url, start='0100', cycles=1024 * 20, timeout=30.0):
+    """Run natively on the server until HALT, in a single request."""
+    url = server_url.rstrip('/') + '/run'
+    resp = requests.post(url, json={'start': start, 'cycles': cycles, 'timeout': timeout},
+                         timeout=timeout + 30)
+    resp.raise_for_status()
+    j = resp.json()
+    print(f" -> reason={j.get('reason')} cycles={j.get('cycles')} pc={j.get('regs', {}).get('pc')}")
+    if j.get('reason') != 'halt':
+        raise RuntimeError(f"No HALT within {cycles} cycles / {timeout}s (start={start}, stopped: {j.get('reason')})")
+    return j
 
 
 def fetch_printer(server_url):
@@ -83,9 +79,10 @@ def main(argv=None):
     p.add_argument('--month', type=int, default=10, help='decimal month to write into MONTH_IN (1-12)')
     p.add_argument('--server', default='http://127.0.0.1:5000', help='webdp8 server base URL')
     p.add_argument('--out', default='printer/output.txt', help='output file to save printer text')
-    p.add_argument('--start', default='0200', help='entry point to trace (octal string)')
-    p.add_argument('--cycles', type=int, default=1024, help='cycles per trace chunk')
-    p.add_argument('--max-iter', type=int, default=20, help='max trace chunks to run')
+    p.add_argument('--start', default='0200', help='entry point to run (octal string)')
+    p.add_argument('--cycles', type=int, default=1024, help='cycle budget unit (total budget is cycles * max-iter)')
+    p.add_argument('--max-iter', type=int, default=20, help='multiplier for --cycles, kept for older invocations')
+    p.add_argument('--timeout', type=float, default=30.0, help='wall-clock limit for the run in seconds')
     p.add_argument('--raw', action='store_true', help='store the full printer output without collapsing to one line')
     args = p.parse_args(argv)
 
@@ -120,9 +117,9 @@ def main(argv=None):
         print("Failed to write MONTH_IN:", e, file=sys.stderr)
         return 5
 
-    print("Running until HALT (chunked)...")
+    print("Running until HALT...")
     try:
-        trace = run_until_halt(args.server, start=args.start, cycles=args.cycles, max_iter=args.max_iter)
+        run_until_halt(args.server, start=args.start, cycles=args.cycles * args.max_iter, timeout=args.timeout)
     except Exception as e:
         print("Run failed:", e, file=sys.stderr)
         return 5
@@ -0,0 +1,106 @@
+"""
+Reverse execution through the native checkpoint store (src/emulator/checkpoint.h).
+
+Running through a store checkpoints the machine every `interval` instructions
+(registers, device state and the pages written since the last checkpoint), so
+it can later be moved back to any instruction still inside its memory budget
+by restoring the nearest checkpoint and replaying forward:
+
+    history = Checkpoints(lib, cpu)
+    history.run(100_000)
+    history.reverse_step(1)             # undo the last instruction
+    lib.pdp8_api_set_watchpoint(cpu, 0o300, driver.WATCH_ACCESSES["write"])
+    history.reverse_continue()          # ('watch-write', 0o300): after the last write
+
+Replays only repeat the original run on a virtual clock (pdp8_api_set_clock);
+input queued after a checkpoint is dropped when going back before it, and
+output already printed or punched stays printed and is not printed again by
+the replay, nor by running forward over the same stretch. Magtape state is
+not checkpointed.
+"""
+
+from __future__ import annotations
+
+import ctypes
+from typing import Tuple
+
+from . import driver
+
+DEFAULT_INTERVAL = 10_000  # PDP8_CHECKPOINT_DEFAULT_INTERVAL
+DEFAULT_BUDGET = 4 * 1024 * 1024  # PDP8_CHECKPOINT_DEFAULT_BUDGET
+
+
+class Checkpoints:
+    """A checkpoint store for `cpu`; see the module docstring."""
+
+    def __init__(
+        self,
+        lib: ctypes.CDLL,
+        cpu: int,
+        interval: int = DEFAULT_INTERVAL,
+        budget_bytes: int = DEFAULT_BUDGET,
+    ) -> None:
+        self.lib = lib
+        self.cpu = cpu
+        self.handle = lib.pdp8_checkpoints_create(cpu, interval, budget_bytes)
+        if not self.handle:
+            raise driver.EmulatorError("Unable to create checkpoint store.")
+
+    def run(self, cycles: int, stop_pc: int = -1) -> int:
+        """pdp8_api_run (or run_until with `stop_pc`) through the store."""
+        executed = self.lib.pdp8_checkpoints_run_until(self.handle, ctypes.c_size_t(cycles), stop_pc)
+        if executed < 0:
+            raise driver.EmulatorError("Emulator reported an error during execution.")
+        return int(executed)
+
+    def seek(self, position: int) -> None:
+        if self.lib.pdp8_checkpoints_seek(self.handle, position) != 0:
+            raise driver.EmulatorError(f"Cannot move to instruction {position} (oldest is {self.oldest}).")
+
+    def reverse_step(self, count: int = 1) -> None:
+        if self.lib.pdp8_checkpoints_reverse_step(self.handle, count) != 0:
+            raise driver.EmulatorError(f"Cannot go back {count} instructions from {self.position}.")
+
+    def reverse_continue(self) -> Tuple[str, int]:
+        """Go back to the last breakpoint or watchpoint hit.
+
+        Returns its stop reason and address, or ('budget', 0) after reaching
+        the oldest checkpoint without finding one.
+        """
+        reason = self.lib.pdp8_checkpoints_reverse_continue(self.handle)
+        if reason < 0:
+            raise driver.EmulatorError("Emulator reported an error during replay.")
+        if reason == 0:
+            return driver.STOP_REASONS[0], 0
+        return driver.STOP_REASONS.get(reason, "unknown"), int(self.lib.pdp8_checkpoints_stop_address(self.handle))
+
+    def reset(self) -> None:
+        """Forget the history; the current state becomes instruction 0."""
+        if self.lib.pdp8_checkpoints_reset(self.handle) != 0:
+            raise driver.EmulatorError("Unable to reset checkpoint store.")
+
+    def set_budget(self, budget_bytes: int) -> None:
+        self.lib.pdp8_checkpoints_set_budget(self.handle, budget_bytes)
+
+    @property
+    def position(self) -> int:
+        """Instructions run through the store since its history began."""
+        return int(self.lib.pdp8_checkpoints_position(self.handle))
+
+    @property
+    def oldest(self) -> int:
+        """Earliest position the store can still go back to."""
+        return int(self.lib.pdp8_checkpoints_oldest(self.handle))
+
+    @property
+    def count(self) -> int:
+        return int(self.lib.pdp8_checkpoints_count(self.handle))
+
+    @property
+    def bytes(self) -> int:
+        return int(self.lib.pdp8_checkpoints_bytes(self.handle))
+
+    def close(self) -> None:
+        if self.handle:
+            self.lib.pdp8_checkpoints_destroy(self.handle)
+            self.handle = None
@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+Cluster mode: run many independent PDP-8s from a manifest on a thread pool.
+
+  python3 -m factory.cluster demo/cluster.json
+  python3 -m factory.cluster demo/cluster.json --workers 8 --quantum 200000
+
+The manifest is JSON. Paths are relative to the manifest's directory:
+
+  {
+    "quantum": 100000,
+    "machines": [
+      {"name": "iron", "image": "diag.srec", "count": 16},
+      {"name": "conveyor", "image": "cal3.srec", "clock": "cycle",
+       "input": "1962 10\\r", "printer": true}
+    ]
+  }
+
+Each machine has its own CPU, KL8E console and (optionally) line printer whose
+output is captured by native output rings. Machines run in rounds: every
+running machine executes one quantum of cycles on the pool, then the main
+thread drains the rings, prints complete lines prefixed with the machine
+name, and routes console input. ctypes releases the GIL for the duration of
+each pdp8_api_run call, so rounds scale across host cores.
+
+Console input typed on stdin goes to the focused machine (the first one to
+start with); `@name text` sends one line to another machine and `@name` on its
+own moves the focus.
+"""
+
+from __future__ import annotations
+
+import argparse
+import ctypes
+import json
+import os
+import select
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, IO, List, Optional
+
+try:
+    from . import driver
+except ImportError:  # run as a script: python3 factory/cluster.py
+    import driver
+
+DEFAULT_QUANTUM = 100_000
+OUTPUT_RING_BYTES = 1 << 16
+PRINTER_COLUMNS = 132
+
+
+@dataclass
+class MachineSpec:
+    name: str
+    image: Path
+    input: str = ""
+    printer: bool = False
+    clock: str = "host"
+    clock_ns: int = driver.PDP8_MEMORY_CYCLE_NS
+    max_cycles: int = 0  # 0 runs until HALT or the machine can no longer make progress
+
+
+def load_manifest(path: Path) -> tuple[List[MachineSpec], Optional[int]]:
+    """Expand a cluster manifest into one MachineSpec per machine."""
+    try:
+        raw = json.loads(path.read_text())
+    except OSError as exc:
+        raise driver.EmulatorError(f"Unable to read {path}: {exc}") from exc
+    except json.JSONDecodeError as exc:
+        raise driver.EmulatorError(f"{path}: invalid JSON: {exc}") from exc
+
+    entries = raw.get("machines") if isinstance(raw, dict) else None
+    if not isinstance(entries, list) or not entries:
+        raise driver.EmulatorError(f"{path}: expected a non-empty \"machines\" list")
+
+    base = path.resolve().parent
+    specs: List[MachineSpec] = []
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict) or "image" not in entry:
+            raise driver.EmulatorError(f"{path}: machine {index} needs an \"image\"")
+        count = int(entry.get("count", 1))
+        name = str(entry.get("name", Path(entry["image"]).stem))
+        clock = str(entry.get("clock", "host"))
+        if clock not in driver.CLOCK_SOURCES:
+            raise driver.EmulatorError(f"{path}: machine {name}: unknown clock '{clock}'")
+        text = str(entry.get("input", ""))
+        if "input_file" in entry:
+            try:
+                text += (base / entry["input_file"]).read_text()
+            except OSError as exc:
+                raise driver.EmulatorError(f"{path}: machine {name}: {exc}") from exc
+        for copy in range(count):
+            specs.append(
+                MachineSpec(
+                    name=f"{name}{copy + 1:02d}" if count > 1 else name,
+                    image=base / entry["image"],
+                    input=text,
+                    printer=bool(entry.get("printer", False)),
+                    clock=clock,
+                    clock_ns=int(entry.get("clock_ns", driver.PDP8_MEMORY_CYCLE_NS)),
+                    max_cycles=int(entry.get("max_cycles", 0)),
+                )
+            )
+
+    names = [spec.name for spec in specs]
+    if len(set(names)) != len(names):
+        raise driver.EmulatorError(f"{path}: machine names must be unique")
+    quantum = raw.get("quantum")
+    return specs, int(quantum) if quantum is not None else None
+
+
+@dataclass
+class OutputTap:
+    """Cursor into one capture ring plus the unfinished last line."""
+
+    ring: int
+    cursor: int = 0
+    partial: str = ""
+
+
+@dataclass
+class ClusterMachine:
+    spec: MachineSpec
+    lib: ctypes.CDLL
+    cpu: int = 0
+    console: int = 0
+    printer: int = 0
+    taps: List[OutputTap] = field(default_factory=list)
+    cycles: int = 0
+    busy_seconds: float = 0.0
+    state: str = "running"
+
+    def build(self, rom_cache: Dict[Path, tuple]) -> None:
+        lib = self.lib
+        self.cpu = lib.pdp8_api_create(ctypes.c_size_t(driver.DEFAULT_MEMORY_WORDS))
+        if not self.cpu:
+            raise driver.EmulatorError(f"{self.spec.name}: failed to create PDP-8 instance")
+        if lib.pdp8_api_set_clock(self.cpu, driver.CLOCK_SOURCES[self.spec.clock], max(0, self.spec.clock_ns)) != 0:
+            raise driver.EmulatorError(f"{self.spec.name}: invalid clock settings")
+        if hasattr(lib, "pdp8_interrupt_control_attach") and lib.pdp8_interrupt_control_attach(self.cpu) != 0:
+            raise driver.EmulatorError(f"{self.spec.name}: failed to attach interrupt control device")
+
+        self.console = lib.pdp8_kl8e_console_create(None, None)
+        if not self.console or lib.pdp8_kl8e_console_attach(self.cpu, self.console) != 0:
+            raise driver.EmulatorError(f"{self.spec.name}: failed to attach KL8E console")
+        lib.pdp8_kl8e_console_set_output_stream(self.console, None)
+        self._capture(lib.pdp8_kl8e_console_set_output_callback, self.console)
+
+        if self.spec.printer:
+            self.printer = lib.pdp8_line_printer_create(None)
+            if not self.printer or lib.pdp8_line_printer_attach(self.cpu, self.printer) != 0:
+                raise driver.EmulatorError(f"{self.spec.name}: failed to attach line printer")
+            lib.pdp8_line_printer_set_stream(self.printer, None)
+            lib.pdp8_line_printer_set_column_limit(self.printer, ctypes.c_uint16(PRINTER_COLUMNS))
+            self._capture(lib.pdp8_line_printer_set_output_callback, self.printer)
+
+        if self.spec.image not in rom_cache:
+            rom_cache[self.spec.image] = driver.load_srec(self.spec.image)
+        rom_words, start_word = rom_cache[self.spec.image]
+        if not rom_words:
+            raise driver.EmulatorError(f"{self.spec.image}: no data records")
+        lib.pdp8_api_reset(self.cpu)
+        start_address, _ = driver.load_rom_into_memory(lib, self.cpu, rom_words)
+        driver.install_reset_vector(lib, self.cpu, start_word if start_word is not None else start_address)
+        self.queue_input(self.spec.input)
+
+    def _capture(self, set_callback, device: int) -> None:
+        ring = self.lib.pdp8_output_ring_create(OUTPUT_RING_BYTES)
+        if not ring:
+            raise driver.EmulatorError(f"{self.spec.name}: failed to create output ring")
+        self.taps.append(OutputTap(ring))
+        set_callback(device, ctypes.cast(self.lib.pdp8_output_ring_push, ctypes.c_void_p), ring)
+
+    def queue_input(self, text: str) -> None:
+        for byte in text.encode("ascii", errors="ignore"):
+            value = 0x0D if byte == 0x0A else (byte & 0x7F)
+            if self.lib.pdp8_kl8e_console_queue_input(self.console, ctypes.c_uint8(value)) != 0:
+                raise driver.EmulatorError(f"{self.spec.name}: failed to queue console input")
+
+    def run(self, quantum: int) -> int:
+        """Run one quantum; called on a pool thread, never concurrently for one machine."""
+        if self.spec.max_cycles:
+            quantum = min(quantum, self.spec.max_cycles - self.cycles)
+        started = time.perf_counter()
+        executed = self.lib.pdp8_api_run(self.cpu, ctypes.c_size_t(quantum))
+        self.busy_seconds += time.perf_counter() - started
+        if executed < 0:
+            raise driver.EmulatorError(f"{self.spec.name}: emulator reported an error")
+        self.cycles += executed
+        return executed
+
+    def update_state(self, stdin_open: bool) -> None:
+        lib = self.lib
+        if lib.pdp8_api_is_halted(self.cpu):
+            self.state = "halted"
+        elif self.spec.max_cycles and self.cycles >= self.spec.max_cycles:
+            self.state = "limit"
+        elif lib.pdp8_api_is_waiting(self.cpu) and not lib.pdp8_kl8e_console_input_pending(self.console):
+            parked = lib.pdp8_api_next_deadline(self.cpu) == driver.PDP8_DEADLINE_NONE and not stdin_open
+            self.state = "parked" if parked else "waiting"
+        else:
+            self.state = "running"
+
+    def drain(self, out: IO[str], final: bool = False) -> None:
+        """Print complete output lines since the last drain, prefixed with the name."""
+        buffer = (ctypes.c_uint8 * OUTPUT_RING_BYTES)()
+        start = ctypes.c_uint64()
+        for tap in self.taps:
+            count = self.lib.pdp8_output_ring_read(tap.ring, tap.cursor, buffer, OUTPUT_RING_BYTES, ctypes.byref(start))
+            tap.cursor = start.value + count
+            text = tap.partial + bytes(buffer[:count]).decode("ascii", errors="replace").replace("\r", "")
+            *lines, tap.partial = text.split("\n")
+            if final and tap.partial:
+                lines.append(tap.partial)
+                tap.partial = ""
+            for line in lines:
+                out.write(f"{self.spec.name:>10} | {line}\n")
+
+    @property
+    def skipped(self) -> int:
+        return self.lib.pdp8_api_idle_skipped(self.cpu) if self.cpu else 0
+
+    def close(self) -> None:
+        lib = self.lib
+        if self.console:
+            lib.pdp8_kl8e_console_destroy(self.console)
+        if self.printer:
+            lib.pdp8_line_printer_destroy(self.printer)
+        if self.cpu:
+            lib.pdp8_api_destroy(self.cpu)
+        for tap in self.taps:
+            lib.pdp8_output_ring_destroy(tap.ring)
+        self.console = self.printer = self.cpu = 0
+        self.taps = []
+
+
+class ConsoleRouter:
+    """Route stdin lines to machines: `@name text`, `@name` to focus, else the focus."""
+
+    def __init__(self, machines: List[ClusterMachine], fd: int) -> None:
+        self.by_name = {machine.spec.name: machine for machine in machines}
+        self.focus = machines[0]
+        self.fd = fd
+        self.pending = ""
+
+    @property
+    def open(self) -> bool:
+        return self.fd >= 0
+
+    def poll(self, timeout: Optional[float] = 0.0) -> None:
+        if self.fd < 0:
+            return
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return
+        data = os.read(self.fd, 4096)
+        if not data:
+            self.fd = -1
+            return
+        self.pending += data.decode("utf-8", errors="ignore")
+        *lines, self.pending = self.pending.split("\n")
+        for line in lines:
+            self.route(line)
+
+    def route(self, line: str) -> None:
+        if line.startswith("@"):
+            name, _, rest = line[1:].partition(" ")
+            target = self.by_name.get(name)
+            if target is None:
+                print(f"cluster: no machine named '{name}'", file=sys.stderr)
+                return
+            if not rest:
+                self.focus = target
+                return
+            target.queue_input(rest + "\n")
+            return
+        self.focus.queue_input(line + "\n")
+
+
+@dataclass
+class ClusterReport:
+    machines: int
+    workers: int
+    rounds: int
+    cycles: int
+    skipped: int
+    seconds: float
+
+    @property
+    def mips(self) -> float:
+        return self.cycles / self.seconds / 1e6 if self.seconds > 0 else 0.0
+
+    @property
+    def stepped_mips(self) -> float:
+        return (self.cycles - self.skipped) / self.seconds / 1e6 if self.seconds > 0 else 0.0
+
+
+def run_cluster(
+    lib: ctypes.CDLL,
+    machines: List[ClusterMachine],
+    quantum: int = DEFAULT_QUANTUM,
+    workers: Optional[int] = None,
+    router: Optional[ConsoleRouter] = None,
+    max_rounds: int = 0,
+    out: IO[str] = sys.stdout,
+) -> ClusterReport:
+    """Run machines in lock-step rounds of `quantum` cycles until none can progress."""
+    quantum = max(1, quantum)
+    workers = max(1, workers or min(len(machines), os.cpu_count() or 1))
+    stdin_open = router is not None and router.open
+    rounds = 0
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pdp8") as pool:
+        while True:
+            if router is not None:
+                router.poll()
+                stdin_open = router.open
+            for machine in machines:
+                machine.update_state(stdin_open)
+            runnable = [m for m in machines if m.state in ("running", "waiting")]
+            if not runnable or (max_rounds and rounds >= max_rounds):
+                break
+
+            if all(m.state == "waiting" for m in runnable):
+                # Everyone is parked in a wait loop: sleep until input or the
+                # nearest host-clock deadline instead of spinning the pool.
+                timeout = idle_timeout(lib, runnable)
+                if timeout is None and router is None:
+                    break
+                if router is not None:
+                    router.poll(timeout)
+                elif timeout:
+                    time.sleep(timeout)
+
+            list(pool.map(lambda machine: machine.run(quantum), runnable))
+            rounds += 1
+            for machine in runnable:
+                machine.drain(out)
+            out.flush()
+    seconds = time.perf_counter() - started
+
+    for machine in machines:
+        machine.drain(out, final=True)
+    out.flush()
+    return ClusterReport(
+        machines=len(machines),
+        workers=workers,
+        rounds=rounds,
+        cycles=sum(m.cycles for m in machines),
+        skipped=sum(m.skipped for m in machines),
+        seconds=seconds,
+    )
+
+
+def idle_timeout(lib: ctypes.CDLL, machines: List[ClusterMachine]) -> Optional[float]:
+    """Seconds until the nearest deadline of waiting machines, 0 under a virtual clock."""
+    timeout: Optional[float] = None
+    for machine in machines:
+        deadline = lib.pdp8_api_next_deadline(machine.cpu)
+        if deadline == driver.PDP8_DEADLINE_NONE:
+            continue
+        if lib.pdp8_api_get_clock_source(machine.cpu) != driver.CLOCK_SOURCES["host"]:
+            return 0.0
+        remaining = max(0.0, (deadline - lib.pdp8_api_now_ns(machine.cpu)) / 1e9)
+        timeout = remaining if timeout is None else min(timeout, remaining)
+    return timeout
+
+
+def report_cluster(lib: ctypes.CDLL, machines: List[ClusterMachine], report: ClusterReport) -> None:
+    print()
+    print("Cluster run complete.")
+    print("Machine       Cycles        Skipped      PC    State    MIPS")
+    print("----------    ------------  -----------  ----  -------  -------")
+    for machine in machines:
+        mips = machine.cycles / machine.busy_seconds / 1e6 if machine.busy_seconds > 0 else 0.0
+        pc = lib.pdp8_api_get_pc(machine.cpu) & 0x0FFF
+        print(
+            f"{machine.spec.name:<12}  {machine.cycles:12d}  {machine.skipped:11d}  "
+            f"{pc:04o}  {machine.state:<7}  {mips:7.2f}"
+        )
+    print(
+        f"Aggregate: {report.machines} machine(s) on {report.workers} worker(s), {report.rounds} round(s), "
+        f"{report.cycles} cycles in {report.seconds:.3f} s = {report.mips:.2f} MIPS "
+        f"({report.stepped_mips:.2f} MIPS excluding {report.skipped} idle-skipped)."
+    )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run a cluster of PDP-8 machines from a manifest.")
+    parser.add_argument("manifest", type=Path, help="JSON manifest listing the machines to start.")
+    parser.add_argument(
+        "--quantum",
+        type=int,
+        help=f"Cycles each machine runs per round (default: manifest value or {DEFAULT_QUANTUM}).",
+    )
+    parser.add_argument("--workers", type=int, help="Thread pool size (default: min(machines, CPUs)).")
+    parser.add_argument("--rounds", type=int, default=0, help="Stop after this many rounds (default: no limit).")
+    parser.add_argument(
+        "--no-console", action="store_true", help="Do not read stdin; machines only get their manifest input."
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    specs, manifest_quantum = load_manifest(args.manifest)
+    quantum = args.quantum or manifest_quantum or DEFAULT_QUANTUM
+
+    lib = driver.load_library()
+    driver.configure_api(lib)
+
+    machines = [ClusterMachine(spec, lib) for spec in specs]
+    try:
+        rom_cache: Dict[Path, tuple] = {}
+        for machine in machines:
+            machine.build(rom_cache)
+        print(f"Cluster: {len(machines)} machine(s) from {args.manifest}, quantum {quantum} cycles.")
+
+        router = None
+        if not args.no_console:
+            try:
+                router = ConsoleRouter(machines, sys.stdin.fileno())
+            except (OSError, AttributeError, ValueError):
+                router = None
+        report = run_cluster(lib, machines, quantum, args.workers, router, args.rounds)
+        report_cluster(lib, machines, report)
+    finally:
+        for machine in machines:
+            machine.close()
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except driver.EmulatorError as exc:
+        print(f"factory.cluster: {exc}", file=sys.stderr)
+        sys.exit(1)
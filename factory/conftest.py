@@ -0,0 +1,18 @@
+"""
+Shared pytest fixtures for the factory tests.
+"""
+
+from __future__ import annotations
+
+import ctypes
+
+import pytest
+
+from factory import driver
+
+
+@pytest.fixture(scope="module")
+def lib() -> ctypes.CDLL:
+    shared = driver.load_library()
+    driver.configure_api(shared)
+    return shared
@@ -0,0 +1,108 @@
+"""
+Table-driven PDP-8 disassembly.
+
+Every 12-bit word is decoded once, at import, into a mnemonic template built
+from the assembler's own tables (tools/pdp8_asm.py), so the text matches what
+the assembler accepts and decodes operate groups the way this emulator
+executes them (7400 is IOFF, group 2 bit 11 is ION). Rendering a trace row or
+listing line is then a list lookup plus, for memory-reference instructions, a
+cheap address step that needs the PC:
+
+    from factory.disasm import disassemble
+    disassemble(0o1234, pc=0o0200)  # 'TAD 0234'
+    disassemble(0o7450, pc=0)       # 'SNA'
+
+MNEMONICS[word] holds the bare template ('TAD I' for memory references).
+"""
+
+from __future__ import annotations
+
+from typing import List, Optional, Sequence, Tuple
+
+from tools.pdp8_asm import GROUP1_BITS, GROUP2_BITS, IOT_MNEMONICS, MEMREF_OPS, SENSE_BIT
+
+WORDS = 0o10000
+INDIRECT_BIT = 0o400
+PAGE_BIT = 0o200
+OFFSET_MASK = 0o177
+PAGE_MASK = 0o7600
+
+_ROTATES = ("RTR", "RTL", "RAR", "RAL", "BSW")  # two-bit rotates first so they win
+_SKIPS = ("SMA", "SZA", "SNL")
+_REVERSED_SKIPS = ("SPA", "SNA", "SZL")
+
+
+def _group1(word: int) -> str:
+    bits = word & 0o377
+    names = [name for name in ("CLA", "CLL", "CMA", "CML", "IAC") if bits & GROUP1_BITS[name]]
+    rotate = bits & 0o016
+    for name in _ROTATES:
+        if rotate and rotate & GROUP1_BITS[name] == GROUP1_BITS[name]:
+            names.append(name)
+            rotate &= ~GROUP1_BITS[name]
+    return " ".join(names) if names else "NOP"
+
+
+def _group2(word: int) -> str:
+    bits = word & 0o377
+    if bits == 0:
+        return "IOFF"
+    reversed_sense = bool(bits & SENSE_BIT)
+    skips = _REVERSED_SKIPS if reversed_sense else _SKIPS
+    names = [name for name in skips if bits & GROUP2_BITS[name] & ~SENSE_BIT]
+    if reversed_sense and not names:
+        names.append("SKP")
+    names += [name for name in ("CLA", "OSR", "HLT", "ION") if bits & GROUP2_BITS[name]]
+    return " ".join(names) if names else "NOP"
+
+
+def _build() -> Tuple[List[str], List[bool]]:
+    opcodes = {value >> 9: name for name, value in MEMREF_OPS.items()}
+    iots = {value: name for name, value in IOT_MNEMONICS.items()}
+    mnemonics: List[str] = []
+    memref: List[bool] = []
+    for word in range(WORDS):
+        opcode = word >> 9
+        if opcode in opcodes:
+            mnemonics.append(opcodes[opcode] + (" I" if word & INDIRECT_BIT else ""))
+            memref.append(True)
+            continue
+        if opcode == 6:
+            mnemonics.append(iots.get(word, f"IOT {word:04o}"))
+        elif word & 0o400:
+            mnemonics.append(_group2(word))
+        else:
+            mnemonics.append(_group1(word))
+        memref.append(False)
+    return mnemonics, memref
+
+
+MNEMONICS, _MEMREF = _build()
+
+
+def is_memory_reference(word: int) -> bool:
+    return _MEMREF[word & 0o7777]
+
+
+def direct_address(word: int, pc: int) -> Optional[int]:
+    """Operand address before indirection, or None for non-memory-reference words."""
+    word &= 0o7777
+    if not _MEMREF[word]:
+        return None
+    page = pc & PAGE_MASK if word & PAGE_BIT else 0
+    return page | (word & OFFSET_MASK)
+
+
+def disassemble(word: int, pc: int) -> str:
+    """Text for the instruction `word` fetched from `pc`."""
+    word &= 0o7777
+    text = MNEMONICS[word]
+    if not _MEMREF[word]:
+        return text
+    page = pc & PAGE_MASK if word & PAGE_BIT else 0
+    return f"{text} {page | (word & OFFSET_MASK):04o}"
+
+
+def disassemble_block(words: Sequence[int], base: int) -> List[str]:
+    """Disassemble consecutive words loaded from `base` onwards."""
+    return [disassemble(word, base + index) for index, word in enumerate(words)]
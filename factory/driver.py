@@ -7,6 +7,7 @@ import argparse
 import errno
 import os
 import select
+import socket
 import sys
 import time
 from dataclasses import dataclass
@@ -15,15 +16,28 @@ from typing import Dict, IO, List, Optional, Tuple
 
 import ctypes
 
+try:
+    from .journal import Journal
+    from .tracefile import DEFAULT_CHUNK_STEPS, TraceWriter
+except ImportError:  # run as a script: python3 factory/driver.py
+    from journal import Journal
+    from tracefile import DEFAULT_CHUNK_STEPS, TraceWriter
+
 
 RESET_VECTOR_ADDR = 0o0000
 RESET_POINTER_ADDR = 0o0020
 JMP_INDIRECT_20 = 0o5420  # JMP I 20, used as the reset vector
 DEFAULT_MEMORY_WORDS = 4096
 RUN_BLOCK_CYCLES = 8
+REPLAY_BLOCK_CYCLES = 1 << 20  # replays stop at recorded input on their own
 KL8E_BAUD = 110
 KL8E_BITS_PER_CHAR = 10
 KL8E_CHAR_PERIOD = KL8E_BITS_PER_CHAR / KL8E_BAUD if KL8E_BAUD > 0 else 0.0
+# Streamed console I/O (pdp8.config keyboard_input / teleprinter_output)
+STREAM_BLOCK_CYCLES = 1 << 14
+CONSOLE_READ_CHUNK = 1 << 16
+KL8E_INPUT_HIGH_WATER = 4096  # characters queued in the KL8E before reading stops
+CONSOLE_OUTPUT_BUFFER = 1 << 20
 
 # Watchdog device constants (match src/emulator/watchdog.h)
 PDP8_WATCHDOG_DEVICE_CODE = 0o55
@@ -39,6 +53,55 @@ WD_CMD_INTERRUPT_ONE_SHOT = 5
 WD_CMD_INTERRUPT_PERIODIC = 6
 WD_CMD_TICK_PERIODIC = 7
 
+# Output flush policies (mirror enum pdp8_output_flush_policy in output_buffer.h)
+OUTPUT_FLUSH_POLICIES = {
+    "char": 0,
+    "line": 1,
+    "bytes": 2,
+    "halt": 3,
+    "manual": 4,
+}
+
+# Clock sources (mirror pdp8_clock_source in pdp8.h)
+CLOCK_SOURCES = {
+    "host": 0,
+    "instruction": 1,
+    "cycle": 2,
+}
+PDP8_MEMORY_CYCLE_NS = 1200
+
+# Breakpoints and watchpoints (mirror PDP8_WATCH_* and pdp8_stop_reason in pdp8.h)
+WATCH_ACCESSES = {
+    "read": 1,
+    "write": 2,
+    "rw": 3,
+}
+STOP_REASONS = {
+    0: "budget",
+    1: "halt",
+    2: "breakpoint",
+    3: "watch-read",
+    4: "watch-write",
+    5: "pc",
+}
+PDP8_DEADLINE_NONE = (1 << 64) - 1  # no tick deadline (pdp8.h)
+LATENCY_BUCKETS = 16  # PDP8_LATENCY_BUCKETS
+
+
+class Counters(ctypes.Structure):
+    """pdp8_counters_t: running totals since the CPU was created."""
+
+    _fields_ = [
+        ("instructions", ctypes.c_uint64),
+        ("halts", ctypes.c_uint64),
+        ("interrupt_requests", ctypes.c_uint64),
+        ("interrupt_dispatches", ctypes.c_uint64),
+        ("interrupt_latency_sum", ctypes.c_uint64),
+        ("interrupt_latency_max", ctypes.c_uint64),
+        ("interrupt_latency", ctypes.c_uint64 * LATENCY_BUCKETS),
+        ("iots", ctypes.c_uint64 * 64),
+    ]
+
 
 @dataclass
 class DeviceConfig:
@@ -49,11 +112,15 @@ class DeviceConfig:
     line_printer_present: bool = True
     line_printer_output: str = "stdout"
     line_printer_column_limit: int = 132
+    line_printer_flush: str = "char"
+    line_printer_flush_bytes: int = 0
 
     paper_tape_present: bool = False
     paper_tape_image: Optional[str] = None
     paper_tape_punch_enabled: bool = True
     paper_tape_punch_output: Optional[str] = None
+    paper_tape_punch_flush: str = "char"
+    paper_tape_punch_flush_bytes: int = 0
     # Watchdog device config
     watchdog_present: bool = False
     watchdog_enabled: bool = False
@@ -86,6 +153,56 @@ def parse_args() -> argparse.Namespace:
         default=RUN_BLOCK_CYCLES,
         help="Number of cycles to execute per emulator run block (default: %(default)s).",
     )
+    parser.add_argument(
+        "--clock",
+        choices=sorted(CLOCK_SOURCES),
+        default="host",
+        help=(
+            "Time source for the watchdog and other timed devices: host monotonic time, or "
+            "virtual time advanced per instruction or per memory cycle (default: %(default)s)."
+        ),
+    )
+    parser.add_argument(
+        "--clock-ns",
+        type=int,
+        default=PDP8_MEMORY_CYCLE_NS,
+        help="Virtual nanoseconds per instruction or memory cycle (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--no-idle-skip",
+        action="store_true",
+        help="Step through idle wait and delay loops instead of fast-forwarding them.",
+    )
+    parser.add_argument(
+        "--trace-out",
+        type=Path,
+        help="Record every instruction to a chunked .p8t trace file (see tools/trace_analyze.py).",
+    )
+    parser.add_argument(
+        "--trace-chunk",
+        type=int,
+        default=DEFAULT_CHUNK_STEPS,
+        help="Instructions per trace chunk (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--trace-level",
+        type=int,
+        default=1,
+        help="zlib level for trace chunks, 0 to store uncompressed (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--journal-out",
+        type=Path,
+        help="Record keyboard input, tape words and host time to a .p8j journal for --replay.",
+    )
+    parser.add_argument(
+        "--replay",
+        type=Path,
+        help=(
+            "Replay a journal recorded with --journal-out (same image and pdp8.config) "
+            "as fast as possible, ignoring stdin."
+        ),
+    )
     return parser.parse_args()
 
 
@@ -97,20 +214,24 @@ def load_srec(path: Path) -> Tuple[List[Tuple[int, int]], Optional[int]]:
     the low byte appears at the even address and the high byte follows.
     """
     try:
-        lines = path.read_text().splitlines()
+        text = path.read_text()
     except OSError as exc:
         raise EmulatorError(f"Unable to read {path}: {exc}") from exc
+    return parse_srec(text, source=str(path))
+
 
+def parse_srec(text: str, source: str = "S-record") -> Tuple[List[Tuple[int, int]], Optional[int]]:
+    """Parse S-record text already in memory; see load_srec."""
     byte_map: Dict[int, int] = {}
     start_word: Optional[int] = None
-    for raw_line in lines:
+    for raw_line in text.splitlines():
         line = raw_line.strip()
         if not line or not line.startswith("S"):
             continue
 
-        record_type = line[1]
-        if record_type not in "123":  # Data-bearing record types
-            if record_type in "789":
+        record_type = line[1:2]
+        if record_type not in ("1", "2", "3"):  # Data-bearing record types
+            if record_type in ("7", "8", "9"):
                 addr_digits = {"7": 8, "8": 6, "9": 4}[record_type]
                 addr_field = line[4 : 4 + addr_digits]
                 try:
@@ -137,12 +258,10 @@ def load_srec(path: Path) -> Tuple[List[Tuple[int, int]], Optional[int]]:
         if len(data_field) % 2 != 0:
             raise EmulatorError(f"Odd number of data nybbles in record: {line}")
 
-        data_bytes = []
-        for idx in range(0, len(data_field), 2):
-            try:
-                data_bytes.append(int(data_field[idx : idx + 2], 16))
-            except ValueError as exc:
-                raise EmulatorError(f"Invalid data byte in record: {line}") from exc
+        try:
+            data_bytes = bytes.fromhex(data_field)
+        except ValueError as exc:
+            raise EmulatorError(f"Invalid data byte in record: {line}") from exc
 
         expected_payload = count - (addr_field_len // 2) - 1
         if expected_payload != len(data_bytes):
@@ -152,7 +271,7 @@ def load_srec(path: Path) -> Tuple[List[Tuple[int, int]], Optional[int]]:
             byte_map[base_address + offset] = value
 
     if not byte_map:
-        raise EmulatorError(f"No data records found in {path}")
+        raise EmulatorError(f"No data records found in {source}")
 
     words: Dict[int, int] = {}
     for byte_address in sorted(byte_map):
@@ -172,6 +291,17 @@ def load_srec(path: Path) -> Tuple[List[Tuple[int, int]], Optional[int]]:
     return sorted(words.items()), start_word
 
 
+def word_runs(rom_words: List[Tuple[int, int]]) -> List[Tuple[int, List[int]]]:
+    """Group sorted (address, value) pairs into contiguous (start, values) runs."""
+    runs: List[Tuple[int, List[int]]] = []
+    for address, value in rom_words:
+        if runs and runs[-1][0] + len(runs[-1][1]) == address:
+            runs[-1][1].append(value)
+        else:
+            runs.append((address, [value]))
+    return runs
+
+
 def load_library() -> ctypes.CDLL:
     root = Path(__file__).resolve().parent
     lib_path = root / "libpdp8.so"
@@ -202,6 +332,33 @@ def configure_api(lib: ctypes.CDLL) -> None:
     lib.pdp8_api_read_mem.argtypes = [ctypes.c_void_p, ctypes.c_uint16]
     lib.pdp8_api_read_mem.restype = ctypes.c_uint16
 
+    lib.pdp8_api_read_block.argtypes = [ctypes.c_void_p, ctypes.c_uint16, ctypes.POINTER(ctypes.c_uint16), ctypes.c_size_t]
+    lib.pdp8_api_read_block.restype = ctypes.c_size_t
+
+    lib.pdp8_api_load.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_uint16), ctypes.c_size_t, ctypes.c_uint16]
+    lib.pdp8_api_load.restype = ctypes.c_int
+
+    lib.pdp8_api_memory_generation.argtypes = [ctypes.c_void_p]
+    lib.pdp8_api_memory_generation.restype = ctypes.c_uint64
+
+    lib.pdp8_api_dirty_pages.argtypes = [ctypes.c_void_p, ctypes.c_uint64, ctypes.POINTER(ctypes.c_uint16), ctypes.c_size_t]
+    lib.pdp8_api_dirty_pages.restype = ctypes.c_size_t
+
+    lib.pdp8_api_page_count.argtypes = [ctypes.c_void_p]
+    lib.pdp8_api_page_count.restype = ctypes.c_size_t
+
+    lib.pdp8_api_read_page.argtypes = [ctypes.c_void_p, ctypes.c_uint16, ctypes.POINTER(ctypes.c_uint16)]
+    lib.pdp8_api_read_page.restype = ctypes.c_int
+
+    lib.pdp8_api_write_page.argtypes = [ctypes.c_void_p, ctypes.c_uint16, ctypes.POINTER(ctypes.c_uint16)]
+    lib.pdp8_api_write_page.restype = ctypes.c_int
+
+    lib.pdp8_api_save_state.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t]
+    lib.pdp8_api_save_state.restype = ctypes.c_size_t
+
+    lib.pdp8_api_restore_state.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t]
+    lib.pdp8_api_restore_state.restype = ctypes.c_int
+
     lib.pdp8_api_set_pc.argtypes = [ctypes.c_void_p, ctypes.c_uint16]
     lib.pdp8_api_set_pc.restype = None
 
@@ -217,6 +374,9 @@ def configure_api(lib: ctypes.CDLL) -> None:
     lib.pdp8_api_is_halted.argtypes = [ctypes.c_void_p]
     lib.pdp8_api_is_halted.restype = ctypes.c_int
 
+    lib.pdp8_api_is_interrupt_enabled.argtypes = [ctypes.c_void_p]
+    lib.pdp8_api_is_interrupt_enabled.restype = ctypes.c_int
+
     # low-level step and AC access useful for issuing IOTs from the driver
     lib.pdp8_api_step.argtypes = [ctypes.c_void_p]
     lib.pdp8_api_step.restype = ctypes.c_int
@@ -227,6 +387,95 @@ def configure_api(lib: ctypes.CDLL) -> None:
     lib.pdp8_api_run.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
     lib.pdp8_api_run.restype = ctypes.c_int
 
+    lib.pdp8_api_run_until.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int]
+    lib.pdp8_api_run_until.restype = ctypes.c_int
+
+    lib.pdp8_api_set_breakpoint.argtypes = [ctypes.c_void_p, ctypes.c_uint16, ctypes.c_int]
+    lib.pdp8_api_set_breakpoint.restype = ctypes.c_int
+
+    lib.pdp8_api_set_watchpoint.argtypes = [ctypes.c_void_p, ctypes.c_uint16, ctypes.c_int]
+    lib.pdp8_api_set_watchpoint.restype = ctypes.c_int
+
+    lib.pdp8_api_clear_breakpoints.argtypes = [ctypes.c_void_p]
+    lib.pdp8_api_clear_breakpoints.restype = None
+
+    lib.pdp8_api_list_breakpoints.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_uint16), ctypes.c_size_t]
+    lib.pdp8_api_list_breakpoints.restype = ctypes.c_size_t
+
+    lib.pdp8_api_list_watchpoints.argtypes = [
+        ctypes.c_void_p,
+        ctypes.POINTER(ctypes.c_uint16),
+        ctypes.POINTER(ctypes.c_uint8),
+        ctypes.c_size_t,
+    ]
+    lib.pdp8_api_list_watchpoints.restype = ctypes.c_size_t
+
+    lib.pdp8_api_get_stop_reason.argtypes = [ctypes.c_void_p]
+    lib.pdp8_api_get_stop_reason.restype = ctypes.c_int
+
+    lib.pdp8_api_get_stop_address.argtypes = [ctypes.c_void_p]
+    lib.pdp8_api_get_stop_address.restype = ctypes.c_uint16
+
+    lib.pdp8_api_trace.argtypes = [
+        ctypes.c_void_p,
+        ctypes.c_size_t,
+        ctypes.POINTER(ctypes.c_uint16),
+        ctypes.POINTER(ctypes.c_uint16),
+        ctypes.POINTER(ctypes.c_uint16),
+        ctypes.POINTER(ctypes.c_uint8),
+    ]
+    lib.pdp8_api_trace.restype = ctypes.c_size_t
+
+    lib.pdp8_api_trace_addresses.argtypes = [
+        ctypes.c_void_p,
+        ctypes.c_size_t,
+        ctypes.POINTER(ctypes.c_uint16),
+        ctypes.POINTER(ctypes.c_uint16),
+        ctypes.POINTER(ctypes.c_uint16),
+        ctypes.POINTER(ctypes.c_uint8),
+        ctypes.POINTER(ctypes.c_uint16),
+    ]
+    lib.pdp8_api_trace_addresses.restype = ctypes.c_size_t
+
+    lib.pdp8_api_set_clock.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_uint64]
+    lib.pdp8_api_set_clock.restype = ctypes.c_int
+
+    lib.pdp8_api_get_clock_source.argtypes = [ctypes.c_void_p]
+    lib.pdp8_api_get_clock_source.restype = ctypes.c_int
+
+    lib.pdp8_api_now_ns.argtypes = [ctypes.c_void_p]
+    lib.pdp8_api_now_ns.restype = ctypes.c_uint64
+
+    lib.pdp8_api_set_idle_skip.argtypes = [ctypes.c_void_p, ctypes.c_int]
+    lib.pdp8_api_set_idle_skip.restype = None
+
+    lib.pdp8_api_idle_skipped.argtypes = [ctypes.c_void_p]
+    lib.pdp8_api_idle_skipped.restype = ctypes.c_uint64
+
+    lib.pdp8_api_get_counters.argtypes = [ctypes.c_void_p, ctypes.POINTER(Counters)]
+    lib.pdp8_api_get_counters.restype = ctypes.c_int
+
+    lib.pdp8_api_set_idle_iot.argtypes = [ctypes.c_void_p, ctypes.c_uint8, ctypes.c_int]
+    lib.pdp8_api_set_idle_iot.restype = ctypes.c_int
+
+    lib.pdp8_api_set_tick_deadline.argtypes = [ctypes.c_void_p, ctypes.c_uint8, ctypes.c_uint64]
+    lib.pdp8_api_set_tick_deadline.restype = ctypes.c_int
+
+    lib.pdp8_api_next_deadline.argtypes = [ctypes.c_void_p]
+    lib.pdp8_api_next_deadline.restype = ctypes.c_uint64
+
+    lib.pdp8_api_is_waiting.argtypes = [ctypes.c_void_p]
+    lib.pdp8_api_is_waiting.restype = ctypes.c_int
+
+    lib.pdp8_api_register_mmio_read.argtypes = [ctypes.c_void_p, ctypes.c_uint16, ctypes.c_void_p, ctypes.c_void_p]
+    lib.pdp8_api_register_mmio_read.restype = ctypes.c_int
+
+    lib.pdp8_api_set_status_word.argtypes = [ctypes.c_void_p, ctypes.c_uint16, ctypes.c_uint16]
+    lib.pdp8_api_set_status_word.restype = ctypes.c_int
+
+    lib.pdp8_api_clear_status_word.argtypes = [ctypes.c_void_p, ctypes.c_uint16]
+    lib.pdp8_api_clear_status_word.restype = ctypes.c_int
+
     lib.pdp8_api_set_switch_register.argtypes = [ctypes.c_void_p, ctypes.c_uint16]
     lib.pdp8_api_set_switch_register.restype = None
 
@@ -248,12 +497,30 @@ def configure_api(lib: ctypes.CDLL) -> None:
     lib.pdp8_kl8e_console_output_pending.argtypes = [ctypes.c_void_p]
     lib.pdp8_kl8e_console_output_pending.restype = ctypes.c_size_t
 
+    lib.pdp8_kl8e_console_input_count.argtypes = [ctypes.c_void_p]
+    lib.pdp8_kl8e_console_input_count.restype = ctypes.c_uint64
+
+    lib.pdp8_kl8e_console_output_count.argtypes = [ctypes.c_void_p]
+    lib.pdp8_kl8e_console_output_count.restype = ctypes.c_uint64
+
     lib.pdp8_kl8e_console_pop_output.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_uint8)]
     lib.pdp8_kl8e_console_pop_output.restype = ctypes.c_int
 
+    lib.pdp8_kl8e_console_queue_block.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_size_t]
+    lib.pdp8_kl8e_console_queue_block.restype = ctypes.c_size_t
+
+    lib.pdp8_kl8e_console_pop_output_block.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_size_t]
+    lib.pdp8_kl8e_console_pop_output_block.restype = ctypes.c_size_t
+
     lib.pdp8_kl8e_console_flush.argtypes = [ctypes.c_void_p]
     lib.pdp8_kl8e_console_flush.restype = ctypes.c_int
 
+    lib.pdp8_kl8e_console_set_output_stream.argtypes = [ctypes.c_void_p, ctypes.c_void_p]
+    lib.pdp8_kl8e_console_set_output_stream.restype = ctypes.c_int
+
+    lib.pdp8_kl8e_console_set_output_callback.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p]
+    lib.pdp8_kl8e_console_set_output_callback.restype = ctypes.c_int
+
     lib.pdp8_line_printer_create.argtypes = [ctypes.c_void_p]
     lib.pdp8_line_printer_create.restype = ctypes.c_void_p
 
@@ -266,6 +533,43 @@ def configure_api(lib: ctypes.CDLL) -> None:
     lib.pdp8_line_printer_set_column_limit.argtypes = [ctypes.c_void_p, ctypes.c_uint16]
     lib.pdp8_line_printer_set_column_limit.restype = ctypes.c_int
 
+    lib.pdp8_line_printer_set_stream.argtypes = [ctypes.c_void_p, ctypes.c_void_p]
+    lib.pdp8_line_printer_set_stream.restype = ctypes.c_int
+
+    lib.pdp8_line_printer_set_flush_policy.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_size_t]
+    lib.pdp8_line_printer_set_flush_policy.restype = ctypes.c_int
+
+    lib.pdp8_line_printer_flush.argtypes = [ctypes.c_void_p]
+    lib.pdp8_line_printer_flush.restype = ctypes.c_int
+
+    lib.pdp8_line_printer_pending.argtypes = [ctypes.c_void_p]
+    lib.pdp8_line_printer_pending.restype = ctypes.c_size_t
+
+    lib.pdp8_line_printer_output_count.argtypes = [ctypes.c_void_p]
+    lib.pdp8_line_printer_output_count.restype = ctypes.c_uint64
+
+    lib.pdp8_line_printer_set_output_callback.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p]
+    lib.pdp8_line_printer_set_output_callback.restype = ctypes.c_int
+
+    # output capture rings (src/emulator/output_ring.h)
+    lib.pdp8_output_ring_create.argtypes = [ctypes.c_size_t]
+    lib.pdp8_output_ring_create.restype = ctypes.c_void_p
+
+    lib.pdp8_output_ring_destroy.argtypes = [ctypes.c_void_p]
+    lib.pdp8_output_ring_destroy.restype = None
+
+    lib.pdp8_output_ring_read.argtypes = [
+        ctypes.c_void_p,
+        ctypes.c_uint64,
+        ctypes.c_void_p,
+        ctypes.c_size_t,
+        ctypes.POINTER(ctypes.c_uint64),
+    ]
+    lib.pdp8_output_ring_read.restype = ctypes.c_size_t
+
+    lib.pdp8_output_ring_end.argtypes = [ctypes.c_void_p]
+    lib.pdp8_output_ring_end.restype = ctypes.c_uint64
+
     lib.pdp8_paper_tape_device_create.argtypes = []
     lib.pdp8_paper_tape_device_create.restype = ctypes.c_void_p
 
@@ -281,6 +585,9 @@ def configure_api(lib: ctypes.CDLL) -> None:
     lib.pdp8_paper_tape_device_label.argtypes = [ctypes.c_void_p]
     lib.pdp8_paper_tape_device_label.restype = ctypes.c_char_p
 
+    lib.pdp8_paper_tape_compile.argtypes = [ctypes.c_char_p, ctypes.c_char_p]
+    lib.pdp8_paper_tape_compile.restype = ctypes.c_int
+
     # Paper tape punch (device code 02)
     lib.pdp8_paper_tape_punch_create.argtypes = []
     lib.pdp8_paper_tape_punch_create.restype = ctypes.c_void_p
@@ -294,6 +601,123 @@ def configure_api(lib: ctypes.CDLL) -> None:
     lib.pdp8_paper_tape_punch_set_output_path.argtypes = [ctypes.c_void_p, ctypes.c_char_p]
     lib.pdp8_paper_tape_punch_set_output_path.restype = ctypes.c_int
 
+    lib.pdp8_paper_tape_punch_set_flush_policy.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_size_t]
+    lib.pdp8_paper_tape_punch_set_flush_policy.restype = ctypes.c_int
+
+    lib.pdp8_paper_tape_punch_flush.argtypes = [ctypes.c_void_p]
+    lib.pdp8_paper_tape_punch_flush.restype = ctypes.c_int
+
+    # Mailbox for host-simulated peripherals (default device code 050)
+    lib.pdp8_mailbox_create.argtypes = []
+    lib.pdp8_mailbox_create.restype = ctypes.c_void_p
+
+    lib.pdp8_mailbox_destroy.argtypes = [ctypes.c_void_p]
+    lib.pdp8_mailbox_destroy.restype = None
+
+    lib.pdp8_mailbox_attach.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_uint8]
+    lib.pdp8_mailbox_attach.restype = ctypes.c_int
+
+    lib.pdp8_mailbox_post.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t]
+    lib.pdp8_mailbox_post.restype = ctypes.c_size_t
+
+    lib.pdp8_mailbox_collect.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t]
+    lib.pdp8_mailbox_collect.restype = ctypes.c_size_t
+
+    lib.pdp8_mailbox_inbound_pending.argtypes = [ctypes.c_void_p]
+    lib.pdp8_mailbox_inbound_pending.restype = ctypes.c_size_t
+
+    lib.pdp8_mailbox_outbound_pending.argtypes = [ctypes.c_void_p]
+    lib.pdp8_mailbox_outbound_pending.restype = ctypes.c_size_t
+
+    lib.pdp8_mailbox_dropped.argtypes = [ctypes.c_void_p]
+    lib.pdp8_mailbox_dropped.restype = ctypes.c_uint64
+
+    lib.pdp8_mailbox_read_registers.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_void_p, ctypes.c_size_t]
+    lib.pdp8_mailbox_read_registers.restype = ctypes.c_int
+
+    lib.pdp8_mailbox_write_registers.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_void_p, ctypes.c_size_t]
+    lib.pdp8_mailbox_write_registers.restype = ctypes.c_int
+
+    # Checkpoints for reverse execution (src/emulator/checkpoint.h)
+    lib.pdp8_checkpoints_create.argtypes = [ctypes.c_void_p, ctypes.c_uint64, ctypes.c_size_t]
+    lib.pdp8_checkpoints_create.restype = ctypes.c_void_p
+
+    lib.pdp8_checkpoints_destroy.argtypes = [ctypes.c_void_p]
+    lib.pdp8_checkpoints_destroy.restype = None
+
+    lib.pdp8_checkpoints_reset.argtypes = [ctypes.c_void_p]
+    lib.pdp8_checkpoints_reset.restype = ctypes.c_int
+
+    lib.pdp8_checkpoints_set_budget.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+    lib.pdp8_checkpoints_set_budget.restype = None
+
+    lib.pdp8_checkpoints_run.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+    lib.pdp8_checkpoints_run.restype = ctypes.c_int
+
+    lib.pdp8_checkpoints_run_until.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int]
+    lib.pdp8_checkpoints_run_until.restype = ctypes.c_int
+
+    lib.pdp8_checkpoints_seek.argtypes = [ctypes.c_void_p, ctypes.c_uint64]
+    lib.pdp8_checkpoints_seek.restype = ctypes.c_int
+
+    lib.pdp8_checkpoints_reverse_step.argtypes = [ctypes.c_void_p, ctypes.c_uint64]
+    lib.pdp8_checkpoints_reverse_step.restype = ctypes.c_int
+
+    lib.pdp8_checkpoints_reverse_continue.argtypes = [ctypes.c_void_p]
+    lib.pdp8_checkpoints_reverse_continue.restype = ctypes.c_int
+
+    lib.pdp8_checkpoints_stop_address.argtypes = [ctypes.c_void_p]
+    lib.pdp8_checkpoints_stop_address.restype = ctypes.c_uint16
+
+    lib.pdp8_checkpoints_position.argtypes = [ctypes.c_void_p]
+    lib.pdp8_checkpoints_position.restype = ctypes.c_uint64
+
+    lib.pdp8_checkpoints_oldest.argtypes = [ctypes.c_void_p]
+    lib.pdp8_checkpoints_oldest.restype = ctypes.c_uint64
+
+    lib.pdp8_checkpoints_count.argtypes = [ctypes.c_void_p]
+    lib.pdp8_checkpoints_count.restype = ctypes.c_size_t
+
+    lib.pdp8_checkpoints_bytes.argtypes = [ctypes.c_void_p]
+    lib.pdp8_checkpoints_bytes.restype = ctypes.c_size_t
+
+    # Input journal for recording and replaying sessions (src/emulator/journal.h)
+    lib.pdp8_api_instruction_count.argtypes = [ctypes.c_void_p]
+    lib.pdp8_api_instruction_count.restype = ctypes.c_uint64
+
+    lib.pdp8_journal_record.argtypes = [ctypes.c_void_p, ctypes.c_char_p]
+    lib.pdp8_journal_record.restype = ctypes.c_void_p
+
+    lib.pdp8_journal_replay.argtypes = [ctypes.c_void_p, ctypes.c_char_p]
+    lib.pdp8_journal_replay.restype = ctypes.c_void_p
+
+    lib.pdp8_journal_set_console.argtypes = [ctypes.c_void_p, ctypes.c_void_p]
+    lib.pdp8_journal_set_console.restype = ctypes.c_int
+
+    lib.pdp8_journal_run.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+    lib.pdp8_journal_run.restype = ctypes.c_int
+
+    lib.pdp8_journal_close.argtypes = [ctypes.c_void_p]
+    lib.pdp8_journal_close.restype = ctypes.c_int
+
+    lib.pdp8_journal_position.argtypes = [ctypes.c_void_p]
+    lib.pdp8_journal_position.restype = ctypes.c_uint64
+
+    lib.pdp8_journal_end.argtypes = [ctypes.c_void_p]
+    lib.pdp8_journal_end.restype = ctypes.c_uint64
+
+    lib.pdp8_journal_events.argtypes = [ctypes.c_void_p]
+    lib.pdp8_journal_events.restype = ctypes.c_uint64
+
+    lib.pdp8_journal_remaining.argtypes = [ctypes.c_void_p]
+    lib.pdp8_journal_remaining.restype = ctypes.c_uint64
+
+    lib.pdp8_journal_mismatches.argtypes = [ctypes.c_void_p]
+    lib.pdp8_journal_mismatches.restype = ctypes.c_uint64
+
+    lib.pdp8_journal_bytes.argtypes = [ctypes.c_void_p]
+    lib.pdp8_journal_bytes.restype = ctypes.c_uint64
+
     # Watchdog API (optional; may not be present in older builds)
     try:
         lib.pdp8_watchdog_create.argtypes = []
@@ -338,6 +762,47 @@ def execute_iot(lib: ctypes.CDLL, cpu: int, instruction: int, ac: int | None = N
     return lib.pdp8_api_get_ac(cpu) & 0x0FFF
 
 
+def list_breakpoints(lib: ctypes.CDLL, cpu: int) -> List[int]:
+    count = lib.pdp8_api_list_breakpoints(cpu, None, 0)
+    addresses = (ctypes.c_uint16 * max(1, count))()
+    count = lib.pdp8_api_list_breakpoints(cpu, addresses, count)
+    return list(addresses[:count])
+
+
+def list_watchpoints(lib: ctypes.CDLL, cpu: int) -> List[Tuple[int, int]]:
+    """(address, PDP8_WATCH_* mask) pairs in ascending address order."""
+    count = lib.pdp8_api_list_watchpoints(cpu, None, None, 0)
+    addresses = (ctypes.c_uint16 * max(1, count))()
+    accesses = (ctypes.c_uint8 * max(1, count))()
+    count = lib.pdp8_api_list_watchpoints(cpu, addresses, accesses, count)
+    return list(zip(addresses[:count], accesses[:count]))
+
+
+def stop_reason(lib: ctypes.CDLL, cpu: int) -> Tuple[str, int]:
+    """Why the last run returned (a STOP_REASONS name) and the address involved."""
+    reason = STOP_REASONS.get(lib.pdp8_api_get_stop_reason(cpu), "budget")
+    return reason, lib.pdp8_api_get_stop_address(cpu)
+
+
+def read_counters(lib: ctypes.CDLL, cpu: int) -> Counters:
+    counters = Counters()
+    if lib.pdp8_api_get_counters(cpu, ctypes.byref(counters)) != 0:
+        raise EmulatorError("Unable to read CPU counters.")
+    return counters
+
+
+def latency_histogram(counters: Counters) -> List[Tuple[float, int]]:
+    """Cumulative (upper bound, count) pairs for the interrupt latency buckets,
+    ending with (inf, dispatches)."""
+    buckets = []
+    total = 0
+    for index, count in enumerate(counters.interrupt_latency):
+        total += count
+        bound = float("inf") if index == LATENCY_BUCKETS - 1 else float((1 << index) - 1)
+        buckets.append((bound, total))
+    return buckets
+
+
 def load_rom_into_memory(lib: ctypes.CDLL, cpu: int, rom_words: List[Tuple[int, int]]) -> Tuple[int, int]:
     min_addr = min(addr for addr, _ in rom_words)
     max_addr = max(addr for addr, _ in rom_words)
@@ -389,6 +854,136 @@ def pump_console_input(
     return True
 
 
+class ConsoleStream:
+    """KL8E keyboard input streamed from a file, FIFO or socket.
+
+    Reads CONSOLE_READ_CHUNK bytes at a time, but only once the previous chunk
+    has been handed to the KL8E, which is only topped up to
+    KL8E_INPUT_HIGH_WATER characters; a faster writer blocks on the pipe or
+    socket instead of growing either queue.
+    """
+
+    def __init__(self, fd: int, owner: Optional[object] = None) -> None:
+        self.fd = fd
+        self.owner = owner  # keeps a socket open
+        self.staged = b""
+        self.offset = 0
+        self.eof = False
+
+    @property
+    def pending(self) -> int:
+        return len(self.staged) - self.offset
+
+    def pump(self, lib: ctypes.CDLL, console: int) -> bool:
+        """Move input towards the KL8E; False once the source is exhausted."""
+        room = KL8E_INPUT_HIGH_WATER - lib.pdp8_kl8e_console_input_pending(console)
+        if room <= 0:
+            return True
+        if not self.pending:
+            if self.eof:
+                return False
+            ready, _, _ = select.select([self.fd], [], [], 0)
+            if not ready:
+                return True
+            try:
+                data = os.read(self.fd, CONSOLE_READ_CHUNK)
+            except OSError as exc:
+                if exc.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    return True
+                raise EmulatorError(f"Console read failed: {exc}") from exc
+            if not data:
+                self.eof = True
+                return False
+            self.staged = data.replace(b"\n", b"\r")
+            self.offset = 0
+
+        chunk = self.staged[self.offset : self.offset + room]
+        if lib.pdp8_kl8e_console_queue_block(console, chunk, len(chunk)) != len(chunk):
+            raise EmulatorError("Failed to queue console input.")
+        self.offset += len(chunk)
+        return True
+
+    def close(self) -> None:
+        if self.owner is not None:
+            self.owner.close()
+        else:
+            os.close(self.fd)
+
+
+def open_keyboard_input(spec: str) -> Optional[ConsoleStream]:
+    """Open a `keyboard_input` setting: stdin (None), tcp:HOST:PORT, unix:PATH,
+    or a file or FIFO path. Opening a FIFO waits for its writer."""
+    if spec == "stdin":
+        return None
+    if spec.startswith("tcp:"):
+        host, _, port = spec[4:].rpartition(":")
+        try:
+            sock = socket.create_connection((host or "localhost", int(port, 10)))
+        except ValueError as exc:
+            raise OSError(f"bad port in {spec}") from exc
+        return ConsoleStream(sock.fileno(), sock)
+    if spec.startswith("unix:"):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(spec[5:])
+        except OSError:
+            sock.close()
+            raise
+        return ConsoleStream(sock.fileno(), sock)
+    return ConsoleStream(os.open(spec, os.O_RDONLY))
+
+
+def open_teleprinter_output(spec: str) -> Optional[IO[bytes]]:
+    """Open a `teleprinter_output` setting: stdout (None, printed natively),
+    stderr, or a file path appended to through a CONSOLE_OUTPUT_BUFFER buffer."""
+    if spec == "stdout":
+        return None
+    if spec == "stderr":
+        return sys.stderr.buffer
+    return open(spec, "ab", buffering=CONSOLE_OUTPUT_BUFFER)
+
+
+def drain_console_output(lib: ctypes.CDLL, console: int, output_stream: Optional[IO[bytes]]) -> int:
+    """Empty the KL8E output log, writing it to output_stream when given (otherwise
+    the console has already printed it). Returns the characters drained."""
+    lib.pdp8_kl8e_console_flush(console)
+    pending = lib.pdp8_kl8e_console_output_pending(console)
+    if not pending:
+        return 0
+    emitted = 0
+    block = ctypes.create_string_buffer(min(pending, CONSOLE_READ_CHUNK))
+    while True:
+        count = lib.pdp8_kl8e_console_pop_output_block(console, block, len(block))
+        if not count:
+            return emitted
+        if output_stream is not None:
+            output_stream.write(block.raw[:count])
+        emitted += count
+
+
+def wait_for_event(lib: ctypes.CDLL, cpu: int, input_fd: int) -> bool:
+    """Block while the machine waits, until stdin is readable or the next device deadline.
+
+    Returns False when nothing can wake the machine: no deadline is pending
+    and console input has reached end of file.
+    """
+    deadline = lib.pdp8_api_next_deadline(cpu)
+    if deadline != PDP8_DEADLINE_NONE:
+        if lib.pdp8_api_get_clock_source(cpu) != CLOCK_SOURCES["host"]:
+            return True  # virtual time only moves as the machine runs
+        timeout: Optional[float] = max(0.0, (deadline - lib.pdp8_api_now_ns(cpu)) / 1e9)
+    elif input_fd < 0:
+        return False
+    else:
+        timeout = None
+
+    if input_fd >= 0:
+        select.select([input_fd], [], [], timeout)
+    elif timeout:
+        time.sleep(timeout)
+    return True
+
+
 def run_factory(
     lib: ctypes.CDLL,
     cpu: int,
@@ -396,16 +991,38 @@ def run_factory(
     stdin_fd: int,
     echo_stream: Optional[IO[str]] = None,
     block_cycles: int = RUN_BLOCK_CYCLES,
+    tracer: Optional[TraceWriter] = None,
+    journal: Optional[Journal] = None,
+    keyboard: Optional[ConsoleStream] = None,
+    output_stream: Optional[IO[bytes]] = None,
 ) -> int:
     total_cycles = 0
     input_fd = stdin_fd
     cycles_per_block = block_cycles if block_cycles > 0 else RUN_BLOCK_CYCLES
+    # a replay takes its input from the journal and runs unpaced
+    replaying = journal is not None and journal.replaying
+    char_period = 0.0 if replaying or output_stream is not None else KL8E_CHAR_PERIOD
+    if replaying:
+        input_fd = -1
+        keyboard = None
+        cycles_per_block = max(cycles_per_block, REPLAY_BLOCK_CYCLES)
+    elif keyboard is not None or output_stream is not None:
+        cycles_per_block = max(cycles_per_block, STREAM_BLOCK_CYCLES)
+    if keyboard is not None:
+        input_fd = -1
     while not lib.pdp8_api_is_halted(cpu):
         if input_fd >= 0:
             if not pump_console_input(lib, console, input_fd, echo_stream):
                 input_fd = -1
+        if keyboard is not None and not keyboard.pump(lib, console):
+            keyboard = None
 
-        executed = lib.pdp8_api_run(cpu, ctypes.c_size_t(cycles_per_block))
+        if tracer is not None:
+            executed = tracer.run(cpu, cycles_per_block)
+        elif journal is not None:
+            executed = journal.run(cycles_per_block)
+        else:
+            executed = lib.pdp8_api_run(cpu, ctypes.c_size_t(cycles_per_block))
         if executed < 0:
             raise EmulatorError("Emulator reported an error during execution.")
         if executed == 0:
@@ -413,29 +1030,30 @@ def run_factory(
         total_cycles += executed
 
         if console:
-            lib.pdp8_kl8e_console_flush(console)
-            emitted = 0
-            while lib.pdp8_kl8e_console_output_pending(console):
-                byte = ctypes.c_uint8(0)
-                if lib.pdp8_kl8e_console_pop_output(console, ctypes.byref(byte)) != 0:
-                    break
-                emitted += 1
-            if emitted and KL8E_CHAR_PERIOD > 0.0:
-                time.sleep(emitted * KL8E_CHAR_PERIOD)
+            emitted = drain_console_output(lib, console, output_stream)
+            if emitted and char_period > 0.0:
+                time.sleep(emitted * char_period)
                 sys.stdout.flush()
 
+        # Parked in a wait loop with nothing queued: sleep instead of spinning.
+        if (
+            not replaying
+            and lib.pdp8_api_is_waiting(cpu)
+            and not (console and lib.pdp8_kl8e_console_input_pending(console))
+            and not (keyboard is not None and keyboard.pending)
+        ):
+            sys.stdout.flush()
+            if not wait_for_event(lib, cpu, keyboard.fd if keyboard is not None else input_fd):
+                break
+
     pump_console_input(lib, console, input_fd, echo_stream)
     if console:
-        lib.pdp8_kl8e_console_flush(console)
-        emitted = 0
-        while lib.pdp8_kl8e_console_output_pending(console):
-            byte = ctypes.c_uint8(0)
-            if lib.pdp8_kl8e_console_pop_output(console, ctypes.byref(byte)) != 0:
-                break
-            emitted += 1
-        if emitted and KL8E_CHAR_PERIOD > 0.0:
-            time.sleep(emitted * KL8E_CHAR_PERIOD)
+        emitted = drain_console_output(lib, console, output_stream)
+        if emitted and char_period > 0.0:
+            time.sleep(emitted * char_period)
         sys.stdout.flush()
+    if output_stream is not None:
+        output_stream.flush()
     return total_cycles
 
 
@@ -448,12 +1066,34 @@ def report_state(lib: ctypes.CDLL, cpu: int, total_cycles: int) -> None:
     print()
     print("Factory run complete.")
     print(f"  Cycles executed: {total_cycles}")
+    skipped = lib.pdp8_api_idle_skipped(cpu)
+    if skipped:
+        print(f"  Idle cycles skipped: {skipped}")
     print(f"  PC: {pc:04o}")
     print(f"  AC: {ac:04o}")
     print(f"  LINK: {link}")
     print(f"  HALT: {'yes' if halted else 'no'}")
 
 
+def report_journal(journal: Journal, path: Path, elapsed: float) -> None:
+    print()
+    if not journal.replaying:
+        print(f"Journal written: {path} ({journal.events} record(s), {journal.position} instructions).")
+        return
+    rate = journal.position / elapsed / 1e6 if elapsed > 0 else 0.0
+    print(
+        f"Replayed {path}: {journal.position} of {journal.end} instructions in {elapsed:.3f}s "
+        f"({rate:.1f} MIPS), {journal.remaining} record(s) unused, {journal.mismatches} mismatch(es)."
+    )
+
+
+def apply_flush_policy(setter, device: int, policy: str, threshold: int, name: str) -> None:
+    """Configure an output device's flush policy, warning on unknown names."""
+    code = OUTPUT_FLUSH_POLICIES.get(policy)
+    if code is None or setter(device, code, threshold) != 0:
+        print(f"Warning: invalid {name} flush policy '{policy}'.", file=sys.stderr)
+
+
 def load_device_config(path: Path) -> Tuple[DeviceConfig, bool]:
     config = DeviceConfig()
     if not path.exists():
@@ -517,6 +1157,13 @@ def load_device_config(path: Path) -> Tuple[DeviceConfig, bool]:
                         config.line_printer_column_limit = limit
                 except ValueError:
                     pass
+            elif key == "flush":
+                config.line_printer_flush = value.lower()
+            elif key == "flush_bytes":
+                try:
+                    config.line_printer_flush_bytes = max(0, int(value, 10))
+                except ValueError:
+                    pass
         elif current == "paper_tape":
             if key == "image":
                 config.paper_tape_image = value
@@ -526,6 +1173,13 @@ def load_device_config(path: Path) -> Tuple[DeviceConfig, bool]:
             elif key == "enabled":
                 val = value.lower()
                 config.paper_tape_punch_enabled = val in ("1", "true", "yes", "on")
+            elif key == "flush":
+                config.paper_tape_punch_flush = value.lower()
+            elif key == "flush_bytes":
+                try:
+                    config.paper_tape_punch_flush_bytes = max(0, int(value, 10))
+                except ValueError:
+                    pass
         elif current == "watchdog":
             if key == "enabled":
                 val = value.lower()
@@ -566,9 +1220,28 @@ def main() -> int:
     paper_tape_device = None
     paper_tape_punch = None
     wd = None
+    tracer = None
+    journal = None
+    keyboard = None
+    teleprinter = None
     stdin_fd = -1
 
     try:
+        if lib.pdp8_api_set_clock(cpu, CLOCK_SOURCES[args.clock], max(0, args.clock_ns)) != 0:
+            raise EmulatorError(f"Invalid clock settings: --clock {args.clock} --clock-ns {args.clock_ns}.")
+        lib.pdp8_api_set_idle_skip(cpu, 0 if args.no_idle_skip else 1)
+
+        # The journal must see the device setup below (the watchdog start reads the clock).
+        if args.replay and (args.journal_out or args.trace_out):
+            raise EmulatorError("--replay cannot be combined with --journal-out or --trace-out.")
+        try:
+            if args.journal_out:
+                journal = Journal.record(lib, cpu, args.journal_out)
+            elif args.replay:
+                journal = Journal.replay(lib, cpu, args.replay)
+        except OSError as exc:
+            raise EmulatorError(str(exc)) from exc
+
         # Attach interrupt control device (device 00; handles ION/IOFF/SKON)
         if hasattr(lib, "pdp8_interrupt_control_attach"):
             if lib.pdp8_interrupt_control_attach(cpu) != 0:
@@ -580,6 +1253,8 @@ def main() -> int:
 
         if lib.pdp8_kl8e_console_attach(cpu, console) != 0:
             raise EmulatorError("Failed to attach KL8E console.")
+        if journal is not None and journal.replaying:
+            journal.set_console(console)
 
         printer = lib.pdp8_line_printer_create(None)
         if not printer:
@@ -591,6 +1266,13 @@ def main() -> int:
         lib.pdp8_line_printer_set_column_limit(
             printer, ctypes.c_uint16(max(1, config.line_printer_column_limit))
         )
+        apply_flush_policy(
+            lib.pdp8_line_printer_set_flush_policy,
+            printer,
+            config.line_printer_flush,
+            config.line_printer_flush_bytes,
+            "line printer",
+        )
 
         if config.paper_tape_present and config.paper_tape_image:
             paper_tape_device = lib.pdp8_paper_tape_device_create()
@@ -655,6 +1337,13 @@ def main() -> int:
                         print(f"Paper tape punch output: {destination}")
                 else:
                     print("Paper tape punch enabled (output disabled on host).")
+                apply_flush_policy(
+                    lib.pdp8_paper_tape_punch_set_flush_policy,
+                    paper_tape_punch,
+                    config.paper_tape_punch_flush,
+                    config.paper_tape_punch_flush_bytes,
+                    "paper tape punch",
+                )
 
         # If the watchdog is configured for the factory driver, create and attach it
         wd = None
@@ -709,7 +1398,8 @@ def main() -> int:
             print(f"Reset vector set from S-record START: 0000 -> JMP I 20, 0020 -> {entry_address:04o}.")
         else:
             print(f"Reset vector set: 0000 -> JMP I 20, 0020 -> {entry_address:04o}.")
-        if not args.run:
+        interactive = not (args.run or args.replay)
+        if interactive:
             print("Type 'go' to start the factory, or 'quit' to exit.")
 
         try:
@@ -724,7 +1414,7 @@ def main() -> int:
             except OSError:
                 echo_stream = None
 
-        if not args.run:
+        if interactive:
             while True:
                 try:
                     command = input("factory> ").strip().lower()
@@ -739,10 +1429,71 @@ def main() -> int:
                     continue
                 print("Enter 'go' to run or 'quit' to exit.")
 
-        total_cycles = run_factory(lib, cpu, console, stdin_fd, echo_stream, args.block_cycles)
+        if args.trace_out:
+            try:
+                tracer = TraceWriter(args.trace_out, lib, args.trace_chunk, args.trace_level)
+            except OSError as exc:
+                raise EmulatorError(f"Failed to open trace file {args.trace_out}: {exc}")
+
+        # pdp8.config may point the console at files, FIFOs or sockets instead of the terminal
+        if not args.replay:
+            try:
+                keyboard = open_keyboard_input(config.kl8e_keyboard_input)
+            except OSError as exc:
+                print(
+                    f"Warning: unable to open KL8E keyboard input '{config.kl8e_keyboard_input}': {exc}. "
+                    "Falling back to stdin.",
+                    file=sys.stderr,
+                )
+        try:
+            teleprinter = open_teleprinter_output(config.kl8e_teleprinter_output)
+        except OSError as exc:
+            print(
+                f"Warning: unable to open KL8E teleprinter output '{config.kl8e_teleprinter_output}': {exc}. "
+                "Falling back to stdout.",
+                file=sys.stderr,
+            )
+        if teleprinter is not None:
+            lib.pdp8_kl8e_console_set_output_stream(console, None)
+
+        started = time.perf_counter()
+        total_cycles = run_factory(
+            lib, cpu, console, stdin_fd, echo_stream, args.block_cycles, tracer, journal, keyboard, teleprinter
+        )
+        elapsed = time.perf_counter() - started
+        if tracer:
+            tracer.close(
+                lib.pdp8_api_get_pc(cpu),
+                lib.pdp8_api_get_ac(cpu),
+                lib.pdp8_api_get_link(cpu),
+                bool(lib.pdp8_api_is_halted(cpu)),
+            )
+            print(
+                f"Trace written: {args.trace_out} ({tracer.total_steps} steps, "
+                f"{tracer.chunks} chunk(s), {tracer.bytes_written} bytes)."
+            )
+        if journal is not None:
+            report_journal(journal, args.replay or args.journal_out, elapsed)
+            finished, journal = journal, None
+            try:
+                finished.close()
+            except OSError as exc:
+                raise EmulatorError(str(exc)) from exc
+        lib.pdp8_line_printer_flush(printer)
+        if paper_tape_punch:
+            lib.pdp8_paper_tape_punch_flush(paper_tape_punch)
         report_state(lib, cpu, total_cycles)
 
     finally:
+        if journal is not None:
+            try:
+                journal.close()
+            except OSError as exc:
+                print(f"Warning: {exc}", file=sys.stderr)
+        if keyboard is not None:
+            keyboard.close()
+        if teleprinter is not None and teleprinter is not sys.stderr.buffer:
+            teleprinter.close()
         if console:
             lib.pdp8_kl8e_console_destroy(console)
         if printer:
@@ -0,0 +1,163 @@
+"""
+Input journals (`.p8j`): record a session's outside inputs, replay them fast.
+
+A recording journal logs every value the program sees that did not come from
+the program or its image: keyboard bytes, paper tape and magtape words, host
+time read by IOTs or reached by a tick deadline (the watchdog), and the wall
+clock word, each stamped with its instruction position. Replaying on a
+machine built the same way feeds them back at the same positions with no
+pacing, so a long interactive session becomes a repeatable benchmark:
+
+    journal = Journal.record(lib, cpu, "session.p8j")   # before any device IOT runs
+    ...                                                 # run as usual, then
+    journal.close()
+
+    journal = Journal.replay(lib, cpu, "session.p8j")
+    journal.set_console(console)
+    while journal.run(1 << 20):
+        pass
+
+See src/emulator/journal.h for the details and the log format, which
+`read_journal` decodes.
+"""
+
+from __future__ import annotations
+
+import ctypes
+from pathlib import Path
+from typing import List, NamedTuple, Tuple, Union
+
+# Sources (mirror enum pdp8_input_source in pdp8.h)
+INPUT_SOURCES = {
+    0: "keyboard",
+    1: "clock",
+    2: "clock-tick",
+    3: "clock-host",
+    4: "wall-clock",
+    5: "paper-tape",
+    6: "magtape",
+    7: "wall-clock-host",
+}
+CLOCK_SOURCES = (1, 2)
+JOURNAL_MAGIC = b"P8JL"
+JOURNAL_VERSION = 1  # PDP8_JOURNAL_VERSION
+JOURNAL_END = 0x7F  # PDP8_JOURNAL_END
+
+
+class JournalRecord(NamedTuple):
+    stamp: int
+    source: str
+    value: int
+
+
+class Journal:
+    """A native input journal attached to `cpu`; use record() or replay()."""
+
+    def __init__(self, lib: ctypes.CDLL, handle: int, replaying: bool) -> None:
+        self.lib = lib
+        self.handle = handle
+        self.replaying = replaying
+
+    @classmethod
+    def record(cls, lib: ctypes.CDLL, cpu: int, path: Union[str, Path]) -> "Journal":
+        handle = lib.pdp8_journal_record(cpu, str(path).encode("utf-8"))
+        if not handle:
+            raise OSError(f"Unable to create journal {path}.")
+        return cls(lib, handle, False)
+
+    @classmethod
+    def replay(cls, lib: ctypes.CDLL, cpu: int, path: Union[str, Path]) -> "Journal":
+        handle = lib.pdp8_journal_replay(cpu, str(path).encode("utf-8"))
+        if not handle:
+            raise OSError(f"Unable to read journal {path} (missing or not a journal).")
+        return cls(lib, handle, True)
+
+    def set_console(self, console: int) -> None:
+        """KL8E console that receives the recorded keyboard bytes."""
+        self.lib.pdp8_journal_set_console(self.handle, console)
+
+    def run(self, cycles: int) -> int:
+        """pdp8_api_run when recording; when replaying, run towards the
+        recorded end, returning 0 once it is reached."""
+        executed = self.lib.pdp8_journal_run(self.handle, ctypes.c_size_t(cycles))
+        if executed < 0:
+            raise RuntimeError("Emulator reported an error during execution.")
+        return int(executed)
+
+    @property
+    def position(self) -> int:
+        return int(self.lib.pdp8_journal_position(self.handle))
+
+    @property
+    def end(self) -> int:
+        """Length of the recorded session in instructions (replay only)."""
+        return int(self.lib.pdp8_journal_end(self.handle))
+
+    @property
+    def events(self) -> int:
+        return int(self.lib.pdp8_journal_events(self.handle))
+
+    @property
+    def remaining(self) -> int:
+        return int(self.lib.pdp8_journal_remaining(self.handle))
+
+    @property
+    def mismatches(self) -> int:
+        """Recorded values the replay could not use where they were recorded."""
+        return int(self.lib.pdp8_journal_mismatches(self.handle))
+
+    @property
+    def bytes(self) -> int:
+        return int(self.lib.pdp8_journal_bytes(self.handle))
+
+    def close(self) -> None:
+        """Finish the log (when recording) and detach from the CPU."""
+        if self.handle:
+            handle, self.handle = self.handle, None
+            if self.lib.pdp8_journal_close(handle) != 0:
+                raise OSError("Failed to write journal.")
+
+
+def _varint(data: bytes, offset: int) -> Tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        if offset >= len(data):
+            raise ValueError("truncated varint")
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, offset
+        shift += 7
+
+
+def read_journal(path: Union[str, Path]) -> Tuple[int, List[JournalRecord], int]:
+    """Decode a journal into (start time in ns, records, end stamp).
+
+    A log cut short decodes up to its last complete record and reports the
+    last stamp as its end."""
+    data = Path(path).read_bytes()
+    if data[:4] != JOURNAL_MAGIC or len(data) < 5 or data[4] != JOURNAL_VERSION:
+        raise ValueError(f"{path}: not a version {JOURNAL_VERSION} journal")
+    start, offset = _varint(data, 5)
+    clock = start
+    stamp = 0
+    records: List[JournalRecord] = []
+    while offset < len(data):
+        source = data[offset]
+        try:
+            delta, offset = _varint(data, offset + 1)
+            if source == JOURNAL_END:
+                return start, records, stamp + delta
+            value, offset = _varint(data, offset)
+        except ValueError:
+            break
+        if source not in INPUT_SOURCES:
+            raise ValueError(f"{path}: unknown source {source}")
+        stamp += delta
+        if source in CLOCK_SOURCES:
+            clock += (value >> 1) ^ -(value & 1)
+            value = clock
+        records.append(JournalRecord(stamp, INPUT_SOURCES[source], value))
+    return start, records, stamp
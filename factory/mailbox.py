@@ -0,0 +1,86 @@
+"""
+Batch exchange with the native mailbox device (src/emulator/mailbox.h).
+
+Python models of factory hardware (irons, conveyor sensors) live on the host
+side of a mailbox rather than behind per-IOT callbacks. Between pdp8_api_run
+calls the simulation posts sensor events, collects the words the program wrote
+and reads or updates the shared register file, one ctypes call per batch:
+
+    mailbox = Mailbox(lib, cpu, device_code=0o50)
+    while running:
+        lib.pdp8_api_run(cpu, quantum)
+        for command in mailbox.collect():
+            plant.apply(command)
+        mailbox.write_registers(plant.levels())
+        mailbox.post(plant.events())
+"""
+
+from __future__ import annotations
+
+import ctypes
+from typing import Iterable, List, Sequence
+
+from . import driver
+
+MAILBOX_DEVICE_CODE = 0o50  # PDP8_MAILBOX_DEVICE_CODE in mailbox.h
+MAILBOX_REGISTERS = 8
+MAILBOX_RING_WORDS = 256
+
+
+class Mailbox:
+    """A mailbox attached to `cpu` at `device_code`; see the module docstring."""
+
+    def __init__(self, lib: ctypes.CDLL, cpu: int, device_code: int = MAILBOX_DEVICE_CODE) -> None:
+        self.lib = lib
+        self.device_code = device_code & 0o77
+        self.handle = lib.pdp8_mailbox_create()
+        if not self.handle:
+            raise driver.EmulatorError("Unable to create mailbox device.")
+        if lib.pdp8_mailbox_attach(cpu, self.handle, self.device_code) != 0:
+            lib.pdp8_mailbox_destroy(self.handle)
+            self.handle = None
+            raise driver.EmulatorError(f"Unable to attach mailbox at device {self.device_code:02o}.")
+        self._out = (ctypes.c_uint16 * MAILBOX_RING_WORDS)()
+        self._registers = (ctypes.c_uint16 * MAILBOX_REGISTERS)()
+
+    def post(self, words: Iterable[int]) -> int:
+        """Queue words for the program; returns how many fitted in the inbound ring."""
+        values = [word & 0o7777 for word in words]
+        if not values:
+            return 0
+        batch = (ctypes.c_uint16 * len(values))(*values)
+        return int(self.lib.pdp8_mailbox_post(self.handle, batch, len(values)))
+
+    def collect(self) -> List[int]:
+        """Drain every word the program wrote since the last call."""
+        count = self.lib.pdp8_mailbox_collect(self.handle, self._out, MAILBOX_RING_WORDS)
+        return self._out[:count]
+
+    def read_registers(self) -> List[int]:
+        self.lib.pdp8_mailbox_read_registers(self.handle, 0, self._registers, MAILBOX_REGISTERS)
+        return self._registers[:]
+
+    def write_registers(self, values: Sequence[int], first: int = 0) -> None:
+        batch = (ctypes.c_uint16 * len(values))(*(value & 0o7777 for value in values))
+        if self.lib.pdp8_mailbox_write_registers(self.handle, first, batch, len(values)) != 0:
+            raise ValueError(f"registers {first}..{first + len(values) - 1} out of range")
+
+    @property
+    def inbound_pending(self) -> int:
+        return int(self.lib.pdp8_mailbox_inbound_pending(self.handle))
+
+    @property
+    def outbound_pending(self) -> int:
+        return int(self.lib.pdp8_mailbox_outbound_pending(self.handle))
+
+    @property
+    def dropped(self) -> int:
+        """Words the program wrote while the outbound ring was full."""
+        return int(self.lib.pdp8_mailbox_dropped(self.handle))
+
+    def close(self) -> None:
+        """Free the device. Only call this once the CPU is destroyed or no
+        longer runs, since its IOT handler still points at the mailbox."""
+        if self.handle:
+            self.lib.pdp8_mailbox_destroy(self.handle)
+            self.handle = None
@@ -0,0 +1,16 @@
+"""
+Simulated waffle plant for the factory control ROM.
+
+The batter tank, irons, cooling conveyor, packaging and cold storage are
+modelled as NumPy arrays (model.WafflePlant) and advanced in fixed steps of
+emulated time. bridge.PlantBridge exposes sensors and actuators to the PDP-8
+through mailbox IOT devices, and bridge.run_plant runs CPU and plant in
+lockstep, paced to the wall clock or as fast as possible for soak tests:
+
+  python3 -m factory.plant control.srec --hours 8
+"""
+
+from .bridge import PlantBridge, PlantRun, run_plant
+from .model import PlantConfig, WafflePlant, command
+
+__all__ = ["PlantBridge", "PlantConfig", "PlantRun", "WafflePlant", "command", "run_plant"]
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Run a control ROM against the simulated waffle plant.
+
+  python3 -m factory.plant control.srec --hours 8            # soak, flat out
+  python3 -m factory.plant control.srec --minutes 5 --speed 1  # real time
+
+The CPU runs on a virtual clock so plant time follows emulated time exactly;
+KL8E output goes to stdout and a status line is printed every --report
+emulated seconds.
+"""
+
+from __future__ import annotations
+
+import argparse
+import ctypes
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from .. import driver
+from .bridge import PlantBridge, run_plant
+from .model import PlantConfig, WafflePlant
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run a control ROM against the simulated waffle plant.")
+    parser.add_argument("image", type=Path, help="Motorola S-record control ROM.")
+    length = parser.add_mutually_exclusive_group()
+    length.add_argument("--seconds", type=float, help="Emulated seconds to run.")
+    length.add_argument("--minutes", type=float, help="Emulated minutes to run.")
+    length.add_argument("--hours", type=float, help="Emulated hours to run (default: 1).")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=0.0,
+        help="Emulated seconds per wall second; 0 runs as fast as possible (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--clock",
+        choices=[name for name in driver.CLOCK_SOURCES if name != "host"],
+        default="cycle",
+        help="Virtual clock the CPU and plant share (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--clock-ns",
+        type=int,
+        default=driver.PDP8_MEMORY_CYCLE_NS,
+        help="Nanoseconds per instruction or memory cycle (default: %(default)s).",
+    )
+    parser.add_argument("--step", type=float, default=PlantConfig.step, help="Plant step in seconds (default: %(default)s).")
+    parser.add_argument(
+        "--report", type=float, default=60.0, help="Emulated seconds between status lines (default: %(default)s)."
+    )
+    return parser.parse_args(argv)
+
+
+def drain_console(lib: ctypes.CDLL, console: int) -> None:
+    lib.pdp8_kl8e_console_flush(console)
+    byte = ctypes.c_uint8(0)
+    while lib.pdp8_kl8e_console_output_pending(console):
+        if lib.pdp8_kl8e_console_pop_output(console, ctypes.byref(byte)) != 0:
+            break
+    sys.stdout.flush()
+
+
+def status_line(plant: WafflePlant) -> str:
+    return (
+        f"[plant {plant.time:9.1f} s] tank {plant.tank_level:5.1f} L  "
+        f"irons {int(plant.heater_on.sum()):2d} hot {int(plant.loaded.sum()):2d} loaded  "
+        f"belt {int(plant.belt_occupied.sum()):2d}  packed {plant.waffles_packed}  "
+        f"rejected {plant.rejected}  storage {plant.storage_temp:6.1f} C"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.seconds is not None:
+        total = args.seconds
+    elif args.minutes is not None:
+        total = args.minutes * 60.0
+    else:
+        total = (args.hours if args.hours is not None else 1.0) * 3600.0
+
+    rom_words, start_word = driver.load_srec(args.image)
+    if not rom_words:
+        raise driver.EmulatorError(f"{args.image}: no data records")
+
+    lib = driver.load_library()
+    driver.configure_api(lib)
+    cpu = lib.pdp8_api_create(ctypes.c_size_t(driver.DEFAULT_MEMORY_WORDS))
+    if not cpu:
+        raise driver.EmulatorError("Failed to create PDP-8 instance.")
+    console = None
+    bridge = None
+    try:
+        if lib.pdp8_api_set_clock(cpu, driver.CLOCK_SOURCES[args.clock], max(1, args.clock_ns)) != 0:
+            raise driver.EmulatorError(f"Invalid clock settings: --clock {args.clock} --clock-ns {args.clock_ns}.")
+        if lib.pdp8_interrupt_control_attach(cpu) != 0:
+            raise driver.EmulatorError("Failed to attach interrupt control device.")
+        console = lib.pdp8_kl8e_console_create(None, None)
+        if not console or lib.pdp8_kl8e_console_attach(cpu, console) != 0:
+            raise driver.EmulatorError("Failed to attach KL8E console.")
+
+        plant = WafflePlant(PlantConfig(step=args.step))
+        bridge = PlantBridge(lib, cpu, plant)
+        lib.pdp8_api_reset(cpu)
+        start_address, _ = driver.load_rom_into_memory(lib, cpu, rom_words)
+        driver.install_reset_vector(lib, cpu, start_word if start_word is not None else start_address)
+
+        seconds = wall = 0.0
+        instructions = 0
+        while seconds < total:
+            run = run_plant(bridge, min(args.report, total - seconds), args.speed, args.clock_ns)
+            drain_console(lib, console)
+            seconds += run.seconds
+            wall += run.wall_seconds
+            instructions += run.instructions
+            print(status_line(plant))
+            if run.seconds <= 0:
+                break
+
+        speedup = seconds / wall if wall > 0 else 0.0
+        print(
+            f"Simulated {seconds:.1f} s in {wall:.2f} s wall ({speedup:.1f}x real time), "
+            f"{instructions} instructions, {bridge.commands} commands, {bridge.events} events."
+        )
+        if lib.pdp8_api_is_halted(cpu):
+            print(f"Controller halted at PC {lib.pdp8_api_get_pc(cpu):04o}.")
+    finally:
+        if console:
+            lib.pdp8_kl8e_console_destroy(console)
+        lib.pdp8_api_destroy(cpu)
+        if bridge is not None:
+            bridge.close()
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except driver.EmulatorError as exc:
+        print(f"factory.plant: {exc}", file=sys.stderr)
+        sys.exit(1)
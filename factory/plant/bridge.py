@@ -0,0 +1,179 @@
+"""
+Couple a WafflePlant to a PDP-8 through mailbox devices, in lockstep with the
+CPU's emulated clock.
+
+Three mailboxes are attached (device codes relative to `base_code`, 050 by
+default):
+
+  050  control   outbound ring: command words (model.CMD_*)
+                 inbound ring:  event words (model.EV_*), one interrupt per batch
+                 registers:     0 tank level (percent)
+                                1 belt occupancy, bit 11 = loading slot, then
+                                  one bit per slot downstream
+                                2 storage temperature (degrees C, two's complement)
+                                3 waffles packed (modulo 4096)
+                                4 waffles rejected (modulo 4096)
+                                5 cooked irons 0-11 (bit 11 = iron 0)
+                                6 cooked irons 12-15 (bit 11 = iron 12)
+                                7 temperature of the waffle about to be packed
+  051  irons 0-7   registers: plate temperature per iron (degrees C)
+  052  irons 8-15  registers: plate temperature per iron (degrees C)
+
+The CPU runs on a virtual clock. Each exchange runs it until the next model step
+is due, advances the plant by however many whole steps of emulated time have
+passed, then collects commands and publishes sensors and events.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import time
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+
+from .. import driver
+from ..mailbox import MAILBOX_DEVICE_CODE, MAILBOX_REGISTERS, Mailbox
+from .model import WafflePlant
+
+IRON_BANKS = 2
+
+
+def to_words(values) -> List[int]:
+    """Round to 12-bit two's complement words, saturating."""
+    clipped = np.clip(np.rint(np.asarray(values, dtype=float)), -0o4000, 0o3777)
+    return (clipped.astype(np.int64) & 0o7777).tolist()
+
+
+def mask_word(bits: np.ndarray) -> int:
+    """Pack up to 12 flags into a word, the first flag in bit 11 (PDP-8 bit 0)."""
+    word = 0
+    for index in np.flatnonzero(bits[:12]):
+        word |= 0o4000 >> int(index)
+    return word
+
+
+class PlantBridge:
+    """Mailboxes wiring a plant to one CPU; see the module docstring."""
+
+    def __init__(self, lib: ctypes.CDLL, cpu: int, plant: WafflePlant, base_code: int = MAILBOX_DEVICE_CODE) -> None:
+        irons = plant.config.irons
+        if irons > IRON_BANKS * MAILBOX_REGISTERS:
+            raise driver.EmulatorError(f"the plant bridge exposes at most {IRON_BANKS * MAILBOX_REGISTERS} irons")
+        self.lib = lib
+        self.cpu = cpu
+        self.plant = plant
+        self.control = Mailbox(lib, cpu, base_code)
+        self.banks = [Mailbox(lib, cpu, base_code + 1 + bank) for bank in range(IRON_BANKS)]
+        self.commands = 0
+        self.events = 0
+        self.publish()
+
+    def exchange(self, steps: int) -> None:
+        """Apply pending commands, advance `steps` model steps and publish the results."""
+        plant = self.plant
+        for word in self.control.collect():
+            plant.apply(word)
+            self.commands += 1
+        events = plant.advance(steps)
+        if events:
+            self.events += len(events)
+            self.control.post(events)
+        self.publish()
+
+    def publish(self) -> None:
+        plant = self.plant
+        cfg = plant.config
+        cooked = np.zeros(24, dtype=bool)
+        cooked[: cfg.irons] = plant.cooked
+        level, storage, packing = to_words(
+            [
+                100.0 * plant.tank_level / cfg.tank_capacity,
+                plant.storage_temp,
+                plant.belt_temp[-1] if plant.belt_occupied[-1] else cfg.ambient,
+            ]
+        )
+        self.control.write_registers(
+            [
+                level,
+                mask_word(plant.belt_occupied),
+                storage,
+                plant.waffles_packed & 0o7777,
+                plant.rejected & 0o7777,
+                mask_word(cooked[:12]),
+                mask_word(cooked[12:]),
+                packing,
+            ]
+        )
+        temps = to_words(plant.iron_temp)
+        for bank, mailbox in enumerate(self.banks):
+            chunk = temps[bank * MAILBOX_REGISTERS:(bank + 1) * MAILBOX_REGISTERS]
+            if chunk:
+                mailbox.write_registers(chunk)
+
+    def close(self) -> None:
+        """Free the mailboxes; only once the CPU is destroyed or stopped for good."""
+        for mailbox in [self.control, *self.banks]:
+            mailbox.close()
+
+
+@dataclass
+class PlantRun:
+    seconds: float  # emulated
+    wall_seconds: float
+    instructions: int
+    halted: bool
+
+    @property
+    def speedup(self) -> float:
+        return self.seconds / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+
+def run_plant(
+    bridge: PlantBridge,
+    seconds: float,
+    speed: float = 0.0,
+    clock_ns: int = driver.PDP8_MEMORY_CYCLE_NS,
+) -> PlantRun:
+    """Run CPU and plant together for `seconds` of emulated time.
+
+    `speed` paces the run against the wall clock (1.0 is real time, 10.0 ten
+    times faster); 0 runs as fast as the host allows, for soak tests.
+    `clock_ns` is the CPU clock's ns per unit, used to size each run call.
+    """
+    lib, cpu, plant = bridge.lib, bridge.cpu, bridge.plant
+    if lib.pdp8_api_get_clock_source(cpu) == driver.CLOCK_SOURCES["host"]:
+        raise driver.EmulatorError("the plant needs a virtual clock (instruction or cycle)")
+    step_ns = int(round(plant.config.step * 1e9))
+    origin_ns = lib.pdp8_api_now_ns(cpu) - plant.steps * step_ns
+    end_step = plant.steps + int(round(seconds / plant.config.step))
+    unit_ns = max(1, clock_ns)
+    started = time.perf_counter()
+    start_time = plant.time
+    instructions = 0
+    halted = False
+    while plant.steps < end_step:
+        due_ns = origin_ns + (plant.steps + 1) * step_ns
+        now_ns = lib.pdp8_api_now_ns(cpu)
+        halted = bool(lib.pdp8_api_is_halted(cpu))
+        if halted:
+            # the plant keeps going without its controller
+            now_ns = origin_ns + end_step * step_ns
+        elif now_ns < due_ns:
+            budget = max(1, (due_ns - now_ns) // unit_ns)
+            executed = lib.pdp8_api_run(cpu, ctypes.c_size_t(budget))
+            if executed < 0:
+                raise driver.EmulatorError("Emulator reported an error during execution.")
+            instructions += executed
+            now_ns = lib.pdp8_api_now_ns(cpu)
+            if now_ns < due_ns and not lib.pdp8_api_is_halted(cpu):
+                continue
+            now_ns = max(now_ns, due_ns)
+        steps = min(end_step, (now_ns - origin_ns) // step_ns) - plant.steps
+        bridge.exchange(steps)
+        if speed > 0:
+            ahead = (plant.time - start_time) / speed - (time.perf_counter() - started)
+            if ahead > 0:
+                time.sleep(ahead)
+    return PlantRun(plant.time - start_time, time.perf_counter() - started, instructions, halted)
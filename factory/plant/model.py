@@ -0,0 +1,204 @@
+"""
+Physical model of the waffle plant as NumPy arrays.
+
+State lives in flat arrays (one element per iron or conveyor slot) so every
+fixed time step is a handful of vectorised operations regardless of how many
+irons the plant has:
+
+  batter tank   level in litres, refilled by a pump
+  irons         plate temperature, heater on/off, batter loaded, doneness
+  conveyor      slots carrying waffles that cool towards ambient as the belt
+                moves them to packaging
+  packaging     takes waffles off the end of the belt: cool and properly cooked
+                ones are boxed, the rest rejected
+  cold storage  room temperature held down by a compressor; every box brings
+                in a little heat
+
+The controller drives the plant with command words (see CMD_*) and is told
+about discrete happenings through event words (EV_*); both are 12-bit, with
+the opcode in bits 0-3 and the argument in bits 4-11.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+
+# command words: (opcode << 8) | argument
+CMD_HEAT_ON = 1  # argument: iron
+CMD_HEAT_OFF = 2  # argument: iron
+CMD_FILL = 3  # argument: iron
+CMD_EJECT = 4  # argument: iron
+CMD_PUMP = 5  # argument: 0 off, 1 on
+CMD_BELT = 6  # argument: 0 stop, 1 run
+CMD_COMPRESSOR = 7  # argument: 0 off, 1 on
+
+# event words: (opcode << 8) | argument
+EV_COOKED = 1  # argument: iron
+EV_BURNT = 2  # argument: iron
+EV_PACKED = 3  # argument: boxes in storage, modulo 256
+EV_REJECTED = 4  # argument: rejected waffles, modulo 256
+EV_TANK_LOW = 5
+EV_JAM = 6  # argument: iron that could not eject onto an occupied belt
+
+
+def command(opcode: int, argument: int = 0) -> int:
+    return ((opcode & 0o17) << 8) | (argument & 0o377)
+
+
+@dataclass
+class PlantConfig:
+    irons: int = 16
+    belt_slots: int = 24
+    step: float = 0.02  # seconds of emulated time per model step
+    ambient: float = 22.0  # degrees C
+    tank_capacity: float = 50.0  # litres
+    tank_low: float = 5.0
+    pump_rate: float = 0.5  # litres per second
+    batter_per_waffle: float = 0.15  # litres
+    heater_power: float = 1500.0  # watts
+    iron_heat_capacity: float = 150.0  # joules per kelvin
+    iron_loss: float = 0.01  # per second, times (T - ambient)
+    batter_chill: float = 30.0  # kelvin lost when batter is poured
+    cook_start: float = 150.0  # degrees C where cooking begins
+    cook_rate: float = 1.0 / (30.0 * 50.0)  # doneness per second per kelvin over cook_start
+    burnt_at: float = 1.6
+    belt_period: float = 0.5  # seconds per slot
+    waffle_cooling: float = 4.0  # time constant in seconds
+    pack_below: float = 40.0  # degrees C
+    waffles_per_box: int = 4
+    storage_start: float = -18.0
+    storage_leak: float = 0.002  # per second, times (ambient - T)
+    compressor_rate: float = 0.1  # kelvin per second
+    box_heat: float = 0.05  # kelvin per box stored
+
+
+class WafflePlant:
+    """The plant state and its fixed-step update; see the module docstring."""
+
+    def __init__(self, config: PlantConfig | None = None) -> None:
+        self.config = cfg = config or PlantConfig()
+        self.steps = 0
+        self.tank_level = cfg.tank_capacity
+        self.pump_on = False
+        self.iron_temp = np.full(cfg.irons, cfg.ambient)
+        self.heater_on = np.zeros(cfg.irons, dtype=bool)
+        self.loaded = np.zeros(cfg.irons, dtype=bool)
+        self.doneness = np.zeros(cfg.irons)
+        self.cooked = np.zeros(cfg.irons, dtype=bool)
+        self.burnt = np.zeros(cfg.irons, dtype=bool)
+        self.belt_on = False
+        self.belt_phase = 0.0
+        self.belt_occupied = np.zeros(cfg.belt_slots, dtype=bool)
+        self.belt_temp = np.full(cfg.belt_slots, cfg.ambient)
+        self.belt_doneness = np.zeros(cfg.belt_slots)
+        self.storage_temp = cfg.storage_start
+        self.compressor_on = False
+        self.waffles_packed = 0
+        self.boxes = 0
+        self.rejected = 0
+        self.jams = 0
+        self._events: List[int] = []
+
+    @property
+    def time(self) -> float:
+        """Emulated seconds simulated so far."""
+        return self.steps * self.config.step
+
+    def apply(self, word: int) -> None:
+        """Carry out one controller command word; unknown opcodes are ignored."""
+        cfg = self.config
+        opcode, argument = (word >> 8) & 0o17, word & 0o377
+        iron = argument if argument < cfg.irons else None
+        if opcode == CMD_HEAT_ON and iron is not None:
+            self.heater_on[iron] = True
+        elif opcode == CMD_HEAT_OFF and iron is not None:
+            self.heater_on[iron] = False
+        elif opcode == CMD_FILL and iron is not None:
+            if self.loaded[iron] or self.tank_level < cfg.batter_per_waffle:
+                return
+            self.tank_level -= cfg.batter_per_waffle
+            self.loaded[iron] = True
+            self.doneness[iron] = 0.0
+            self.cooked[iron] = self.burnt[iron] = False
+            self.iron_temp[iron] -= cfg.batter_chill
+            if self.tank_level < cfg.tank_low:
+                self._events.append(command(EV_TANK_LOW))
+        elif opcode == CMD_EJECT and iron is not None:
+            if not self.loaded[iron]:
+                return
+            if self.belt_occupied[0]:
+                self.jams += 1
+                self._events.append(command(EV_JAM, iron))
+                return
+            self.belt_occupied[0] = True
+            self.belt_temp[0] = self.iron_temp[iron]
+            self.belt_doneness[0] = self.doneness[iron]
+            self.loaded[iron] = self.cooked[iron] = self.burnt[iron] = False
+            self.doneness[iron] = 0.0
+        elif opcode == CMD_PUMP:
+            self.pump_on = bool(argument)
+        elif opcode == CMD_BELT:
+            self.belt_on = bool(argument)
+        elif opcode == CMD_COMPRESSOR:
+            self.compressor_on = bool(argument)
+
+    def advance(self, steps: int) -> List[int]:
+        """Advance `steps` fixed time steps; returns the event words raised."""
+        for _ in range(max(0, steps)):
+            self._step()
+        events, self._events = self._events, []
+        return events
+
+    def _step(self) -> None:
+        cfg = self.config
+        dt = cfg.step
+        self.steps += 1
+
+        if self.pump_on:
+            self.tank_level = min(cfg.tank_capacity, self.tank_level + cfg.pump_rate * dt)
+
+        # irons: heater input against losses to the room
+        heat = np.where(self.heater_on, cfg.heater_power / cfg.iron_heat_capacity, 0.0)
+        self.iron_temp += (heat - cfg.iron_loss * (self.iron_temp - cfg.ambient)) * dt
+        cooking = self.loaded & (self.iron_temp > cfg.cook_start)
+        self.doneness += np.where(cooking, (self.iron_temp - cfg.cook_start) * cfg.cook_rate * dt, 0.0)
+        for iron in np.flatnonzero(self.loaded & ~self.cooked & (self.doneness >= 1.0)):
+            self.cooked[iron] = True
+            self._events.append(command(EV_COOKED, int(iron)))
+        for iron in np.flatnonzero(self.loaded & ~self.burnt & (self.doneness >= cfg.burnt_at)):
+            self.burnt[iron] = True
+            self._events.append(command(EV_BURNT, int(iron)))
+
+        # conveyor: waffles cool in place, the belt shifts one slot per period
+        self.belt_temp += (cfg.ambient - self.belt_temp) * (1.0 - np.exp(-dt / cfg.waffle_cooling))
+        if self.belt_on:
+            self.belt_phase += dt
+            while self.belt_phase >= cfg.belt_period:
+                self.belt_phase -= cfg.belt_period
+                self._package(self.belt_occupied[-1], self.belt_temp[-1], self.belt_doneness[-1])
+                self.belt_occupied = np.roll(self.belt_occupied, 1)
+                self.belt_temp = np.roll(self.belt_temp, 1)
+                self.belt_doneness = np.roll(self.belt_doneness, 1)
+                self.belt_occupied[0] = False
+
+        # cold storage: leaks heat in, the compressor pumps it out
+        self.storage_temp += cfg.storage_leak * (cfg.ambient - self.storage_temp) * dt
+        if self.compressor_on:
+            self.storage_temp -= cfg.compressor_rate * dt
+
+    def _package(self, occupied: bool, temp: float, doneness: float) -> None:
+        if not occupied:
+            return
+        cfg = self.config
+        if temp < cfg.pack_below and 1.0 <= doneness < cfg.burnt_at:
+            self.waffles_packed += 1
+            if self.waffles_packed % cfg.waffles_per_box == 0:
+                self.boxes += 1
+                self.storage_temp += cfg.box_heat
+                self._events.append(command(EV_PACKED, self.boxes))
+        else:
+            self.rejected += 1
+            self._events.append(command(EV_REJECTED, self.rejected))
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Pytest for reverse execution: stepping back restores memory, registers and
+mailbox state, and reverse continue lands on the last watchpoint hit.
+"""
+
+from __future__ import annotations
+
+import ctypes
+
+import pytest
+
+from factory import driver
+from factory.checkpoints import Checkpoints
+from factory.mailbox import Mailbox
+from factory.testing import make_machine
+
+PROGRAM = (
+    0o6501,  # 0200 SKI
+    0o5200,  # 0201 JMP 200
+    0o6502,  # 0202 RDI
+    0o3300,  # 0203 DCA 300
+    0o1300,  # 0204 TAD 300
+    0o7041,  # 0205 CMA IAC
+    0o6504,  # 0206 WRO
+    0o7200,  # 0207 CLA
+    0o5200,  # 0210 JMP 200
+)
+
+
+def test_reverse_step_and_continue(lib: ctypes.CDLL) -> None:
+    machine = make_machine(lib, PROGRAM)
+    cpu = machine.cpu
+    mailbox = Mailbox(lib, cpu)
+    history = None
+    try:
+        lib.pdp8_api_set_clock(cpu, driver.CLOCK_SOURCES["instruction"], 1000)
+        history = Checkpoints(lib, cpu, interval=16)
+
+        assert history.run(100) == 100
+        start = history.position
+        assert mailbox.post([1, 2, 3]) == 3
+        history.run(1000)
+        assert mailbox.collect() == [0o7777, 0o7776, 0o7775]
+        assert lib.pdp8_api_read_mem(cpu, 0o300) == 3
+
+        # going back before the post puts the words back in the ring
+        history.seek(start)
+        assert mailbox.inbound_pending == 3
+        assert lib.pdp8_api_read_mem(cpu, 0o300) == 0
+        history.run(1000)
+        assert mailbox.collect() == [0o7777, 0o7776, 0o7775]
+
+        lib.pdp8_api_set_watchpoint(cpu, 0o300, driver.WATCH_ACCESSES["write"])
+        assert history.reverse_continue() == ("watch-write", 0o300)
+        assert lib.pdp8_api_get_pc(cpu) == 0o204
+        assert lib.pdp8_api_read_mem(cpu, 0o300) == 3
+        assert mailbox.inbound_pending == 0
+        history.reverse_step(1)
+        assert lib.pdp8_api_read_mem(cpu, 0o300) == 2
+        assert history.reverse_continue() == ("watch-write", 0o300)
+        assert lib.pdp8_api_read_mem(cpu, 0o300) == 2
+
+        lib.pdp8_api_clear_breakpoints(cpu)
+        history.set_budget(1)
+        assert history.count == 1
+        assert history.oldest > 0
+        with pytest.raises(driver.EmulatorError):
+            history.seek(history.oldest - 1)
+        assert history.reverse_continue() == ("budget", 0)
+    finally:
+        if history:
+            history.close()
+        machine.close()
+        mailbox.close()
+
+
+ECHO_PROGRAM = (
+    0o7001,  # 0200 IAC
+    0o6046,  # 0201 TLS
+    0o6041,  # 0202 TSF
+    0o5202,  # 0203 JMP 202
+    0o5200,  # 0204 JMP 200
+)
+
+
+def test_replay_does_not_print_again(lib: ctypes.CDLL) -> None:
+    machine = make_machine(lib, ECHO_PROGRAM, console=True)
+    cpu = machine.cpu
+    ring = lib.pdp8_output_ring_create(0)
+    assert ring
+    history = None
+    try:
+        push = ctypes.cast(lib.pdp8_output_ring_push, ctypes.c_void_p)
+        lib.pdp8_kl8e_console_set_output_callback(machine.console, push, ring)
+        lib.pdp8_api_set_clock(cpu, driver.CLOCK_SOURCES["instruction"], 1000)
+        history = Checkpoints(lib, cpu, interval=1000)
+
+        assert history.run(500) == 500
+        printed = lib.pdp8_output_ring_end(ring)
+        assert printed > 0
+        history.reverse_step(1)
+        history.reverse_step(1)
+        history.seek(100)
+        assert lib.pdp8_output_ring_end(ring) == printed
+
+        # running forward again only prints past the furthest point reached
+        assert history.run(400) == 400
+        assert lib.pdp8_output_ring_end(ring) == printed
+        history.run(100)
+        assert lib.pdp8_output_ring_end(ring) > printed
+    finally:
+        if history:
+            history.close()
+        machine.close()
+        lib.pdp8_output_ring_destroy(ring)
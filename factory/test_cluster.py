@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Pytest for cluster mode: expand a manifest, run the machines on a thread pool
+and check that each one's console output is captured under its own name.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from factory import cluster, driver
+
+DEMO = Path(__file__).resolve().parents[1] / "demo"
+
+
+def write_manifest(tmp_path: Path, machines: list) -> Path:
+    path = tmp_path / "cluster.json"
+    path.write_text(json.dumps({"quantum": 16, "machines": machines}))
+    return path
+
+
+def test_manifest_expands_counts(tmp_path: Path) -> None:
+    path = write_manifest(
+        tmp_path,
+        [
+            {"name": "iron", "image": str(DEMO / "diag.srec"), "count": 3},
+            {"image": "cal3.srec", "clock": "cycle", "printer": True},
+        ],
+    )
+    specs, quantum = cluster.load_manifest(path)
+    assert quantum == 16
+    assert [spec.name for spec in specs] == ["iron01", "iron02", "iron03", "cal3"]
+    assert specs[3].image == tmp_path / "cal3.srec"
+    assert specs[3].printer and specs[3].clock == "cycle"
+
+
+def test_manifest_rejects_duplicate_names(tmp_path: Path) -> None:
+    path = write_manifest(tmp_path, [{"name": "a", "image": "x.srec"}, {"name": "a", "image": "y.srec"}])
+    with pytest.raises(driver.EmulatorError):
+        cluster.load_manifest(path)
+
+
+def test_cluster_runs_every_machine(lib: ctypes.CDLL, tmp_path: Path) -> None:
+    path = write_manifest(tmp_path, [{"name": "iron", "image": str(DEMO / "diag.srec"), "count": 3}])
+    specs, quantum = cluster.load_manifest(path)
+    machines = [cluster.ClusterMachine(spec, lib) for spec in specs]
+    out = io.StringIO()
+    try:
+        rom_cache: dict = {}
+        for machine in machines:
+            machine.build(rom_cache)
+        report = cluster.run_cluster(lib, machines, quantum, workers=2, out=out)
+        assert all(machine.state == "halted" for machine in machines)
+        assert report.cycles == sum(machine.cycles for machine in machines)
+        assert report.rounds == (machines[0].cycles + quantum - 1) // quantum
+    finally:
+        for machine in machines:
+            machine.close()
+
+    lines = out.getvalue().splitlines()
+    for name in ("iron01", "iron02", "iron03"):
+        assert f"{name:>10} | DC" in lines
+
+
+def test_router_sends_lines_to_named_machine() -> None:
+    received = {}
+
+    class Stub:
+        def __init__(self, name: str) -> None:
+            self.spec = cluster.MachineSpec(name, Path("x.srec"))
+
+        def queue_input(self, text: str) -> None:
+            received.setdefault(self.spec.name, []).append(text)
+
+    router = cluster.ConsoleRouter([Stub("a"), Stub("b")], -1)
+    router.route("hello")
+    router.route("@b one")
+    router.route("@b")
+    router.route("two")
+    assert received == {"a": ["hello\n"], "b": ["one\n", "two\n"]}
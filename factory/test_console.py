@@ -17,6 +17,12 @@ import sys
 import time
 from pathlib import Path
 
+import pytest
+
+# A script, not a pytest module: its test_* helpers are called from the
+# __main__ block. Run it as python3 factory/test_console.py.
+pytestmark = pytest.mark.skip(reason="standalone script; run python3 factory/test_console.py")
+
 # KL8E Console IOT Instructions
 # Keyboard (device 03)
 KL8E_KEYBOARD_KSF = 0o6031   # Skip if keyboard flag set
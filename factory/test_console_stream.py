@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Pytest for streamed console I/O: keyboard input from a file or FIFO and
+teleprinter output to a file, as selected by pdp8.config.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+from factory import driver
+from factory.testing import make_machine
+
+PROGRAM = (
+    0o6031,  # 0200 KSF
+    0o5200,  # 0201 JMP 200
+    0o6036,  # 0202 KRB
+    0o6046,  # 0203 TLS
+    0o6041,  # 0204 TSF
+    0o5204,  # 0205 JMP 204
+    0o5200,  # 0206 JMP 200
+)
+PAYLOAD = b"".join(b"line %05d of the batch job\n" % n for n in range(40000))  # about 1 MB
+
+
+def run_echo(lib: ctypes.CDLL, keyboard: driver.ConsoleStream, output: Path) -> int:
+    machine = make_machine(lib, PROGRAM, console=True)
+    cpu, console = machine.cpu, machine.console
+    try:
+        teleprinter = driver.open_teleprinter_output(str(output))
+        try:
+            # ends parked in the KSF loop once the input is used up
+            driver.run_factory(lib, cpu, console, -1, keyboard=keyboard, output_stream=teleprinter)
+        finally:
+            teleprinter.close()
+        assert lib.pdp8_api_is_waiting(cpu)
+        assert lib.pdp8_kl8e_console_input_pending(console) == 0
+        return lib.pdp8_kl8e_console_input_count(console)
+    finally:
+        keyboard.close()
+        machine.close()
+
+
+def test_streams_a_file_through_the_console(lib: ctypes.CDLL, tmp_path: Path) -> None:
+    source = tmp_path / "input.txt"
+    source.write_bytes(PAYLOAD)
+    output = tmp_path / "output.txt"
+
+    count = run_echo(lib, driver.open_keyboard_input(str(source)), output)
+
+    assert count == len(PAYLOAD)
+    assert output.read_bytes() == PAYLOAD.replace(b"\n", b"\r")
+
+
+def test_streams_a_fifo_with_a_blocked_writer(lib: ctypes.CDLL, tmp_path: Path) -> None:
+    fifo = tmp_path / "keyboard"
+    os.mkfifo(fifo)
+    output = tmp_path / "output.txt"
+
+    def writer() -> None:
+        with open(fifo, "wb") as stream:
+            stream.write(PAYLOAD)
+
+    feeder = threading.Thread(target=writer)
+    feeder.start()
+    try:
+        count = run_echo(lib, driver.open_keyboard_input(str(fifo)), output)
+    finally:
+        feeder.join()
+
+    assert count == len(PAYLOAD)
+    assert output.read_bytes() == PAYLOAD.replace(b"\n", b"\r")
+
+
+def test_keyboard_stops_reading_at_the_high_water_mark(lib: ctypes.CDLL, tmp_path: Path) -> None:
+    source = tmp_path / "input.txt"
+    source.write_bytes(PAYLOAD)
+    console = lib.pdp8_kl8e_console_create(None, None)
+    keyboard = driver.open_keyboard_input(str(source))
+    try:
+        for _ in range(3):
+            assert keyboard.pump(lib, console)
+        assert lib.pdp8_kl8e_console_input_pending(console) == driver.KL8E_INPUT_HIGH_WATER
+        # one chunk read, the rest left in the file until the KL8E catches up
+        assert keyboard.pending == driver.CONSOLE_READ_CHUNK - driver.KL8E_INPUT_HIGH_WATER
+        assert os.lseek(keyboard.fd, 0, os.SEEK_CUR) == driver.CONSOLE_READ_CHUNK
+    finally:
+        keyboard.close()
+        lib.pdp8_kl8e_console_destroy(console)
+
+
+def test_stdio_settings_keep_the_terminal(tmp_path: Path) -> None:
+    assert driver.open_keyboard_input("stdin") is None
+    assert driver.open_teleprinter_output("stdout") is None
+    with pytest.raises(OSError):
+        driver.open_keyboard_input(str(tmp_path / "missing"))
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Pytest for the native counters: instructions, HLTs and IOTs per device are
+counted by the core, characters in and out by the KL8E console.
+"""
+
+from __future__ import annotations
+
+import ctypes
+
+from factory import driver
+from factory.testing import make_machine
+
+PROGRAM = (
+    0o6031,  # 0200 KSF
+    0o5200,  # 0201 JMP 200
+    0o6036,  # 0202 KRB
+    0o6046,  # 0203 TLS
+    0o7402,  # 0204 HLT
+)
+
+
+def test_counts_instructions_iots_and_characters(lib: ctypes.CDLL) -> None:
+    machine = make_machine(lib, PROGRAM, console=True)
+    cpu, console = machine.cpu, machine.console
+    try:
+        assert lib.pdp8_api_run(cpu, 10) == 10
+        assert lib.pdp8_kl8e_console_queue_input(console, ord("A")) == 0
+        lib.pdp8_api_run(cpu, 100)
+        assert lib.pdp8_api_is_halted(cpu)
+
+        counters = driver.read_counters(lib, cpu)
+        assert counters.instructions == 14
+        assert counters.halts == 1
+        assert counters.iots[0o3] == 7
+        assert counters.iots[0o4] == 1
+        assert counters.interrupt_dispatches == 0
+        assert lib.pdp8_kl8e_console_input_count(console) == 1
+        assert lib.pdp8_kl8e_console_output_count(console) == 1
+
+        # totals survive a reset
+        lib.pdp8_api_reset(cpu)
+        assert driver.read_counters(lib, cpu).instructions == 14
+    finally:
+        machine.close()
+
+
+def test_latency_histogram_is_cumulative() -> None:
+    counters = driver.Counters()
+    counters.interrupt_latency[1] = 2  # latency 1
+    counters.interrupt_latency[3] = 1  # latency 4..7
+    counters.interrupt_latency[driver.LATENCY_BUCKETS - 1] = 1
+    buckets = driver.latency_histogram(counters)
+    assert buckets[:4] == [(0.0, 0), (1.0, 2), (3.0, 2), (7.0, 3)]
+    assert buckets[-1] == (float("inf"), 4)
+    assert len(buckets) == driver.LATENCY_BUCKETS
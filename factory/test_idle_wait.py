@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Pytest for the factory event loop: a program parked in a KSF wait loop should
+sleep in select() until console input arrives instead of spinning.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import os
+import threading
+import time
+
+from factory import driver
+from factory.testing import make_machine
+
+PROGRAM = (
+    0o6031,  # 0200 KSF
+    0o5200,  # 0201 JMP 200
+    0o6036,  # 0202 KRB
+    0o7402,  # 0203 HLT
+)
+
+
+def test_waits_for_input_without_spinning(lib: ctypes.CDLL) -> None:
+    machine = make_machine(lib, PROGRAM, console=True)
+    cpu = machine.cpu
+    read_fd, write_fd = os.pipe()
+
+    def type_key() -> None:
+        time.sleep(0.3)
+        os.write(write_fd, b"a")
+        os.close(write_fd)
+
+    typist = threading.Thread(target=type_key)
+    try:
+        typist.start()
+        wall = time.monotonic()
+        cycles = driver.run_factory(lib, cpu, machine.console, read_fd)
+        wall = time.monotonic() - wall
+
+        assert lib.pdp8_api_is_halted(cpu)
+        assert lib.pdp8_api_get_ac(cpu) == ord("a")
+        assert wall >= 0.25
+        # one block to reach the wait loop and one after the key: spinning
+        # through the 0.3 s wait would run block after block
+        assert cycles <= 2 * driver.RUN_BLOCK_CYCLES
+    finally:
+        typist.join()
+        os.close(read_fd)
+        machine.close()
+
+
+def test_stops_when_nothing_can_wake_it(lib: ctypes.CDLL) -> None:
+    machine = make_machine(lib, PROGRAM, console=True)
+    cpu = machine.cpu
+    try:
+        # no console input at all and no device deadline: return instead of hanging
+        driver.run_factory(lib, cpu, machine.console, -1)
+        assert not lib.pdp8_api_is_halted(cpu)
+        assert lib.pdp8_api_is_waiting(cpu)
+    finally:
+        machine.close()
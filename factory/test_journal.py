@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Pytest for input journals: a recorded keyboard byte is decoded by
+read_journal and fed back at the same position on replay.
+"""
+
+from __future__ import annotations
+
+import ctypes
+from pathlib import Path
+
+import pytest
+
+from factory import driver
+from factory.journal import Journal, read_journal
+from factory.testing import Machine, make_machine
+
+PROGRAM = (
+    0o6031,  # 0200 KSF
+    0o5200,  # 0201 JMP 200
+    0o6036,  # 0202 KRB
+    0o6046,  # 0203 TLS
+    0o7402,  # 0204 HLT
+)
+
+
+def pop_output(lib: ctypes.CDLL, console: int) -> bytes:
+    out = bytearray()
+    byte = ctypes.c_uint8()
+    while lib.pdp8_kl8e_console_pop_output(console, ctypes.byref(byte)) == 0:
+        out.append(byte.value)
+    return bytes(out)
+
+
+def test_replay_feeds_keyboard_input_at_recorded_position(lib: ctypes.CDLL, tmp_path: Path) -> None:
+    path = tmp_path / "session.p8j"
+
+    machine = make_machine(lib, PROGRAM, console=True)
+    cpu, console = machine.cpu, machine.console
+    try:
+        journal = Journal.record(lib, cpu, path)
+        assert journal.run(10) == 10
+        assert lib.pdp8_kl8e_console_queue_input(console, ord("A")) == 0
+        while not lib.pdp8_api_is_halted(cpu):
+            journal.run(100)
+        recorded = journal.position
+        assert journal.events == 1
+        journal.close()
+        assert pop_output(lib, console) == b"A"
+    finally:
+        machine.close()
+
+    _, records, end = read_journal(path)
+    assert [(record.source, record.value) for record in records] == [("keyboard", ord("A"))]
+    assert records[0].stamp == 10
+    assert end == recorded
+
+    machine = make_machine(lib, PROGRAM, console=True)
+    cpu, console = machine.cpu, machine.console
+    try:
+        journal = Journal.replay(lib, cpu, path)
+        journal.set_console(console)
+        assert journal.end == recorded
+        # typed input is refused; the journal supplies it
+        assert lib.pdp8_kl8e_console_queue_input(console, ord("B")) != 0
+        while journal.run(1 << 20):
+            pass
+        assert lib.pdp8_api_is_halted(cpu)
+        assert journal.position == recorded
+        assert journal.remaining == 0
+        assert journal.mismatches == 0
+        journal.close()
+        assert pop_output(lib, console) == b"A"
+    finally:
+        machine.close()
+
+
+def test_replay_rejects_a_file_that_is_not_a_journal(lib: ctypes.CDLL, tmp_path: Path) -> None:
+    path = tmp_path / "bogus.p8j"
+    path.write_bytes(b"not a journal")
+    with pytest.raises(ValueError):
+        read_journal(path)
+    machine = make_machine(lib, ())
+    try:
+        with pytest.raises(OSError):
+            Journal.replay(lib, machine.cpu, path)
+    finally:
+        machine.close()
+
+
+CLOCK_PROGRAM = (
+    0o1610,  # 0200 TAD I 210
+    0o7402,  # 0201 HLT
+)
+
+
+def build_clock_machine(lib: ctypes.CDLL) -> Machine:
+    machine = make_machine(lib, CLOCK_PROGRAM)
+    driver.write_word(lib, machine.cpu, 0o210, 0o7760)
+    return machine
+
+
+def test_front_end_wall_clock_reads_are_not_journaled(lib: ctypes.CDLL, tmp_path: Path) -> None:
+    path = tmp_path / "clock.p8j"
+
+    machine = build_clock_machine(lib)
+    cpu = machine.cpu
+    try:
+        journal = Journal.record(lib, cpu, path)
+        lib.pdp8_api_read_mem(cpu, 0o7760)
+        assert journal.events == 0
+        journal.run(10)
+        assert journal.events == 1
+        minutes = lib.pdp8_api_get_ac(cpu)
+        journal.close()
+    finally:
+        machine.close()
+
+    machine = build_clock_machine(lib)
+    cpu = machine.cpu
+    try:
+        journal = Journal.replay(lib, cpu, path)
+        lib.pdp8_api_read_mem(cpu, 0o7760)
+        while journal.run(10):
+            pass
+        assert lib.pdp8_api_get_ac(cpu) == minutes
+        assert journal.mismatches == 0
+        journal.close()
+    finally:
+        machine.close()
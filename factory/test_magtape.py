@@ -16,6 +16,12 @@ import ctypes
 import sys
 from pathlib import Path
 
+import pytest
+
+# A script, not a pytest module: its test_* helpers are called from the
+# __main__ block. Run it as python3 factory/test_magtape.py.
+pytestmark = pytest.mark.skip(reason="standalone script; run python3 factory/test_magtape.py")
+
 MAGTAPE_INSTR_GO = 0o6701
 MAGTAPE_INSTR_READ = 0o6702
 MAGTAPE_INSTR_WRITE = 0o6704
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Pytest for the mailbox device: a host-side "sensor" posts batches between
+run calls and collects the program's replies without any IOT callbacks.
+"""
+
+from __future__ import annotations
+
+import ctypes
+
+import pytest
+
+from factory.mailbox import MAILBOX_RING_WORDS, Mailbox
+from factory.testing import make_machine
+
+PROGRAM = (
+    0o6501,  # 0200 SKI
+    0o5200,  # 0201 JMP 200
+    0o6502,  # 0202 RDI
+    0o7041,  # 0203 CMA IAC
+    0o6504,  # 0204 WRO
+    0o7200,  # 0205 CLA
+    0o6506,  # 0206 RDR
+    0o7001,  # 0207 IAC
+    0o6507,  # 0210 WRR
+    0o5200,  # 0211 JMP 200
+)
+
+
+def test_batches_round_trip(lib: ctypes.CDLL) -> None:
+    machine = make_machine(lib, PROGRAM)
+    cpu = machine.cpu
+    mailbox = Mailbox(lib, cpu)
+    try:
+        mailbox.write_registers([0o100])
+
+        lib.pdp8_api_run(cpu, 1000)
+        assert mailbox.collect() == []
+        assert lib.pdp8_api_is_waiting(cpu)
+
+        assert mailbox.post([1, 2, 3]) == 3
+        lib.pdp8_api_run(cpu, 1000)
+        assert mailbox.collect() == [0o7777, 0o7776, 0o7775]  # negated
+        assert mailbox.read_registers()[0] == 0o103  # one bump per word
+        assert mailbox.inbound_pending == 0
+
+        assert mailbox.post(range(MAILBOX_RING_WORDS + 10)) == MAILBOX_RING_WORDS
+        with pytest.raises(ValueError):
+            mailbox.write_registers([0, 0], first=7)
+    finally:
+        machine.close()
+        mailbox.close()
@@ -16,6 +16,12 @@ import ctypes
 import sys
 from pathlib import Path
 
+import pytest
+
+# A script, not a pytest module: its test_* helpers are called from the
+# __main__ block. Run it as python3 factory/test_papertape.py.
+pytestmark = pytest.mark.skip(reason="standalone script; run python3 factory/test_papertape.py")
+
 # Paper tape IOT instructions (067x)
 PAPER_TAPE_INSTR_SKIP = 0o6671    # Skip if ready
 PAPER_TAPE_INSTR_SELECT = 0o6672  # Select block (AC contains block number)
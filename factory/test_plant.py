@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Pytest for factory.plant: the NumPy model on its own, then the demo control
+ROM driving it through the mailbox bridge on a virtual clock.
+"""
+
+from __future__ import annotations
+
+import ctypes
+from pathlib import Path
+
+import pytest
+
+from factory import driver
+
+pytest.importorskip("numpy")
+from factory.plant import PlantBridge, WafflePlant, command, run_plant
+from factory.plant.model import CMD_BELT, CMD_EJECT, CMD_FILL, CMD_HEAT_ON, EV_COOKED
+from factory.testing import make_machine
+
+CONTROL_ROM = Path(__file__).resolve().parents[1] / "demo" / "plant-control.srec"
+
+
+def test_model_cooks_and_packs_one_waffle() -> None:
+    plant = WafflePlant()
+    plant.apply(command(CMD_HEAT_ON, 3))
+    plant.apply(command(CMD_FILL, 3))
+    plant.apply(command(CMD_BELT, 1))
+    events = []
+    while command(EV_COOKED, 3) not in events:
+        assert plant.time < 120, "iron 3 never finished"
+        events += plant.advance(50)
+    assert plant.loaded[3] and not plant.loaded[2]
+    assert plant.iron_temp[0] == pytest.approx(plant.config.ambient)
+
+    plant.apply(command(CMD_EJECT, 3))
+    assert not plant.loaded[3] and plant.belt_occupied[0]
+    plant.advance(int(plant.config.belt_slots * plant.config.belt_period / plant.config.step) + 1)
+    assert plant.waffles_packed == 1 and plant.rejected == 0
+    assert not plant.belt_occupied.any()
+
+
+def test_control_rom_runs_the_plant(lib: ctypes.CDLL) -> None:
+    machine = make_machine(lib, ())
+    cpu = machine.cpu
+    bridge = None
+    try:
+        assert lib.pdp8_api_set_clock(cpu, driver.CLOCK_SOURCES["cycle"], driver.PDP8_MEMORY_CYCLE_NS) == 0
+        plant = WafflePlant()
+        bridge = PlantBridge(lib, cpu, plant)
+        rom_words, start = driver.load_srec(CONTROL_ROM)
+        driver.load_rom_into_memory(lib, cpu, rom_words)
+        driver.install_reset_vector(lib, cpu, start)
+
+        run = run_plant(bridge, 75.0)
+        assert run.seconds == pytest.approx(75.0)
+        assert not run.halted
+        assert lib.pdp8_api_now_ns(cpu) >= 75 * 10**9
+        assert plant.heater_on.any() and plant.belt_on
+        assert 190 < plant.iron_temp.mean() < 215  # held by the ROM's thermostat
+        assert plant.waffles_packed > 0 and plant.rejected == 0
+        assert bridge.commands > 32 and bridge.events >= 16
+    finally:
+        machine.close()
+        if bridge is not None:
+            bridge.close()
+
+
+def test_host_clock_is_rejected(lib: ctypes.CDLL) -> None:
+    machine = make_machine(lib, ())
+    bridge = None
+    try:
+        bridge = PlantBridge(lib, machine.cpu, WafflePlant())
+        with pytest.raises(driver.EmulatorError):
+            run_plant(bridge, 1.0)
+    finally:
+        machine.close()
+        if bridge is not None:
+            bridge.close()
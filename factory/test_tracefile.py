@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Pytest for the .p8t trace recorder: record a short program through
+TraceWriter, then read it back chunk by chunk with TraceFile.
+"""
+
+from __future__ import annotations
+
+import ctypes
+from array import array
+from pathlib import Path
+
+import pytest
+
+from factory import driver
+from factory.testing import make_machine
+from factory.tracefile import TRACE_NO_ADDRESS, TraceFile, TraceWriter, column_layout
+
+PROGRAM = (
+    0o7001,  # 0200 IAC
+    0o3300,  # 0201 DCA 300
+    0o2301,  # 0202 ISZ 301
+    0o5200,  # 0203 JMP 200
+)
+
+
+def read_column(trace: TraceFile, name: str) -> array:
+    values = array("H")
+    for chunk, payload in trace:
+        for column, offset, dtype in column_layout(chunk.count):
+            if column == name:
+                values.frombytes(bytes(payload[offset:offset + 2 * chunk.count]))
+    return values
+
+
+@pytest.mark.parametrize("level", [0, 1])
+def test_trace_round_trip(lib: ctypes.CDLL, tmp_path: Path, level: int) -> None:
+    machine = make_machine(lib, PROGRAM)
+    cpu = machine.cpu
+    try:
+        driver.write_word(lib, cpu, 0o301, 0o7000)
+
+        path = tmp_path / "run.p8t"
+        writer = TraceWriter(path, lib, chunk_steps=5, level=level)
+        assert writer.run(cpu, 12) == 12
+        writer.close(
+            lib.pdp8_api_get_pc(cpu),
+            lib.pdp8_api_get_ac(cpu),
+            lib.pdp8_api_get_link(cpu),
+            bool(lib.pdp8_api_is_halted(cpu)),
+        )
+        assert writer.chunks == 3
+    finally:
+        machine.close()
+
+    with TraceFile(path) as trace:
+        assert trace.total_steps == 12
+        assert [chunk.count for chunk in trace.chunks] == [5, 5, 2]
+        assert not trace.truncated
+        assert trace.end is not None and trace.end.pc == 0o200
+        pcs = read_column(trace, "pc")
+        addresses = read_column(trace, "address")
+    assert list(pcs[:4]) == [0o200, 0o201, 0o202, 0o203]
+    assert list(addresses[:4]) == [TRACE_NO_ADDRESS, 0o300, 0o301, 0o200]
+
+
+def test_truncated_trace_keeps_complete_chunks(lib: ctypes.CDLL, tmp_path: Path) -> None:
+    machine = make_machine(lib, PROGRAM)
+    try:
+        path = tmp_path / "cut.p8t"
+        writer = TraceWriter(path, lib, chunk_steps=4, level=1)
+        writer.run(machine.cpu, 8)
+        writer.close(0, 0, 0, False)
+    finally:
+        machine.close()
+
+    data = path.read_bytes()
+    path.write_bytes(data[:-40])  # lose the end record and part of the last chunk
+    with TraceFile(path) as trace:
+        assert trace.truncated
+        assert trace.end is None
+        assert trace.total_steps == 4
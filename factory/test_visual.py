@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Pytest for the front panel internals that run without a terminal: the
+emulation thread's snapshots and the renderer's damage tracking.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+from factory import visual
+from factory.testing import make_machine
+
+
+class FakeWindow:
+    def __init__(self, height: int = 24, width: int = 80) -> None:
+        self.size = (height, width)
+        self.writes: List[Tuple[int, int, str]] = []
+        self.refreshes = 0
+
+    def getmaxyx(self) -> Tuple[int, int]:
+        return self.size
+
+    def erase(self) -> None:
+        pass
+
+    def addnstr(self, row: int, col: int, text: str, limit: int) -> None:
+        self.writes.append((row, col, text[:limit]))
+
+    def refresh(self) -> None:
+        self.refreshes += 1
+
+
+def make_state(lib: ctypes.CDLL, program: List[int]) -> visual.PanelState:
+    cpu = make_machine(lib, program).cpu
+    return visual.PanelState(lib, cpu, None, None, None, None, Path("loop.srec"))
+
+
+def snapshot(**fields) -> visual.PanelSnapshot:
+    values = dict(
+        paused=True, halted=False, cycles=0, pc=0o200, ac=0, link=0, int_enabled=False,
+        watchdog=None, listing_base=0o200, listing=(), output=("",),
+    )
+    values.update(fields)
+    return visual.PanelSnapshot(**values)
+
+
+def test_renderer_repaints_only_changed_fields(lib: ctypes.CDLL) -> None:
+    window = FakeWindow()
+    renderer = visual.PanelRenderer(window)  # type: ignore[arg-type]
+    state = make_state(lib, [0o7402])
+    try:
+        visual.draw_panel(renderer, snapshot(output=("HELLO",)), state)
+        first = len(window.writes)
+        assert first > 10 and window.refreshes == 1
+
+        window.writes.clear()
+        visual.draw_panel(renderer, snapshot(output=("HELLO",)), state)
+        assert window.writes == [] and window.refreshes == 1
+
+        visual.draw_panel(renderer, snapshot(cycles=42, output=("HI",)), state)
+        assert window.writes == [(2, 0, "Cycles: 42"), (7, 0, "HI   ")]
+        assert window.refreshes == 2
+
+        window.size = (30, 100)  # a resize repaints everything
+        window.writes.clear()
+        visual.draw_panel(renderer, snapshot(cycles=42, output=("HI",)), state)
+        assert len(window.writes) > first
+    finally:
+        lib.pdp8_api_destroy(state.cpu)
+
+
+def test_emulation_thread_runs_and_publishes(lib: ctypes.CDLL) -> None:
+    # 0200: ISZ 0210 / JMP 0200, counting forever
+    state = make_state(lib, [0o2210, 0o5200])
+    emulation = visual.EmulationThread(state, 0.01, 64)
+    emulation.listing_rows = 3
+    emulation.start()
+    try:
+        emulation.commands.put(ord(" "))
+        deadline = time.monotonic() + 5.0
+        while emulation.snapshot.cycles < 1000 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not emulation.snapshot.paused
+        assert emulation.snapshot.cycles >= 1000
+
+        emulation.commands.put(ord(" "))
+        while not emulation.snapshot.paused and time.monotonic() < deadline:
+            time.sleep(0.01)
+        cycles = emulation.snapshot.cycles
+        emulation.commands.put(ord("s"))
+        while emulation.snapshot.cycles == cycles and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert emulation.snapshot.cycles == cycles + 1
+        pc = emulation.snapshot.pc
+        assert emulation.snapshot.listing_base == pc
+        assert emulation.snapshot.listing == tuple(lib.pdp8_api_read_mem(state.cpu, (pc + i) & 0o7777) for i in range(3))
+    finally:
+        state.exiting = True
+        emulation.join()
+        lib.pdp8_api_destroy(state.cpu)
+    assert emulation.error is None
+
+
+def test_emulation_thread_pauses_at_breakpoint(lib: ctypes.CDLL) -> None:
+    # 0200: ISZ 0210 / JMP 0200, with a breakpoint on the JMP
+    state = make_state(lib, [0o2210, 0o5200])
+    visual.install_breakpoints(state, ["0201"], [])
+    emulation = visual.EmulationThread(state, 0.01, 64)
+    emulation.start()
+    try:
+        emulation.commands.put(ord(" "))
+        deadline = time.monotonic() + 5.0
+        while (emulation.snapshot.cycles == 0 or not emulation.snapshot.paused) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert emulation.snapshot.paused
+        assert emulation.snapshot.pc == 0o201
+        assert emulation.snapshot.stop == "breakpoint 0201"
+        assert emulation.snapshot.breakpoints == frozenset({0o201})
+
+        emulation.commands.put(ord("b"))  # clear it and resume: runs freely again
+        emulation.commands.put(ord(" "))
+        cycles = emulation.snapshot.cycles
+        while emulation.snapshot.cycles < cycles + 1000 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not emulation.snapshot.paused and emulation.snapshot.stop == ""
+        assert emulation.snapshot.breakpoints == frozenset()
+    finally:
+        state.exiting = True
+        emulation.join()
+        lib.pdp8_api_destroy(state.cpu)
+    assert emulation.error is None
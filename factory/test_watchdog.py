@@ -1,38 +1,31 @@
 #!/usr/bin/env python3
 """
-Simple watchdog device tests.
-
-Tests included:
-- write/read control register roundtrip
-- one-shot HALT expiry
-- one-shot RESET expiry
-
-These use the factory shared library (libpdp8.so) and the C API via ctypes.
+Pytest for the watchdog device: control register round trip, then each
+expiry action on the virtual instruction clock. At 1 ms of emulated time per
+instruction a decisecond count is 100 instructions, so every scenario fires
+on an exact instruction count and finishes without waiting on the host.
 """
 
 from __future__ import annotations
 
 import ctypes
-import sys
-import time
-from pathlib import Path
+from typing import Iterator, List, Tuple
+
+import pytest
 
-# Watchdog device constants (match src/emulator/watchdog.h)
-PDP8_WATCHDOG_DEVICE_CODE = 0o55
-PDP8_WATCHDOG_IOT_BASE = 0o6000 | ((PDP8_WATCHDOG_DEVICE_CODE & 0x3F) << 3)
-PDP8_WATCHDOG_BIT_WRITE = 0x1
-PDP8_WATCHDOG_BIT_READ = 0x2
-PDP8_WATCHDOG_BIT_RESTART = 0x4
+from factory import driver
+from factory.testing import Machine, make_machine
 
-# Command encodings (matches watchdog.c enum)
-WD_CMD_DISABLE = 0
-WD_CMD_RESET_ONE_SHOT = 1
-WD_CMD_RESET_PERIODIC = 2
-WD_CMD_HALT_ONE_SHOT = 3
-WD_CMD_HALT_PERIODIC = 4
-WD_CMD_INTERRUPT_ONE_SHOT = 5
-WD_CMD_INTERRUPT_PERIODIC = 6
-WD_CMD_TICK_PERIODIC = 7
+# IOT function codes (match PDP8_WATCHDOG_FUNC_* in watchdog.h)
+PDP8_WATCHDOG_FUNC_WRITE = 0x2
+PDP8_WATCHDOG_FUNC_READ = 0x3
+PDP8_WATCHDOG_FUNC_RESTART = 0x4
+
+NS_PER_INSTRUCTION = 1_000_000
+
+IDLE_PROGRAM = (
+    0o5200,  # 0200 JMP 200
+)
 
 
 class WatchdogStatus(ctypes.Structure):
@@ -45,297 +38,104 @@ class WatchdogStatus(ctypes.Structure):
     ]
 
 
-def instr(bits: int) -> int:
-    return PDP8_WATCHDOG_IOT_BASE | (bits & 0x7)
-
-
-def load_library() -> ctypes.CDLL:
-    factory_dir = Path(__file__).resolve().parent
-    lib_path = factory_dir / "libpdp8.so"
-    if not lib_path.exists():
-        print(f"{lib_path} not found. Build it with the project Makefile.", file=sys.stderr)
-        raise SystemExit(1)
-    return ctypes.CDLL(str(lib_path))
-
-
-def configure_signatures(lib: ctypes.CDLL) -> None:
-    # Core API
-    lib.pdp8_api_create.argtypes = [ctypes.c_size_t]
-    lib.pdp8_api_create.restype = ctypes.c_void_p
-
-    lib.pdp8_api_destroy.argtypes = [ctypes.c_void_p]
-    lib.pdp8_api_destroy.restype = None
-
-    lib.pdp8_api_reset.argtypes = [ctypes.c_void_p]
-    lib.pdp8_api_reset.restype = None
-
-    lib.pdp8_api_write_mem.argtypes = [ctypes.c_void_p, ctypes.c_uint16, ctypes.c_uint16]
-    lib.pdp8_api_write_mem.restype = ctypes.c_int
-
-    lib.pdp8_api_step.argtypes = [ctypes.c_void_p]
-    lib.pdp8_api_step.restype = ctypes.c_int
-
-    lib.pdp8_api_set_ac.argtypes = [ctypes.c_void_p, ctypes.c_uint16]
-    lib.pdp8_api_set_ac.restype = None
-
-    lib.pdp8_api_get_ac.argtypes = [ctypes.c_void_p]
-    lib.pdp8_api_get_ac.restype = ctypes.c_uint16
-
-    lib.pdp8_api_get_pc.argtypes = [ctypes.c_void_p]
-    lib.pdp8_api_get_pc.restype = ctypes.c_uint16
-
-    lib.pdp8_api_set_pc.argtypes = [ctypes.c_void_p, ctypes.c_uint16]
-    lib.pdp8_api_set_pc.restype = None
-
-    lib.pdp8_api_is_halted.argtypes = [ctypes.c_void_p]
-    lib.pdp8_api_is_halted.restype = ctypes.c_int
-
-    # Interrupt API
-    lib.pdp8_api_request_interrupt.argtypes = [ctypes.c_void_p, ctypes.c_uint8]
-    lib.pdp8_api_request_interrupt.restype = ctypes.c_int
-
+@pytest.fixture
+def watchdog(lib: ctypes.CDLL) -> Iterator[Tuple[Machine, int]]:
     lib.pdp8_api_peek_interrupt_pending.argtypes = [ctypes.c_void_p]
     lib.pdp8_api_peek_interrupt_pending.restype = ctypes.c_int
-
     lib.pdp8_api_clear_interrupt_pending.argtypes = [ctypes.c_void_p]
     lib.pdp8_api_clear_interrupt_pending.restype = ctypes.c_int
-
-    # Watchdog API
-    lib.pdp8_watchdog_create.argtypes = []
-    lib.pdp8_watchdog_create.restype = ctypes.c_void_p
-
-    lib.pdp8_watchdog_destroy.argtypes = [ctypes.c_void_p]
-    lib.pdp8_watchdog_destroy.restype = None
-
-    lib.pdp8_watchdog_attach.argtypes = [ctypes.c_void_p, ctypes.c_void_p]
-    lib.pdp8_watchdog_attach.restype = ctypes.c_int
     lib.pdp8_watchdog_get_status.argtypes = [ctypes.c_void_p, ctypes.POINTER(WatchdogStatus)]
     lib.pdp8_watchdog_get_status.restype = ctypes.c_int
 
-
-def execute_iot(lib: ctypes.CDLL, cpu: int, instruction: int, ac: int | None = None) -> int:
-    """Write an IOT to memory and execute it; return resulting AC."""
-    if ac is not None:
-        lib.pdp8_api_set_ac(cpu, ctypes.c_uint16(ac & 0x0FFF))
-    # ensure CPU is not halted
-    try:
-        lib.pdp8_api_set_pc(cpu, ctypes.c_uint16(0))
-    except Exception:
-        pass
-    if lib.pdp8_api_write_mem(cpu, ctypes.c_uint16(0), ctypes.c_uint16(instruction & 0x0FFF)) != 0:
-        raise RuntimeError("Failed to write IOT instruction to memory.")
-    lib.pdp8_api_set_pc(cpu, ctypes.c_uint16(0))
-    if lib.pdp8_api_step(cpu) == 0:
-        raise RuntimeError("Failed to execute IOT instruction.")
-    return lib.pdp8_api_get_ac(cpu) & 0x0FFF
-
-
-def test_read_write_roundtrip(lib: ctypes.CDLL) -> None:
-    cpu = lib.pdp8_api_create(4096)
-    try:
-        wd = lib.pdp8_watchdog_create()
-        assert wd != 0
-        assert lib.pdp8_watchdog_attach(cpu, wd) == 0
-
-        # write control (cmd=HALT_ONE_SHOT, count=5)
-        ac_val = ((WD_CMD_HALT_ONE_SHOT & 0x7) << 9) | (5 & 0x1FF)
-        res = execute_iot(lib, cpu, instr(PDP8_WATCHDOG_BIT_WRITE), ac=ac_val)
-        # read back
-        read = execute_iot(lib, cpu, instr(PDP8_WATCHDOG_BIT_READ))
-        assert read == ac_val, f"Read back {read:o} != wrote {ac_val:o}"
-        print("watchdog read/write roundtrip OK")
-    finally:
-        if 'wd' in locals() and wd:
-            lib.pdp8_watchdog_destroy(wd)
-        lib.pdp8_api_destroy(cpu)
-
-
-def wait_for_halt(lib: ctypes.CDLL, cpu: int, timeout: float = 120.0) -> bool:
-    deadline = time.time() + timeout
-    while time.time() < deadline:
-        # step the CPU to allow ticks to run
-        lib.pdp8_api_step(cpu)
-        if lib.pdp8_api_is_halted(cpu):
-            return True
-        time.sleep(0.02)
-    return False
-
-
-def wait_for_pc(lib: ctypes.CDLL, cpu: int, target_pc: int, timeout: float = 2.0) -> bool:
-    deadline = time.time() + timeout
-    while time.time() < deadline:
-        lib.pdp8_api_step(cpu)
-        pc = lib.pdp8_api_get_pc(cpu)
-        if pc == target_pc:
-            return True
-        time.sleep(0.02)
-    return False
-
-
-def test_one_shot_halt(lib: ctypes.CDLL) -> None:
-    cpu = lib.pdp8_api_create(4096)
-    try:
-        wd = lib.pdp8_watchdog_create()
-        assert wd != 0
-        assert lib.pdp8_watchdog_attach(cpu, wd) == 0
-
-        # ensure CPU running and not halted
-        lib.pdp8_api_set_pc(cpu, ctypes.c_uint16(10))
-
-        # write control: HALT one-shot, count = 2 deciseconds
-        ac_val = ((WD_CMD_HALT_ONE_SHOT & 0x7) << 9) | (2 & 0x1FF)
-        execute_iot(lib, cpu, instr(PDP8_WATCHDOG_BIT_WRITE), ac=ac_val)
-
-        halted = wait_for_halt(lib, cpu, timeout=120.0)
-        assert halted, "watchdog did not HALT within timeout"
-        print("watchdog one-shot HALT OK")
-    finally:
-        if 'wd' in locals() and wd:
-            lib.pdp8_watchdog_destroy(wd)
-        lib.pdp8_api_destroy(cpu)
-
-
-def test_one_shot_reset(lib: ctypes.CDLL) -> None:
-    cpu = lib.pdp8_api_create(4096)
+    machine = make_machine(lib, IDLE_PROGRAM)
+    wd = lib.pdp8_watchdog_create()
     try:
-        wd = lib.pdp8_watchdog_create()
-        assert wd != 0
-        assert lib.pdp8_watchdog_attach(cpu, wd) == 0
-
-        # set PC to non-zero so reset effect is visible
-        lib.pdp8_api_set_pc(cpu, ctypes.c_uint16(123))
-
-        # write control: RESET one-shot, count = 2 deciseconds
-        ac_val = ((WD_CMD_RESET_ONE_SHOT & 0x7) << 9) | (2 & 0x1FF)
-        execute_iot(lib, cpu, instr(PDP8_WATCHDOG_BIT_WRITE), ac=ac_val)
-
-        reset = wait_for_pc(lib, cpu, 0, timeout=3.0)
-        assert reset, "watchdog did not RESET (PC->0) within timeout"
-        print("watchdog one-shot RESET OK")
+        assert wd
+        assert lib.pdp8_api_set_clock(machine.cpu, driver.CLOCK_SOURCES["instruction"], NS_PER_INSTRUCTION) == 0
+        assert lib.pdp8_watchdog_attach(machine.cpu, wd) == 0
+        yield machine, wd
     finally:
-        if 'wd' in locals() and wd:
+        if wd:
             lib.pdp8_watchdog_destroy(wd)
-        lib.pdp8_api_destroy(cpu)
+        machine.close()
 
 
-def test_interrupt_one_shot(lib: ctypes.CDLL) -> None:
-    cpu = lib.pdp8_api_create(4096)
-    try:
-        wd = lib.pdp8_watchdog_create()
-        assert wd != 0
-        assert lib.pdp8_watchdog_attach(cpu, wd) == 0
-
-        # Set up: PC at 10, interrupts disabled
-        lib.pdp8_api_set_pc(cpu, ctypes.c_uint16(10))
-
-        # write control: INTERRUPT one-shot, count = 1 decisecond
-        ac_val = ((WD_CMD_INTERRUPT_ONE_SHOT & 0x7) << 9) | (1 & 0x1FF)
-        execute_iot(lib, cpu, instr(PDP8_WATCHDOG_BIT_WRITE), ac=ac_val)
-
-        # Initially no interrupts pending
-        assert lib.pdp8_api_peek_interrupt_pending(cpu) == 0
-
-        # Step CPU to allow watchdog tick to fire
-        # This should generate an interrupt request
-        deadline = time.time() + 2.0
-        interrupt_fired = False
-        while time.time() < deadline:
-            lib.pdp8_api_step(cpu)
-            if lib.pdp8_api_peek_interrupt_pending(cpu) > 0:
-                interrupt_fired = True
-                break
-            time.sleep(0.02)
-
-        assert interrupt_fired, "watchdog did not generate interrupt within timeout"
-        print("watchdog one-shot INTERRUPT OK")
-    finally:
-        if 'wd' in locals() and wd:
-            lib.pdp8_watchdog_destroy(wd)
-        lib.pdp8_api_destroy(cpu)
-
-
-def test_interrupt_periodic(lib: ctypes.CDLL) -> None:
-    cpu = lib.pdp8_api_create(4096)
-    try:
-        wd = lib.pdp8_watchdog_create()
-        assert wd != 0
-        assert lib.pdp8_watchdog_attach(cpu, wd) == 0
-
-        # Set up: PC at 10, interrupts disabled
-        lib.pdp8_api_set_pc(cpu, ctypes.c_uint16(10))
-
-        # write control: INTERRUPT periodic, count = 1 decisecond
-        ac_val = ((WD_CMD_INTERRUPT_PERIODIC & 0x7) << 9) | (1 & 0x1FF)
-        execute_iot(lib, cpu, instr(PDP8_WATCHDOG_BIT_WRITE), ac=ac_val)
-
-        # Initially no interrupts pending
-        assert lib.pdp8_api_peek_interrupt_pending(cpu) == 0
-
-        # Step CPU to allow watchdog tick to fire multiple times
-        interrupt_count = 0
-        deadline = time.time() + 3.0  # Watch for ~3 seconds
-        while time.time() < deadline and interrupt_count < 3:
-            lib.pdp8_api_step(cpu)
-            pending = lib.pdp8_api_peek_interrupt_pending(cpu)
-            if pending > 0:
-                interrupt_count += 1
-                # Clear the interrupt so we can count the next one
-                while lib.pdp8_api_clear_interrupt_pending(cpu) == 0:
-                    pass
-            time.sleep(0.02)
-
-        assert interrupt_count >= 2, f"watchdog periodic interrupt fired {interrupt_count} times, expected at least 2"
-        print("watchdog periodic INTERRUPT OK")
-    finally:
-        if 'wd' in locals() and wd:
-            lib.pdp8_watchdog_destroy(wd)
-        lib.pdp8_api_destroy(cpu)
-
-
-def test_tick_periodic_flag(lib: ctypes.CDLL) -> None:
-    cpu = lib.pdp8_api_create(4096)
-    try:
-        wd = lib.pdp8_watchdog_create()
-        assert wd != 0
-        assert lib.pdp8_watchdog_attach(cpu, wd) == 0
-
-        # Configure periodic tick mode with a short interval (1 decisecond)
-        ac_val = ((WD_CMD_TICK_PERIODIC & 0x7) << 9) | (1 & 0x1FF)
-        execute_iot(lib, cpu, instr(PDP8_WATCHDOG_BIT_WRITE), ac=ac_val)
-
-        status = WatchdogStatus()
-        deadline = time.time() + 2.5
-        tick_seen = False
-        while time.time() < deadline:
-            lib.pdp8_api_step(cpu)
-            if lib.pdp8_watchdog_get_status(wd, ctypes.byref(status)) == 0 and status.expired:
-                tick_seen = True
-                break
-            time.sleep(0.02)
-
-        assert tick_seen, "watchdog tick flag never latched"
-        assert lib.pdp8_api_is_halted(cpu) == 0, "tick mode should not HALT the CPU"
-
-        # Restart to clear the latched flag
-        execute_iot(lib, cpu, instr(PDP8_WATCHDOG_BIT_RESTART))
-        assert lib.pdp8_watchdog_get_status(wd, ctypes.byref(status)) == 0
-        assert status.expired == 0, "RESTART should clear the tick flag"
-        print("watchdog periodic TICK OK")
-    finally:
-        if 'wd' in locals() and wd:
-            lib.pdp8_watchdog_destroy(wd)
-        lib.pdp8_api_destroy(cpu)
-
-
-if __name__ == '__main__':
-    lib = load_library()
-    configure_signatures(lib)
-
-    test_read_write_roundtrip(lib)
-    test_one_shot_halt(lib)
-    test_one_shot_reset(lib)
-    test_interrupt_one_shot(lib)
-    test_interrupt_periodic(lib)
-    test_tick_periodic_flag(lib)
-
-    print('watchdog tests completed')
+def execute_iot(lib: ctypes.CDLL, cpu: int, function: int, ac: int = 0) -> int:
+    """Run one watchdog IOT from location 0 with `ac` in the AC and return the
+    resulting AC. The PC is put back afterwards."""
+    pc = lib.pdp8_api_get_pc(cpu)
+    lib.pdp8_api_set_ac(cpu, ctypes.c_uint16(ac & 0o7777))
+    driver.write_word(lib, cpu, 0, driver.PDP8_WATCHDOG_IOT_BASE | function)
+    lib.pdp8_api_set_pc(cpu, ctypes.c_uint16(0))
+    assert lib.pdp8_api_step(cpu) == 1
+    lib.pdp8_api_set_pc(cpu, ctypes.c_uint16(pc))
+    return lib.pdp8_api_get_ac(cpu) & 0o7777
+
+
+def control(cmd: int, count: int) -> int:
+    return ((cmd & 0o7) << 9) | (count & 0o777)
+
+
+def test_read_write_roundtrip(lib: ctypes.CDLL, watchdog: Tuple[Machine, int]) -> None:
+    machine, _ = watchdog
+    word = control(driver.WD_CMD_HALT_ONE_SHOT, 5)
+    execute_iot(lib, machine.cpu, PDP8_WATCHDOG_FUNC_WRITE, word)
+    assert execute_iot(lib, machine.cpu, PDP8_WATCHDOG_FUNC_READ) == word
+
+
+def test_one_shot_halt(lib: ctypes.CDLL, watchdog: Tuple[Machine, int]) -> None:
+    machine, _ = watchdog
+    execute_iot(lib, machine.cpu, PDP8_WATCHDOG_FUNC_WRITE, control(driver.WD_CMD_HALT_ONE_SHOT, 2))
+    assert lib.pdp8_api_run(machine.cpu, 1_000_000) == 199
+    assert lib.pdp8_api_is_halted(machine.cpu)
+    assert lib.pdp8_api_get_pc(machine.cpu) == 0o200
+
+
+def test_one_shot_reset(lib: ctypes.CDLL, watchdog: Tuple[Machine, int]) -> None:
+    machine, _ = watchdog
+    execute_iot(lib, machine.cpu, PDP8_WATCHDOG_FUNC_WRITE, control(driver.WD_CMD_RESET_ONE_SHOT, 2))
+    assert lib.pdp8_api_run_until(machine.cpu, 1_000_000, 0) == 199
+    assert lib.pdp8_api_get_pc(machine.cpu) == 0
+    assert not lib.pdp8_api_is_halted(machine.cpu)
+
+
+def test_interrupt_one_shot(lib: ctypes.CDLL, watchdog: Tuple[Machine, int]) -> None:
+    machine, _ = watchdog
+    execute_iot(lib, machine.cpu, PDP8_WATCHDOG_FUNC_WRITE, control(driver.WD_CMD_INTERRUPT_ONE_SHOT, 1))
+    assert lib.pdp8_api_run(machine.cpu, 98) == 98
+    assert lib.pdp8_api_peek_interrupt_pending(machine.cpu) == 0
+    assert lib.pdp8_api_run(machine.cpu, 1) == 1
+    assert lib.pdp8_api_peek_interrupt_pending(machine.cpu) == 1
+    # one-shot: nothing more however long it runs
+    lib.pdp8_api_run(machine.cpu, 1000)
+    assert lib.pdp8_api_peek_interrupt_pending(machine.cpu) == 1
+
+
+def test_interrupt_periodic(lib: ctypes.CDLL, watchdog: Tuple[Machine, int]) -> None:
+    machine, _ = watchdog
+    execute_iot(lib, machine.cpu, PDP8_WATCHDOG_FUNC_WRITE, control(driver.WD_CMD_INTERRUPT_PERIODIC, 1))
+    fired: List[int] = []
+    for executed in range(1, 351):
+        assert lib.pdp8_api_step(machine.cpu) == 1
+        if lib.pdp8_api_peek_interrupt_pending(machine.cpu) > 0:
+            fired.append(executed)
+            while lib.pdp8_api_clear_interrupt_pending(machine.cpu) == 0:
+                pass
+    assert fired == [99, 199, 299]
+
+
+def test_tick_periodic_flag(lib: ctypes.CDLL, watchdog: Tuple[Machine, int]) -> None:
+    machine, wd = watchdog
+    execute_iot(lib, machine.cpu, PDP8_WATCHDOG_FUNC_WRITE, control(driver.WD_CMD_TICK_PERIODIC, 1))
+    status = WatchdogStatus()
+    lib.pdp8_api_run(machine.cpu, 98)
+    assert lib.pdp8_watchdog_get_status(wd, ctypes.byref(status)) == 0
+    assert not status.expired
+    lib.pdp8_api_run(machine.cpu, 1)
+    assert lib.pdp8_watchdog_get_status(wd, ctypes.byref(status)) == 0
+    assert status.expired and status.enabled
+    assert not lib.pdp8_api_is_halted(machine.cpu), "tick mode should not HALT the CPU"
+
+    execute_iot(lib, machine.cpu, PDP8_WATCHDOG_FUNC_RESTART)
+    assert lib.pdp8_watchdog_get_status(wd, ctypes.byref(status)) == 0
+    assert not status.expired, "RESTART should clear the tick flag"
@@ -0,0 +1,54 @@
+"""
+Helpers shared by the factory tests: build a CPU (optionally with a KL8E
+console) running a short program at PROGRAM_START.
+"""
+
+from __future__ import annotations
+
+import ctypes
+from dataclasses import dataclass
+from typing import Sequence
+
+from factory import driver
+
+PROGRAM_START = 0o200
+
+
+@dataclass
+class Machine:
+    """A CPU and, when requested, its KL8E console (0 otherwise)."""
+
+    lib: ctypes.CDLL
+    cpu: int
+    console: int = 0
+
+    def close(self) -> None:
+        if self.console:
+            self.lib.pdp8_kl8e_console_destroy(self.console)
+        self.lib.pdp8_api_destroy(self.cpu)
+
+
+def make_machine(
+    lib: ctypes.CDLL,
+    program: Sequence[int],
+    console: bool = False,
+    start: int = PROGRAM_START,
+) -> Machine:
+    """Load `program` at `start` and point the PC at it. With `console`, a
+    KL8E is attached whose output is only kept in its log."""
+    cpu = lib.pdp8_api_create(driver.DEFAULT_MEMORY_WORDS)
+    assert cpu
+    machine = Machine(lib, cpu)
+    try:
+        if console:
+            machine.console = lib.pdp8_kl8e_console_create(None, None)
+            assert machine.console
+            assert lib.pdp8_kl8e_console_attach(cpu, machine.console) == 0
+            lib.pdp8_kl8e_console_set_output_stream(machine.console, None)
+        for offset, word in enumerate(program):
+            driver.write_word(lib, cpu, start + offset, word)
+        lib.pdp8_api_set_pc(cpu, ctypes.c_uint16(start))
+    except BaseException:
+        machine.close()
+        raise
+    return machine
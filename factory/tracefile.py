@@ -0,0 +1,253 @@
+"""
+Chunked on-disk instruction traces (`.p8t`).
+
+A trace file is a fixed header followed by chunks of up to `chunk_steps`
+instructions and, when the run ended cleanly, an end record:
+
+    header  "<8sHHI"      magic b"P8TRACE\\0", version, flags, chunk_steps
+    chunk   "<4sQIBBHI"   b"P8TC", first_step, count, codec, 0, 0, payload bytes
+            payload       column data, zlib-compressed when codec is CODEC_ZLIB
+    end     "<4sQHHBB6x"  b"P8TE", total_steps, pc, ac, link, halted
+
+Each chunk payload holds the columns of TRACE_COLUMNS back to back, `count`
+little-endian values each, recording the CPU state before every step plus the
+effective address of memory-reference instructions (TRACE_NO_ADDRESS
+otherwise). A file cut short by a crash stays readable up to its last complete
+chunk.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import mmap
+import struct
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional, Tuple, Union
+
+
+FILE_MAGIC = b"P8TRACE\0"
+CHUNK_MAGIC = b"P8TC"
+END_MAGIC = b"P8TE"
+FORMAT_VERSION = 1
+
+HEADER = struct.Struct("<8sHHI")
+CHUNK_HEADER = struct.Struct("<4sQIBBHI")
+END_RECORD = struct.Struct("<4sQHHBB6x")
+
+CODEC_STORED = 0
+CODEC_ZLIB = 1
+
+DEFAULT_CHUNK_STEPS = 1 << 20
+TRACE_NO_ADDRESS = 0xFFFF  # PDP8_TRACE_NO_ADDRESS in pdp8.h
+
+# (name, ctypes element type, NumPy dtype), in payload order
+TRACE_COLUMNS: Tuple[Tuple[str, type, str], ...] = (
+    ("pc", ctypes.c_uint16, "<u2"),
+    ("instr", ctypes.c_uint16, "<u2"),
+    ("ac", ctypes.c_uint16, "<u2"),
+    ("address", ctypes.c_uint16, "<u2"),
+    ("link", ctypes.c_uint8, "u1"),
+)
+
+
+class TraceFormatError(ValueError):
+    """Raised when a file is not a readable .p8t trace."""
+
+
+def column_layout(count: int) -> List[Tuple[str, int, str]]:
+    """(name, byte offset, dtype) of each column in a payload of `count` steps."""
+    layout = []
+    offset = 0
+    for name, ctype, dtype in TRACE_COLUMNS:
+        layout.append((name, offset, dtype))
+        offset += ctypes.sizeof(ctype) * count
+    return layout
+
+
+def payload_size(count: int) -> int:
+    return sum(ctypes.sizeof(ctype) for _, ctype, _ in TRACE_COLUMNS) * count
+
+
+class TraceWriter:
+    """Run the CPU through pdp8_api_trace_addresses, streaming chunks to disk.
+
+    Steps are recorded straight into per-column ctypes buffers; a chunk is
+    compressed and written only when `chunk_steps` steps have accumulated.
+    A compression `level` of 0 stores chunks uncompressed.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        lib: ctypes.CDLL,
+        chunk_steps: int = DEFAULT_CHUNK_STEPS,
+        level: int = 1,
+    ) -> None:
+        # A private handle taking raw addresses, so each call only costs a
+        # few integer additions rather than building pointer objects.
+        self._trace = lib["pdp8_api_trace_addresses"]
+        self._trace.argtypes = [ctypes.c_void_p, ctypes.c_size_t] + [ctypes.c_void_p] * 5
+        self._trace.restype = ctypes.c_size_t
+        self.chunk_steps = max(1, chunk_steps)
+        self.level = max(0, min(level, 9))
+        self.total_steps = 0
+        self.chunks = 0
+        self.bytes_written = 0
+        self._count = 0
+        self._columns = [(ctype * self.chunk_steps)() for _, ctype, _ in TRACE_COLUMNS]
+        self._bases = [ctypes.addressof(column) for column in self._columns]
+        self._sizes = [ctypes.sizeof(ctype) for _, ctype, _ in TRACE_COLUMNS]
+        self._file: Optional[BinaryIO] = open(path, "wb")
+        self._write(HEADER.pack(FILE_MAGIC, FORMAT_VERSION, 0, self.chunk_steps))
+
+    def run(self, cpu: int, max_steps: int) -> int:
+        """Execute up to `max_steps` instructions, tracing each one."""
+        executed = 0
+        while executed < max_steps:
+            room = min(max_steps - executed, self.chunk_steps - self._count)
+            count = self._count
+            pc, instr, ac, address, link = self._bases
+            n = self._trace(cpu, room, pc + 2 * count, instr + 2 * count, ac + 2 * count, link + count, address + 2 * count)
+            self._count += n
+            executed += n
+            if self._count == self.chunk_steps:
+                self.flush()
+            if n < room:
+                break
+        return executed
+
+    def flush(self) -> None:
+        """Write the buffered steps as one chunk."""
+        if not self._count:
+            return
+        count = self._count
+        payload = b"".join(
+            ctypes.string_at(base, size * count) for base, size in zip(self._bases, self._sizes)
+        )
+        codec = CODEC_STORED
+        if self.level > 0:
+            payload = zlib.compress(payload, self.level)
+            codec = CODEC_ZLIB
+        self._write(CHUNK_HEADER.pack(CHUNK_MAGIC, self.total_steps, count, codec, 0, 0, len(payload)))
+        self._write(payload)
+        self.total_steps += count
+        self.chunks += 1
+        self._count = 0
+
+    def close(self, pc: int, ac: int, link: int, halted: bool) -> None:
+        """Flush pending steps and append the end record with the final registers."""
+        if self._file is None:
+            return
+        self.flush()
+        self._write(END_RECORD.pack(END_MAGIC, self.total_steps, pc & 0o7777, ac & 0o7777, link & 1, int(halted)))
+        self._file.close()
+        self._file = None
+
+    def _write(self, data: bytes) -> None:
+        assert self._file is not None
+        self._file.write(data)
+        self.bytes_written += len(data)
+
+
+@dataclass
+class TraceChunk:
+    first_step: int
+    count: int
+    codec: int
+    offset: int  # payload offset within the file
+    length: int
+
+
+@dataclass
+class TraceEnd:
+    total_steps: int
+    pc: int
+    ac: int
+    link: int
+    halted: bool
+
+
+class TraceFile:
+    """Memory-mapped view of a .p8t file.
+
+    Opening only walks the chunk headers; payloads are read on demand, and
+    uncompressed chunks are returned as zero-copy views of the mapping.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self._fh = open(self.path, "rb")
+        try:
+            self._map = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as exc:  # empty file
+            self._fh.close()
+            raise TraceFormatError(f"{self.path}: empty trace") from exc
+        self.chunks: List[TraceChunk] = []
+        self.end: Optional[TraceEnd] = None
+        self.truncated = False
+        self._scan()
+
+    def _scan(self) -> None:
+        data = self._map
+        if len(data) < HEADER.size:
+            raise TraceFormatError(f"{self.path}: truncated header")
+        magic, version, _flags, chunk_steps = HEADER.unpack_from(data, 0)
+        if magic != FILE_MAGIC:
+            raise TraceFormatError(f"{self.path}: not a .p8t trace")
+        if version != FORMAT_VERSION:
+            raise TraceFormatError(f"{self.path}: unsupported trace version {version}")
+        self.chunk_steps = chunk_steps
+
+        offset = HEADER.size
+        size = len(data)
+        while offset + 4 <= size:
+            tag = data[offset:offset + 4]
+            if tag == CHUNK_MAGIC and offset + CHUNK_HEADER.size <= size:
+                _, first, count, codec, _, _, length = CHUNK_HEADER.unpack_from(data, offset)
+                start = offset + CHUNK_HEADER.size
+                if start + length > size:
+                    break
+                self.chunks.append(TraceChunk(first, count, codec, start, length))
+                offset = start + length
+            elif tag == END_MAGIC and offset + END_RECORD.size <= size:
+                _, total, pc, ac, link, halted = END_RECORD.unpack_from(data, offset)
+                self.end = TraceEnd(total, pc, ac, link, bool(halted))
+                return
+            else:
+                break
+        self.truncated = True
+
+    @property
+    def total_steps(self) -> int:
+        if not self.chunks:
+            return 0
+        last = self.chunks[-1]
+        return last.first_step + last.count
+
+    def payload(self, chunk: TraceChunk) -> Union[bytes, memoryview]:
+        """Raw column bytes of one chunk (see column_layout)."""
+        raw = memoryview(self._map)[chunk.offset:chunk.offset + chunk.length]
+        if chunk.codec == CODEC_STORED:
+            return raw
+        if chunk.codec == CODEC_ZLIB:
+            return zlib.decompress(raw)
+        raise TraceFormatError(f"{self.path}: unknown codec {chunk.codec}")
+
+    def __iter__(self) -> Iterator[Tuple[TraceChunk, Union[bytes, memoryview]]]:
+        for chunk in self.chunks:
+            yield chunk, self.payload(chunk)
+
+    def close(self) -> None:
+        try:
+            self._map.close()
+        except BufferError:
+            pass  # zero-copy views still alive; the mapping goes with them
+        self._fh.close()
+
+    def __enter__(self) -> "TraceFile":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -1,5 +1,22 @@
 "use strict";
 
+// Each browser tab drives its own emulator session on the webdp8 server.
+function tabSessionId() {
+  const key = "pdp8-session";
+  let id = window.sessionStorage.getItem(key);
+  if (!id) {
+    id = `tab-${Date.now().toString(36)}-${Math.random().toString(36).slice(2, 10)}`;
+    window.sessionStorage.setItem(key, id);
+  }
+  return id;
+}
+
+function sessionFetch(url, options = {}) {
+  const headers = new Headers(options.headers || {});
+  headers.set("X-PDP8-Session", tabSessionId());
+  return fetch(url, { ...options, headers });
+}
+
 class FactoryUI {
   constructor() {
     this.romForm = document.getElementById("rom-form");
@@ -66,7 +83,7 @@ class FactoryUI {
 
   async clearHaltAndTrace(cycles) {
     try {
-      await fetch("/continue", { method: "POST" });
+      await sessionFetch("/continue", { method: "POST" });
     } catch (error) {
       console.warn("Continue failed", error);
     }
@@ -97,7 +114,7 @@ class FactoryUI {
 
     this.setStatus(this.romStatus, "Uploading S-record payload…");
     try {
-      const response = await fetch("/loader", {
+      const response = await sessionFetch("/loader", {
         method: "POST",
         headers: { "Content-Type": "text/plain" },
         body: raw,
@@ -110,7 +127,7 @@ class FactoryUI {
       const payload = await response.json();
       this.setStatus(
         this.romStatus,
-        `Loaded ${payload.written.length} words` +
+        `Loaded ${payload.words} words` +
           (payload.start ? `; start vector ${payload.start}` : "") +
           ".",
       );
@@ -131,7 +148,7 @@ class FactoryUI {
   async queueCommand(endpoint, body = undefined) {
     this.setStatus(this.executionStatus, "Sending command…");
     try {
-      const response = await fetch(endpoint, {
+      const response = await sessionFetch(endpoint, {
         method: body ? "POST" : "GET",
         headers: body ? { "Content-Type": "application/json" } : undefined,
         body: body ? JSON.stringify(body) : undefined,
@@ -157,7 +174,7 @@ class FactoryUI {
 
   async refreshRegisters() {
     try {
-      const response = await fetch("/regs");
+      const response = await sessionFetch("/regs");
       if (!response.ok) {
         throw new Error(response.statusText);
       }
@@ -197,7 +214,7 @@ class FactoryUI {
 
   async loadTeleprinter() {
     try {
-      const response = await fetch("/output/teleprinter");
+      const response = await sessionFetch("/output/teleprinter");
       if (!response.ok) {
         return;
       }
@@ -212,7 +229,7 @@ class FactoryUI {
 
   async loadPrinter() {
     try {
-      const response = await fetch("/output/printer");
+      const response = await sessionFetch("/output/printer");
       if (!response.ok) {
         return;
       }
@@ -239,7 +256,7 @@ class FactoryUI {
       return;
     }
     try {
-      const response = await fetch("/input/keyboard", {
+      const response = await sessionFetch("/input/keyboard", {
         method: "POST",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify({ chars: value }),
@@ -283,7 +300,7 @@ class FactoryUI {
       return;
     }
     try {
-      const response = await fetch("/regs");
+      const response = await sessionFetch("/regs");
       if (!response.ok) {
         return;
       }
@@ -4,6 +4,10 @@ Interactive curses front panel for the PDP-8 emulator.
 
 This script reuses the factory driver helpers to initialise the emulator and
 peripherals, then paints register state and console output in a curses UI.
+Emulation runs on its own thread and publishes a snapshot at the refresh rate;
+the UI thread repaints only the fields that changed since the last frame.
+Breakpoints (--break, or [b] at the current PC) and watchpoints (--watch) live
+in the core, so a debugging run goes as fast as a plain one and pauses itself.
 """
 
 from __future__ import annotations
@@ -11,12 +15,14 @@ from __future__ import annotations
 import argparse
 import curses
 import ctypes
+import queue
 import sys
+import threading
 import time
 from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Deque, Optional
+from typing import Deque, Dict, FrozenSet, List, Optional, Tuple
 
 # Ensure the repository root is on sys.path so we can import factory.driver.
 REPO_ROOT = Path(__file__).resolve().parents[1]
@@ -24,6 +30,7 @@ if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
 from factory import driver as factory_driver
+from factory.disasm import disassemble
 
 
 OUTPUT_MAX_LINES = 20
@@ -95,9 +102,46 @@ def parse_args() -> argparse.Namespace:
         default=factory_driver.RUN_BLOCK_CYCLES,
         help="Number of cycles per emulator run block.",
     )
+    parser.add_argument(
+        "--break",
+        dest="breakpoints",
+        action="append",
+        default=[],
+        metavar="ADDR",
+        help="Pause before executing the octal address (repeatable).",
+    )
+    parser.add_argument(
+        "--watch",
+        action="append",
+        default=[],
+        metavar="ADDR[:ACCESS]",
+        help="Pause after the octal address is accessed; ACCESS is read, write (default) or rw (repeatable).",
+    )
     return parser.parse_args()
 
 
+def _octal_address(text: str) -> int:
+    try:
+        address = int(text, 8)
+    except ValueError:
+        address = -1
+    if not 0 <= address < factory_driver.DEFAULT_MEMORY_WORDS:
+        raise factory_driver.EmulatorError(f"Invalid octal address '{text}'.")
+    return address
+
+
+def install_breakpoints(state: PanelState, breakpoints: List[str], watches: List[str]) -> None:
+    lib = state.lib
+    for text in breakpoints:
+        lib.pdp8_api_set_breakpoint(state.cpu, ctypes.c_uint16(_octal_address(text)), 1)
+    for text in watches:
+        address_text, _, access = text.partition(":")
+        mask = factory_driver.WATCH_ACCESSES.get(access or "write")
+        if mask is None:
+            raise factory_driver.EmulatorError(f"Unknown watch access '{access}' (read, write or rw).")
+        lib.pdp8_api_set_watchpoint(state.cpu, ctypes.c_uint16(_octal_address(address_text)), mask)
+
+
 def initialise_emulator(image: Path) -> PanelState:
     lib = factory_driver.load_library()
     factory_driver.configure_api(lib)
@@ -107,11 +151,6 @@ def initialise_emulator(image: Path) -> PanelState:
         lib.pdp8_watchdog_get_status.argtypes = [ctypes.c_void_p, ctypes.POINTER(WatchdogStatus)]
         lib.pdp8_watchdog_get_status.restype = ctypes.c_int
 
-    # Configure interrupt status API if available
-    if hasattr(lib, "pdp8_api_is_interrupt_enabled"):
-        lib.pdp8_api_is_interrupt_enabled.argtypes = [ctypes.c_void_p]
-        lib.pdp8_api_is_interrupt_enabled.restype = ctypes.c_int
-
     config, _ = factory_driver.load_device_config(Path("pdp8.config"))
     rom_words, start_word = factory_driver.load_srec(image)
 
@@ -286,104 +325,274 @@ def queue_console_input(state: PanelState, char_code: int) -> None:
         raise factory_driver.EmulatorError("Failed to queue console input.")
 
 
-def draw_panel(stdscr: curses.window, state: PanelState, output_buffer: Deque[str]) -> None:
-    stdscr.erase()
-    height, width = stdscr.getmaxyx()
-
-    status = "PAUSED" if state.paused else "RUNNING"
-    halted = bool(state.lib.pdp8_api_is_halted(state.cpu))
-    pc = state.lib.pdp8_api_get_pc(state.cpu) & 0x0FFF
-    ac = state.lib.pdp8_api_get_ac(state.cpu) & 0x0FFF
-    link = state.lib.pdp8_api_get_link(state.cpu) & 0x1
-    
-    # Get interrupt status
-    int_enabled = False
-    if hasattr(state.lib, "pdp8_api_is_interrupt_enabled"):
-        int_enabled = bool(state.lib.pdp8_api_is_interrupt_enabled(state.cpu))
-    int_status = "[ION]" if int_enabled else "[IOFF]"
-
-    # Get watchdog status if available
-    wd_enabled = False
-    wd_mode = "N/A"
-    wd_config = "N/A"
-    wd_remaining = "N/A"
-    wd_expired = "N/A"
-    
-    if state.watchdog and hasattr(state.lib, "pdp8_watchdog_get_status"):
-        wd_status = WatchdogStatus()
-        if state.lib.pdp8_watchdog_get_status(state.watchdog, ctypes.byref(wd_status)) == 0:
-            wd_enabled = bool(wd_status.enabled)
-            wd_mode = WD_CMD_NAMES.get(wd_status.cmd, f"CMD{wd_status.cmd}")
-            wd_config = f"{wd_status.configured_count}ds"
-            wd_remaining = f"{wd_status.remaining_ds}ds" if wd_status.remaining_ds >= 0 else "N/A"
-            wd_expired = "YES" if wd_status.expired else "NO"
+@dataclass(frozen=True)
+class PanelSnapshot:
+    """Everything draw_panel shows, captured by the emulation thread."""
+
+    paused: bool
+    halted: bool
+    cycles: int
+    pc: int
+    ac: int
+    link: int
+    int_enabled: bool
+    watchdog: Optional[Tuple[str, str, str, str]]  # mode, timeout, remaining, expired
+    listing_base: int
+    listing: Tuple[int, ...]
+    output: Tuple[str, ...]
+    stop: str = ""  # why the run last paused itself, e.g. "breakpoint 0215"
+    breakpoints: FrozenSet[int] = frozenset()
+
+
+class EmulationThread(threading.Thread):
+    """Runs the CPU and owns every call into it.
+
+    The UI thread never touches the emulator: it posts key presses to
+    `commands` and draws whatever `snapshot` the emulation thread last
+    published, so a slow terminal no longer costs execution time.
+    """
+
+    def __init__(self, state: PanelState, refresh_period: float, block_cycles: int) -> None:
+        super().__init__(name="pdp8-panel", daemon=True)
+        self.state = state
+        self.refresh_period = max(0.001, refresh_period)
+        self.block_cycles = max(1, block_cycles)
+        self.commands: "queue.Queue[int]" = queue.Queue()
+        self.listing_rows = 0  # set by the UI thread; 0 when the listing is hidden
+        self.error: Optional[BaseException] = None
+        self.output: Deque[str] = deque([""], maxlen=OUTPUT_MAX_LINES)
+        self._memory = (ctypes.c_uint16 * factory_driver.DEFAULT_MEMORY_WORDS)()
+        self._listing_key: Tuple[int, int, int] = (-1, -1, -1)
+        self.stop = ""
+        self.breakpoints = frozenset(factory_driver.list_breakpoints(state.lib, state.cpu))
+        self.snapshot = self._capture()
+
+    def run(self) -> None:
+        state = self.state
+        lib = state.lib
+        published = time.monotonic()
+        try:
+            while not state.exiting:
+                changed = self._handle_commands()
+                if state.paused or lib.pdp8_api_is_halted(state.cpu):
+                    state.paused = True
+                    try:
+                        self._apply(self.commands.get(timeout=self.refresh_period))
+                        changed = True
+                    except queue.Empty:
+                        pass
+                else:
+                    executed = lib.pdp8_api_run(state.cpu, ctypes.c_size_t(self.block_cycles))
+                    if executed < 0:
+                        raise factory_driver.EmulatorError("Emulator reported an error during execution.")
+                    state.total_cycles += executed
+                    changed = self._note_stop() or changed
+                    if executed == 0 and not state.paused:
+                        time.sleep(self.refresh_period)
+                emitted = poll_console_output(state, self.output)
+                if emitted and factory_driver.KL8E_CHAR_PERIOD > 0.0:
+                    time.sleep(emitted * factory_driver.KL8E_CHAR_PERIOD)
+                now = time.monotonic()
+                if changed or emitted or now - published >= self.refresh_period:
+                    self.snapshot = self._capture()
+                    published = now
+        except BaseException as exc:  # handed to the UI thread
+            self.error = exc
+            state.exiting = True
+        finally:
+            self.snapshot = self._capture()
+
+    def _handle_commands(self) -> bool:
+        handled = False
+        while True:
+            try:
+                key = self.commands.get_nowait()
+            except queue.Empty:
+                return handled
+            self._apply(key)
+            handled = True
+
+    def _note_stop(self) -> bool:
+        """Pause on a breakpoint or watchpoint hit; True if the run stopped on one."""
+        reason, address = factory_driver.stop_reason(self.state.lib, self.state.cpu)
+        if reason == "breakpoint":
+            self.stop = f"breakpoint {address:04o}"
+        elif reason.startswith("watch-"):
+            self.stop = f"{reason[len('watch-'):]} {address:04o}"
+        else:
+            return False
+        self.state.paused = True
+        return True
+
+    def _apply(self, key: int) -> None:
+        state = self.state
+        if key == ord(" "):
+            state.paused = not state.paused
+            self.stop = ""
+        elif key == ord("b"):
+            pc = state.lib.pdp8_api_get_pc(state.cpu) & 0x0FFF
+            enabled = pc not in self.breakpoints
+            state.lib.pdp8_api_set_breakpoint(state.cpu, ctypes.c_uint16(pc), int(enabled))
+            self.breakpoints = self.breakpoints | {pc} if enabled else self.breakpoints - {pc}
+        elif key == ord("s"):
+            if state.paused and not state.lib.pdp8_api_is_halted(state.cpu):
+                stepped = state.lib.pdp8_api_step(state.cpu)
+                if stepped < 0:
+                    raise factory_driver.EmulatorError("Emulator reported an error during step execution.")
+                state.total_cycles += stepped
+                self.stop = ""
+        else:
+            queue_console_input(state, key)
+
+    def _capture(self) -> PanelSnapshot:
+        state = self.state
+        lib = state.lib
+        pc = lib.pdp8_api_get_pc(state.cpu) & 0x0FFF
+        int_enabled = False
+        if hasattr(lib, "pdp8_api_is_interrupt_enabled"):
+            int_enabled = bool(lib.pdp8_api_is_interrupt_enabled(state.cpu))
+        watchdog = None
+        if state.watchdog:
+            watchdog = ("N/A", "N/A", "N/A", "N/A")
+            wd_status = WatchdogStatus()
+            if (
+                hasattr(lib, "pdp8_watchdog_get_status")
+                and lib.pdp8_watchdog_get_status(state.watchdog, ctypes.byref(wd_status)) == 0
+            ):
+                watchdog = (
+                    WD_CMD_NAMES.get(wd_status.cmd, f"CMD{wd_status.cmd}"),
+                    f"{wd_status.configured_count}ds",
+                    f"{wd_status.remaining_ds}ds" if wd_status.remaining_ds >= 0 else "N/A",
+                    "YES" if wd_status.expired else "NO",
+                )
+        return PanelSnapshot(
+            paused=state.paused,
+            halted=bool(lib.pdp8_api_is_halted(state.cpu)),
+            cycles=state.total_cycles,
+            pc=pc,
+            ac=lib.pdp8_api_get_ac(state.cpu) & 0x0FFF,
+            link=lib.pdp8_api_get_link(state.cpu) & 0x1,
+            int_enabled=int_enabled,
+            watchdog=watchdog,
+            listing_base=pc,
+            listing=self._read_listing(pc),
+            output=tuple(self.output),
+            stop=self.stop,
+            breakpoints=self.breakpoints,
+        )
+
+    def _read_listing(self, pc: int) -> Tuple[int, ...]:
+        rows = min(self.listing_rows, factory_driver.DEFAULT_MEMORY_WORDS)
+        if rows <= 0:
+            return ()
+        # one bulk read, and none at all while PC and memory stand still
+        key = (pc, rows, self.state.lib.pdp8_api_memory_generation(self.state.cpu))
+        if key != self._listing_key:
+            self.state.lib.pdp8_api_read_block(self.state.cpu, ctypes.c_uint16(pc), self._memory, rows)
+            self._listing_key = key
+        return tuple(word & 0x0FFF for word in self._memory[:rows])
+
+
+class PanelRenderer:
+    """Remembers what is on screen and repaints only the fields that changed."""
+
+    def __init__(self, stdscr: curses.window) -> None:
+        self.stdscr = stdscr
+        self.size: Tuple[int, int] = (0, 0)
+        self.fields: Dict[Tuple[int, int], str] = {}
+        self.dirty = False
+
+    def begin(self) -> Tuple[int, int]:
+        size = self.stdscr.getmaxyx()
+        if size != self.size:
+            self.size = size
+            self.fields.clear()
+            self.stdscr.erase()
+            self.dirty = True
+        return size
+
+    def put(self, row: int, col: int, text: str, limit: int) -> None:
+        height, width = self.size
+        limit = min(limit, width - col)
+        if row >= height or limit <= 0:
+            return
+        text = text[:limit]
+        previous = self.fields.get((row, col))
+        if previous == text:
+            return
+        self.fields[(row, col)] = text
+        # pad over the tail of the old text rather than clearing the line,
+        # which would also wipe other fields sharing the row
+        padded = text.ljust(len(previous)) if previous else text
+        try:
+            self.stdscr.addnstr(row, col, padded, limit)
+        except curses.error:
+            pass  # writing the bottom-right cell moves the cursor off screen
+        self.dirty = True
+
+    def finish(self) -> None:
+        if self.dirty:
+            self.stdscr.refresh()
+            self.dirty = False
+
+
+def draw_panel(renderer: PanelRenderer, snapshot: PanelSnapshot, state: PanelState) -> None:
+    height, width = renderer.begin()
+
+    status = "PAUSED" if snapshot.paused else "RUNNING"
+    if snapshot.paused and snapshot.stop:
+        status += f" at {snapshot.stop}"
+    int_status = "[ION]" if snapshot.int_enabled else "[IOFF]"
 
     # Draw main title
-    title = f"PDP-8 Front Panel — {status}"
-    stdscr.addnstr(0, 0, title, width)
+    renderer.put(0, 0, f"PDP-8 Front Panel — {status}", width)
 
     # Draw watchdog panel in top right (if watchdog exists)
     wd_panel_width = 28
-    if state.watchdog and width > wd_panel_width + 2:
+    if snapshot.watchdog is not None and width > wd_panel_width + 2:
+        wd_mode, wd_config, wd_remaining, wd_expired = snapshot.watchdog
         wd_x = width - wd_panel_width - 1
         # Box border (no right edge)
-        stdscr.addnstr(0, wd_x, "+" + "-" * (wd_panel_width - 2), wd_panel_width)
-        stdscr.addnstr(1, wd_x, f"| WATCHDOG", wd_panel_width)
-        stdscr.addnstr(2, wd_x, f"| Mode: {wd_mode:<16}", wd_panel_width)
-        stdscr.addnstr(3, wd_x, f"| Timeout: {wd_config:<13}", wd_panel_width)
-        stdscr.addnstr(4, wd_x, f"| Remain: {wd_remaining:<14}", wd_panel_width)
-        stdscr.addnstr(5, wd_x, f"| Expired: {wd_expired:<13}", wd_panel_width)
-        stdscr.addnstr(6, wd_x, "+" + "-" * (wd_panel_width - 2), wd_panel_width)
-
-    stdscr.addnstr(
-        1,
-        0,
-        f"Image: {state.image_path.name} ",
-        min(width - wd_panel_width - 2 if state.watchdog else width, width),
-    )
-    stdscr.addnstr(
-        2,
-        0,
-        f"Cycles: {state.total_cycles}",
-        min(width - wd_panel_width - 2 if state.watchdog else width, width),
-    )
-    stdscr.addnstr(
+        renderer.put(0, wd_x, "+" + "-" * (wd_panel_width - 2), wd_panel_width)
+        renderer.put(1, wd_x, "| WATCHDOG", wd_panel_width)
+        renderer.put(2, wd_x, f"| Mode: {wd_mode:<16}", wd_panel_width)
+        renderer.put(3, wd_x, f"| Timeout: {wd_config:<13}", wd_panel_width)
+        renderer.put(4, wd_x, f"| Remain: {wd_remaining:<14}", wd_panel_width)
+        renderer.put(5, wd_x, f"| Expired: {wd_expired:<13}", wd_panel_width)
+        renderer.put(6, wd_x, "+" + "-" * (wd_panel_width - 2), wd_panel_width)
+
+    left_width = min(width - wd_panel_width - 2 if state.watchdog else width, width)
+    renderer.put(1, 0, f"Image: {state.image_path.name} ", left_width)
+    renderer.put(2, 0, f"Cycles: {snapshot.cycles}", left_width)
+    renderer.put(
         3,
         0,
-        f"PC: {pc:04o}  AC: {ac:04o}  LINK: {link}  HALT: {'yes' if halted else 'no'}  {int_status}",
-        min(width - wd_panel_width - 2 if state.watchdog else width, width),
+        f"PC: {snapshot.pc:04o}  AC: {snapshot.ac:04o}  LINK: {snapshot.link}  "
+        f"HALT: {'yes' if snapshot.halted else 'no'}  {int_status}",
+        left_width,
     )
-    stdscr.addnstr(
-        4,
-        0,
-        "Controls: [space]=pause/resume [s]=step [=]=listing [q]=quit",
-        width,
-    )
-    stdscr.hline(5, 0, "-", width * 5 // 8)
+    renderer.put(4, 0, "Controls: [space]=pause/resume [s]=step [b]=break at PC [=]=listing [q]=quit", width)
+    renderer.put(5, 0, "-" * (width * 5 // 8), width)
 
     # Console output or program listing starts at line 7
     output_start_line = 7
-    available_rows = height - output_start_line - 1
-    
+    available_rows = max(0, height - output_start_line - 1)
+
     if state.show_listing:
         # Show program listing starting at PC
-        listing_lines = []
-        start_addr = pc
-        for i in range(available_rows):
-            addr = (start_addr + i) & 0x0FFF
-            word = state.lib.pdp8_api_read_mem(state.cpu, ctypes.c_uint16(addr)) & 0x0FFF
-            marker = ">" if addr == pc else " "
-            listing_lines.append(f"{marker} {addr:04o}  {word:04o}")
-        
-        for idx, line in enumerate(listing_lines):
-            stdscr.addnstr(output_start_line + idx, 0, line, width)
+        lines = []
+        for i, word in enumerate(snapshot.listing[:available_rows]):
+            addr = (snapshot.listing_base + i) & 0x0FFF
+            marker = ">" if addr == snapshot.pc else " "
+            mark = "*" if addr in snapshot.breakpoints else " "
+            lines.append(f"{marker}{mark}{addr:04o}  {word:04o}  {disassemble(word, addr)}")
     else:
         # Show console output
-        output_lines = list(output_buffer)[-available_rows:] if available_rows > 0 else []
-        for idx, line in enumerate(output_lines):
-            stdscr.addnstr(output_start_line + idx, 0, line, width)
+        lines = list(snapshot.output[-available_rows:]) if available_rows > 0 else []
+    for idx in range(available_rows):
+        renderer.put(output_start_line + idx, 0, lines[idx] if idx < len(lines) else "", width)
 
-    stdscr.refresh()
+    renderer.finish()
 
 
 def panel_loop(
@@ -393,62 +602,37 @@ def panel_loop(
     block_cycles: int,
 ) -> None:
     curses.curs_set(0)
-    stdscr.nodelay(True)
-    stdscr.timeout(0)
-
-    output_buffer: Deque[str] = deque([""], maxlen=OUTPUT_MAX_LINES)
+    # getch waits out the refresh period, so keys are handled as they arrive
+    stdscr.timeout(max(1, int(refresh_period * 1000)))
 
+    renderer = PanelRenderer(stdscr)
+    emulation = EmulationThread(state, refresh_period, block_cycles)
+    emulation.start()
     try:
         while not state.exiting:
-            if not state.paused and not state.lib.pdp8_api_is_halted(state.cpu):
-                executed = state.lib.pdp8_api_run(state.cpu, ctypes.c_size_t(block_cycles))
-                if executed < 0:
-                    raise factory_driver.EmulatorError(
-                        "Emulator reported an error during execution."
-                    )
-                state.total_cycles += executed
-                if executed == 0:
-                    time.sleep(refresh_period)
-
-            emitted = poll_console_output(state, output_buffer)
-            if emitted and factory_driver.KL8E_CHAR_PERIOD > 0.0:
-                time.sleep(emitted * factory_driver.KL8E_CHAR_PERIOD)
-
-            draw_panel(stdscr, state, output_buffer)
+            if state.show_listing:
+                emulation.listing_rows = max(0, stdscr.getmaxyx()[0] - 8)
+            draw_panel(renderer, emulation.snapshot, state)
 
             key = stdscr.getch()
-            handled = False
             while key != curses.ERR:
                 if key == ord("q"):
                     state.exiting = True
-                    handled = True
-                elif key == ord(" "):
-                    state.paused = not state.paused
-                    handled = True
                 elif key == ord("="):
                     state.show_listing = not state.show_listing
-                    handled = True
-                elif key == ord("s"):
-                    handled = True
-                    if state.paused and not state.lib.pdp8_api_is_halted(state.cpu):
-                        stepped = state.lib.pdp8_api_step(state.cpu)
-                        if stepped < 0:
-                            raise factory_driver.EmulatorError(
-                                "Emulator reported an error during step execution."
-                            )
-                        state.total_cycles += stepped
-                else:
-                    queue_console_input(state, key)
+                    emulation.listing_rows = max(0, stdscr.getmaxyx()[0] - 8) if state.show_listing else 0
+                elif key != curses.KEY_RESIZE:
+                    emulation.commands.put(key)
+                stdscr.timeout(0)
                 key = stdscr.getch()
-            if not handled:
-                time.sleep(refresh_period)
-
-            if state.lib.pdp8_api_is_halted(state.cpu) and not state.paused:
-                state.paused = True
+            stdscr.timeout(max(1, int(refresh_period * 1000)))
     finally:
-        draw_panel(stdscr, state, output_buffer)
-        stdscr.nodelay(False)
+        state.exiting = True
+        emulation.join()
+        draw_panel(renderer, emulation.snapshot, state)
         stdscr.timeout(-1)
+    if emulation.error is not None:
+        raise emulation.error
 
 
 def main() -> int:
@@ -458,6 +642,7 @@ def main() -> int:
 
     state = initialise_emulator(args.image)
     try:
+        install_breakpoints(state, args.breakpoints, args.watch)
         curses.wrapper(panel_loop, state, args.refresh, args.block_cycles)
     finally:
         try:
@@ -0,0 +1,507 @@
+#include "checkpoint.h"
+
+#include "pdp8.h"
+
+#include <stdbool.h>
+#include <stdint.h>
+#include <stdlib.h>
+#include <string.h>
+
+#define PAGE_WORDS PDP8_DIRTY_PAGE_WORDS
+#define PAGE_BYTES (PAGE_WORDS * sizeof(uint16_t))
+
+/* One checkpoint. undo holds the contents at this checkpoint of every page
+ * written before the next one; the newest checkpoint's are in the shadow. */
+struct checkpoint {
+    uint64_t position;
+    uint8_t *state;
+    size_t state_size;
+    uint16_t *undo_pages;
+    uint16_t *undo_words; /* undo_count * PAGE_WORDS */
+    size_t undo_count;
+};
+
+struct pdp8_checkpoints {
+    pdp8_t *cpu;
+    uint64_t interval;
+    size_t budget;
+    struct checkpoint *items; /* ring, oldest at first */
+    size_t first;
+    size_t count;
+    size_t capacity;
+    size_t page_count;
+    uint16_t *shadow;          /* memory as of the newest checkpoint */
+    uint64_t shadow_generation;
+    uint16_t *dirty;           /* scratch page list */
+    size_t bytes;
+    uint64_t position;
+    uint64_t frontier;         /* furthest position run: output up to here was emitted */
+    uint16_t stop_address;
+    /* what the last call left behind, to notice changes made elsewhere */
+    uint64_t left_generation;
+    uint8_t *left_state;
+    size_t left_size;
+    size_t left_capacity;
+};
+
+static struct checkpoint *item(pdp8_checkpoints_t *store, size_t index) {
+    return &store->items[(store->first + index) % store->capacity];
+}
+
+static const struct checkpoint *newest(const pdp8_checkpoints_t *store) {
+    return &store->items[(store->first + store->count - 1u) % store->capacity];
+}
+
+static size_t checkpoint_bytes(const struct checkpoint *cp) {
+    return sizeof(*cp) + cp->state_size + cp->undo_count * (sizeof(uint16_t) + PAGE_BYTES);
+}
+
+static void drop_undo(pdp8_checkpoints_t *store, struct checkpoint *cp) {
+    store->bytes -= cp->undo_count * (sizeof(uint16_t) + PAGE_BYTES);
+    free(cp->undo_pages);
+    free(cp->undo_words);
+    cp->undo_pages = NULL;
+    cp->undo_words = NULL;
+    cp->undo_count = 0u;
+}
+
+static void drop_checkpoint(pdp8_checkpoints_t *store, struct checkpoint *cp) {
+    drop_undo(store, cp);
+    store->bytes -= checkpoint_bytes(cp);
+    free(cp->state);
+    memset(cp, 0, sizeof(*cp));
+}
+
+static void drop_oldest(pdp8_checkpoints_t *store) {
+    drop_checkpoint(store, item(store, 0));
+    store->first = (store->first + 1u) % store->capacity;
+    store->count--;
+}
+
+static void trim_to_budget(pdp8_checkpoints_t *store) {
+    while (store->count > 1u && store->bytes > store->budget) {
+        drop_oldest(store);
+    }
+}
+
+static int grow_ring(pdp8_checkpoints_t *store) {
+    size_t capacity = store->capacity ? store->capacity * 2u : 64u;
+    struct checkpoint *items = (struct checkpoint *)calloc(capacity, sizeof(*items));
+    if (!items) {
+        return -1;
+    }
+    for (size_t i = 0; i < store->count; ++i) {
+        items[i] = *item(store, i);
+    }
+    free(store->items);
+    store->items = items;
+    store->first = 0u;
+    store->capacity = capacity;
+    return 0;
+}
+
+static uint8_t *save_state(pdp8_t *cpu, size_t *size) {
+    size_t needed = pdp8_api_save_state(cpu, NULL, 0u);
+    uint8_t *state = (uint8_t *)malloc(needed);
+    if (!state) {
+        return NULL;
+    }
+    *size = pdp8_api_save_state(cpu, state, needed);
+    return state;
+}
+
+/* Record where this call leaves the machine. */
+static void remember(pdp8_checkpoints_t *store) {
+    pdp8_t *cpu = store->cpu;
+    store->left_generation = pdp8_api_memory_generation(cpu);
+    size_t needed = pdp8_api_save_state(cpu, NULL, 0u);
+    if (needed > store->left_capacity) {
+        uint8_t *grown = (uint8_t *)realloc(store->left_state, needed);
+        if (!grown) {
+            store->left_size = 0u; /* the next call then checkpoints regardless */
+            return;
+        }
+        store->left_state = grown;
+        store->left_capacity = needed;
+    }
+    store->left_size = pdp8_api_save_state(cpu, store->left_state, needed);
+}
+
+static bool changed_elsewhere(pdp8_checkpoints_t *store) {
+    pdp8_t *cpu = store->cpu;
+    if (pdp8_api_memory_generation(cpu) != store->left_generation || store->left_size == 0u) {
+        return true;
+    }
+    size_t needed = pdp8_api_save_state(cpu, NULL, 0u);
+    if (needed != store->left_size) {
+        return true;
+    }
+    uint8_t *state = (uint8_t *)malloc(needed);
+    if (!state) {
+        return true;
+    }
+    pdp8_api_save_state(cpu, state, needed);
+    bool changed = memcmp(state, store->left_state, needed) != 0;
+    free(state);
+    return changed;
+}
+
+static int take_checkpoint(pdp8_checkpoints_t *store) {
+    pdp8_t *cpu = store->cpu;
+    if (store->count == store->capacity && grow_ring(store) != 0) {
+        return -1;
+    }
+    size_t dirty = pdp8_api_dirty_pages(cpu, store->shadow_generation, store->dirty, store->page_count);
+    if (store->count) {
+        /* the pages written since the newest checkpoint become its undo log */
+        struct checkpoint *previous = item(store, store->count - 1u);
+        uint16_t *pages = (uint16_t *)malloc((dirty ? dirty : 1u) * sizeof(uint16_t));
+        uint16_t *words = (uint16_t *)malloc((dirty ? dirty : 1u) * PAGE_BYTES);
+        if (!pages || !words) {
+            free(pages);
+            free(words);
+            return -1;
+        }
+        for (size_t i = 0; i < dirty; ++i) {
+            pages[i] = store->dirty[i];
+            memcpy(words + i * PAGE_WORDS, store->shadow + (size_t)pages[i] * PAGE_WORDS, PAGE_BYTES);
+        }
+        previous->undo_pages = pages;
+        previous->undo_words = words;
+        previous->undo_count = dirty;
+        store->bytes += dirty * (sizeof(uint16_t) + PAGE_BYTES);
+    } else {
+        dirty = store->page_count;
+        for (size_t page = 0; page < dirty; ++page) {
+            store->dirty[page] = (uint16_t)page;
+        }
+    }
+    for (size_t i = 0; i < dirty; ++i) {
+        pdp8_api_read_page(cpu, store->dirty[i], store->shadow + (size_t)store->dirty[i] * PAGE_WORDS);
+    }
+    store->shadow_generation = pdp8_api_memory_generation(cpu);
+
+    struct checkpoint cp;
+    memset(&cp, 0, sizeof(cp));
+    cp.position = store->position;
+    cp.state = save_state(cpu, &cp.state_size);
+    if (!cp.state) {
+        return -1;
+    }
+    *item(store, store->count) = cp;
+    store->count++;
+    store->bytes += checkpoint_bytes(&cp);
+    trim_to_budget(store);
+    return 0;
+}
+
+/* Bring memory, registers and devices back to checkpoint index, dropping
+ * every later checkpoint. */
+static int restore_checkpoint(pdp8_checkpoints_t *store, size_t index) {
+    pdp8_t *cpu = store->cpu;
+    size_t dirty = pdp8_api_dirty_pages(cpu, store->shadow_generation, store->dirty, store->page_count);
+    for (size_t i = 0; i < dirty; ++i) {
+        pdp8_api_write_page(cpu, store->dirty[i], store->shadow + (size_t)store->dirty[i] * PAGE_WORDS);
+    }
+    while (store->count > index + 1u) {
+        drop_checkpoint(store, item(store, store->count - 1u));
+        store->count--;
+        struct checkpoint *cp = item(store, store->count - 1u);
+        for (size_t i = 0; i < cp->undo_count; ++i) {
+            const uint16_t *words = cp->undo_words + i * PAGE_WORDS;
+            pdp8_api_write_page(cpu, cp->undo_pages[i], words);
+            memcpy(store->shadow + (size_t)cp->undo_pages[i] * PAGE_WORDS, words, PAGE_BYTES);
+        }
+        drop_undo(store, cp);
+    }
+    const struct checkpoint *target = item(store, index);
+    if (pdp8_api_restore_state(cpu, target->state, target->state_size) != 0) {
+        return -1;
+    }
+    store->shadow_generation = pdp8_api_memory_generation(cpu);
+    store->position = target->position;
+    return 0;
+}
+
+/* Run up to count instructions, checkpointing every interval. With
+ * debug_stops false, breakpoints and watchpoints are run past. Returns the
+ * number executed or -1. */
+static int64_t advance(pdp8_checkpoints_t *store, uint64_t count, bool debug_stops, int stop_pc) {
+    pdp8_t *cpu = store->cpu;
+    uint64_t executed = 0;
+    while (executed < count) {
+        uint64_t next = newest(store)->position + store->interval;
+        uint64_t chunk = count - executed;
+        if (next > store->position && next - store->position < chunk) {
+            chunk = next - store->position;
+        }
+        /* stop at the frontier too: only what lies beyond it prints */
+        bool replaying = store->position < store->frontier;
+        if (replaying && store->frontier - store->position < chunk) {
+            chunk = store->frontier - store->position;
+        }
+        if (chunk > (uint64_t)INT32_MAX) {
+            chunk = (uint64_t)INT32_MAX;
+        }
+        pdp8_api_set_replaying(cpu, replaying);
+        int ran = pdp8_api_run_until(cpu, (size_t)chunk, stop_pc);
+        pdp8_api_set_replaying(cpu, 0);
+        if (ran < 0) {
+            return -1;
+        }
+        executed += (uint64_t)ran;
+        store->position += (uint64_t)ran;
+        if (store->position > store->frontier) {
+            store->frontier = store->position;
+        }
+        if (store->position >= next && take_checkpoint(store) != 0) {
+            return -1;
+        }
+        /* a watch can stop the very last instruction of a chunk */
+        int reason = pdp8_api_get_stop_reason(cpu);
+        if ((uint64_t)ran < chunk || reason != PDP8_STOP_NONE) {
+            bool debug = reason == PDP8_STOP_BREAKPOINT || reason == PDP8_STOP_WATCH_READ ||
+                         reason == PDP8_STOP_WATCH_WRITE;
+            if (debug_stops || !debug) {
+                break;
+            }
+        }
+    }
+    return (int64_t)executed;
+}
+
+/* Start a new checkpoint if someone else changed the machine since our last call. */
+static int sync_history(pdp8_checkpoints_t *store) {
+    if (pdp8_api_page_count(store->cpu) != store->page_count) {
+        /* memory was resized: nothing before this point can be restored */
+        return pdp8_checkpoints_reset(store);
+    }
+    if (!changed_elsewhere(store)) {
+        return 0;
+    }
+    /* the run from here on may differ from the one already printed */
+    store->frontier = store->position;
+    return take_checkpoint(store);
+}
+
+/* Latest checkpoint at or before position, or -1. */
+static long find_checkpoint(pdp8_checkpoints_t *store, uint64_t position) {
+    for (size_t i = store->count; i-- > 0;) {
+        if (item(store, i)->position <= position) {
+            return (long)i;
+        }
+    }
+    return -1;
+}
+
+static int seek_to(pdp8_checkpoints_t *store, uint64_t position) {
+    if (position < store->position) {
+        long index = find_checkpoint(store, position);
+        if (index < 0 || restore_checkpoint(store, (size_t)index) != 0) {
+            return -1;
+        }
+    }
+    if (position > store->position && advance(store, position - store->position, false, -1) < 0) {
+        return -1;
+    }
+    return store->position == position ? 0 : -1;
+}
+
+static int init_history(pdp8_checkpoints_t *store) {
+    store->position = 0u;
+    store->frontier = 0u;
+    store->shadow_generation = 0u;
+    if (take_checkpoint(store) != 0) {
+        return -1;
+    }
+    remember(store);
+    return 0;
+}
+
+pdp8_checkpoints_t *pdp8_checkpoints_create(pdp8_t *cpu, uint64_t interval, size_t budget_bytes) {
+    if (!cpu) {
+        return NULL;
+    }
+    pdp8_checkpoints_t *store = (pdp8_checkpoints_t *)calloc(1, sizeof(*store));
+    if (!store) {
+        return NULL;
+    }
+    store->cpu = cpu;
+    store->interval = interval ? interval : PDP8_CHECKPOINT_DEFAULT_INTERVAL;
+    store->budget = budget_bytes ? budget_bytes : PDP8_CHECKPOINT_DEFAULT_BUDGET;
+    store->page_count = pdp8_api_page_count(cpu);
+    store->shadow = (uint16_t *)calloc(store->page_count, PAGE_BYTES);
+    store->dirty = (uint16_t *)calloc(store->page_count, sizeof(uint16_t));
+    if (!store->shadow || !store->dirty) {
+        pdp8_checkpoints_destroy(store);
+        return NULL;
+    }
+    store->bytes = sizeof(*store) + store->page_count * (PAGE_BYTES + sizeof(uint16_t));
+    if (init_history(store) != 0) {
+        pdp8_checkpoints_destroy(store);
+        return NULL;
+    }
+    return store;
+}
+
+void pdp8_checkpoints_destroy(pdp8_checkpoints_t *store) {
+    if (!store) {
+        return;
+    }
+    while (store->count) {
+        drop_oldest(store);
+    }
+    free(store->items);
+    free(store->shadow);
+    free(store->dirty);
+    free(store->left_state);
+    free(store);
+}
+
+int pdp8_checkpoints_reset(pdp8_checkpoints_t *store) {
+    if (!store) {
+        return -1;
+    }
+    while (store->count) {
+        drop_oldest(store);
+    }
+    size_t page_count = pdp8_api_page_count(store->cpu);
+    if (page_count != store->page_count) {
+        uint16_t *shadow = (uint16_t *)realloc(store->shadow, page_count * PAGE_BYTES);
+        if (shadow) {
+            store->shadow = shadow;
+        }
+        uint16_t *dirty = (uint16_t *)realloc(store->dirty, page_count * sizeof(uint16_t));
+        if (dirty) {
+            store->dirty = dirty;
+        }
+        if (!shadow || !dirty) {
+            return -1;
+        }
+        store->bytes -= store->page_count * (PAGE_BYTES + sizeof(uint16_t));
+        store->page_count = page_count;
+        store->bytes += page_count * (PAGE_BYTES + sizeof(uint16_t));
+    }
+    return init_history(store);
+}
+
+void pdp8_checkpoints_set_budget(pdp8_checkpoints_t *store, size_t budget_bytes) {
+    if (!store) {
+        return;
+    }
+    store->budget = budget_bytes ? budget_bytes : PDP8_CHECKPOINT_DEFAULT_BUDGET;
+    trim_to_budget(store);
+}
+
+int pdp8_checkpoints_run(pdp8_checkpoints_t *store, size_t max_cycles) {
+    return pdp8_checkpoints_run_until(store, max_cycles, -1);
+}
+
+int pdp8_checkpoints_run_until(pdp8_checkpoints_t *store, size_t max_cycles, int stop_pc) {
+    if (!store || sync_history(store) != 0) {
+        return -1;
+    }
+    int64_t ran = advance(store, max_cycles, true, stop_pc);
+    remember(store);
+    return (int)ran;
+}
+
+int pdp8_checkpoints_seek(pdp8_checkpoints_t *store, uint64_t position) {
+    if (!store || sync_history(store) != 0) {
+        return -1;
+    }
+    int result = seek_to(store, position);
+    remember(store);
+    return result;
+}
+
+int pdp8_checkpoints_reverse_step(pdp8_checkpoints_t *store, uint64_t count) {
+    if (!store || sync_history(store) != 0 || count > store->position) {
+        return -1;
+    }
+    int result = seek_to(store, store->position - count);
+    remember(store);
+    return result;
+}
+
+int pdp8_checkpoints_reverse_continue(pdp8_checkpoints_t *store) {
+    if (!store || sync_history(store) != 0) {
+        return -1;
+    }
+    pdp8_t *cpu = store->cpu;
+    uint64_t origin = store->position;
+    uint64_t end = origin;
+    /* scan the stretches between checkpoints from the newest backwards,
+     * replaying each one and keeping its last hit; a watch hit lands after
+     * its instruction, so one ending a stretch still belongs to it */
+    while (end > pdp8_checkpoints_oldest(store)) {
+        long index = find_checkpoint(store, end - 1u);
+        if (index < 0 || restore_checkpoint(store, (size_t)index) != 0) {
+            break;
+        }
+        uint64_t start = store->position;
+        bool found = false;
+        uint64_t hit = 0;
+        int hit_reason = PDP8_STOP_NONE;
+        uint16_t hit_address = 0;
+        while (store->position < end) {
+            int64_t ran = advance(store, end - store->position, true, -1);
+            if (ran < 0) {
+                remember(store);
+                return -1;
+            }
+            int reason = pdp8_api_get_stop_reason(cpu);
+            bool watch = reason == PDP8_STOP_WATCH_READ || reason == PDP8_STOP_WATCH_WRITE;
+            if (watch || reason == PDP8_STOP_BREAKPOINT) {
+                if (store->position < end || (watch && end < origin)) {
+                    found = true;
+                    hit = store->position;
+                    hit_reason = reason;
+                    hit_address = pdp8_api_get_stop_address(cpu);
+                }
+            } else if (ran == 0) {
+                break; /* HALT */
+            }
+        }
+        if (found) {
+            int result = seek_to(store, hit);
+            if (result == 0 && hit_reason == PDP8_STOP_BREAKPOINT) {
+                /* stop on it the way a forward run does, so the next run passes it */
+                advance(store, 1u, true, -1);
+            }
+            store->stop_address = hit_address;
+            remember(store);
+            return result == 0 ? hit_reason : -1;
+        }
+        end = start;
+        if (seek_to(store, end) != 0) {
+            break;
+        }
+    }
+    seek_to(store, pdp8_checkpoints_oldest(store));
+    remember(store);
+    return PDP8_STOP_NONE;
+}
+
+uint16_t pdp8_checkpoints_stop_address(const pdp8_checkpoints_t *store) {
+    return store ? store->stop_address : 0u;
+}
+
+uint64_t pdp8_checkpoints_position(const pdp8_checkpoints_t *store) {
+    return store ? store->position : 0u;
+}
+
+uint64_t pdp8_checkpoints_oldest(const pdp8_checkpoints_t *store) {
+    if (!store || store->count == 0u) {
+        return 0u;
+    }
+    return store->items[store->first].position;
+}
+
+size_t pdp8_checkpoints_count(const pdp8_checkpoints_t *store) {
+    return store ? store->count : 0u;
+}
+
+size_t pdp8_checkpoints_bytes(const pdp8_checkpoints_t *store) {
+    return store ? store->bytes : 0u;
+}
@@ -0,0 +1,77 @@
+#ifndef PDP8_CHECKPOINT_H
+#define PDP8_CHECKPOINT_H
+
+#include <stddef.h>
+#include <stdint.h>
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/* Checkpoints and replay for stepping backwards.
+ *
+ * A store runs its CPU in slices and takes a checkpoint every `interval`
+ * instructions: registers and device state (pdp8_api_save_state) plus the
+ * previous contents of each 128-word page written since the last checkpoint,
+ * so a checkpoint costs only the pages the program touched. Going back
+ * restores the nearest checkpoint at or before the target and replays
+ * forward natively, which reproduces the run exactly as long as the machine
+ * is deterministic: a virtual clock (pdp8_api_set_clock) and no host input
+ * arriving inside the replayed stretch. Instructions up to the furthest
+ * position reached are replayed with pdp8_api_set_replaying on, whether
+ * seeking or running forward again, so their device output is not emitted
+ * twice.
+ *
+ * Positions count instructions run through the store since its history
+ * began, idle-loop iterations included. Changes made behind the store's back
+ * (memory writes, register or PC changes, queued input, instructions stepped
+ * elsewhere) are noticed on the next call and start a new checkpoint at the
+ * current position, so replays never run across them. Checkpoints, plus one
+ * shadow copy of memory, stay within `budget_bytes`; the oldest are dropped
+ * first, which limits how far back the store can go. */
+
+typedef struct pdp8_checkpoints pdp8_checkpoints_t;
+typedef struct pdp8 pdp8_t;
+
+#define PDP8_CHECKPOINT_DEFAULT_INTERVAL 10000u
+#define PDP8_CHECKPOINT_DEFAULT_BUDGET (4u * 1024u * 1024u)
+
+/* Takes the first checkpoint at position 0. Zero interval or budget picks the default. */
+pdp8_checkpoints_t *pdp8_checkpoints_create(pdp8_t *cpu, uint64_t interval, size_t budget_bytes);
+void pdp8_checkpoints_destroy(pdp8_checkpoints_t *store);
+/* Forget all history; the current state becomes position 0. Returns 0 or -1. */
+int pdp8_checkpoints_reset(pdp8_checkpoints_t *store);
+/* Drops the oldest checkpoints at once if the store is over the new budget. */
+void pdp8_checkpoints_set_budget(pdp8_checkpoints_t *store, size_t budget_bytes);
+
+/* pdp8_api_run / pdp8_api_run_until through the store, taking checkpoints
+ * on the way. Same return value and stop reasons. */
+int pdp8_checkpoints_run(pdp8_checkpoints_t *store, size_t max_cycles);
+int pdp8_checkpoints_run_until(pdp8_checkpoints_t *store, size_t max_cycles, int stop_pc);
+
+/* Move to position (earlier or later), replaying past breakpoints and
+ * watchpoints. Returns 0, or -1 if position is older than the oldest
+ * checkpoint or a HALT ends the replay first. */
+int pdp8_checkpoints_seek(pdp8_checkpoints_t *store, uint64_t position);
+/* Go back count instructions. */
+int pdp8_checkpoints_reverse_step(pdp8_checkpoints_t *store, uint64_t count);
+/* Go back to the most recent breakpoint or watchpoint hit before the current
+ * position: before the instruction at a breakpoint, after the instruction
+ * whose access hit a watch. Returns its pdp8_stop_reason, or PDP8_STOP_NONE
+ * after going back to the oldest checkpoint without finding one; -1 on error. */
+int pdp8_checkpoints_reverse_continue(pdp8_checkpoints_t *store);
+/* The breakpoint or watched word the last reverse continue stopped at. */
+uint16_t pdp8_checkpoints_stop_address(const pdp8_checkpoints_t *store);
+
+uint64_t pdp8_checkpoints_position(const pdp8_checkpoints_t *store);
+/* Earliest position the store can still go back to. */
+uint64_t pdp8_checkpoints_oldest(const pdp8_checkpoints_t *store);
+size_t pdp8_checkpoints_count(const pdp8_checkpoints_t *store);
+/* Bytes held against the budget. */
+size_t pdp8_checkpoints_bytes(const pdp8_checkpoints_t *store);
+
+#ifdef __cplusplus
+}
+#endif
+
+#endif
@@ -0,0 +1,469 @@
+#include "journal.h"
+
+#include "kl8e_console.h"
+#include "pdp8.h"
+
+#include <stdbool.h>
+#include <stdint.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+
+#define JOURNAL_MAGIC "P8JL"
+#define JOURNAL_MAGIC_BYTES 4u
+#define JOURNAL_BUFFER_BYTES (1u << 16)
+#define VARINT_MAX_BYTES 10u
+
+struct journal_event {
+    uint64_t stamp;
+    uint64_t value;
+    uint8_t source;
+};
+
+struct pdp8_journal {
+    pdp8_t *cpu;
+    bool replaying;
+    uint64_t origin;    /* instruction count when the journal was created */
+    uint64_t clock;     /* last host time logged or served */
+    uint64_t wall;      /* last wall clock minutes logged or served */
+    bool have_wall;
+    uint64_t events;
+    uint64_t bytes;
+    uint64_t mismatches;
+    /* recording */
+    FILE *out;
+    uint64_t last_stamp;
+    bool failed;
+    /* replaying */
+    struct journal_event *log;
+    size_t count;
+    size_t cursor[PDP8_INPUT_SOURCES]; /* next unused record of each source */
+    uint64_t consumed;
+    uint64_t end;
+    pdp8_kl8e_console_t *console;
+    bool injecting;
+};
+
+static bool is_clock(int source) {
+    return source == PDP8_INPUT_CLOCK || source == PDP8_INPUT_CLOCK_TICK;
+}
+
+static size_t put_varint(uint8_t *out, uint64_t value) {
+    size_t n = 0u;
+    while (value >= 0x80u) {
+        out[n++] = (uint8_t)(value | 0x80u);
+        value >>= 7;
+    }
+    out[n++] = (uint8_t)value;
+    return n;
+}
+
+static bool get_varint(const uint8_t *data, size_t size, size_t *offset, uint64_t *value) {
+    uint64_t result = 0u;
+    for (unsigned shift = 0u; shift < 64u && *offset < size; shift += 7u) {
+        uint8_t byte = data[(*offset)++];
+        result |= (uint64_t)(byte & 0x7Fu) << shift;
+        if (!(byte & 0x80u)) {
+            *value = result;
+            return true;
+        }
+    }
+    return false;
+}
+
+static uint64_t zigzag(uint64_t delta) {
+    return (delta << 1) ^ (uint64_t)((int64_t)delta >> 63);
+}
+
+static uint64_t unzigzag(uint64_t encoded) {
+    return (encoded >> 1) ^ (uint64_t)-(int64_t)(encoded & 1u);
+}
+
+static void write_bytes(pdp8_journal_t *journal, const uint8_t *data, size_t size) {
+    if (fwrite(data, 1u, size, journal->out) != size) {
+        journal->failed = true;
+    }
+    journal->bytes += size;
+}
+
+static void write_record(pdp8_journal_t *journal, uint8_t source, uint64_t stamp, uint64_t value) {
+    uint8_t record[1u + 2u * VARINT_MAX_BYTES];
+    size_t n = 0u;
+    record[n++] = source;
+    n += put_varint(record + n, stamp - journal->last_stamp);
+    if (source != PDP8_JOURNAL_END) {
+        if (is_clock(source)) {
+            n += put_varint(record + n, zigzag(value - journal->clock));
+            journal->clock = value;
+        } else {
+            n += put_varint(record + n, value);
+        }
+        journal->events++;
+    }
+    journal->last_stamp = stamp;
+    write_bytes(journal, record, n);
+}
+
+static int record_input(pdp8_journal_t *journal, const pdp8_t *cpu, int source, uint64_t stamp, uint64_t value) {
+    switch (source) {
+    case PDP8_INPUT_CLOCK_HOST:
+    case PDP8_INPUT_WALL_CLOCK_HOST:
+        return 0; /* the front end's own reads, never seen by the program */
+    case PDP8_INPUT_CLOCK_TICK: {
+        /* until the earliest deadline no tick handler acts on the time; a
+         * deadline of 0 acts on every step without needing it */
+        uint64_t deadline = pdp8_api_next_deadline(cpu);
+        if (deadline == 0u || value < deadline) {
+            return 0;
+        }
+        break;
+    }
+    case PDP8_INPUT_WALL_CLOCK:
+        if (journal->have_wall && value == journal->wall) {
+            return 0;
+        }
+        journal->wall = value;
+        journal->have_wall = true;
+        break;
+    default:
+        break;
+    }
+    write_record(journal, (uint8_t)source, stamp, value);
+    return 0;
+}
+
+/* Next unused record of source, or NULL. */
+static const struct journal_event *peek(pdp8_journal_t *journal, int source) {
+    size_t i = journal->cursor[source];
+    while (i < journal->count && journal->log[i].source != source) {
+        ++i;
+    }
+    journal->cursor[source] = i;
+    return i < journal->count ? &journal->log[i] : NULL;
+}
+
+static void consume(pdp8_journal_t *journal, int source) {
+    journal->cursor[source]++;
+    journal->consumed++;
+}
+
+/* Remember the latest clock and wall clock values the program was given. */
+static void note_replayed(pdp8_journal_t *journal, int source, uint64_t value) {
+    if (is_clock(source)) {
+        journal->clock = value;
+    } else if (source == PDP8_INPUT_WALL_CLOCK) {
+        journal->wall = value;
+        journal->have_wall = true;
+    }
+}
+
+static int replay_input(pdp8_journal_t *journal, int source, uint64_t stamp, uint64_t *value) {
+    if (source == PDP8_INPUT_KEYBOARD) {
+        return journal->injecting ? 0 : -1;
+    }
+    if (source == PDP8_INPUT_CLOCK_HOST) {
+        *value = journal->clock;
+        return 0;
+    }
+    if (source == PDP8_INPUT_WALL_CLOCK_HOST) {
+        if (journal->have_wall) {
+            *value = journal->wall;
+        }
+        return 0;
+    }
+    const struct journal_event *event = peek(journal, source);
+    while (event && event->stamp < stamp) {
+        /* recorded at a point this replay went past: it diverged, but the
+         * value still stands until the next one */
+        journal->mismatches++;
+        note_replayed(journal, source, event->value);
+        consume(journal, source);
+        event = peek(journal, source);
+    }
+    if (event && event->stamp == stamp) {
+        *value = event->value;
+        consume(journal, source);
+        note_replayed(journal, source, *value);
+        return 0;
+    }
+    /* nothing logged here: the value did not matter or did not change */
+    if (source == PDP8_INPUT_CLOCK_TICK) {
+        *value = journal->clock;
+    } else if (source == PDP8_INPUT_WALL_CLOCK && journal->have_wall) {
+        *value = journal->wall;
+    } else {
+        journal->mismatches++;
+        if (source == PDP8_INPUT_CLOCK) {
+            *value = journal->clock;
+        }
+    }
+    return 0;
+}
+
+static int journal_hook(const pdp8_t *cpu, void *context, int source, uint64_t *value) {
+    pdp8_journal_t *journal = (pdp8_journal_t *)context;
+    if (source < 0 || source >= PDP8_INPUT_SOURCES) {
+        return 0;
+    }
+    uint64_t stamp = pdp8_api_instruction_count(cpu) - journal->origin;
+    if (journal->replaying) {
+        return replay_input(journal, source, stamp, value);
+    }
+    return record_input(journal, cpu, source, stamp, *value);
+}
+
+static pdp8_journal_t *journal_new(pdp8_t *cpu) {
+    pdp8_journal_t *journal = (pdp8_journal_t *)calloc(1u, sizeof(*journal));
+    if (!journal) {
+        return NULL;
+    }
+    journal->cpu = cpu;
+    journal->origin = pdp8_api_instruction_count(cpu);
+    return journal;
+}
+
+pdp8_journal_t *pdp8_journal_record(pdp8_t *cpu, const char *path) {
+    if (!cpu || !path) {
+        return NULL;
+    }
+    pdp8_journal_t *journal = journal_new(cpu);
+    if (!journal) {
+        return NULL;
+    }
+    journal->out = fopen(path, "wb");
+    if (!journal->out) {
+        free(journal);
+        return NULL;
+    }
+    setvbuf(journal->out, NULL, _IOFBF, JOURNAL_BUFFER_BYTES);
+    journal->clock = pdp8_api_now_ns(cpu);
+
+    uint8_t header[JOURNAL_MAGIC_BYTES + 1u + VARINT_MAX_BYTES];
+    memcpy(header, JOURNAL_MAGIC, JOURNAL_MAGIC_BYTES);
+    header[JOURNAL_MAGIC_BYTES] = PDP8_JOURNAL_VERSION;
+    size_t n = JOURNAL_MAGIC_BYTES + 1u;
+    n += put_varint(header + n, journal->clock);
+    write_bytes(journal, header, n);
+
+    pdp8_api_set_input_hook(cpu, journal_hook, journal);
+    return journal;
+}
+
+static uint8_t *read_file(const char *path, size_t *size) {
+    FILE *in = fopen(path, "rb");
+    if (!in) {
+        return NULL;
+    }
+    uint8_t *data = NULL;
+    size_t used = 0u;
+    size_t capacity = 0u;
+    for (;;) {
+        if (used == capacity) {
+            size_t grown = capacity ? capacity * 2u : JOURNAL_BUFFER_BYTES;
+            uint8_t *bigger = (uint8_t *)realloc(data, grown);
+            if (!bigger) {
+                free(data);
+                fclose(in);
+                return NULL;
+            }
+            data = bigger;
+            capacity = grown;
+        }
+        size_t got = fread(data + used, 1u, capacity - used, in);
+        used += got;
+        if (got == 0u) {
+            break;
+        }
+    }
+    bool failed = ferror(in) != 0;
+    fclose(in);
+    if (failed) {
+        free(data);
+        return NULL;
+    }
+    *size = used;
+    return data;
+}
+
+/* Decode a whole log. A log cut short (the recorder died) replays up to its
+ * last complete record. */
+static int load_log(pdp8_journal_t *journal, const uint8_t *data, size_t size) {
+    if (size < JOURNAL_MAGIC_BYTES + 1u || memcmp(data, JOURNAL_MAGIC, JOURNAL_MAGIC_BYTES) != 0 ||
+        data[JOURNAL_MAGIC_BYTES] != PDP8_JOURNAL_VERSION) {
+        return -1;
+    }
+    size_t offset = JOURNAL_MAGIC_BYTES + 1u;
+    if (!get_varint(data, size, &offset, &journal->clock)) {
+        return -1;
+    }
+    size_t capacity = 0u;
+    uint64_t stamp = 0u;
+    uint64_t clock = journal->clock;
+    bool ended = false;
+    while (offset < size && !ended) {
+        uint8_t source = data[offset++];
+        uint64_t delta = 0u;
+        uint64_t value = 0u;
+        if (!get_varint(data, size, &offset, &delta)) {
+            break;
+        }
+        if (source == PDP8_JOURNAL_END) {
+            stamp += delta;
+            ended = true;
+            break;
+        }
+        if (source >= PDP8_INPUT_SOURCES) {
+            return -1;
+        }
+        if (!get_varint(data, size, &offset, &value)) {
+            break;
+        }
+        stamp += delta;
+        if (is_clock(source)) {
+            clock += unzigzag(value);
+            value = clock;
+        }
+        if (journal->count == capacity) {
+            size_t grown = capacity ? capacity * 2u : 256u;
+            struct journal_event *bigger =
+                (struct journal_event *)realloc(journal->log, grown * sizeof(*bigger));
+            if (!bigger) {
+                return -1;
+            }
+            journal->log = bigger;
+            capacity = grown;
+        }
+        journal->log[journal->count].stamp = stamp;
+        journal->log[journal->count].value = value;
+        journal->log[journal->count].source = source;
+        journal->count++;
+    }
+    journal->end = stamp;
+    journal->events = journal->count;
+    journal->bytes = size;
+    return 0;
+}
+
+pdp8_journal_t *pdp8_journal_replay(pdp8_t *cpu, const char *path) {
+    if (!cpu || !path) {
+        return NULL;
+    }
+    size_t size = 0u;
+    uint8_t *data = read_file(path, &size);
+    if (!data) {
+        return NULL;
+    }
+    pdp8_journal_t *journal = journal_new(cpu);
+    if (!journal || load_log(journal, data, size) != 0) {
+        free(data);
+        if (journal) {
+            free(journal->log);
+            free(journal);
+        }
+        return NULL;
+    }
+    free(data);
+    journal->replaying = true;
+    pdp8_api_set_input_hook(cpu, journal_hook, journal);
+    return journal;
+}
+
+int pdp8_journal_set_console(pdp8_journal_t *journal, pdp8_kl8e_console_t *console) {
+    if (!journal) {
+        return -1;
+    }
+    journal->console = console;
+    return 0;
+}
+
+/* Queue every keyboard byte recorded at or before position. */
+static void inject_keyboard(pdp8_journal_t *journal, uint64_t position) {
+    const struct journal_event *event;
+    while ((event = peek(journal, PDP8_INPUT_KEYBOARD)) != NULL && event->stamp <= position) {
+        if (event->stamp < position || !journal->console) {
+            journal->mismatches++;
+        }
+        if (journal->console) {
+            journal->injecting = true;
+            pdp8_kl8e_console_queue_input(journal->console, (uint8_t)event->value);
+            journal->injecting = false;
+        }
+        consume(journal, PDP8_INPUT_KEYBOARD);
+    }
+}
+
+int pdp8_journal_run(pdp8_journal_t *journal, size_t max_cycles) {
+    if (!journal) {
+        return -1;
+    }
+    if (!journal->replaying) {
+        return pdp8_api_run(journal->cpu, max_cycles);
+    }
+    size_t executed = 0u;
+    while (executed < max_cycles) {
+        uint64_t position = pdp8_journal_position(journal);
+        inject_keyboard(journal, position);
+        if (position >= journal->end) {
+            break;
+        }
+        uint64_t target = journal->end;
+        const struct journal_event *next = peek(journal, PDP8_INPUT_KEYBOARD);
+        if (next && next->stamp < target) {
+            target = next->stamp;
+        }
+        size_t slice = max_cycles - executed;
+        if (target - position < slice) {
+            slice = (size_t)(target - position);
+        }
+        int ran = pdp8_api_run(journal->cpu, slice);
+        if (ran < 0) {
+            return -1;
+        }
+        executed += (size_t)ran;
+        if ((size_t)ran < slice) {
+            break; /* halted */
+        }
+    }
+    return (int)executed;
+}
+
+int pdp8_journal_close(pdp8_journal_t *journal) {
+    if (!journal) {
+        return -1;
+    }
+    int result = 0;
+    if (journal->out) {
+        write_record(journal, PDP8_JOURNAL_END, pdp8_journal_position(journal), 0u);
+        if (fclose(journal->out) != 0 || journal->failed) {
+            result = -1;
+        }
+    }
+    pdp8_api_set_input_hook(journal->cpu, NULL, NULL);
+    free(journal->log);
+    free(journal);
+    return result;
+}
+
+uint64_t pdp8_journal_position(const pdp8_journal_t *journal) {
+    return journal ? pdp8_api_instruction_count(journal->cpu) - journal->origin : 0u;
+}
+
+uint64_t pdp8_journal_end(const pdp8_journal_t *journal) {
+    return journal ? journal->end : 0u;
+}
+
+uint64_t pdp8_journal_events(const pdp8_journal_t *journal) {
+    return journal ? journal->events : 0u;
+}
+
+uint64_t pdp8_journal_remaining(const pdp8_journal_t *journal) {
+    return journal && journal->replaying ? journal->count - journal->consumed : 0u;
+}
+
+uint64_t pdp8_journal_mismatches(const pdp8_journal_t *journal) {
+    return journal ? journal->mismatches : 0u;
+}
+
+uint64_t pdp8_journal_bytes(const pdp8_journal_t *journal) {
+    return journal ? journal->bytes : 0u;
+}
@@ -0,0 +1,74 @@
+#ifndef PDP8_JOURNAL_H
+#define PDP8_JOURNAL_H
+
+#include <stddef.h>
+#include <stdint.h>
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/* Input journal for reproducible sessions.
+ *
+ * A recording journal installs itself as the CPU's input hook (pdp8.h) and
+ * writes every externally sourced value to a compact binary log, stamped
+ * with the number of instructions executed since the journal was created:
+ * keyboard bytes, words read from paper tape and magtape, host time read by
+ * IOTs (the watchdog) and the wall clock word as read by the program (the
+ * front end's reads of it are not logged). Host time handed to tick
+ * handlers is only logged when it has reached the earliest tick deadline,
+ * since before that no handler acts on it, and the wall clock only when it
+ * changes, so an idle hour costs a few bytes.
+ *
+ * A replaying journal feeds the log back: running through it stops at each
+ * keyboard stamp to queue the recorded byte, and reads of host time, the
+ * wall clock and tape words get the recorded values at the same positions,
+ * with no pacing. Replay needs the same image and devices, attached in the
+ * same order, and the journal created before any device IOT runs. Typed
+ * input from the host is refused while replaying. Values the journal cannot
+ * match (the replay went a different way) are counted as mismatches. Virtual
+ * clocks never consult the journal; they are already reproducible.
+ *
+ * Log format: "P8JL", a version byte, the host time at creation as a varint,
+ * then one record per value: source byte, varint stamp delta, varint value
+ * (a zigzag delta from the previous time for clock sources), and an end
+ * record (source PDP8_JOURNAL_END) with the final stamp. */
+
+typedef struct pdp8_journal pdp8_journal_t;
+typedef struct pdp8 pdp8_t;
+typedef struct pdp8_kl8e_console pdp8_kl8e_console_t;
+
+#define PDP8_JOURNAL_VERSION 1u
+#define PDP8_JOURNAL_END 0x7Fu
+
+/* Start recording to path. NULL if the file cannot be created. */
+pdp8_journal_t *pdp8_journal_record(pdp8_t *cpu, const char *path);
+/* Load a recording for replay. NULL if it cannot be read or is malformed. */
+pdp8_journal_t *pdp8_journal_replay(pdp8_t *cpu, const char *path);
+/* Console that receives recorded keyboard bytes during replay. */
+int pdp8_journal_set_console(pdp8_journal_t *journal, pdp8_kl8e_console_t *console);
+/* Recording: pdp8_api_run. Replaying: run up to max_cycles without passing
+ * the recorded end, queueing keyboard bytes at their stamps. Returns the
+ * instructions executed, 0 once the end is reached, -1 on error. */
+int pdp8_journal_run(pdp8_journal_t *journal, size_t max_cycles);
+/* Recording: write the end record and close the log. Removes the input hook
+ * and frees the journal. Returns 0, or -1 if any write failed. */
+int pdp8_journal_close(pdp8_journal_t *journal);
+
+/* Instructions executed since the journal was created. */
+uint64_t pdp8_journal_position(const pdp8_journal_t *journal);
+/* Replaying: the recorded session's length in instructions. */
+uint64_t pdp8_journal_end(const pdp8_journal_t *journal);
+/* Records written, or loaded for replay (the end record excluded). */
+uint64_t pdp8_journal_events(const pdp8_journal_t *journal);
+/* Replaying: loaded records not used yet. */
+uint64_t pdp8_journal_remaining(const pdp8_journal_t *journal);
+uint64_t pdp8_journal_mismatches(const pdp8_journal_t *journal);
+/* Bytes of log written or loaded. */
+uint64_t pdp8_journal_bytes(const pdp8_journal_t *journal);
+
+#ifdef __cplusplus
+}
+#endif
+
+#endif
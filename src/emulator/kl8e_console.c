@@ -25,6 +25,9 @@ struct pdp8_kl8e_console {
     bool teleprinter_flag;
     pdp8_kl8e_console_output_callback output_callback;
     void *output_context;
+    uint64_t output_count;
+    uint64_t input_count;
+    pdp8_t *cpu; /* set by attach, for the input journal */
 };
 
 static void buffer_release(struct pdp8_buffer *buffer) {
@@ -110,9 +113,13 @@ static void teleprinter_record_output(pdp8_kl8e_console_t *console, uint8_t ch)
     if (!console) {
         return;
     }
-    buffer_push_back(&console->output_log, ch);
+    console->output_count++;
+    /* a callback takes the output instead of the log, which only the
+     * pop calls would ever drain */
     if (console->output_callback) {
         console->output_callback(ch, console->output_context);
+    } else {
+        buffer_push_back(&console->output_log, ch);
     }
     if (console->output_stream) {
         fputc((int)ch, console->output_stream);
@@ -177,11 +184,55 @@ static void kl8e_teleprinter_iot(pdp8_t *cpu, uint16_t instruction, void *contex
         uint16_t ac = pdp8_api_get_ac(cpu);
         uint8_t ch = (uint8_t)(ac & PDP8_KL8E_ASCII_MASK);
         console->teleprinter_flag = false;
-        teleprinter_record_output(console, ch);
+        if (!pdp8_api_is_replaying(cpu)) {
+            teleprinter_record_output(console, ch);
+        }
         console->teleprinter_flag = true;
     }
 }
 
+/* Checkpoint state: the keyboard latch, both flags, then the queued input. */
+struct kl8e_saved_state {
+    uint8_t keyboard_buffer;
+    uint8_t keyboard_flag;
+    uint8_t teleprinter_flag;
+};
+
+static size_t kl8e_save_state(const pdp8_t *cpu, void *context, uint8_t *buffer, size_t size) {
+    (void)cpu;
+    const pdp8_kl8e_console_t *console = (const pdp8_kl8e_console_t *)context;
+    struct kl8e_saved_state head = {console->keyboard_buffer, console->keyboard_flag, console->teleprinter_flag};
+    size_t needed = sizeof(head) + console->pending_input.size;
+    if (buffer && size >= needed) {
+        memcpy(buffer, &head, sizeof(head));
+        if (console->pending_input.size) {
+            memcpy(buffer + sizeof(head), console->pending_input.data, console->pending_input.size);
+        }
+    }
+    return needed;
+}
+
+static void kl8e_restore_state(pdp8_t *cpu, void *context, const uint8_t *buffer, size_t size) {
+    (void)cpu;
+    pdp8_kl8e_console_t *console = (pdp8_kl8e_console_t *)context;
+    struct kl8e_saved_state head;
+    if (size < sizeof(head)) {
+        return;
+    }
+    memcpy(&head, buffer, sizeof(head));
+    size_t pending = size - sizeof(head);
+    if (buffer_reserve(&console->pending_input, pending) != 0) {
+        return;
+    }
+    if (pending) {
+        memcpy(console->pending_input.data, buffer + sizeof(head), pending);
+    }
+    console->pending_input.size = pending;
+    console->keyboard_buffer = head.keyboard_buffer;
+    console->keyboard_flag = head.keyboard_flag != 0u;
+    console->teleprinter_flag = head.teleprinter_flag != 0u;
+}
+
 pdp8_kl8e_console_t *pdp8_kl8e_console_create(FILE *input_stream, FILE *output_stream) {
     pdp8_kl8e_console_t *console = (pdp8_kl8e_console_t *)calloc(1, sizeof(pdp8_kl8e_console_t));
     if (!console) {
@@ -220,6 +271,11 @@ int pdp8_kl8e_console_attach(pdp8_t *cpu, pdp8_kl8e_console_t *console) {
         pdp8_api_register_iot(cpu, PDP8_KL8E_KEYBOARD_DEVICE_CODE, NULL, NULL);
         return -1;
     }
+    /* KSF only changes when input is queued; TSF is set again by TLS itself. */
+    pdp8_api_set_idle_iot(cpu, PDP8_KL8E_KEYBOARD_DEVICE_CODE, 1);
+    pdp8_api_set_idle_iot(cpu, PDP8_KL8E_TELEPRINTER_DEVICE_CODE, 1);
+    pdp8_api_register_state(cpu, PDP8_KL8E_KEYBOARD_DEVICE_CODE, kl8e_save_state, kl8e_restore_state, console);
+    console->cpu = cpu;
     return 0;
 }
 
@@ -227,13 +283,33 @@ int pdp8_kl8e_console_queue_input(pdp8_kl8e_console_t *console, uint8_t ch) {
     if (!console) {
         return -1;
     }
-    uint8_t value = (uint8_t)(ch & PDP8_KL8E_ASCII_MASK);
+    uint64_t journaled = ch & PDP8_KL8E_ASCII_MASK;
+    if (pdp8_api_input(console->cpu, PDP8_INPUT_KEYBOARD, &journaled) != 0) {
+        return -1; /* a replaying journal supplies the input itself */
+    }
+    uint8_t value = (uint8_t)(journaled & PDP8_KL8E_ASCII_MASK);
     if (!console->keyboard_flag) {
         console->keyboard_buffer = value;
         console->keyboard_flag = true;
-        return 0;
+    } else if (buffer_push_back(&console->pending_input, value) != 0) {
+        return -1;
     }
-    return buffer_push_back(&console->pending_input, value);
+    console->input_count++;
+    return 0;
+}
+
+size_t pdp8_kl8e_console_queue_block(pdp8_kl8e_console_t *console, const uint8_t *data, size_t length) {
+    if (!console || !data) {
+        return 0u;
+    }
+    if (buffer_reserve(&console->pending_input, console->pending_input.size + length) != 0) {
+        return 0u;
+    }
+    size_t queued = 0u;
+    while (queued < length && pdp8_kl8e_console_queue_input(console, data[queued]) == 0) {
+        queued++;
+    }
+    return queued;
 }
 
 size_t pdp8_kl8e_console_input_pending(const pdp8_kl8e_console_t *console) {
@@ -251,6 +327,14 @@ size_t pdp8_kl8e_console_output_pending(const pdp8_kl8e_console_t *console) {
     return console ? console->output_log.size : 0u;
 }
 
+uint64_t pdp8_kl8e_console_input_count(const pdp8_kl8e_console_t *console) {
+    return console ? console->input_count : 0u;
+}
+
+uint64_t pdp8_kl8e_console_output_count(const pdp8_kl8e_console_t *console) {
+    return console ? console->output_count : 0u;
+}
+
 int pdp8_kl8e_console_pop_output(pdp8_kl8e_console_t *console, uint8_t *ch) {
     if (!console || !ch) {
         return -1;
@@ -258,6 +342,23 @@ int pdp8_kl8e_console_pop_output(pdp8_kl8e_console_t *console, uint8_t *ch) {
     return buffer_pop_front(&console->output_log, ch);
 }
 
+size_t pdp8_kl8e_console_pop_output_block(pdp8_kl8e_console_t *console, uint8_t *buffer, size_t max) {
+    if (!console || !buffer) {
+        return 0u;
+    }
+    struct pdp8_buffer *log = &console->output_log;
+    size_t count = log->size < max ? log->size : max;
+    if (count == 0u) {
+        return 0u;
+    }
+    memcpy(buffer, log->data, count);
+    if (count < log->size) {
+        memmove(log->data, log->data + count, log->size - count);
+    }
+    log->size -= count;
+    return count;
+}
+
 int pdp8_kl8e_console_flush(pdp8_kl8e_console_t *console) {
     if (!console) {
         return -1;
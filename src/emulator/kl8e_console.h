@@ -32,11 +32,21 @@ pdp8_kl8e_console_t *pdp8_kl8e_console_create(FILE *input_stream, FILE *output_s
 void pdp8_kl8e_console_destroy(pdp8_kl8e_console_t *console);
 int pdp8_kl8e_console_attach(pdp8_t *cpu, pdp8_kl8e_console_t *console);
 int pdp8_kl8e_console_queue_input(pdp8_kl8e_console_t *console, uint8_t ch);
+/* Queue up to length characters at once, as queue_input would one by one.
+ * Returns how many were queued; fewer than length only on failure. */
+size_t pdp8_kl8e_console_queue_block(pdp8_kl8e_console_t *console, const uint8_t *data, size_t length);
 size_t pdp8_kl8e_console_input_pending(const pdp8_kl8e_console_t *console);
 size_t pdp8_kl8e_console_output_pending(const pdp8_kl8e_console_t *console);
+/* Characters queued for the keyboard and printed since creation. */
+uint64_t pdp8_kl8e_console_input_count(const pdp8_kl8e_console_t *console);
+uint64_t pdp8_kl8e_console_output_count(const pdp8_kl8e_console_t *console);
 int pdp8_kl8e_console_pop_output(pdp8_kl8e_console_t *console, uint8_t *ch);
+/* Pop up to max buffered output characters into buffer; returns the count. */
+size_t pdp8_kl8e_console_pop_output_block(pdp8_kl8e_console_t *console, uint8_t *buffer, size_t max);
 int pdp8_kl8e_console_flush(pdp8_kl8e_console_t *console);
 int pdp8_kl8e_console_set_output_stream(pdp8_kl8e_console_t *console, FILE *stream);
+/* While a callback is installed it receives each printed character instead
+ * of the output log that pop_output drains. */
 int pdp8_kl8e_console_set_output_callback(pdp8_kl8e_console_t *console,
                                           pdp8_kl8e_console_output_callback callback,
                                           void *context);
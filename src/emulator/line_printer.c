@@ -1,47 +1,50 @@
 #include "line_printer.h"
 
+#include "output_buffer.h"
 #include "pdp8.h"
 
 #include <stdbool.h>
 #include <stdlib.h>
+#include <string.h>
 
 #define PDP8_LINE_PRINTER_DEFAULT_COLUMN_LIMIT 132u
 
 struct pdp8_line_printer {
-    FILE *stream;
+    pdp8_output_buffer output;
+    pdp8_t *cpu;
     uint16_t column_limit;
     uint16_t column;
     bool ready;
     bool color_active;
     pdp8_line_printer_output_callback output_callback;
     void *output_context;
+    uint64_t output_count;
 };
 
 static void line_printer_output_char(pdp8_line_printer_t *printer, uint8_t value) {
-    if (!printer) {
+    if (!printer || pdp8_api_is_replaying(printer->cpu)) {
         return;
     }
-    if (printer->stream) {
-        fputc((int)value, printer->stream);
-    }
+    pdp8_output_buffer_put(&printer->output, value);
+    printer->output_count++;
     if (printer->output_callback) {
         printer->output_callback(value, printer->output_context);
     }
 }
 
 static void line_printer_start_color(pdp8_line_printer_t *printer) {
-    if (!printer || !printer->stream || printer->color_active) {
+    if (!printer || !printer->output.stream || printer->color_active || pdp8_api_is_replaying(printer->cpu)) {
         return;
     }
-    fputs("\x1b[33m", printer->stream);
+    pdp8_output_buffer_puts(&printer->output, "\x1b[33m");
     printer->color_active = true;
 }
 
 static void line_printer_stop_color(pdp8_line_printer_t *printer) {
-    if (!printer || !printer->stream || !printer->color_active) {
+    if (!printer || !printer->output.stream || !printer->color_active || pdp8_api_is_replaying(printer->cpu)) {
         return;
     }
-    fputs("\x1b[0m", printer->stream);
+    pdp8_output_buffer_puts(&printer->output, "\x1b[0m");
     printer->color_active = false;
 }
 
@@ -85,9 +88,28 @@ static void line_printer_emit(pdp8_line_printer_t *printer, uint8_t ch) {
             line_printer_stop_color(printer);
         }
     }
-    if (printer->stream) {
-        fflush(printer->stream);
+    pdp8_output_buffer_commit(&printer->output);
+}
+
+static void line_printer_tick(pdp8_t *cpu, void *context, uint64_t now_ns) {
+    pdp8_line_printer_t *printer = (pdp8_line_printer_t *)context;
+    (void)now_ns;
+    if (printer && printer->output.size > 0u && pdp8_api_is_halted(cpu)) {
+        pdp8_output_buffer_flush(&printer->output);
+    }
+}
+
+/* The halt policy needs a per-instruction check, so the tick handler is only
+ * registered while that policy is active. */
+static void line_printer_update_tick(pdp8_line_printer_t *printer) {
+    if (!printer->cpu) {
+        return;
     }
+    bool on_halt = printer->output.policy == PDP8_OUTPUT_FLUSH_HALT;
+    pdp8_api_register_tick(printer->cpu, PDP8_LINE_PRINTER_DEVICE_CODE,
+                           on_halt ? line_printer_tick : NULL, on_halt ? printer : NULL);
+    /* it only acts once the CPU halts, which ends any idle loop anyway */
+    pdp8_api_set_tick_deadline(printer->cpu, PDP8_LINE_PRINTER_DEVICE_CODE, PDP8_DEADLINE_NONE);
 }
 
 static void line_printer_iot(pdp8_t *cpu, uint16_t instruction, void *context) {
@@ -116,12 +138,43 @@ static void line_printer_iot(pdp8_t *cpu, uint16_t instruction, void *context) {
     }
 }
 
+/* Checkpoint state: the print column and the ready flag. */
+struct line_printer_saved_state {
+    uint16_t column;
+    uint8_t ready;
+};
+
+static size_t line_printer_save_state(const pdp8_t *cpu, void *context, uint8_t *buffer, size_t size) {
+    (void)cpu;
+    const pdp8_line_printer_t *printer = (const pdp8_line_printer_t *)context;
+    struct line_printer_saved_state saved;
+    memset(&saved, 0, sizeof(saved));
+    saved.column = printer->column;
+    saved.ready = printer->ready;
+    if (buffer && size >= sizeof(saved)) {
+        memcpy(buffer, &saved, sizeof(saved));
+    }
+    return sizeof(saved);
+}
+
+static void line_printer_restore_state(pdp8_t *cpu, void *context, const uint8_t *buffer, size_t size) {
+    (void)cpu;
+    pdp8_line_printer_t *printer = (pdp8_line_printer_t *)context;
+    struct line_printer_saved_state saved;
+    if (size != sizeof(saved)) {
+        return;
+    }
+    memcpy(&saved, buffer, sizeof(saved));
+    printer->column = saved.column;
+    printer->ready = saved.ready != 0u;
+}
+
 pdp8_line_printer_t *pdp8_line_printer_create(FILE *stream) {
     pdp8_line_printer_t *printer = (pdp8_line_printer_t *)calloc(1, sizeof(pdp8_line_printer_t));
     if (!printer) {
         return NULL;
     }
-    printer->stream = stream ? stream : stdout;
+    pdp8_output_buffer_init(&printer->output, stream ? stream : stdout);
     printer->column_limit = PDP8_LINE_PRINTER_DEFAULT_COLUMN_LIMIT;
     printer->column = 0;
     printer->ready = true;
@@ -133,10 +186,13 @@ void pdp8_line_printer_destroy(pdp8_line_printer_t *printer) {
     if (!printer) {
         return;
     }
-    if (printer->stream) {
+    if (printer->output.stream) {
         line_printer_stop_color(printer);
-        fflush(printer->stream);
     }
+    if (printer->cpu && printer->output.policy == PDP8_OUTPUT_FLUSH_HALT) {
+        pdp8_api_register_tick(printer->cpu, PDP8_LINE_PRINTER_DEVICE_CODE, NULL, NULL);
+    }
+    pdp8_output_buffer_release(&printer->output);
     free(printer);
 }
 
@@ -144,7 +200,15 @@ int pdp8_line_printer_attach(pdp8_t *cpu, pdp8_line_printer_t *printer) {
     if (!cpu || !printer) {
         return -1;
     }
-    return pdp8_api_register_iot(cpu, PDP8_LINE_PRINTER_DEVICE_CODE, line_printer_iot, printer);
+    if (pdp8_api_register_iot(cpu, PDP8_LINE_PRINTER_DEVICE_CODE, line_printer_iot, printer) != 0) {
+        return -1;
+    }
+    printer->cpu = cpu;
+    line_printer_update_tick(printer);
+    pdp8_api_set_idle_iot(cpu, PDP8_LINE_PRINTER_DEVICE_CODE, 1);
+    pdp8_api_register_state(cpu, PDP8_LINE_PRINTER_DEVICE_CODE, line_printer_save_state,
+                            line_printer_restore_state, printer);
+    return 0;
 }
 
 int pdp8_line_printer_set_column_limit(pdp8_line_printer_t *printer, uint16_t columns) {
@@ -159,10 +223,37 @@ int pdp8_line_printer_set_stream(pdp8_line_printer_t *printer, FILE *stream) {
     if (!printer) {
         return -1;
     }
-    printer->stream = stream;
+    return pdp8_output_buffer_set_stream(&printer->output, stream);
+}
+
+int pdp8_line_printer_set_flush_policy(pdp8_line_printer_t *printer,
+                                       pdp8_output_flush_policy policy,
+                                       size_t threshold) {
+    if (!printer) {
+        return -1;
+    }
+    if (pdp8_output_buffer_set_policy(&printer->output, policy, threshold) != 0) {
+        return -1;
+    }
+    line_printer_update_tick(printer);
     return 0;
 }
 
+int pdp8_line_printer_flush(pdp8_line_printer_t *printer) {
+    if (!printer) {
+        return -1;
+    }
+    return pdp8_output_buffer_flush(&printer->output);
+}
+
+size_t pdp8_line_printer_pending(const pdp8_line_printer_t *printer) {
+    return printer ? printer->output.size : 0u;
+}
+
+uint64_t pdp8_line_printer_output_count(const pdp8_line_printer_t *printer) {
+    return printer ? printer->output_count : 0u;
+}
+
 int pdp8_line_printer_set_output_callback(pdp8_line_printer_t *printer,
                                           pdp8_line_printer_output_callback callback,
                                           void *context) {
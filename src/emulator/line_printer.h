@@ -1,9 +1,12 @@
 #ifndef PDP8_LINE_PRINTER_H
 #define PDP8_LINE_PRINTER_H
 
+#include <stddef.h>
 #include <stdio.h>
 #include <stdint.h>
 
+#include "output_buffer.h"
+
 #ifdef __cplusplus
 extern "C" {
 #endif
@@ -24,6 +27,16 @@ void pdp8_line_printer_destroy(pdp8_line_printer_t *printer);
 int pdp8_line_printer_attach(pdp8_t *cpu, pdp8_line_printer_t *printer);
 int pdp8_line_printer_set_column_limit(pdp8_line_printer_t *printer, uint16_t columns);
 int pdp8_line_printer_set_stream(pdp8_line_printer_t *printer, FILE *stream);
+/* Choose when buffered output reaches the stream (default: every character).
+ * threshold is the byte count for PDP8_OUTPUT_FLUSH_BYTES and ignored otherwise. */
+int pdp8_line_printer_set_flush_policy(pdp8_line_printer_t *printer,
+                                       pdp8_output_flush_policy policy,
+                                       size_t threshold);
+int pdp8_line_printer_flush(pdp8_line_printer_t *printer);
+/* Bytes buffered for the stream, and bytes printed since creation (column
+ * wraps and tab expansion included, colour escapes not). */
+size_t pdp8_line_printer_pending(const pdp8_line_printer_t *printer);
+uint64_t pdp8_line_printer_output_count(const pdp8_line_printer_t *printer);
 int pdp8_line_printer_set_output_callback(pdp8_line_printer_t *printer,
                                           pdp8_line_printer_output_callback callback,
                                           void *context);
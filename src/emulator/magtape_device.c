@@ -810,8 +810,9 @@ static void perform_read(pdp8_t *cpu, struct magtape_unit *unit) {
         }
         return;
     }
-    uint16_t word = record->words[unit->position++];
-    pdp8_api_set_ac(cpu, word & 0x0FFFu);
+    uint64_t word = record->words[unit->position++];
+    pdp8_api_input(cpu, PDP8_INPUT_MAGTAPE, &word);
+    pdp8_api_set_ac(cpu, (uint16_t)(word & 0x0FFFu));
     unit->ready = unit->position < record->word_count;
     if (!unit->ready) {
         unit->end_of_record = true;
@@ -0,0 +1,231 @@
+#include "mailbox.h"
+
+#include "pdp8.h"
+
+#include <stdbool.h>
+#include <stdlib.h>
+#include <string.h>
+
+#define MAILBOX_RING_MASK (PDP8_MAILBOX_RING_WORDS - 1u)
+
+struct mailbox_ring {
+    uint16_t words[PDP8_MAILBOX_RING_WORDS];
+    size_t head; /* next word to read */
+    size_t count;
+};
+
+struct pdp8_mailbox {
+    struct mailbox_ring inbound;
+    struct mailbox_ring outbound;
+    uint16_t registers[PDP8_MAILBOX_REGISTERS];
+    uint8_t selected;
+    bool interrupt_enable;
+    uint8_t device_code;
+    uint64_t dropped;
+    pdp8_t *cpu;
+};
+
+static bool ring_push(struct mailbox_ring *ring, uint16_t word) {
+    if (ring->count == PDP8_MAILBOX_RING_WORDS) {
+        return false;
+    }
+    ring->words[(ring->head + ring->count) & MAILBOX_RING_MASK] = (uint16_t)(word & 07777u);
+    ring->count++;
+    return true;
+}
+
+static uint16_t ring_pop(struct mailbox_ring *ring) {
+    if (ring->count == 0u) {
+        return 0u;
+    }
+    uint16_t word = ring->words[ring->head];
+    ring->head = (ring->head + 1u) & MAILBOX_RING_MASK;
+    ring->count--;
+    return word;
+}
+
+static void mailbox_iot(pdp8_t *cpu, uint16_t instruction, void *context) {
+    pdp8_mailbox_t *mailbox = (pdp8_mailbox_t *)context;
+    if (!mailbox || !cpu) {
+        return;
+    }
+
+    switch (instruction & 0x7u) {
+    case PDP8_MAILBOX_FUNC_SIE:
+        mailbox->interrupt_enable = (pdp8_api_get_ac(cpu) & 1u) != 0u;
+        break;
+    case PDP8_MAILBOX_FUNC_SKI:
+        if (mailbox->inbound.count > 0u) {
+            pdp8_api_request_skip(cpu);
+        }
+        break;
+    case PDP8_MAILBOX_FUNC_RDI:
+        pdp8_api_set_ac(cpu, ring_pop(&mailbox->inbound));
+        break;
+    case PDP8_MAILBOX_FUNC_SKO:
+        if (mailbox->outbound.count < PDP8_MAILBOX_RING_WORDS) {
+            pdp8_api_request_skip(cpu);
+        }
+        break;
+    case PDP8_MAILBOX_FUNC_WRO:
+        if (!ring_push(&mailbox->outbound, pdp8_api_get_ac(cpu))) {
+            mailbox->dropped++;
+        }
+        break;
+    case PDP8_MAILBOX_FUNC_SEL:
+        mailbox->selected = (uint8_t)(pdp8_api_get_ac(cpu) & (PDP8_MAILBOX_REGISTERS - 1u));
+        break;
+    case PDP8_MAILBOX_FUNC_RDR:
+        pdp8_api_set_ac(cpu, mailbox->registers[mailbox->selected]);
+        break;
+    case PDP8_MAILBOX_FUNC_WRR:
+        mailbox->registers[mailbox->selected] = (uint16_t)(pdp8_api_get_ac(cpu) & 07777u);
+        break;
+    }
+}
+
+/* Checkpoint state: this head, then the inbound and outbound words in ring order. */
+struct mailbox_saved_state {
+    uint16_t registers[PDP8_MAILBOX_REGISTERS];
+    uint16_t inbound_count;
+    uint16_t outbound_count;
+    uint8_t selected;
+    uint8_t interrupt_enable;
+};
+
+static size_t mailbox_save_ring(const struct mailbox_ring *ring, uint8_t *out) {
+    for (size_t i = 0; i < ring->count; ++i) {
+        uint16_t word = ring->words[(ring->head + i) & MAILBOX_RING_MASK];
+        if (out) {
+            memcpy(out + i * sizeof(word), &word, sizeof(word));
+        }
+    }
+    return ring->count * sizeof(uint16_t);
+}
+
+static void mailbox_restore_ring(struct mailbox_ring *ring, const uint8_t *in, size_t count) {
+    ring->head = 0u;
+    ring->count = count;
+    memcpy(ring->words, in, count * sizeof(uint16_t));
+}
+
+static size_t mailbox_save_state(const pdp8_t *cpu, void *context, uint8_t *buffer, size_t size) {
+    (void)cpu;
+    const pdp8_mailbox_t *mailbox = (const pdp8_mailbox_t *)context;
+    struct mailbox_saved_state head;
+    size_t needed = sizeof(head) + (mailbox->inbound.count + mailbox->outbound.count) * sizeof(uint16_t);
+    if (!buffer || size < needed) {
+        return needed;
+    }
+    memset(&head, 0, sizeof(head));
+    memcpy(head.registers, mailbox->registers, sizeof(head.registers));
+    head.inbound_count = (uint16_t)mailbox->inbound.count;
+    head.outbound_count = (uint16_t)mailbox->outbound.count;
+    head.selected = mailbox->selected;
+    head.interrupt_enable = mailbox->interrupt_enable;
+    memcpy(buffer, &head, sizeof(head));
+    size_t offset = sizeof(head);
+    offset += mailbox_save_ring(&mailbox->inbound, buffer + offset);
+    mailbox_save_ring(&mailbox->outbound, buffer + offset);
+    return needed;
+}
+
+static void mailbox_restore_state(pdp8_t *cpu, void *context, const uint8_t *buffer, size_t size) {
+    (void)cpu;
+    pdp8_mailbox_t *mailbox = (pdp8_mailbox_t *)context;
+    struct mailbox_saved_state head;
+    if (size < sizeof(head)) {
+        return;
+    }
+    memcpy(&head, buffer, sizeof(head));
+    if (head.inbound_count > PDP8_MAILBOX_RING_WORDS || head.outbound_count > PDP8_MAILBOX_RING_WORDS ||
+        size != sizeof(head) + ((size_t)head.inbound_count + head.outbound_count) * sizeof(uint16_t)) {
+        return;
+    }
+    memcpy(mailbox->registers, head.registers, sizeof(head.registers));
+    mailbox->selected = (uint8_t)(head.selected & (PDP8_MAILBOX_REGISTERS - 1u));
+    mailbox->interrupt_enable = head.interrupt_enable != 0u;
+    mailbox_restore_ring(&mailbox->inbound, buffer + sizeof(head), head.inbound_count);
+    mailbox_restore_ring(&mailbox->outbound, buffer + sizeof(head) + head.inbound_count * sizeof(uint16_t),
+                         head.outbound_count);
+}
+
+pdp8_mailbox_t *pdp8_mailbox_create(void) {
+    return (pdp8_mailbox_t *)calloc(1, sizeof(pdp8_mailbox_t));
+}
+
+void pdp8_mailbox_destroy(pdp8_mailbox_t *mailbox) {
+    free(mailbox);
+}
+
+int pdp8_mailbox_attach(pdp8_t *cpu, pdp8_mailbox_t *mailbox, uint8_t device_code) {
+    if (!cpu || !mailbox) {
+        return -1;
+    }
+    if (pdp8_api_register_iot(cpu, device_code, mailbox_iot, mailbox) != 0) {
+        return -1;
+    }
+    mailbox->cpu = cpu;
+    mailbox->device_code = (uint8_t)(device_code & 0x3Fu);
+    /* the rings only change between run calls, so a skip loop can be skipped */
+    pdp8_api_set_idle_iot(cpu, mailbox->device_code, 1);
+    pdp8_api_register_state(cpu, mailbox->device_code, mailbox_save_state, mailbox_restore_state, mailbox);
+    return 0;
+}
+
+size_t pdp8_mailbox_post(pdp8_mailbox_t *mailbox, const uint16_t *words, size_t count) {
+    if (!mailbox || !words) {
+        return 0u;
+    }
+    size_t accepted = 0u;
+    while (accepted < count && ring_push(&mailbox->inbound, words[accepted])) {
+        accepted++;
+    }
+    if (accepted > 0u && mailbox->interrupt_enable && mailbox->cpu) {
+        pdp8_api_request_interrupt(mailbox->cpu, mailbox->device_code);
+    }
+    return accepted;
+}
+
+size_t pdp8_mailbox_collect(pdp8_mailbox_t *mailbox, uint16_t *words, size_t max) {
+    if (!mailbox || !words) {
+        return 0u;
+    }
+    size_t copied = 0u;
+    while (copied < max && mailbox->outbound.count > 0u) {
+        words[copied++] = ring_pop(&mailbox->outbound);
+    }
+    return copied;
+}
+
+size_t pdp8_mailbox_inbound_pending(const pdp8_mailbox_t *mailbox) {
+    return mailbox ? mailbox->inbound.count : 0u;
+}
+
+size_t pdp8_mailbox_outbound_pending(const pdp8_mailbox_t *mailbox) {
+    return mailbox ? mailbox->outbound.count : 0u;
+}
+
+uint64_t pdp8_mailbox_dropped(const pdp8_mailbox_t *mailbox) {
+    return mailbox ? mailbox->dropped : 0u;
+}
+
+int pdp8_mailbox_read_registers(const pdp8_mailbox_t *mailbox, size_t first, uint16_t *words, size_t count) {
+    if (!mailbox || !words || first > PDP8_MAILBOX_REGISTERS || count > PDP8_MAILBOX_REGISTERS - first) {
+        return -1;
+    }
+    for (size_t i = 0; i < count; ++i) {
+        words[i] = mailbox->registers[first + i];
+    }
+    return 0;
+}
+
+int pdp8_mailbox_write_registers(pdp8_mailbox_t *mailbox, size_t first, const uint16_t *words, size_t count) {
+    if (!mailbox || !words || first > PDP8_MAILBOX_REGISTERS || count > PDP8_MAILBOX_REGISTERS - first) {
+        return -1;
+    }
+    for (size_t i = 0; i < count; ++i) {
+        mailbox->registers[first + i] = (uint16_t)(words[i] & 07777u);
+    }
+    return 0;
+}
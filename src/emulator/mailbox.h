@@ -0,0 +1,69 @@
+#ifndef PDP8_MAILBOX_H
+#define PDP8_MAILBOX_H
+
+#include <stddef.h>
+#include <stdint.h>
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/* Shared-memory mailbox for peripherals simulated on the host.
+ *
+ * The PDP-8 side talks to it with IOTs; the host side exchanges whole batches
+ * of words with the post/collect/register calls between pdp8_api_run calls,
+ * so no host code runs while the CPU executes. Three areas are shared:
+ *
+ *   inbound ring   host -> PDP-8 words (sensor events), read with RDI
+ *   outbound ring  PDP-8 -> host words (actuator commands), written with WRO
+ *   registers      PDP8_MAILBOX_REGISTERS 12-bit slots either side may read
+ *                  or write, for levels rather than events
+ *
+ * Posting to the inbound ring raises one interrupt per batch while the
+ * device's interrupt enable is set (SIE with AC bit 11 set). */
+
+#define PDP8_MAILBOX_DEVICE_CODE 050u
+#define PDP8_MAILBOX_IOT_BASE(device) (06000u | ((uint16_t)((device) & 0x3Fu) << 3))
+#define PDP8_MAILBOX_REGISTERS 8u
+#define PDP8_MAILBOX_RING_WORDS 256u
+
+/* Discrete IOT function codes (microcode field) */
+#define PDP8_MAILBOX_FUNC_SIE 0x0u /* 6500 - interrupt enable from AC bit 11 */
+#define PDP8_MAILBOX_FUNC_SKI 0x1u /* 6501 - skip if an inbound word is waiting */
+#define PDP8_MAILBOX_FUNC_RDI 0x2u /* 6502 - pop inbound word into AC (0 if empty) */
+#define PDP8_MAILBOX_FUNC_SKO 0x3u /* 6503 - skip if the outbound ring has room */
+#define PDP8_MAILBOX_FUNC_WRO 0x4u /* 6504 - push AC onto the outbound ring */
+#define PDP8_MAILBOX_FUNC_SEL 0x5u /* 6505 - select register AC & 7 */
+#define PDP8_MAILBOX_FUNC_RDR 0x6u /* 6506 - read selected register into AC */
+#define PDP8_MAILBOX_FUNC_WRR 0x7u /* 6507 - write AC to selected register */
+
+#define PDP8_MAILBOX_INSTR(device, func) (PDP8_MAILBOX_IOT_BASE(device) | (uint16_t)((func) & 0x7u))
+
+typedef struct pdp8_mailbox pdp8_mailbox_t;
+typedef struct pdp8 pdp8_t;
+
+pdp8_mailbox_t *pdp8_mailbox_create(void);
+void pdp8_mailbox_destroy(pdp8_mailbox_t *mailbox);
+/* Attach at device_code; several mailboxes can serve different peripherals. */
+int pdp8_mailbox_attach(pdp8_t *cpu, pdp8_mailbox_t *mailbox, uint8_t device_code);
+
+/* Queue up to count words for the PDP-8. Returns the number accepted, which is
+ * less than count when the inbound ring fills up. */
+size_t pdp8_mailbox_post(pdp8_mailbox_t *mailbox, const uint16_t *words, size_t count);
+/* Move up to max words the PDP-8 wrote into words. Returns the number copied. */
+size_t pdp8_mailbox_collect(pdp8_mailbox_t *mailbox, uint16_t *words, size_t max);
+size_t pdp8_mailbox_inbound_pending(const pdp8_mailbox_t *mailbox);
+size_t pdp8_mailbox_outbound_pending(const pdp8_mailbox_t *mailbox);
+/* Words the PDP-8 wrote while the outbound ring was full. */
+uint64_t pdp8_mailbox_dropped(const pdp8_mailbox_t *mailbox);
+
+/* Copy registers [first, first + count) out of or into the register file.
+ * Return 0 on success, -1 on a NULL argument or an out-of-range span. */
+int pdp8_mailbox_read_registers(const pdp8_mailbox_t *mailbox, size_t first, uint16_t *words, size_t count);
+int pdp8_mailbox_write_registers(pdp8_mailbox_t *mailbox, size_t first, const uint16_t *words, size_t count);
+
+#ifdef __cplusplus
+}
+#endif
+
+#endif
@@ -18,6 +18,20 @@
 #define PDP8_AUTO_INCREMENT_END   0x000Fu /* octal 0017 */
 #define PDP8_WALL_CLOCK_ADDRESS   07760u  /* minutes since midnight */
 
+/* Read hooks for one page; allocated only for pages that have any. Status
+ * words keep their value here so the hook context lives as long as the page. */
+struct pdp8_mmio_page {
+    pdp8_mmio_read_handler handlers[PDP8_DIRTY_PAGE_WORDS];
+    void *contexts[PDP8_DIRTY_PAGE_WORDS];
+    uint16_t status[PDP8_DIRTY_PAGE_WORDS];
+    unsigned count;
+};
+
+struct pdp8_wall_clock {
+    time_t valid_until; /* start of the next minute */
+    uint16_t minutes;
+};
+
 struct pdp8 {
     uint16_t *memory;
     size_t memory_words;
@@ -34,6 +48,66 @@ struct pdp8 {
     pdp8_tick_handler tick_handlers[64];
     void *tick_contexts[64];
     const pdp8_board_spec *board;
+    uint64_t memory_generation;
+    uint64_t *page_generation; /* last memory_generation that touched each page */
+    size_t page_count;
+    uint16_t last_effective_address; /* set by memory-reference instructions */
+    int clock_source;                 /* pdp8_clock_source */
+    uint64_t clock_ns_per_unit;       /* virtual ns per instruction or memory cycle */
+    uint64_t virtual_ns;              /* emulated time for the virtual sources */
+    unsigned tick_handler_count;
+    struct pdp8_mmio_page **mmio_pages; /* page_count entries, NULL when unhooked */
+    struct pdp8_wall_clock wall_clock;
+    uint64_t tick_deadlines[64];      /* earliest time each tick handler may act */
+    uint64_t idle_iot_mask;           /* devices whose skip IOT waits on outside events */
+    bool idle_skip;                   /* fast-forward idle loops in run/run_until */
+    uint64_t idle_skipped;            /* instructions fast-forwarded so far */
+    uint16_t wait_loop;               /* first address of the last wait loop seen */
+    uint8_t wait_loop_words;          /* its length, 0 when there is none */
+    uint64_t *break_bits;             /* one bit per word: stop before executing */
+    uint64_t *read_watch_bits;        /* stop after an AND/TAD operand or pointer read */
+    uint64_t *write_watch_bits;       /* stop after a program store */
+    size_t debug_words;               /* uint64_t words in each bitmap */
+    unsigned break_count;
+    unsigned watch_count;             /* addresses with any watch bit set */
+    bool break_resume;                /* let the breakpoint last stopped at run once */
+    uint8_t watch_hit;                /* pdp8_stop_reason of a watch hit this step */
+    uint16_t watch_address;
+    int stop_reason;                  /* pdp8_stop_reason of the last run */
+    uint16_t stop_address;
+    pdp8_state_save_handler state_savers[64];      /* device state for checkpoints */
+    pdp8_state_restore_handler state_restorers[64];
+    void *state_contexts[64];
+    pdp8_counters_t counters;
+    uint64_t interrupt_since;         /* counters.instructions when the oldest wait began */
+    pdp8_input_hook input_hook;       /* journal of externally sourced values */
+    void *input_context;
+    bool in_iot;                      /* an IOT handler is running: its clock reads are journaled */
+    bool in_operand;                  /* an AND/TAD operand is being read: wall clock reads are journaled */
+    bool replaying;                   /* re-running instructions whose output was already emitted */
+};
+
+/* Head of a pdp8_api_save_state blob; a pdp8_saved_device record and its
+ * bytes follow for each device with state handlers. */
+struct pdp8_saved_state {
+    uint64_t virtual_ns;
+    uint64_t tick_deadlines[64];
+    int32_t interrupt_pending;
+    uint16_t pc;
+    uint16_t ac;
+    uint16_t switch_register;
+    uint16_t last_effective_address;
+    uint16_t wait_loop;
+    uint8_t link;
+    uint8_t halted;
+    uint8_t skip_pending;
+    uint8_t interrupt_enable;
+    uint8_t wait_loop_words;
+};
+
+struct pdp8_saved_device {
+    uint32_t device_code;
+    uint32_t length;
 };
 
 static int ensure_memory_capacity(pdp8_t *cpu, size_t memory_words) {
@@ -44,6 +118,39 @@ static int ensure_memory_capacity(pdp8_t *cpu, size_t memory_words) {
         memory_words = cpu->memory_words ? cpu->memory_words : 4096u;
     }
 
+    /* Grow the page table first so a failure leaves memory untouched. */
+    size_t page_count = (memory_words + PDP8_DIRTY_PAGE_WORDS - 1u) / PDP8_DIRTY_PAGE_WORDS;
+    if (page_count > cpu->page_count) {
+        uint64_t *new_pages = (uint64_t *)realloc(cpu->page_generation, page_count * sizeof(uint64_t));
+        if (!new_pages) {
+            return -1;
+        }
+        memset(new_pages + cpu->page_count, 0, (page_count - cpu->page_count) * sizeof(uint64_t));
+        cpu->page_generation = new_pages;
+
+        struct pdp8_mmio_page **new_mmio =
+            (struct pdp8_mmio_page **)realloc(cpu->mmio_pages, page_count * sizeof(*new_mmio));
+        if (!new_mmio) {
+            return -1;
+        }
+        memset(new_mmio + cpu->page_count, 0, (page_count - cpu->page_count) * sizeof(*new_mmio));
+        cpu->mmio_pages = new_mmio;
+    }
+
+    size_t debug_words = (memory_words + 63u) / 64u;
+    if (debug_words > cpu->debug_words) {
+        uint64_t **bitmaps[] = {&cpu->break_bits, &cpu->read_watch_bits, &cpu->write_watch_bits};
+        for (size_t i = 0; i < sizeof(bitmaps) / sizeof(bitmaps[0]); ++i) {
+            uint64_t *grown = (uint64_t *)realloc(*bitmaps[i], debug_words * sizeof(uint64_t));
+            if (!grown) {
+                return -1;
+            }
+            memset(grown + cpu->debug_words, 0, (debug_words - cpu->debug_words) * sizeof(uint64_t));
+            *bitmaps[i] = grown;
+        }
+        cpu->debug_words = debug_words;
+    }
+
     size_t old_words = cpu->memory_words;
     uint16_t *new_memory = (uint16_t *)realloc(cpu->memory, memory_words * sizeof(uint16_t));
     if (!new_memory) {
@@ -56,6 +163,7 @@ static int ensure_memory_capacity(pdp8_t *cpu, size_t memory_words) {
 
     cpu->memory = new_memory;
     cpu->memory_words = memory_words;
+    cpu->page_count = page_count;
 
     if (cpu->memory_words) {
         cpu->pc = (uint16_t)(cpu->pc % cpu->memory_words);
@@ -75,11 +183,61 @@ static uint16_t normalise_address(const pdp8_t *cpu, uint16_t address) {
     return address % (uint16_t)cpu->memory_words;
 }
 
-static uint16_t read_wall_clock_minutes(void) {
+/* Store a word and stamp its page with a fresh generation number. */
+static void store_word(pdp8_t *cpu, uint16_t address, uint16_t value) {
+    cpu->memory[address] = mask_word(value);
+    cpu->page_generation[address / PDP8_DIRTY_PAGE_WORDS] = ++cpu->memory_generation;
+}
+
+static bool debug_bit(const uint64_t *bits, uint16_t address) {
+    return (bits[address / 64u] >> (address % 64u)) & 1u;
+}
+
+static void note_watch(pdp8_t *cpu, const uint64_t *bits, uint16_t address, uint8_t reason) {
+    if (cpu->watch_count && debug_bit(bits, address) && !cpu->watch_hit) {
+        cpu->watch_hit = reason;
+        cpu->watch_address = address;
+    }
+}
+
+/* A store made by the program, as opposed to the front end: watched. */
+static void program_store(pdp8_t *cpu, uint16_t address, uint16_t value) {
+    store_word(cpu, address, value);
+    note_watch(cpu, cpu->write_watch_bits, address, PDP8_STOP_WATCH_WRITE);
+}
+
+static uint64_t host_now_ns(void) {
+    struct timespec ts;
+    if (clock_gettime(CLOCK_MONOTONIC, &ts) != 0) {
+        return 0ull;
+    }
+    return (uint64_t)ts.tv_sec * 1000000000ull + (uint64_t)ts.tv_nsec;
+}
+
+/* Memory cycles taken by an instruction: fetch, plus defer for indirect
+ * references, plus execute for every memory reference except JMP. */
+static unsigned memory_cycles(uint16_t instruction) {
+    uint16_t opcode = (uint16_t)((instruction & PDP8_OPCODE_MASK) >> 9);
+    if (opcode >= 6u) {
+        return 1u;
+    }
+    unsigned cycles = (instruction & PDP8_INDIRECT_MASK) ? 2u : 1u;
+    if (opcode != 5u) {
+        ++cycles;
+    }
+    return cycles;
+}
+
+/* Minutes since local midnight. localtime_r only runs once per minute; in
+ * between the cached value is returned. */
+static uint16_t local_minutes(struct pdp8_wall_clock *clock) {
     time_t now = time(NULL);
     if (now == (time_t)-1) {
         return 0u;
     }
+    if (now < clock->valid_until) {
+        return clock->minutes;
+    }
     struct tm tm_buf;
     struct tm *local = localtime_r(&now, &tm_buf);
 #if !defined(_POSIX_C_SOURCE) || _POSIX_C_SOURCE < 199309L
@@ -91,15 +249,80 @@ static uint16_t read_wall_clock_minutes(void) {
         return 0u;
     }
     int minutes = local->tm_hour * 60 + local->tm_min;
+    clock->minutes = (uint16_t)(minutes & PDP8_WORD_MASK);
+    clock->valid_until = now - local->tm_sec + 60;
+    return clock->minutes;
+}
+
+/* Wall clock hook, passed through the input journal. Only reads by the
+ * program are journaled; the front end's reads get the same value without
+ * leaving a record, like pdp8_api_now_ns outside an IOT. */
+static uint16_t read_wall_clock_minutes(const pdp8_t *cpu, uint16_t address, void *context) {
+    (void)address;
+    uint64_t minutes = local_minutes((struct pdp8_wall_clock *)context);
+    pdp8_api_input(cpu, cpu->in_operand ? PDP8_INPUT_WALL_CLOCK : PDP8_INPUT_WALL_CLOCK_HOST, &minutes);
     return (uint16_t)(minutes & PDP8_WORD_MASK);
 }
 
-static uint16_t read_effective_word(const pdp8_t *cpu, uint16_t address) {
-    uint16_t normalised = normalise_address(cpu, address);
-    if (normalised == PDP8_WALL_CLOCK_ADDRESS) {
-        return read_wall_clock_minutes();
+static uint16_t read_status_word(const pdp8_t *cpu, uint16_t address, void *context) {
+    (void)cpu;
+    (void)address;
+    return *(const uint16_t *)context;
+}
+
+/* Word as seen by AND/TAD and the read APIs: memory, unless the page has a
+ * read hook for it. Ordinary pages cost one NULL check. */
+static uint16_t read_hooked_word(const pdp8_t *cpu, uint16_t address) {
+    const struct pdp8_mmio_page *page = cpu->mmio_pages[address / PDP8_DIRTY_PAGE_WORDS];
+    if (page) {
+        size_t offset = address % PDP8_DIRTY_PAGE_WORDS;
+        if (page->handlers[offset]) {
+            return mask_word(page->handlers[offset](cpu, address, page->contexts[offset]));
+        }
     }
-    return cpu->memory[normalised] & PDP8_WORD_MASK;
+    return cpu->memory[address] & PDP8_WORD_MASK;
+}
+
+/* Operand read by AND/TAD: watched. */
+static uint16_t read_effective_word(pdp8_t *cpu, uint16_t address) {
+    address = normalise_address(cpu, address);
+    note_watch(cpu, cpu->read_watch_bits, address, PDP8_STOP_WATCH_READ);
+    cpu->in_operand = true;
+    uint16_t word = read_hooked_word(cpu, address);
+    cpu->in_operand = false;
+    return word;
+}
+
+/* Install or (with a NULL handler) remove the hook for one address. */
+static int set_mmio_hook(pdp8_t *cpu, uint16_t address, pdp8_mmio_read_handler handler, void *context) {
+    if (!cpu || address >= cpu->memory_words) {
+        return -1;
+    }
+    size_t index = address / PDP8_DIRTY_PAGE_WORDS;
+    size_t offset = address % PDP8_DIRTY_PAGE_WORDS;
+    struct pdp8_mmio_page *page = cpu->mmio_pages[index];
+    if (!page) {
+        if (!handler) {
+            return 0;
+        }
+        page = (struct pdp8_mmio_page *)calloc(1, sizeof(*page));
+        if (!page) {
+            return -1;
+        }
+        cpu->mmio_pages[index] = page;
+    }
+    if (handler && !page->handlers[offset]) {
+        page->count++;
+    } else if (!handler && page->handlers[offset]) {
+        page->count--;
+    }
+    page->handlers[offset] = handler;
+    page->contexts[offset] = handler ? context : NULL;
+    if (page->count == 0) {
+        free(page);
+        cpu->mmio_pages[index] = NULL;
+    }
+    return 0;
 }
 
 static uint16_t fetch_effective_address(pdp8_t *cpu, uint16_t instruction) {
@@ -109,10 +332,12 @@ static uint16_t fetch_effective_address(pdp8_t *cpu, uint16_t instruction) {
 
     if (instruction & PDP8_INDIRECT_MASK) {
         if (address >= PDP8_AUTO_INCREMENT_START && address <= PDP8_AUTO_INCREMENT_END) {
-            cpu->memory[address] = mask_word(cpu->memory[address] + 1u);
+            program_store(cpu, address, cpu->memory[address] + 1u);
         }
+        note_watch(cpu, cpu->read_watch_bits, address, PDP8_STOP_WATCH_READ);
         address = normalise_address(cpu, cpu->memory[address]);
     }
+    cpu->last_effective_address = address;
     return address;
 }
 
@@ -208,6 +433,7 @@ static void operate_group2(pdp8_t *cpu, uint16_t instruction) {
     }
     if (instruction & 0x0002u) { /* HLT */
         cpu->halted = true;
+        cpu->counters.halts++;
     }
     /* Interrupt control (Group 2 bit 0): ION/IOFF */
     /* Pure 7400 (IOFF) disables interrupts; pure 7401 (ION) enables them */
@@ -244,18 +470,18 @@ static void execute_memory_reference(pdp8_t *cpu, uint16_t instruction) {
         break;
     }
     case 0x0400u: { /* ISZ */
-        cpu->memory[address] = mask_word(cpu->memory[address] + 1u);
+        program_store(cpu, address, cpu->memory[address] + 1u);
         if (cpu->memory[address] == 0u) {
             cpu->skip_pending = true;
         }
         break;
     }
     case 0x0600u: /* DCA */
-        cpu->memory[address] = mask_word(cpu->ac);
+        program_store(cpu, address, cpu->ac);
         cpu->ac = 0;
         break;
     case 0x0800u: { /* JMS */
-        cpu->memory[address] = mask_word(cpu->pc);
+        program_store(cpu, address, cpu->pc);
         cpu->pc = normalise_address(cpu, address + 1u);
         break;
     }
@@ -267,11 +493,30 @@ static void execute_memory_reference(pdp8_t *cpu, uint16_t instruction) {
     }
 }
 
+static void note_dispatch(pdp8_t *cpu) {
+    pdp8_counters_t *counters = &cpu->counters;
+    uint64_t latency = counters->instructions - cpu->interrupt_since;
+    unsigned bucket = 0;
+    while (bucket + 1u < PDP8_LATENCY_BUCKETS && (latency >> bucket) != 0u) {
+        ++bucket;
+    }
+    counters->interrupt_dispatches++;
+    counters->interrupt_latency_sum += latency;
+    if (latency > counters->interrupt_latency_max) {
+        counters->interrupt_latency_max = latency;
+    }
+    counters->interrupt_latency[bucket]++;
+    cpu->interrupt_since = counters->instructions;
+}
+
 static void execute_iot(pdp8_t *cpu, uint16_t instruction) {
     uint8_t device = (uint8_t)((instruction >> 3) & 0x3Fu);
     pdp8_iot_handler handler = cpu->iot_handlers[device];
+    cpu->counters.iots[device]++;
     if (handler) {
+        cpu->in_iot = true;
         handler(cpu, instruction, cpu->iot_contexts[device]);
+        cpu->in_iot = false;
     }
 }
 
@@ -289,8 +534,18 @@ pdp8_t *pdp8_api_create(size_t memory_size) {
         return NULL;
     }
 
+    cpu->idle_skip = true;
+    for (size_t i = 0; i < 64u; ++i) {
+        cpu->tick_deadlines[i] = PDP8_DEADLINE_NONE;
+    }
+
     if (ensure_memory_capacity(cpu, memory_size ? memory_size : 4096u) != 0) {
-        free(cpu);
+        pdp8_api_destroy(cpu);
+        return NULL;
+    }
+    if (cpu->memory_words > PDP8_WALL_CLOCK_ADDRESS &&
+        set_mmio_hook(cpu, PDP8_WALL_CLOCK_ADDRESS, read_wall_clock_minutes, &cpu->wall_clock) != 0) {
+        pdp8_api_destroy(cpu);
         return NULL;
     }
 
@@ -301,7 +556,15 @@ void pdp8_api_destroy(pdp8_t *cpu) {
     if (!cpu) {
         return;
     }
+    for (size_t page = 0; cpu->mmio_pages && page < cpu->page_count; ++page) {
+        free(cpu->mmio_pages[page]);
+    }
+    free(cpu->mmio_pages);
+    free(cpu->break_bits);
+    free(cpu->read_watch_bits);
+    free(cpu->write_watch_bits);
     free(cpu->memory);
+    free(cpu->page_generation);
     free(cpu);
 }
 
@@ -316,6 +579,10 @@ void pdp8_api_reset(pdp8_t *cpu) {
     cpu->skip_pending = false;
     cpu->interrupt_enable = false;
     cpu->interrupt_pending = 0;
+    cpu->wait_loop_words = 0u;
+    cpu->break_resume = false;
+    cpu->watch_hit = 0u;
+    cpu->stop_reason = PDP8_STOP_NONE;
     if (cpu->memory && cpu->memory_words) {
         memset(cpu->memory, 0, cpu->memory_words * sizeof(uint16_t));
     }
@@ -329,6 +596,12 @@ void pdp8_api_reset(pdp8_t *cpu) {
             cpu->memory[i] = mask_word(cpu->board->rom_image[i]);
         }
     }
+
+    /* Every page changed as far as observers are concerned. */
+    cpu->memory_generation++;
+    for (size_t page = 0; page < cpu->page_count; ++page) {
+        cpu->page_generation[page] = cpu->memory_generation;
+    }
 }
 
 void pdp8_api_set_halt(pdp8_t *cpu) {
@@ -352,6 +625,9 @@ int pdp8_api_step(pdp8_t *cpu) {
 
     uint16_t instruction = cpu->memory[cpu->pc];
     cpu->pc = normalise_address(cpu, cpu->pc + 1u);
+    cpu->break_resume = false;
+    cpu->watch_hit = 0u;
+    cpu->counters.instructions++;
 
     uint16_t opcode = instruction & PDP8_OPCODE_MASK;
     switch (opcode) {
@@ -378,22 +654,32 @@ int pdp8_api_step(pdp8_t *cpu) {
     /* Interrupt dispatch: check for pending interrupt after instruction execution */
     if (cpu->interrupt_enable && cpu->interrupt_pending > 0) {
         /* Save context: AC at octal 0006, PC at octal 0007, LINK at octal 0010 */
-        cpu->memory[006] = cpu->ac;
-        cpu->memory[007] = cpu->pc;
-        cpu->memory[010] = (uint16_t)cpu->link;
+        program_store(cpu, 006, cpu->ac);
+        program_store(cpu, 007, cpu->pc);
+        program_store(cpu, 010, (uint16_t)cpu->link);
         
         /* Decrement pending count and disable interrupts */
         cpu->interrupt_pending--;
         cpu->interrupt_enable = false;
+        note_dispatch(cpu);
         
         /* Jump to interrupt service routine at octal 0020 */
         cpu->pc = 020;
     }
 
-    /* call registered tick handlers with current monotonic time (ns) */
-    struct timespec ts;
-    if (clock_gettime(CLOCK_MONOTONIC, &ts) == 0) {
-        uint64_t now_ns = (uint64_t)ts.tv_sec * 1000000000ull + (uint64_t)ts.tv_nsec;
+    /* advance virtual time, then call registered tick handlers with the
+     * current time (ns) from the selected clock source */
+    if (cpu->clock_source == PDP8_CLOCK_VIRTUAL_INSTRUCTION) {
+        cpu->virtual_ns += cpu->clock_ns_per_unit;
+    } else if (cpu->clock_source == PDP8_CLOCK_VIRTUAL_MEMORY_CYCLE) {
+        cpu->virtual_ns += cpu->clock_ns_per_unit * memory_cycles(instruction);
+    }
+    if (cpu->tick_handler_count) {
+        uint64_t now_ns = cpu->virtual_ns;
+        if (cpu->clock_source == PDP8_CLOCK_HOST) {
+            now_ns = host_now_ns();
+            pdp8_api_input(cpu, PDP8_INPUT_CLOCK_TICK, &now_ns);
+        }
         for (uint8_t i = 0; i < 64u; ++i) {
             pdp8_tick_handler th = cpu->tick_handlers[i];
             if (th) {
@@ -404,23 +690,326 @@ int pdp8_api_step(pdp8_t *cpu) {
     return 1;
 }
 
+/* Target of a direct JMP/ISZ at address, using the same page rule as
+ * fetch_effective_address (the page of the incremented PC). */
+static uint16_t direct_target(const pdp8_t *cpu, uint16_t address, uint16_t instruction) {
+    uint16_t next = normalise_address(cpu, address + 1u);
+    uint16_t page_base = (instruction & PDP8_PAGE_MASK) ? (next & (uint16_t)~PDP8_OFFSET_MASK) : 0u;
+    return normalise_address(cpu, page_base | (instruction & PDP8_OFFSET_MASK));
+}
+
+static bool is_jump_to(const pdp8_t *cpu, uint16_t address, uint16_t target) {
+    uint16_t word = cpu->memory[address];
+    return (word & (PDP8_OPCODE_MASK | PDP8_INDIRECT_MASK)) == 0x0A00u &&
+           direct_target(cpu, address, word) == target;
+}
+
+/* Whole iterations of an idle loop (instructions and memory cycles per
+ * iteration) that fit in budget and end before the next tick deadline, so the
+ * step that reaches a deadline still runs with its tick handlers. */
+static size_t idle_iterations(const pdp8_t *cpu, unsigned instructions, unsigned cycles, size_t budget) {
+    size_t iterations = budget / instructions;
+    uint64_t deadline = pdp8_api_next_deadline(cpu);
+    if (deadline == PDP8_DEADLINE_NONE || iterations == 0u) {
+        return iterations;
+    }
+    if (cpu->clock_source == PDP8_CLOCK_HOST || deadline <= cpu->virtual_ns) {
+        return 0u; /* host time does not move with skipped instructions */
+    }
+    uint64_t units = cpu->clock_source == PDP8_CLOCK_VIRTUAL_INSTRUCTION ? instructions : cycles;
+    uint64_t fit = (deadline - cpu->virtual_ns - 1u) / (cpu->clock_ns_per_unit * units);
+    return fit < iterations ? (size_t)fit : iterations;
+}
+
+static size_t idle_advance(pdp8_t *cpu, size_t iterations, unsigned instructions, unsigned cycles) {
+    if (cpu->clock_source == PDP8_CLOCK_VIRTUAL_INSTRUCTION) {
+        cpu->virtual_ns += cpu->clock_ns_per_unit * instructions * (uint64_t)iterations;
+    } else if (cpu->clock_source == PDP8_CLOCK_VIRTUAL_MEMORY_CYCLE) {
+        cpu->virtual_ns += cpu->clock_ns_per_unit * cycles * (uint64_t)iterations;
+    }
+    size_t skipped = iterations * instructions;
+    cpu->idle_skipped += skipped;
+    cpu->counters.instructions += skipped;
+    return skipped;
+}
+
+/* Called after `instruction` ran from `pc`. Recognises loops whose next
+ * iterations cannot change anything until a tick deadline or outside input:
+ *
+ *   JMP .                  one instruction, one cycle
+ *   xSF; JMP .-1           skip IOT on an idle-safe device that did not skip
+ *   ISZ X; JMP .-1         delay loop, run forward until just before X wraps
+ *
+ * and skips as many whole iterations as the budget and deadlines allow,
+ * returning the number of instructions skipped. */
+static size_t idle_fast_forward(pdp8_t *cpu, uint16_t pc, uint16_t instruction, size_t budget) {
+    if (cpu->halted || (cpu->interrupt_enable && cpu->interrupt_pending > 0)) {
+        return 0u;
+    }
+    uint16_t opcode = instruction & PDP8_OPCODE_MASK;
+    uint16_t next = normalise_address(cpu, pc + 1u);
+    if (cpu->break_count && (debug_bit(cpu->break_bits, pc) || debug_bit(cpu->break_bits, next))) {
+        return 0u; /* every pass through a breakpoint must be seen */
+    }
+
+    if (opcode == 0x0A00u) {
+        if (cpu->pc != pc || (instruction & PDP8_INDIRECT_MASK) || direct_target(cpu, pc, instruction) != pc) {
+            return 0u;
+        }
+        cpu->wait_loop = pc;
+        cpu->wait_loop_words = 1u;
+        return idle_advance(cpu, idle_iterations(cpu, 1u, 1u, budget), 1u, 1u);
+    }
+
+    if (cpu->pc != next || !is_jump_to(cpu, next, pc)) {
+        return 0u;
+    }
+
+    if (opcode == 0x0C00u) {
+        uint8_t device = (uint8_t)((instruction >> 3) & 0x3Fu);
+        if ((instruction & 0x7u) != 1u || !(cpu->idle_iot_mask & (1ull << device))) {
+            return 0u;
+        }
+        cpu->wait_loop = pc;
+        cpu->wait_loop_words = 2u;
+        size_t iterations = idle_iterations(cpu, 2u, 2u, budget);
+        cpu->counters.iots[device] += iterations; /* as if each skip test ran */
+        return idle_advance(cpu, iterations, 2u, 2u);
+    }
+
+    if (opcode == 0x0400u && !(instruction & PDP8_INDIRECT_MASK)) {
+        uint16_t counter = direct_target(cpu, pc, instruction);
+        if (counter == pc || counter == next) {
+            return 0u;
+        }
+        if (cpu->watch_count && debug_bit(cpu->write_watch_bits, counter)) {
+            return 0u;
+        }
+        uint16_t value = cpu->memory[counter];
+        size_t iterations = idle_iterations(cpu, 2u, 3u, budget);
+        if (iterations > (size_t)(PDP8_WORD_MASK - value)) {
+            iterations = (size_t)(PDP8_WORD_MASK - value);
+        }
+        if (iterations == 0u) {
+            return 0u;
+        }
+        store_word(cpu, counter, (uint16_t)(value + iterations));
+        return idle_advance(cpu, iterations, 2u, 3u);
+    }
+    return 0u;
+}
+
 int pdp8_api_run(pdp8_t *cpu, size_t max_cycles) {
+    if (!cpu) {
+        return -1;
+    }
+    if (cpu->break_count || cpu->watch_count) {
+        return pdp8_api_run_until(cpu, max_cycles, -1);
+    }
+    /* nothing to check per step: keep the plain loop at full speed */
+    size_t executed = 0;
+    while (executed < max_cycles) {
+        if (cpu->halted) {
+            break;
+        }
+        uint16_t pc = cpu->pc;
+        uint16_t instruction = cpu->memory[pc];
+        if (pdp8_api_step(cpu) == 0) {
+            break;
+        }
+        ++executed;
+        if (cpu->idle_skip) {
+            executed += idle_fast_forward(cpu, pc, instruction, max_cycles - executed);
+        }
+    }
+    cpu->stop_reason = cpu->halted ? PDP8_STOP_HALT : PDP8_STOP_NONE;
+    return (int)executed;
+}
+
+int pdp8_api_run_until(pdp8_t *cpu, size_t max_cycles, int stop_pc) {
     if (!cpu) {
         return -1;
     }
     size_t executed = 0;
+    cpu->stop_reason = PDP8_STOP_NONE;
     while (executed < max_cycles) {
         if (cpu->halted) {
+            cpu->stop_reason = PDP8_STOP_HALT;
+            break;
+        }
+        uint16_t pc = cpu->pc;
+        if (cpu->break_count && debug_bit(cpu->break_bits, pc) && !cpu->break_resume) {
+            cpu->stop_reason = PDP8_STOP_BREAKPOINT;
+            cpu->stop_address = pc;
+            cpu->break_resume = true;
             break;
         }
+        uint16_t instruction = cpu->memory[pc];
         if (pdp8_api_step(cpu) == 0) {
             break;
         }
         ++executed;
+        if (cpu->watch_hit) {
+            cpu->stop_reason = cpu->watch_hit;
+            cpu->stop_address = cpu->watch_address;
+            cpu->watch_hit = 0u;
+            break;
+        }
+        if (stop_pc >= 0 && cpu->pc == (uint16_t)stop_pc) {
+            cpu->stop_reason = PDP8_STOP_PC;
+            cpu->stop_address = cpu->pc;
+            break;
+        }
+        /* a stop inside the loop must still be seen, so never skip over it */
+        if (cpu->idle_skip && (stop_pc < 0 || ((uint16_t)stop_pc != pc && (uint16_t)stop_pc != cpu->pc))) {
+            executed += idle_fast_forward(cpu, pc, instruction, max_cycles - executed);
+        }
+    }
+    if (cpu->halted && cpu->stop_reason == PDP8_STOP_NONE) {
+        cpu->stop_reason = PDP8_STOP_HALT;
     }
     return (int)executed;
 }
 
+static int set_debug_bit(uint64_t *bits, uint16_t address, bool enabled) {
+    uint64_t mask = 1ull << (address % 64u);
+    bool was = (bits[address / 64u] & mask) != 0u;
+    if (enabled) {
+        bits[address / 64u] |= mask;
+    } else {
+        bits[address / 64u] &= ~mask;
+    }
+    return (int)enabled - (int)was;
+}
+
+int pdp8_api_set_breakpoint(pdp8_t *cpu, uint16_t address, int enabled) {
+    if (!cpu || address >= cpu->memory_words) {
+        return -1;
+    }
+    cpu->break_count += set_debug_bit(cpu->break_bits, address, enabled != 0);
+    return 0;
+}
+
+int pdp8_api_set_watchpoint(pdp8_t *cpu, uint16_t address, int access) {
+    if (!cpu || address >= cpu->memory_words || (access & ~(PDP8_WATCH_READ | PDP8_WATCH_WRITE))) {
+        return -1;
+    }
+    bool before = debug_bit(cpu->read_watch_bits, address) || debug_bit(cpu->write_watch_bits, address);
+    set_debug_bit(cpu->read_watch_bits, address, (access & PDP8_WATCH_READ) != 0);
+    set_debug_bit(cpu->write_watch_bits, address, (access & PDP8_WATCH_WRITE) != 0);
+    cpu->watch_count += (unsigned)(access != 0) - (unsigned)before;
+    return 0;
+}
+
+void pdp8_api_clear_breakpoints(pdp8_t *cpu) {
+    if (!cpu) {
+        return;
+    }
+    size_t bytes = cpu->debug_words * sizeof(uint64_t);
+    memset(cpu->break_bits, 0, bytes);
+    memset(cpu->read_watch_bits, 0, bytes);
+    memset(cpu->write_watch_bits, 0, bytes);
+    cpu->break_count = 0u;
+    cpu->watch_count = 0u;
+    cpu->break_resume = false;
+}
+
+size_t pdp8_api_list_breakpoints(const pdp8_t *cpu, uint16_t *addresses, size_t max) {
+    if (!cpu) {
+        return 0u;
+    }
+    size_t found = 0;
+    for (size_t address = 0; found < cpu->break_count && address < cpu->memory_words; ++address) {
+        if (debug_bit(cpu->break_bits, (uint16_t)address)) {
+            if (addresses && found < max) {
+                addresses[found] = (uint16_t)address;
+            }
+            found++;
+        }
+    }
+    return found;
+}
+
+size_t pdp8_api_list_watchpoints(const pdp8_t *cpu, uint16_t *addresses, uint8_t *accesses, size_t max) {
+    if (!cpu) {
+        return 0u;
+    }
+    size_t found = 0;
+    for (size_t address = 0; found < cpu->watch_count && address < cpu->memory_words; ++address) {
+        uint8_t access = (uint8_t)((debug_bit(cpu->read_watch_bits, (uint16_t)address) ? PDP8_WATCH_READ : 0) |
+                                   (debug_bit(cpu->write_watch_bits, (uint16_t)address) ? PDP8_WATCH_WRITE : 0));
+        if (access) {
+            if (found < max) {
+                if (addresses) {
+                    addresses[found] = (uint16_t)address;
+                }
+                if (accesses) {
+                    accesses[found] = access;
+                }
+            }
+            found++;
+        }
+    }
+    return found;
+}
+
+int pdp8_api_get_stop_reason(const pdp8_t *cpu) {
+    return cpu ? cpu->stop_reason : PDP8_STOP_NONE;
+}
+
+uint16_t pdp8_api_get_stop_address(const pdp8_t *cpu) {
+    return cpu ? cpu->stop_address : 0u;
+}
+
+size_t pdp8_api_trace(pdp8_t *cpu,
+                      size_t max_steps,
+                      uint16_t *pcs,
+                      uint16_t *instructions,
+                      uint16_t *acs,
+                      uint8_t *links) {
+    return pdp8_api_trace_addresses(cpu, max_steps, pcs, instructions, acs, links, NULL);
+}
+
+size_t pdp8_api_trace_addresses(pdp8_t *cpu,
+                                size_t max_steps,
+                                uint16_t *pcs,
+                                uint16_t *instructions,
+                                uint16_t *acs,
+                                uint8_t *links,
+                                uint16_t *addresses) {
+    if (!cpu || cpu->memory_words == 0) {
+        return 0u;
+    }
+    size_t executed = 0;
+    while (executed < max_steps && !cpu->halted) {
+        uint16_t pc = cpu->pc;
+        uint16_t ac = cpu->ac;
+        uint8_t link = cpu->link;
+        uint16_t instruction = cpu->memory[pc] & PDP8_WORD_MASK;
+        cpu->last_effective_address = PDP8_TRACE_NO_ADDRESS;
+        if (pdp8_api_step(cpu) == 0) {
+            break;
+        }
+        if (pcs) {
+            pcs[executed] = pc;
+        }
+        if (instructions) {
+            instructions[executed] = instruction;
+        }
+        if (acs) {
+            acs[executed] = ac;
+        }
+        if (links) {
+            links[executed] = link;
+        }
+        if (addresses) {
+            addresses[executed] = cpu->last_effective_address;
+        }
+        ++executed;
+    }
+    return executed;
+}
+
 int pdp8_api_attach_board(pdp8_t *cpu, const pdp8_board_spec *spec) {
     if (!cpu || !spec) {
         return -1;
@@ -459,6 +1048,8 @@ void pdp8_api_set_pc(pdp8_t *cpu, uint16_t value) {
         return;
     }
     cpu->pc = normalise_address(cpu, value);
+    cpu->wait_loop_words = 0u;
+    cpu->break_resume = false;
 }
 
 uint8_t pdp8_api_get_link(const pdp8_t *cpu) {
@@ -476,7 +1067,7 @@ int pdp8_api_write_mem(pdp8_t *cpu, uint16_t address, uint16_t value) {
     if (!cpu || cpu->memory_words == 0) {
         return -1;
     }
-    cpu->memory[normalise_address(cpu, address)] = mask_word(value);
+    store_word(cpu, normalise_address(cpu, address), value);
     return 0;
 }
 
@@ -484,7 +1075,110 @@ uint16_t pdp8_api_read_mem(const pdp8_t *cpu, uint16_t address) {
     if (!cpu || cpu->memory_words == 0) {
         return 0u;
     }
-    return read_effective_word(cpu, address);
+    return read_hooked_word(cpu, normalise_address(cpu, address));
+}
+
+size_t pdp8_api_read_block(const pdp8_t *cpu, uint16_t start_address, uint16_t *words, size_t count) {
+    if (!cpu || !words || cpu->memory_words == 0) {
+        return 0u;
+    }
+    if (count > cpu->memory_words) {
+        count = cpu->memory_words;
+    }
+    size_t address = normalise_address(cpu, start_address);
+    for (size_t i = 0; i < count; ++i) {
+        words[i] = read_hooked_word(cpu, (uint16_t)address);
+        if (++address == cpu->memory_words) {
+            address = 0;
+        }
+    }
+    return count;
+}
+
+int pdp8_api_register_mmio_read(pdp8_t *cpu, uint16_t address, pdp8_mmio_read_handler handler, void *context) {
+    return set_mmio_hook(cpu, address, handler, context);
+}
+
+int pdp8_api_set_status_word(pdp8_t *cpu, uint16_t address, uint16_t value) {
+    if (!cpu || address >= cpu->memory_words) {
+        return -1;
+    }
+    struct pdp8_mmio_page *page = cpu->mmio_pages[address / PDP8_DIRTY_PAGE_WORDS];
+    size_t offset = address % PDP8_DIRTY_PAGE_WORDS;
+    if (!page || page->handlers[offset] != read_status_word) {
+        if (set_mmio_hook(cpu, address, read_status_word, NULL) != 0) {
+            return -1;
+        }
+        page = cpu->mmio_pages[address / PDP8_DIRTY_PAGE_WORDS];
+        page->contexts[offset] = &page->status[offset];
+    }
+    page->status[offset] = mask_word(value);
+    return 0;
+}
+
+int pdp8_api_clear_status_word(pdp8_t *cpu, uint16_t address) {
+    if (!cpu || address >= cpu->memory_words) {
+        return -1;
+    }
+    const struct pdp8_mmio_page *page = cpu->mmio_pages[address / PDP8_DIRTY_PAGE_WORDS];
+    if (!page || page->handlers[address % PDP8_DIRTY_PAGE_WORDS] != read_status_word) {
+        return -1;
+    }
+    return set_mmio_hook(cpu, address, NULL, NULL);
+}
+
+uint64_t pdp8_api_memory_generation(const pdp8_t *cpu) {
+    return cpu ? cpu->memory_generation : 0u;
+}
+
+size_t pdp8_api_page_count(const pdp8_t *cpu) {
+    return cpu ? cpu->page_count : 0u;
+}
+
+/* Words of memory in a page; only the last one can be short. */
+static size_t page_words(const pdp8_t *cpu, uint16_t page) {
+    size_t start = (size_t)page * PDP8_DIRTY_PAGE_WORDS;
+    size_t left = cpu->memory_words - start;
+    return left < PDP8_DIRTY_PAGE_WORDS ? left : PDP8_DIRTY_PAGE_WORDS;
+}
+
+int pdp8_api_read_page(const pdp8_t *cpu, uint16_t page, uint16_t *words) {
+    if (!cpu || !words || page >= cpu->page_count) {
+        return -1;
+    }
+    size_t count = page_words(cpu, page);
+    memcpy(words, cpu->memory + (size_t)page * PDP8_DIRTY_PAGE_WORDS, count * sizeof(uint16_t));
+    memset(words + count, 0, (PDP8_DIRTY_PAGE_WORDS - count) * sizeof(uint16_t));
+    return 0;
+}
+
+int pdp8_api_write_page(pdp8_t *cpu, uint16_t page, const uint16_t *words) {
+    if (!cpu || !words || page >= cpu->page_count) {
+        return -1;
+    }
+    uint16_t *memory = cpu->memory + (size_t)page * PDP8_DIRTY_PAGE_WORDS;
+    size_t count = page_words(cpu, page);
+    for (size_t i = 0; i < count; ++i) {
+        memory[i] = mask_word(words[i]);
+    }
+    cpu->page_generation[page] = ++cpu->memory_generation;
+    return 0;
+}
+
+size_t pdp8_api_dirty_pages(const pdp8_t *cpu, uint64_t since, uint16_t *pages, size_t max_pages) {
+    if (!cpu) {
+        return 0u;
+    }
+    size_t found = 0;
+    for (size_t page = 0; page < cpu->page_count; ++page) {
+        if (cpu->page_generation[page] > since) {
+            if (pages && found < max_pages) {
+                pages[found] = (uint16_t)page;
+            }
+            found++;
+        }
+    }
+    return found;
 }
 
 int pdp8_api_load(pdp8_t *cpu, const uint16_t *words, size_t count, uint16_t start_address) {
@@ -503,6 +1197,118 @@ int pdp8_api_register_iot(pdp8_t *cpu, uint8_t device_code, pdp8_iot_handler han
     }
     cpu->iot_handlers[device_code] = handler;
     cpu->iot_contexts[device_code] = context;
+    cpu->idle_iot_mask &= ~(1ull << device_code); /* new handlers opt in again */
+    cpu->state_savers[device_code] = NULL;         /* and register their state again */
+    cpu->state_restorers[device_code] = NULL;
+    cpu->state_contexts[device_code] = NULL;
+    return 0;
+}
+
+int pdp8_api_register_state(pdp8_t *cpu,
+                            uint8_t device_code,
+                            pdp8_state_save_handler save,
+                            pdp8_state_restore_handler restore,
+                            void *context) {
+    if (!cpu || device_code >= 64u || (!save != !restore)) {
+        return -1;
+    }
+    cpu->state_savers[device_code] = save;
+    cpu->state_restorers[device_code] = restore;
+    cpu->state_contexts[device_code] = save ? context : NULL;
+    return 0;
+}
+
+size_t pdp8_api_save_state(const pdp8_t *cpu, uint8_t *buffer, size_t size) {
+    if (!cpu) {
+        return 0u;
+    }
+    struct pdp8_saved_state head;
+    memset(&head, 0, sizeof(head));
+    head.virtual_ns = cpu->virtual_ns;
+    memcpy(head.tick_deadlines, cpu->tick_deadlines, sizeof(head.tick_deadlines));
+    head.interrupt_pending = cpu->interrupt_pending;
+    head.pc = cpu->pc;
+    head.ac = cpu->ac;
+    head.switch_register = cpu->switch_register;
+    head.last_effective_address = cpu->last_effective_address;
+    head.wait_loop = cpu->wait_loop;
+    head.link = cpu->link;
+    head.halted = cpu->halted;
+    head.skip_pending = cpu->skip_pending;
+    head.interrupt_enable = cpu->interrupt_enable;
+    head.wait_loop_words = cpu->wait_loop_words;
+
+    size_t used = sizeof(head);
+    if (buffer && size >= used) {
+        memcpy(buffer, &head, sizeof(head));
+    }
+    for (uint32_t code = 0; code < 64u; ++code) {
+        if (!cpu->state_savers[code]) {
+            continue;
+        }
+        size_t offset = used + sizeof(struct pdp8_saved_device);
+        uint8_t *out = (buffer && size >= offset) ? buffer + offset : NULL;
+        size_t length = cpu->state_savers[code](cpu, cpu->state_contexts[code], out, out ? size - offset : 0u);
+        if (out && size - offset >= length) {
+            struct pdp8_saved_device record = {code, (uint32_t)length};
+            memcpy(buffer + used, &record, sizeof(record));
+        }
+        used = offset + length;
+    }
+    return used;
+}
+
+int pdp8_api_restore_state(pdp8_t *cpu, const uint8_t *buffer, size_t size) {
+    struct pdp8_saved_state head;
+    if (!cpu || !buffer || size < sizeof(head)) {
+        return -1;
+    }
+    /* check the device records before touching anything */
+    struct pdp8_saved_device record;
+    size_t offset = sizeof(head);
+    while (offset < size) {
+        if (size - offset < sizeof(record)) {
+            return -1;
+        }
+        memcpy(&record, buffer + offset, sizeof(record));
+        offset += sizeof(record);
+        if (record.device_code >= 64u || record.length > size - offset) {
+            return -1;
+        }
+        offset += record.length;
+    }
+
+    memcpy(&head, buffer, sizeof(head));
+    cpu->virtual_ns = head.virtual_ns;
+    for (size_t code = 0; code < 64u; ++code) {
+        /* a handler registered since the save keeps acting on every step */
+        if (cpu->tick_handlers[code] && head.tick_deadlines[code] != PDP8_DEADLINE_NONE) {
+            cpu->tick_deadlines[code] = head.tick_deadlines[code];
+        }
+    }
+    cpu->interrupt_pending = head.interrupt_pending;
+    cpu->interrupt_since = cpu->counters.instructions;
+    cpu->pc = normalise_address(cpu, head.pc);
+    cpu->ac = head.ac & PDP8_WORD_MASK;
+    cpu->switch_register = head.switch_register & PDP8_WORD_MASK;
+    cpu->last_effective_address = head.last_effective_address;
+    cpu->wait_loop = head.wait_loop;
+    cpu->link = head.link & PDP8_LINK_MASK;
+    cpu->halted = head.halted != 0u;
+    cpu->skip_pending = head.skip_pending != 0u;
+    cpu->interrupt_enable = head.interrupt_enable != 0u;
+    cpu->wait_loop_words = head.wait_loop_words;
+    cpu->break_resume = false;
+    cpu->watch_hit = 0u;
+
+    for (offset = sizeof(head); offset < size; offset += record.length) {
+        memcpy(&record, buffer + offset, sizeof(record));
+        offset += sizeof(record);
+        if (cpu->state_restorers[record.device_code]) {
+            cpu->state_restorers[record.device_code](cpu, cpu->state_contexts[record.device_code], buffer + offset,
+                                                     record.length);
+        }
+    }
     return 0;
 }
 
@@ -510,11 +1316,156 @@ int pdp8_api_register_tick(pdp8_t *cpu, uint8_t device_code, pdp8_tick_handler h
     if (!cpu || device_code >= 64u) {
         return -1;
     }
+    if (cpu->tick_handlers[device_code] && !handler) {
+        --cpu->tick_handler_count;
+    } else if (!cpu->tick_handlers[device_code] && handler) {
+        ++cpu->tick_handler_count;
+    }
     cpu->tick_handlers[device_code] = handler;
     cpu->tick_contexts[device_code] = context;
+    /* until told otherwise, a handler may act on any step */
+    cpu->tick_deadlines[device_code] = handler ? 0u : PDP8_DEADLINE_NONE;
+    return 0;
+}
+
+int pdp8_api_set_tick_deadline(pdp8_t *cpu, uint8_t device_code, uint64_t deadline_ns) {
+    if (!cpu || device_code >= 64u || !cpu->tick_handlers[device_code]) {
+        return -1;
+    }
+    cpu->tick_deadlines[device_code] = deadline_ns;
+    return 0;
+}
+
+uint64_t pdp8_api_next_deadline(const pdp8_t *cpu) {
+    uint64_t next = PDP8_DEADLINE_NONE;
+    if (!cpu || cpu->tick_handler_count == 0u) {
+        return next;
+    }
+    for (size_t i = 0; i < 64u; ++i) {
+        if (cpu->tick_handlers[i] && cpu->tick_deadlines[i] < next) {
+            next = cpu->tick_deadlines[i];
+        }
+    }
+    return next;
+}
+
+int pdp8_api_set_idle_iot(pdp8_t *cpu, uint8_t device_code, int idle_safe) {
+    if (!cpu || device_code >= 64u) {
+        return -1;
+    }
+    if (idle_safe) {
+        cpu->idle_iot_mask |= 1ull << device_code;
+    } else {
+        cpu->idle_iot_mask &= ~(1ull << device_code);
+    }
+    return 0;
+}
+
+void pdp8_api_set_idle_skip(pdp8_t *cpu, int enabled) {
+    if (!cpu) {
+        return;
+    }
+    cpu->idle_skip = enabled != 0;
+}
+
+int pdp8_api_get_idle_skip(const pdp8_t *cpu) {
+    return cpu ? (int)cpu->idle_skip : 0;
+}
+
+void pdp8_api_set_replaying(pdp8_t *cpu, int replaying) {
+    if (!cpu) {
+        return;
+    }
+    cpu->replaying = replaying != 0;
+}
+
+int pdp8_api_is_replaying(const pdp8_t *cpu) {
+    return cpu && cpu->replaying ? 1 : 0;
+}
+
+uint64_t pdp8_api_idle_skipped(const pdp8_t *cpu) {
+    return cpu ? cpu->idle_skipped : 0u;
+}
+
+int pdp8_api_get_counters(const pdp8_t *cpu, pdp8_counters_t *counters) {
+    if (!cpu || !counters) {
+        return -1;
+    }
+    *counters = cpu->counters;
+    return 0;
+}
+
+int pdp8_api_is_waiting(const pdp8_t *cpu) {
+    if (!cpu || cpu->halted || cpu->wait_loop_words == 0u) {
+        return 0;
+    }
+    if (cpu->interrupt_enable && cpu->interrupt_pending > 0) {
+        return 0;
+    }
+    return cpu->pc == cpu->wait_loop ||
+           (cpu->wait_loop_words == 2u && cpu->pc == normalise_address(cpu, cpu->wait_loop + 1u));
+}
+
+int pdp8_api_set_clock(pdp8_t *cpu, int source, uint64_t ns_per_unit) {
+    if (!cpu) {
+        return -1;
+    }
+    switch (source) {
+    case PDP8_CLOCK_HOST:
+        break;
+    case PDP8_CLOCK_VIRTUAL_INSTRUCTION:
+    case PDP8_CLOCK_VIRTUAL_MEMORY_CYCLE:
+        if (ns_per_unit == 0u) {
+            return -1;
+        }
+        break;
+    default:
+        return -1;
+    }
+    cpu->clock_source = source;
+    cpu->clock_ns_per_unit = ns_per_unit;
     return 0;
 }
 
+int pdp8_api_get_clock_source(const pdp8_t *cpu) {
+    return cpu ? cpu->clock_source : -1;
+}
+
+uint64_t pdp8_api_get_clock_ns(const pdp8_t *cpu) {
+    return cpu ? cpu->clock_ns_per_unit : 0u;
+}
+
+uint64_t pdp8_api_now_ns(const pdp8_t *cpu) {
+    if (!cpu) {
+        return host_now_ns();
+    }
+    if (cpu->clock_source != PDP8_CLOCK_HOST) {
+        return cpu->virtual_ns;
+    }
+    uint64_t now = host_now_ns();
+    pdp8_api_input(cpu, cpu->in_iot ? PDP8_INPUT_CLOCK : PDP8_INPUT_CLOCK_HOST, &now);
+    return now;
+}
+
+void pdp8_api_set_input_hook(pdp8_t *cpu, pdp8_input_hook hook, void *context) {
+    if (!cpu) {
+        return;
+    }
+    cpu->input_hook = hook;
+    cpu->input_context = hook ? context : NULL;
+}
+
+int pdp8_api_input(const pdp8_t *cpu, int source, uint64_t *value) {
+    if (!cpu || !value || !cpu->input_hook) {
+        return 0;
+    }
+    return cpu->input_hook(cpu, cpu->input_context, source, value) == 0 ? 0 : -1;
+}
+
+uint64_t pdp8_api_instruction_count(const pdp8_t *cpu) {
+    return cpu ? cpu->counters.instructions : 0u;
+}
+
 void pdp8_api_request_skip(pdp8_t *cpu) {
     if (!cpu) {
         return;
@@ -542,7 +1493,11 @@ int pdp8_api_request_interrupt(pdp8_t *cpu, uint8_t device_code) {
         return -1;
     }
     (void)device_code;  /* Parameter for logging/debugging purposes */
+    if (cpu->interrupt_pending <= 0) {
+        cpu->interrupt_since = cpu->counters.instructions;
+    }
     cpu->interrupt_pending++;
+    cpu->counters.interrupt_requests++;
     return 0;
 }
 
@@ -0,0 +1,159 @@
+#include "output_buffer.h"
+
+#include <stdlib.h>
+#include <string.h>
+
+static const char *const policy_names[] = {"char", "line", "bytes", "halt", "manual"};
+
+int pdp8_output_flush_policy_parse(const char *name, pdp8_output_flush_policy *out_policy) {
+    if (!name || !out_policy) {
+        return -1;
+    }
+    for (size_t i = 0; i < sizeof(policy_names) / sizeof(policy_names[0]); ++i) {
+        if (strcmp(name, policy_names[i]) == 0) {
+            *out_policy = (pdp8_output_flush_policy)i;
+            return 0;
+        }
+    }
+    return -1;
+}
+
+const char *pdp8_output_flush_policy_name(pdp8_output_flush_policy policy) {
+    if ((size_t)policy >= sizeof(policy_names) / sizeof(policy_names[0])) {
+        return "unknown";
+    }
+    return policy_names[policy];
+}
+
+static int output_buffer_write_pending(pdp8_output_buffer *buffer) {
+    if (buffer->size == 0u) {
+        return 0;
+    }
+    size_t pending = buffer->size;
+    buffer->size = 0u;
+    if (!buffer->stream) {
+        return 0;
+    }
+    if (fwrite(buffer->data, 1u, pending, buffer->stream) != pending) {
+        return -1;
+    }
+    return 0;
+}
+
+void pdp8_output_buffer_init(pdp8_output_buffer *buffer, FILE *stream) {
+    if (!buffer) {
+        return;
+    }
+    memset(buffer, 0, sizeof(*buffer));
+    buffer->stream = stream;
+    buffer->policy = PDP8_OUTPUT_FLUSH_CHAR;
+    buffer->threshold = PDP8_OUTPUT_BUFFER_DEFAULT_CAPACITY;
+}
+
+void pdp8_output_buffer_release(pdp8_output_buffer *buffer) {
+    if (!buffer) {
+        return;
+    }
+    pdp8_output_buffer_flush(buffer);
+    free(buffer->data);
+    buffer->data = NULL;
+    buffer->size = 0u;
+    buffer->capacity = 0u;
+}
+
+int pdp8_output_buffer_set_policy(pdp8_output_buffer *buffer,
+                                  pdp8_output_flush_policy policy,
+                                  size_t threshold) {
+    if (!buffer || (size_t)policy >= sizeof(policy_names) / sizeof(policy_names[0])) {
+        return -1;
+    }
+    pdp8_output_buffer_flush(buffer);
+    size_t capacity = PDP8_OUTPUT_BUFFER_DEFAULT_CAPACITY;
+    if (policy == PDP8_OUTPUT_FLUSH_BYTES && threshold > 0u) {
+        buffer->threshold = threshold;
+        if (threshold > capacity) {
+            capacity = threshold;
+        }
+    }
+    if (policy != PDP8_OUTPUT_FLUSH_CHAR && capacity != buffer->capacity) {
+        uint8_t *data = (uint8_t *)realloc(buffer->data, capacity);
+        if (!data) {
+            return -1;
+        }
+        buffer->data = data;
+        buffer->capacity = capacity;
+    }
+    buffer->policy = policy;
+    return 0;
+}
+
+int pdp8_output_buffer_set_stream(pdp8_output_buffer *buffer, FILE *stream) {
+    if (!buffer) {
+        return -1;
+    }
+    pdp8_output_buffer_flush(buffer);
+    buffer->stream = stream;
+    return 0;
+}
+
+void pdp8_output_buffer_put(pdp8_output_buffer *buffer, uint8_t ch) {
+    if (!buffer || !buffer->stream) {
+        return;
+    }
+    if (ch == '\n' || ch == '\f') {
+        buffer->line_ended = true;
+    }
+    if (buffer->capacity == 0u) {
+        fputc((int)ch, buffer->stream);
+        return;
+    }
+    if (buffer->size == buffer->capacity) {
+        output_buffer_write_pending(buffer);
+    }
+    buffer->data[buffer->size++] = ch;
+}
+
+void pdp8_output_buffer_puts(pdp8_output_buffer *buffer, const char *text) {
+    if (!text) {
+        return;
+    }
+    while (*text) {
+        pdp8_output_buffer_put(buffer, (uint8_t)*text++);
+    }
+}
+
+void pdp8_output_buffer_commit(pdp8_output_buffer *buffer) {
+    if (!buffer || !buffer->stream) {
+        return;
+    }
+    bool flush = false;
+    switch (buffer->policy) {
+    case PDP8_OUTPUT_FLUSH_CHAR:
+        flush = true;
+        break;
+    case PDP8_OUTPUT_FLUSH_LINE:
+        flush = buffer->line_ended;
+        break;
+    case PDP8_OUTPUT_FLUSH_BYTES:
+        flush = buffer->size >= buffer->threshold;
+        break;
+    case PDP8_OUTPUT_FLUSH_HALT:
+    case PDP8_OUTPUT_FLUSH_MANUAL:
+        break;
+    }
+    buffer->line_ended = false;
+    if (flush) {
+        pdp8_output_buffer_flush(buffer);
+    }
+}
+
+int pdp8_output_buffer_flush(pdp8_output_buffer *buffer) {
+    if (!buffer) {
+        return -1;
+    }
+    int rc = output_buffer_write_pending(buffer);
+    if (buffer->stream && fflush(buffer->stream) != 0) {
+        rc = -1;
+    }
+    return rc;
+}
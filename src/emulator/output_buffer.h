@@ -0,0 +1,58 @@
+#ifndef PDP8_OUTPUT_BUFFER_H
+#define PDP8_OUTPUT_BUFFER_H
+
+#include <stdbool.h>
+#include <stddef.h>
+#include <stdint.h>
+#include <stdio.h>
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/* When a character-output device (line printer, paper tape punch) pushes its
+ * buffered bytes to the host stream. Bytes are also written out whenever the
+ * buffer fills, and always on destroy or an explicit device flush call. */
+typedef enum pdp8_output_flush_policy {
+    PDP8_OUTPUT_FLUSH_CHAR = 0,   /* after every character (unbuffered) */
+    PDP8_OUTPUT_FLUSH_LINE = 1,   /* after LF or FF */
+    PDP8_OUTPUT_FLUSH_BYTES = 2,  /* once the threshold number of bytes is pending */
+    PDP8_OUTPUT_FLUSH_HALT = 3,   /* when the CPU halts */
+    PDP8_OUTPUT_FLUSH_MANUAL = 4, /* only on explicit flush / destroy */
+} pdp8_output_flush_policy;
+
+#define PDP8_OUTPUT_BUFFER_DEFAULT_CAPACITY 4096u
+
+typedef struct pdp8_output_buffer {
+    FILE *stream;
+    uint8_t *data;
+    size_t size;
+    size_t capacity;
+    size_t threshold;
+    pdp8_output_flush_policy policy;
+    bool line_ended;
+} pdp8_output_buffer;
+
+/* Parse "char", "line", "bytes", "halt" or "manual". Returns 0 on success. */
+int pdp8_output_flush_policy_parse(const char *name, pdp8_output_flush_policy *out_policy);
+const char *pdp8_output_flush_policy_name(pdp8_output_flush_policy policy);
+
+void pdp8_output_buffer_init(pdp8_output_buffer *buffer, FILE *stream);
+/* Flush pending bytes and release storage. The stream is not closed. */
+void pdp8_output_buffer_release(pdp8_output_buffer *buffer);
+int pdp8_output_buffer_set_policy(pdp8_output_buffer *buffer,
+                                  pdp8_output_flush_policy policy,
+                                  size_t threshold);
+/* Flush pending bytes to the current stream, then switch streams. */
+int pdp8_output_buffer_set_stream(pdp8_output_buffer *buffer, FILE *stream);
+void pdp8_output_buffer_put(pdp8_output_buffer *buffer, uint8_t ch);
+void pdp8_output_buffer_puts(pdp8_output_buffer *buffer, const char *text);
+/* Apply the flush policy at the end of a device operation. */
+void pdp8_output_buffer_commit(pdp8_output_buffer *buffer);
+int pdp8_output_buffer_flush(pdp8_output_buffer *buffer);
+
+#ifdef __cplusplus
+}
+#endif
+
+#endif /* PDP8_OUTPUT_BUFFER_H */
@@ -0,0 +1,111 @@
+#include "output_ring.h"
+
+#include <stdlib.h>
+#include <string.h>
+
+struct pdp8_output_ring {
+    uint8_t *data;
+    size_t capacity;
+    uint64_t end;
+};
+
+pdp8_output_ring_t *pdp8_output_ring_create(size_t capacity) {
+    if (capacity == 0u) {
+        capacity = PDP8_OUTPUT_RING_DEFAULT_CAPACITY;
+    }
+    pdp8_output_ring_t *ring = (pdp8_output_ring_t *)calloc(1, sizeof(pdp8_output_ring_t));
+    if (!ring) {
+        return NULL;
+    }
+    ring->data = (uint8_t *)malloc(capacity);
+    if (!ring->data) {
+        free(ring);
+        return NULL;
+    }
+    ring->capacity = capacity;
+    return ring;
+}
+
+void pdp8_output_ring_destroy(pdp8_output_ring_t *ring) {
+    if (!ring) {
+        return;
+    }
+    free(ring->data);
+    free(ring);
+}
+
+void pdp8_output_ring_push(uint8_t ch, void *context) {
+    pdp8_output_ring_t *ring = (pdp8_output_ring_t *)context;
+    if (!ring) {
+        return;
+    }
+    ring->data[ring->end % ring->capacity] = ch;
+    ring->end++;
+}
+
+void pdp8_output_ring_clear(pdp8_output_ring_t *ring) {
+    if (!ring) {
+        return;
+    }
+    ring->end = 0u;
+}
+
+void pdp8_output_ring_restore(pdp8_output_ring_t *ring, uint64_t begin, const uint8_t *data, size_t count) {
+    if (!ring || (!data && count)) {
+        return;
+    }
+    ring->end = begin;
+    for (size_t i = 0; i < count; ++i) {
+        pdp8_output_ring_push(data[i], ring);
+    }
+}
+
+uint64_t pdp8_output_ring_end(const pdp8_output_ring_t *ring) {
+    return ring ? ring->end : 0u;
+}
+
+uint64_t pdp8_output_ring_begin(const pdp8_output_ring_t *ring) {
+    if (!ring) {
+        return 0u;
+    }
+    return ring->end > ring->capacity ? ring->end - ring->capacity : 0u;
+}
+
+size_t pdp8_output_ring_read(const pdp8_output_ring_t *ring,
+                             uint64_t since,
+                             uint8_t *dst,
+                             size_t max,
+                             uint64_t *out_start) {
+    if (!ring) {
+        if (out_start) {
+            *out_start = 0u;
+        }
+        return 0u;
+    }
+
+    uint64_t begin = pdp8_output_ring_begin(ring);
+    uint64_t start = since < begin ? begin : since;
+    if (start > ring->end) {
+        start = ring->end;
+    }
+    if (out_start) {
+        *out_start = start;
+    }
+
+    uint64_t available = ring->end - start;
+    size_t count = available < (uint64_t)max ? (size_t)available : max;
+    if (!dst || count == 0u) {
+        return 0u;
+    }
+
+    size_t index = (size_t)(start % ring->capacity);
+    size_t first = ring->capacity - index;
+    if (first > count) {
+        first = count;
+    }
+    memcpy(dst, ring->data + index, first);
+    if (count > first) {
+        memcpy(dst + first, ring->data, count - first);
+    }
+    return count;
+}
@@ -0,0 +1,46 @@
+#ifndef PDP8_OUTPUT_RING_H
+#define PDP8_OUTPUT_RING_H
+
+#include <stddef.h>
+#include <stdint.h>
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/* Bounded in-memory capture of device output. Every byte gets a monotonically
+ * increasing offset; once the ring is full the oldest bytes are dropped but
+ * offsets keep counting, so readers can poll with "give me everything since
+ * offset N" and detect when they fell behind. */
+typedef struct pdp8_output_ring pdp8_output_ring_t;
+
+#define PDP8_OUTPUT_RING_DEFAULT_CAPACITY 65536u
+
+pdp8_output_ring_t *pdp8_output_ring_create(size_t capacity);
+void pdp8_output_ring_destroy(pdp8_output_ring_t *ring);
+/* Matches the KL8E / line printer output callback signature so the ring can be
+ * installed directly as a device callback with itself as the context. */
+void pdp8_output_ring_push(uint8_t ch, void *context);
+void pdp8_output_ring_clear(pdp8_output_ring_t *ring);
+/* Refill the ring with count bytes whose first byte has offset begin, as read
+ * back from another ring, so offsets carry on where they left off. Only the
+ * newest capacity bytes are kept, as if they had been pushed. */
+void pdp8_output_ring_restore(pdp8_output_ring_t *ring, uint64_t begin, const uint8_t *data, size_t count);
+/* Offset one past the newest byte (total bytes ever pushed). */
+uint64_t pdp8_output_ring_end(const pdp8_output_ring_t *ring);
+/* Offset of the oldest byte still held. */
+uint64_t pdp8_output_ring_begin(const pdp8_output_ring_t *ring);
+/* Copy up to max bytes starting at offset since (clamped to the retained
+ * window) into dst. The offset actually used is stored in *out_start.
+ * Returns the number of bytes copied. */
+size_t pdp8_output_ring_read(const pdp8_output_ring_t *ring,
+                             uint64_t since,
+                             uint8_t *dst,
+                             size_t max,
+                             uint64_t *out_start);
+
+#ifdef __cplusplus
+}
+#endif
+
+#endif /* PDP8_OUTPUT_RING_H */
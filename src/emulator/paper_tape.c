@@ -1,3 +1,4 @@
+#define _POSIX_C_SOURCE 200809L
 #include "paper_tape.h"
 
 #include <ctype.h>
@@ -7,6 +8,53 @@
 #include <stdarg.h>
 #include <errno.h>
 #include <stdbool.h>
+#include <sys/stat.h>
+
+#if defined(__unix__) || defined(__APPLE__)
+#define PAPER_TAPE_HAVE_MMAP 1
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <unistd.h>
+#endif
+
+/* Compiled image layout (all fields host byte order, checked via byte_order):
+ *   header
+ *   block table: block_count entries sorted by block number
+ *   words: total_words packed 12-bit words, one uint16_t each
+ */
+#define PAPER_TAPE_COMPILED_MAGIC "P8PT"
+#define PAPER_TAPE_COMPILED_VERSION 2u
+#define PAPER_TAPE_COMPILED_BYTE_ORDER 0x0102u
+
+struct paper_tape_compiled_header {
+    char magic[4];
+    uint16_t version;
+    uint16_t byte_order;
+    char label[4];
+    uint32_t block_count;
+    uint32_t total_words;
+    uint32_t source_mtime_ns; /* also keeps the 64-bit fields aligned on every ABI */
+    uint64_t source_size;   /* 0 with source_mtime 0: not tied to a text source */
+    int64_t source_mtime;
+};
+
+/* Sub-second part of a file's mtime, so an edit within the same second that
+ * keeps the length still invalidates the image; 0 where st_mtim is missing. */
+static uint32_t stat_mtime_ns(const struct stat *st) {
+#if defined(_POSIX_C_SOURCE) && _POSIX_C_SOURCE >= 200809L && !defined(__APPLE__)
+    return (uint32_t)st->st_mtim.tv_nsec;
+#else
+    (void)st;
+    return 0u;
+#endif
+}
+
+struct paper_tape_compiled_entry {
+    uint16_t block;
+    uint16_t reserved;
+    uint32_t word_count;
+    uint64_t word_offset;   /* index into the packed words array */
+};
 
 static bool is_valid_label_char(int ch) {
     return (ch >= 'A' && ch <= 'Z') || (ch >= '0' && ch <= '9');
@@ -43,6 +91,23 @@ static int ensure_block_capacity(pdp8_paper_tape *image, size_t desired_count) {
     return 0;
 }
 
+static int compare_blocks(const void *lhs, const void *rhs) {
+    const pdp8_paper_tape_block *a = (const pdp8_paper_tape_block *)lhs;
+    const pdp8_paper_tape_block *b = (const pdp8_paper_tape_block *)rhs;
+    return (a->block > b->block) - (a->block < b->block);
+}
+
+/* Sort blocks by number and rebuild the direct lookup index. */
+static void paper_tape_sort_blocks(pdp8_paper_tape *image) {
+    if (image->block_count > 1u) {
+        qsort(image->blocks, image->block_count, sizeof(pdp8_paper_tape_block), compare_blocks);
+    }
+    memset(image->block_index, 0, sizeof(image->block_index));
+    for (size_t i = 0; i < image->block_count; ++i) {
+        image->block_index[image->blocks[i].block % PDP8_PAPER_TAPE_MAX_BLOCKS] = (uint16_t)(i + 1u);
+    }
+}
+
 static int parse_bits(const char *text, uint16_t **out_words, size_t *out_word_count) {
     size_t bit_capacity = 64;
     size_t bit_count = 0;
@@ -135,11 +200,7 @@ static void analyze_bit_text(size_t line_number, const char *text) {
     }
 }
 
-int pdp8_paper_tape_load(const char *path, pdp8_paper_tape **out_image) {
-    if (!path || !out_image) {
-        return -1;
-    }
-
+static int paper_tape_parse_text(const char *path, pdp8_paper_tape **out_image) {
     *out_image = NULL;
 
     FILE *fp = fopen(path, "r");
@@ -365,14 +426,12 @@ int pdp8_paper_tape_load(const char *path, pdp8_paper_tape **out_image) {
         }
 
         uint16_t block_value = (uint16_t)strtoul(block_text, NULL, 8);
-        for (size_t i = 0; i < image->block_count; ++i) {
-            if (image->blocks[i].block == block_value) {
-                paper_tape_report_error(line_number, "duplicate block number %s", block_text);
-                free(words);
-                pdp8_paper_tape_destroy(image);
-                fclose(fp);
-                return -1;
-            }
+        if (image->block_index[block_value] != 0u) {
+            paper_tape_report_error(line_number, "duplicate block number %s", block_text);
+            free(words);
+            pdp8_paper_tape_destroy(image);
+            fclose(fp);
+            return -1;
         }
 
         if (ensure_block_capacity(image, image->block_count + 1) != 0) {
@@ -388,6 +447,7 @@ int pdp8_paper_tape_load(const char *path, pdp8_paper_tape **out_image) {
         block->word_count = word_count;
         block->words = words;
         image->block_count += 1;
+        image->block_index[block_value] = (uint16_t)image->block_count;
         /* record parser used for this block */
         if (parser_used_count + 1 > parser_used_capacity) {
             size_t newcap = parser_used_capacity ? parser_used_capacity * 2 : 8;
@@ -443,31 +503,295 @@ int pdp8_paper_tape_load(const char *path, pdp8_paper_tape **out_image) {
             image->label);
     free(parser_used);
 
+    paper_tape_sort_blocks(image);
     *out_image = image;
     return 0;
 }
 
+static char *compiled_path_for(const char *source_path) {
+    size_t len = strlen(source_path);
+    size_t suffix_len = strlen(PDP8_PAPER_TAPE_COMPILED_SUFFIX);
+    char *path = (char *)malloc(len + suffix_len + 1u);
+    if (!path) {
+        return NULL;
+    }
+    memcpy(path, source_path, len);
+    memcpy(path + len, PDP8_PAPER_TAPE_COMPILED_SUFFIX, suffix_len + 1u);
+    return path;
+}
+
+static void *read_whole_file(const char *path, size_t *out_size, bool *out_mapped) {
+    *out_size = 0u;
+    *out_mapped = false;
+#ifdef PAPER_TAPE_HAVE_MMAP
+    int fd = open(path, O_RDONLY);
+    if (fd < 0) {
+        return NULL;
+    }
+    struct stat st;
+    if (fstat(fd, &st) != 0 || st.st_size <= 0) {
+        close(fd);
+        return NULL;
+    }
+    void *data = mmap(NULL, (size_t)st.st_size, PROT_READ, MAP_PRIVATE, fd, 0);
+    close(fd);
+    if (data == MAP_FAILED) {
+        return NULL;
+    }
+    *out_size = (size_t)st.st_size;
+    *out_mapped = true;
+    return data;
+#else
+    FILE *fp = fopen(path, "rb");
+    if (!fp) {
+        return NULL;
+    }
+    if (fseek(fp, 0, SEEK_END) != 0) {
+        fclose(fp);
+        return NULL;
+    }
+    long size = ftell(fp);
+    if (size <= 0 || fseek(fp, 0, SEEK_SET) != 0) {
+        fclose(fp);
+        return NULL;
+    }
+    void *data = malloc((size_t)size);
+    if (!data || fread(data, 1u, (size_t)size, fp) != (size_t)size) {
+        free(data);
+        fclose(fp);
+        return NULL;
+    }
+    fclose(fp);
+    *out_size = (size_t)size;
+    return data;
+#endif
+}
+
+static void release_file_data(void *data, size_t size, bool mapped) {
+    if (!data) {
+        return;
+    }
+#ifdef PAPER_TAPE_HAVE_MMAP
+    if (mapped) {
+        munmap(data, size);
+        return;
+    }
+#endif
+    (void)size;
+    (void)mapped;
+    free(data);
+}
+
+/* Validate a compiled image and build a tape whose block words point straight
+ * into the file data. When source is non-NULL the image must record the same
+ * size and mtime (to the nanosecond where available) as the text source. Returns 1 on success, 0 if the data is
+ * not a (fresh) compiled image, -1 on allocation failure. */
+static int paper_tape_adopt_compiled(void *data, size_t size, bool mapped,
+                                     const struct stat *source, pdp8_paper_tape **out_image) {
+    const struct paper_tape_compiled_header *header = (const struct paper_tape_compiled_header *)data;
+    if (size < sizeof(*header) || memcmp(header->magic, PAPER_TAPE_COMPILED_MAGIC, 4) != 0 ||
+        header->version != PAPER_TAPE_COMPILED_VERSION ||
+        header->byte_order != PAPER_TAPE_COMPILED_BYTE_ORDER ||
+        header->block_count == 0u || header->block_count > PDP8_PAPER_TAPE_MAX_BLOCKS) {
+        return 0;
+    }
+    if (source && (header->source_size != (uint64_t)source->st_size ||
+                   header->source_mtime != (int64_t)source->st_mtime ||
+                   header->source_mtime_ns != stat_mtime_ns(source))) {
+        return 0;
+    }
+
+    size_t table_bytes = (size_t)header->block_count * sizeof(struct paper_tape_compiled_entry);
+    size_t words_offset = sizeof(*header) + table_bytes;
+    if (size < words_offset || (size - words_offset) / sizeof(uint16_t) < header->total_words) {
+        return 0;
+    }
+
+    const struct paper_tape_compiled_entry *entries =
+        (const struct paper_tape_compiled_entry *)((const char *)data + sizeof(*header));
+    uint16_t *words = (uint16_t *)((char *)data + words_offset);
+
+    pdp8_paper_tape *image = (pdp8_paper_tape *)calloc(1, sizeof(pdp8_paper_tape));
+    if (!image) {
+        return -1;
+    }
+    if (ensure_block_capacity(image, header->block_count) != 0) {
+        free(image);
+        return -1;
+    }
+
+    for (uint32_t i = 0; i < header->block_count; ++i) {
+        const struct paper_tape_compiled_entry *entry = &entries[i];
+        if (entry->block >= PDP8_PAPER_TAPE_MAX_BLOCKS ||
+            entry->word_count > PDP8_PAPER_TAPE_MAX_HALFWORDS ||
+            entry->word_offset > header->total_words ||
+            header->total_words - entry->word_offset < entry->word_count ||
+            image->block_index[entry->block] != 0u ||
+            (i > 0u && entries[i - 1u].block >= entry->block)) {
+            free(image->blocks);
+            free(image);
+            return 0;
+        }
+        pdp8_paper_tape_block *block = &image->blocks[i];
+        block->block = entry->block;
+        block->word_count = entry->word_count;
+        block->words = words + entry->word_offset;
+        image->block_index[entry->block] = (uint16_t)(i + 1u);
+    }
+    image->block_count = header->block_count;
+    memcpy(image->label, header->label, 2u);
+    image->label[2] = '\0';
+
+    image->mapping = data;
+    image->mapping_size = size;
+    if (!mapped) {
+        /* Heap-backed fallback: remember to free() rather than munmap(). */
+        image->mapping_size = 0u;
+    }
+    *out_image = image;
+    return 1;
+}
+
+/* Try to load path itself as a compiled image (source == NULL), or a compiled
+ * sibling validated against source. Returns 0 on success. */
+static int paper_tape_load_compiled(const char *path, const struct stat *source,
+                                    pdp8_paper_tape **out_image) {
+    size_t size = 0u;
+    bool mapped = false;
+    void *data = read_whole_file(path, &size, &mapped);
+    if (!data) {
+        return -1;
+    }
+    if (paper_tape_adopt_compiled(data, size, mapped, source, out_image) != 1) {
+        release_file_data(data, size, mapped);
+        return -1;
+    }
+    return 0;
+}
+
+int pdp8_paper_tape_load(const char *path, pdp8_paper_tape **out_image) {
+    if (!path || !out_image) {
+        return -1;
+    }
+    *out_image = NULL;
+
+    if (paper_tape_load_compiled(path, NULL, out_image) == 0) {
+        return 0;
+    }
+
+    struct stat source;
+    if (stat(path, &source) == 0) {
+        char *compiled = compiled_path_for(path);
+        if (compiled) {
+            int rc = paper_tape_load_compiled(compiled, &source, out_image);
+            if (rc == 0) {
+                fprintf(stderr, "paper_tape_load: Loaded %zu blocks from %s (compiled) label=%s\n",
+                        (*out_image)->block_count, compiled, (*out_image)->label);
+            }
+            free(compiled);
+            if (rc == 0) {
+                return 0;
+            }
+        }
+    }
+
+    return paper_tape_parse_text(path, out_image);
+}
+
+int pdp8_paper_tape_compile(const char *source_path, const char *out_path) {
+    if (!source_path) {
+        return -1;
+    }
+    struct stat source;
+    if (stat(source_path, &source) != 0) {
+        return -1;
+    }
+
+    pdp8_paper_tape *image = NULL;
+    if (paper_tape_parse_text(source_path, &image) != 0) {
+        return -1;
+    }
+
+    char *default_path = NULL;
+    if (!out_path) {
+        default_path = compiled_path_for(source_path);
+        if (!default_path) {
+            pdp8_paper_tape_destroy(image);
+            return -1;
+        }
+        out_path = default_path;
+    }
+
+    struct paper_tape_compiled_header header;
+    memset(&header, 0, sizeof(header));
+    memcpy(header.magic, PAPER_TAPE_COMPILED_MAGIC, 4);
+    header.version = PAPER_TAPE_COMPILED_VERSION;
+    header.byte_order = PAPER_TAPE_COMPILED_BYTE_ORDER;
+    memcpy(header.label, image->label, 2u);
+    header.block_count = (uint32_t)image->block_count;
+    header.source_size = (uint64_t)source.st_size;
+    header.source_mtime = (int64_t)source.st_mtime;
+    header.source_mtime_ns = stat_mtime_ns(&source);
+
+    uint64_t total_words = 0u;
+    for (size_t i = 0; i < image->block_count; ++i) {
+        total_words += image->blocks[i].word_count;
+    }
+    header.total_words = (uint32_t)total_words;
+
+    int rc = -1;
+    FILE *fp = fopen(out_path, "wb");
+    if (fp) {
+        bool ok = fwrite(&header, sizeof(header), 1u, fp) == 1u;
+        uint64_t offset = 0u;
+        for (size_t i = 0; ok && i < image->block_count; ++i) {
+            struct paper_tape_compiled_entry entry;
+            memset(&entry, 0, sizeof(entry));
+            entry.block = image->blocks[i].block;
+            entry.word_count = (uint32_t)image->blocks[i].word_count;
+            entry.word_offset = offset;
+            offset += entry.word_count;
+            ok = fwrite(&entry, sizeof(entry), 1u, fp) == 1u;
+        }
+        for (size_t i = 0; ok && i < image->block_count; ++i) {
+            size_t count = image->blocks[i].word_count;
+            ok = count == 0u || fwrite(image->blocks[i].words, sizeof(uint16_t), count, fp) == count;
+        }
+        if (fclose(fp) != 0) {
+            ok = false;
+        }
+        if (ok) {
+            rc = 0;
+        } else {
+            remove(out_path);
+        }
+    }
+
+    free(default_path);
+    pdp8_paper_tape_destroy(image);
+    return rc;
+}
+
 void pdp8_paper_tape_destroy(pdp8_paper_tape *image) {
     if (!image) {
         return;
     }
-    if (image->blocks) {
+    if (image->mapping) {
+        /* Block words live inside the compiled image. */
+        release_file_data(image->mapping, image->mapping_size, image->mapping_size != 0u);
+    } else if (image->blocks) {
         for (size_t i = 0; i < image->block_count; ++i) {
             free(image->blocks[i].words);
         }
-        free(image->blocks);
     }
+    free(image->blocks);
     free(image);
 }
 
 const pdp8_paper_tape_block *pdp8_paper_tape_find(const pdp8_paper_tape *image, uint16_t block) {
-    if (!image) {
+    if (!image || block >= PDP8_PAPER_TAPE_MAX_BLOCKS) {
         return NULL;
     }
-    for (size_t i = 0; i < image->block_count; ++i) {
-        if (image->blocks[i].block == block) {
-            return &image->blocks[i];
-        }
-    }
-    return NULL;
+    uint16_t slot = image->block_index[block];
+    return slot ? &image->blocks[slot - 1u] : NULL;
 }
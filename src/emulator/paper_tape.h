@@ -10,18 +10,33 @@ typedef struct pdp8_paper_tape_block {
     uint16_t *words;           /* Array of 12-bit words (upper bits zeroed). */
 } pdp8_paper_tape_block;
 
+#define PDP8_PAPER_TAPE_MAX_HALFWORDS 64u
+#define PDP8_PAPER_TAPE_MAX_WORDS ((PDP8_PAPER_TAPE_MAX_HALFWORDS) / 2u)
+#define PDP8_PAPER_TAPE_MAX_BLOCKS 01000u  /* three octal digits */
+
+/* Compiled images live next to their text source with this suffix
+ * (tapes/foo.tape -> tapes/foo.tape.ptc). See tools/compile_tape.py. */
+#define PDP8_PAPER_TAPE_COMPILED_SUFFIX ".ptc"
+
 typedef struct pdp8_paper_tape {
     char label[3];                    /* Two-character tape label, null-terminated. */
     size_t block_count;               /* Number of blocks parsed. */
     size_t block_capacity;            /* Allocated capacity for blocks array. */
-    pdp8_paper_tape_block *blocks;    /* Block array. */
+    pdp8_paper_tape_block *blocks;    /* Block array, sorted by block number. */
+    uint16_t block_index[PDP8_PAPER_TAPE_MAX_BLOCKS]; /* block number -> position + 1, 0 if absent. */
+    void *mapping;                    /* Compiled image backing the words, or NULL. */
+    size_t mapping_size;
 } pdp8_paper_tape;
 
-#define PDP8_PAPER_TAPE_MAX_HALFWORDS 64u
-#define PDP8_PAPER_TAPE_MAX_WORDS ((PDP8_PAPER_TAPE_MAX_HALFWORDS) / 2u)
-
+/* Load a tape. Accepts a text tape or a compiled image; for a text tape a
+ * compiled sibling (path + PDP8_PAPER_TAPE_COMPILED_SUFFIX) is used instead of
+ * parsing when its recorded source size and mtime still match. */
 int pdp8_paper_tape_load(const char *path, pdp8_paper_tape **out_image);
 void pdp8_paper_tape_destroy(pdp8_paper_tape *image);
 const pdp8_paper_tape_block *pdp8_paper_tape_find(const pdp8_paper_tape *image, uint16_t block);
 
+/* Parse the text tape at source_path and write a compiled image to out_path
+ * (NULL means source_path + PDP8_PAPER_TAPE_COMPILED_SUFFIX). Returns 0 on success. */
+int pdp8_paper_tape_compile(const char *source_path, const char *out_path);
+
 #endif /* PDP8_PAPER_TAPE_H */
@@ -6,6 +6,7 @@
 #include <stdbool.h>
 #include <stdint.h>
 #include <stdlib.h>
+#include <string.h>
 
 struct pdp8_paper_tape_device {
     pdp8_paper_tape *image;
@@ -57,12 +58,54 @@ static void paper_tape_device_iot(pdp8_t *cpu, uint16_t instruction, void *conte
             device->ready = false;
             return;
         }
-        uint16_t word = device->current->words[device->index++] & 0x0FFFu;
-        pdp8_api_set_ac(cpu, word);
+        uint64_t word = device->current->words[device->index++] & 0x0FFFu;
+        pdp8_api_input(cpu, PDP8_INPUT_PAPER_TAPE, &word);
+        pdp8_api_set_ac(cpu, (uint16_t)(word & 0x0FFFu));
         device->ready = (device->index < device->current->word_count);
     }
 }
 
+/* Checkpoint state: the selected block by number, so it survives reloading. */
+struct paper_tape_saved_state {
+    uint32_t index;
+    uint16_t block;
+    uint8_t selected;
+    uint8_t ready;
+};
+
+static size_t paper_tape_device_save_state(const pdp8_t *cpu, void *context, uint8_t *buffer, size_t size) {
+    (void)cpu;
+    const pdp8_paper_tape_device_t *device = (const pdp8_paper_tape_device_t *)context;
+    struct paper_tape_saved_state saved;
+    memset(&saved, 0, sizeof(saved));
+    saved.index = (uint32_t)device->index;
+    saved.block = device->current ? device->current->block : 0u;
+    saved.selected = device->current != NULL;
+    saved.ready = device->ready;
+    if (buffer && size >= sizeof(saved)) {
+        memcpy(buffer, &saved, sizeof(saved));
+    }
+    return sizeof(saved);
+}
+
+static void paper_tape_device_restore_state(pdp8_t *cpu, void *context, const uint8_t *buffer, size_t size) {
+    (void)cpu;
+    pdp8_paper_tape_device_t *device = (pdp8_paper_tape_device_t *)context;
+    struct paper_tape_saved_state saved;
+    if (size != sizeof(saved)) {
+        return;
+    }
+    memcpy(&saved, buffer, sizeof(saved));
+    paper_tape_device_reset(device);
+    if (saved.selected && device->image) {
+        device->current = pdp8_paper_tape_find(device->image, saved.block);
+    }
+    if (device->current) {
+        device->index = saved.index;
+        device->ready = saved.ready != 0u;
+    }
+}
+
 pdp8_paper_tape_device_t *pdp8_paper_tape_device_create(void) {
     pdp8_paper_tape_device_t *device = (pdp8_paper_tape_device_t *)calloc(1, sizeof(pdp8_paper_tape_device_t));
     if (!device) {
@@ -87,7 +130,12 @@ int pdp8_paper_tape_device_attach(pdp8_t *cpu, pdp8_paper_tape_device_t *device)
     if (!cpu || !device) {
         return -1;
     }
-    return pdp8_api_register_iot(cpu, (uint8_t)PDP8_PAPER_TAPE_DEVICE_CODE, paper_tape_device_iot, device);
+    if (pdp8_api_register_iot(cpu, (uint8_t)PDP8_PAPER_TAPE_DEVICE_CODE, paper_tape_device_iot, device) != 0) {
+        return -1;
+    }
+    pdp8_api_register_state(cpu, (uint8_t)PDP8_PAPER_TAPE_DEVICE_CODE, paper_tape_device_save_state,
+                            paper_tape_device_restore_state, device);
+    return 0;
 }
 
 int pdp8_paper_tape_device_load(pdp8_paper_tape_device_t *device, const char *path) {
@@ -1,5 +1,6 @@
 #include "paper_tape_punch.h"
 
+#include "output_buffer.h"
 #include "pdp8.h"
 
 #include <stdbool.h>
@@ -7,7 +8,8 @@
 #include <string.h>
 
 struct pdp8_paper_tape_punch {
-    FILE *stream;
+    pdp8_output_buffer output;
+    pdp8_t *cpu;
     bool owns_stream;
     bool ready;
     size_t bytes_written;
@@ -19,10 +21,11 @@ static void punch_close_stream(struct pdp8_paper_tape_punch *punch) {
     if (!punch) {
         return;
     }
-    if (punch->owns_stream && punch->stream) {
-        fclose(punch->stream);
+    FILE *stream = punch->output.stream;
+    pdp8_output_buffer_set_stream(&punch->output, NULL);
+    if (punch->owns_stream && stream) {
+        fclose(stream);
     }
-    punch->stream = NULL;
     punch->owns_stream = false;
 }
 
@@ -30,16 +33,34 @@ static void punch_emit(struct pdp8_paper_tape_punch *punch, uint8_t value) {
     if (!punch) {
         return;
     }
-    if (punch->stream) {
-        fputc((int)value, punch->stream);
-        fflush(punch->stream);
-    }
+    pdp8_output_buffer_put(&punch->output, value);
+    pdp8_output_buffer_commit(&punch->output);
     if (punch->callback) {
         punch->callback(value, punch->callback_context);
     }
     punch->bytes_written++;
 }
 
+static void paper_tape_punch_tick(pdp8_t *cpu, void *context, uint64_t now_ns) {
+    struct pdp8_paper_tape_punch *punch = (struct pdp8_paper_tape_punch *)context;
+    (void)now_ns;
+    if (punch && punch->output.size > 0u && pdp8_api_is_halted(cpu)) {
+        pdp8_output_buffer_flush(&punch->output);
+    }
+}
+
+/* Only pay for the per-instruction tick while the halt policy is active. */
+static void paper_tape_punch_update_tick(struct pdp8_paper_tape_punch *punch) {
+    if (!punch->cpu) {
+        return;
+    }
+    bool on_halt = punch->output.policy == PDP8_OUTPUT_FLUSH_HALT;
+    pdp8_api_register_tick(punch->cpu, PDP8_PAPER_TAPE_PUNCH_DEVICE_CODE,
+                           on_halt ? paper_tape_punch_tick : NULL, on_halt ? punch : NULL);
+    /* it only acts once the CPU halts, which ends any idle loop anyway */
+    pdp8_api_set_tick_deadline(punch->cpu, PDP8_PAPER_TAPE_PUNCH_DEVICE_CODE, PDP8_DEADLINE_NONE);
+}
+
 static void paper_tape_punch_iot(pdp8_t *cpu, uint16_t instruction, void *context) {
     struct pdp8_paper_tape_punch *punch = (struct pdp8_paper_tape_punch *)context;
     if (!cpu || !punch) {
@@ -60,18 +81,38 @@ static void paper_tape_punch_iot(pdp8_t *cpu, uint16_t instruction, void *contex
         uint16_t ac = pdp8_api_get_ac(cpu);
         uint8_t output = (uint8_t)(ac & 0xFFu);
         punch->ready = false;
-        punch_emit(punch, output);
+        if (!pdp8_api_is_replaying(cpu)) {
+            punch_emit(punch, output);
+        }
         punch->ready = true;
     }
 }
 
+/* Checkpoint state: just the ready flag; punched bytes stay punched. */
+static size_t paper_tape_punch_save_state(const pdp8_t *cpu, void *context, uint8_t *buffer, size_t size) {
+    (void)cpu;
+    const struct pdp8_paper_tape_punch *punch = (const struct pdp8_paper_tape_punch *)context;
+    if (buffer && size >= 1u) {
+        buffer[0] = punch->ready;
+    }
+    return 1u;
+}
+
+static void paper_tape_punch_restore_state(pdp8_t *cpu, void *context, const uint8_t *buffer, size_t size) {
+    (void)cpu;
+    struct pdp8_paper_tape_punch *punch = (struct pdp8_paper_tape_punch *)context;
+    if (size == 1u) {
+        punch->ready = buffer[0] != 0u;
+    }
+}
+
 pdp8_paper_tape_punch_t *pdp8_paper_tape_punch_create(void) {
     struct pdp8_paper_tape_punch *punch =
         (struct pdp8_paper_tape_punch *)calloc(1, sizeof(struct pdp8_paper_tape_punch));
     if (!punch) {
         return NULL;
     }
-    punch->stream = NULL;
+    pdp8_output_buffer_init(&punch->output, NULL);
     punch->owns_stream = false;
     punch->ready = true;
     punch->bytes_written = 0u;
@@ -85,7 +126,11 @@ void pdp8_paper_tape_punch_destroy(pdp8_paper_tape_punch_t *punch_ptr) {
     if (!punch) {
         return;
     }
+    if (punch->cpu && punch->output.policy == PDP8_OUTPUT_FLUSH_HALT) {
+        pdp8_api_register_tick(punch->cpu, PDP8_PAPER_TAPE_PUNCH_DEVICE_CODE, NULL, NULL);
+    }
     punch_close_stream(punch);
+    pdp8_output_buffer_release(&punch->output);
     free(punch);
 }
 
@@ -93,10 +138,18 @@ int pdp8_paper_tape_punch_attach(pdp8_t *cpu, pdp8_paper_tape_punch_t *punch_ptr
     if (!cpu || !punch_ptr) {
         return -1;
     }
-    return pdp8_api_register_iot(cpu,
-                                 PDP8_PAPER_TAPE_PUNCH_DEVICE_CODE,
-                                 paper_tape_punch_iot,
-                                 punch_ptr);
+    if (pdp8_api_register_iot(cpu,
+                              PDP8_PAPER_TAPE_PUNCH_DEVICE_CODE,
+                              paper_tape_punch_iot,
+                              punch_ptr) != 0) {
+        return -1;
+    }
+    punch_ptr->cpu = cpu;
+    paper_tape_punch_update_tick(punch_ptr);
+    pdp8_api_set_idle_iot(cpu, PDP8_PAPER_TAPE_PUNCH_DEVICE_CODE, 1);
+    pdp8_api_register_state(cpu, PDP8_PAPER_TAPE_PUNCH_DEVICE_CODE, paper_tape_punch_save_state,
+                            paper_tape_punch_restore_state, punch_ptr);
+    return 0;
 }
 
 int pdp8_paper_tape_punch_set_stream(pdp8_paper_tape_punch_t *punch_ptr, FILE *stream) {
@@ -104,11 +157,11 @@ int pdp8_paper_tape_punch_set_stream(pdp8_paper_tape_punch_t *punch_ptr, FILE *s
     if (!punch) {
         return -1;
     }
-    if (punch->stream == stream && !punch->owns_stream) {
+    if (punch->output.stream == stream && !punch->owns_stream) {
         return 0;
     }
     punch_close_stream(punch);
-    punch->stream = stream;
+    pdp8_output_buffer_set_stream(&punch->output, stream);
     punch->owns_stream = false;
     return 0;
 }
@@ -126,12 +179,12 @@ int pdp8_paper_tape_punch_set_output_path(pdp8_paper_tape_punch_t *punch_ptr, co
     }
 
     if (strcmp(path, "stdout") == 0 || strcmp(path, "-") == 0) {
-        punch->stream = stdout;
+        pdp8_output_buffer_set_stream(&punch->output, stdout);
         punch->owns_stream = false;
         return 0;
     }
     if (strcmp(path, "stderr") == 0) {
-        punch->stream = stderr;
+        pdp8_output_buffer_set_stream(&punch->output, stderr);
         punch->owns_stream = false;
         return 0;
     }
@@ -140,11 +193,33 @@ int pdp8_paper_tape_punch_set_output_path(pdp8_paper_tape_punch_t *punch_ptr, co
     if (!fp) {
         return -1;
     }
-    punch->stream = fp;
+    pdp8_output_buffer_set_stream(&punch->output, fp);
     punch->owns_stream = true;
     return 0;
 }
 
+int pdp8_paper_tape_punch_set_flush_policy(pdp8_paper_tape_punch_t *punch_ptr,
+                                           pdp8_output_flush_policy policy,
+                                           size_t threshold) {
+    struct pdp8_paper_tape_punch *punch = (struct pdp8_paper_tape_punch *)punch_ptr;
+    if (!punch) {
+        return -1;
+    }
+    if (pdp8_output_buffer_set_policy(&punch->output, policy, threshold) != 0) {
+        return -1;
+    }
+    paper_tape_punch_update_tick(punch);
+    return 0;
+}
+
+int pdp8_paper_tape_punch_flush(pdp8_paper_tape_punch_t *punch_ptr) {
+    struct pdp8_paper_tape_punch *punch = (struct pdp8_paper_tape_punch *)punch_ptr;
+    if (!punch) {
+        return -1;
+    }
+    return pdp8_output_buffer_flush(&punch->output);
+}
+
 int pdp8_paper_tape_punch_set_output_callback(pdp8_paper_tape_punch_t *punch_ptr,
                                               pdp8_paper_tape_punch_output_callback callback,
                                               void *context) {
@@ -5,6 +5,8 @@
 #include <stdint.h>
 #include <stdio.h>
 
+#include "output_buffer.h"
+
 #ifdef __cplusplus
 extern "C" {
 #endif
@@ -43,6 +45,12 @@ int pdp8_paper_tape_punch_set_output_path(pdp8_paper_tape_punch_t *punch, const
 int pdp8_paper_tape_punch_set_output_callback(pdp8_paper_tape_punch_t *punch,
                                               pdp8_paper_tape_punch_output_callback callback,
                                               void *context);
+/* Choose when buffered output reaches the stream (default: every byte).
+ * threshold is the byte count for PDP8_OUTPUT_FLUSH_BYTES and ignored otherwise. */
+int pdp8_paper_tape_punch_set_flush_policy(pdp8_paper_tape_punch_t *punch,
+                                           pdp8_output_flush_policy policy,
+                                           size_t threshold);
+int pdp8_paper_tape_punch_flush(pdp8_paper_tape_punch_t *punch);
 size_t pdp8_paper_tape_punch_bytes_written(const pdp8_paper_tape_punch_t *punch);
 
 #ifdef __cplusplus
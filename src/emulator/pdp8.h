@@ -12,6 +12,16 @@ typedef struct pdp8 pdp8_t;
 
 typedef void (*pdp8_iot_handler)(pdp8_t *cpu, uint16_t instruction, void *context);
 typedef void (*pdp8_tick_handler)(pdp8_t *cpu, void *context, uint64_t now_ns);
+/* Supplies the value AND, TAD and the read APIs see at a hooked address. */
+typedef uint16_t (*pdp8_mmio_read_handler)(const pdp8_t *cpu, uint16_t address, void *context);
+/* Device state for checkpoints: save returns the bytes the state needs and
+ * writes them when buffer is non-NULL and size is large enough; restore gets
+ * back exactly what a save wrote. */
+typedef size_t (*pdp8_state_save_handler)(const pdp8_t *cpu, void *context, uint8_t *buffer, size_t size);
+typedef void (*pdp8_state_restore_handler)(pdp8_t *cpu, void *context, const uint8_t *buffer, size_t size);
+/* Sees every externally sourced value (pdp8_input_source) and may replace
+ * it; a nonzero return refuses pushed input. */
+typedef int (*pdp8_input_hook)(const pdp8_t *cpu, void *context, int source, uint64_t *value);
 
 pdp8_t *pdp8_api_create(size_t memory_size);
 void pdp8_api_destroy(pdp8_t *cpu);
@@ -20,6 +30,62 @@ void pdp8_api_set_halt(pdp8_t *cpu);
 void pdp8_api_clear_halt(pdp8_t *cpu);
 int pdp8_api_step(pdp8_t *cpu);
 int pdp8_api_run(pdp8_t *cpu, size_t max_cycles);
+/* Like pdp8_api_run, but also stops once PC reaches stop_pc after an
+ * instruction (pass -1 for no PC stop). At least one instruction runs even if
+ * PC already equals stop_pc. Returns the number of instructions executed. */
+int pdp8_api_run_until(pdp8_t *cpu, size_t max_cycles, int stop_pc);
+
+/* Breakpoints and watchpoints: one bit per word, checked inline by
+ * pdp8_api_run and pdp8_api_run_until (pdp8_api_step and the trace APIs run
+ * regardless). A run stops before an instruction at a breakpoint, except the
+ * one it last stopped at when resuming from there, and after an instruction
+ * whose memory access hit a watchpoint. Write watches see program stores
+ * (DCA, ISZ, JMS, auto-index increments, interrupt context saves); read
+ * watches see AND/TAD operands and indirect pointers. Front-end reads and
+ * writes through the API never trigger them. */
+#define PDP8_WATCH_READ 1
+#define PDP8_WATCH_WRITE 2
+typedef enum {
+    PDP8_STOP_NONE = 0, /* budget used up */
+    PDP8_STOP_HALT = 1,
+    PDP8_STOP_BREAKPOINT = 2,
+    PDP8_STOP_WATCH_READ = 3,
+    PDP8_STOP_WATCH_WRITE = 4,
+    PDP8_STOP_PC = 5, /* pdp8_api_run_until reached stop_pc */
+} pdp8_stop_reason;
+int pdp8_api_set_breakpoint(pdp8_t *cpu, uint16_t address, int enabled);
+/* access is a PDP8_WATCH_* mask; 0 removes the watch. */
+int pdp8_api_set_watchpoint(pdp8_t *cpu, uint16_t address, int access);
+/* Remove every breakpoint and watchpoint. */
+void pdp8_api_clear_breakpoints(pdp8_t *cpu);
+/* Fill addresses (and the PDP8_WATCH_* mask of each watch in accesses; either
+ * may be NULL) in ascending order, up to max. Returns the total count. */
+size_t pdp8_api_list_breakpoints(const pdp8_t *cpu, uint16_t *addresses, size_t max);
+size_t pdp8_api_list_watchpoints(const pdp8_t *cpu, uint16_t *addresses, uint8_t *accesses, size_t max);
+/* Why the last pdp8_api_run/pdp8_api_run_until returned (pdp8_stop_reason),
+ * and the breakpoint, watched address or stop_pc involved. */
+int pdp8_api_get_stop_reason(const pdp8_t *cpu);
+uint16_t pdp8_api_get_stop_address(const pdp8_t *cpu);
+/* Execute up to max_steps instructions, recording the state before each one
+ * (PC, instruction word, AC, LINK) into the caller's columns; any column may
+ * be NULL. Stops early on HALT. Returns the number of steps recorded. */
+size_t pdp8_api_trace(pdp8_t *cpu,
+                      size_t max_steps,
+                      uint16_t *pcs,
+                      uint16_t *instructions,
+                      uint16_t *acs,
+                      uint8_t *links);
+/* Effective-address column value for steps that are not memory references. */
+#define PDP8_TRACE_NO_ADDRESS 0xFFFFu
+/* pdp8_api_trace plus the effective address of each memory-reference
+ * instruction (after indirection), or PDP8_TRACE_NO_ADDRESS. */
+size_t pdp8_api_trace_addresses(pdp8_t *cpu,
+                                size_t max_steps,
+                                uint16_t *pcs,
+                                uint16_t *instructions,
+                                uint16_t *acs,
+                                uint8_t *links,
+                                uint16_t *addresses);
 uint16_t pdp8_api_get_ac(const pdp8_t *cpu);
 void pdp8_api_set_ac(pdp8_t *cpu, uint16_t value);
 uint16_t pdp8_api_get_pc(const pdp8_t *cpu);
@@ -28,14 +94,142 @@ uint8_t pdp8_api_get_link(const pdp8_t *cpu);
 void pdp8_api_set_link(pdp8_t *cpu, uint8_t value);
 int pdp8_api_write_mem(pdp8_t *cpu, uint16_t address, uint16_t value);
 uint16_t pdp8_api_read_mem(const pdp8_t *cpu, uint16_t address);
+/* Copy count words starting at start_address (wrapping at the top of memory)
+ * into words. Returns the number of words copied. */
+size_t pdp8_api_read_block(const pdp8_t *cpu, uint16_t start_address, uint16_t *words, size_t count);
 int pdp8_api_load(pdp8_t *cpu, const uint16_t *words, size_t count, uint16_t start_address);
 int pdp8_api_register_iot(pdp8_t *cpu, uint8_t device_code, pdp8_iot_handler handler, void *context);
 int pdp8_api_register_tick(pdp8_t *cpu, uint8_t device_code, pdp8_tick_handler handler, void *context);
+/* Checkpoint support. A device registers its state handlers after its IOT
+ * (re-registering the IOT drops them; NULL handlers remove them). The saved
+ * state covers the registers, interrupt and skip flags, virtual clock, tick
+ * deadlines and each registered device, but not memory, which checkpoint
+ * stores copy page by page with the raw page calls below. Output a device has
+ * already emitted is not taken back by a restore, and is not emitted again
+ * while the store replays (pdp8_api_set_replaying). */
+int pdp8_api_register_state(pdp8_t *cpu,
+                            uint8_t device_code,
+                            pdp8_state_save_handler save,
+                            pdp8_state_restore_handler restore,
+                            void *context);
+/* Returns the bytes the state needs, writing them if size is large enough. */
+size_t pdp8_api_save_state(const pdp8_t *cpu, uint8_t *buffer, size_t size);
+int pdp8_api_restore_state(pdp8_t *cpu, const uint8_t *buffer, size_t size);
+/* Set while a checkpoint store re-runs instructions that already ran once:
+ * output devices keep their flags and state moving but emit nothing, so
+ * stepping back does not print the replayed stretch a second time. */
+void pdp8_api_set_replaying(pdp8_t *cpu, int replaying);
+int pdp8_api_is_replaying(const pdp8_t *cpu);
+/* Idle-loop fast-forward. pdp8_api_run and pdp8_api_run_until recognise
+ * `JMP .`, `ISZ X; JMP .-1` and `xSF; JMP .-1` on devices marked idle-safe,
+ * and count whole iterations as executed without stepping them, advancing the
+ * virtual clock by the time they would have taken. Skipping never passes the
+ * earliest tick deadline, so devices with tick handlers must publish their
+ * next deadline (a newly registered handler counts as due on every step,
+ * which disables skipping until it does). Enabled by default. */
+#define PDP8_DEADLINE_NONE UINT64_MAX
+int pdp8_api_set_tick_deadline(pdp8_t *cpu, uint8_t device_code, uint64_t deadline_ns);
+/* Earliest published tick deadline, or PDP8_DEADLINE_NONE. */
+uint64_t pdp8_api_next_deadline(const pdp8_t *cpu);
+/* Mark a device whose skip IOT (function 1) only changes outcome on outside
+ * input or at its tick deadline. Re-registering the IOT clears the mark. */
+int pdp8_api_set_idle_iot(pdp8_t *cpu, uint8_t device_code, int idle_safe);
+void pdp8_api_set_idle_skip(pdp8_t *cpu, int enabled);
+int pdp8_api_get_idle_skip(const pdp8_t *cpu);
+/* Instructions fast-forwarded rather than stepped since creation. */
+uint64_t pdp8_api_idle_skipped(const pdp8_t *cpu);
+
+/* Running totals since pdp8_api_create for monitoring. They only grow:
+ * pdp8_api_reset and checkpoint restores leave them alone, and replayed
+ * instructions count again. Interrupt latency is the number of instructions
+ * from a request (or the previous dispatch, while more are pending) to the
+ * dispatch; bucket i counts latencies below 1 << i that fit no lower
+ * bucket, and the last bucket takes everything longer. */
+#define PDP8_LATENCY_BUCKETS 16u
+typedef struct pdp8_counters {
+    uint64_t instructions; /* stepped or fast-forwarded */
+    uint64_t halts;        /* HLT instructions executed */
+    uint64_t interrupt_requests;
+    uint64_t interrupt_dispatches;
+    uint64_t interrupt_latency_sum;
+    uint64_t interrupt_latency_max;
+    uint64_t interrupt_latency[PDP8_LATENCY_BUCKETS];
+    uint64_t iots[64]; /* IOT instructions by device code, fast-forwarded skip tests included */
+} pdp8_counters_t;
+int pdp8_api_get_counters(const pdp8_t *cpu, pdp8_counters_t *counters);
+/* 1 while PC sits in the `JMP .` or `xSF; JMP .-1` loop last recognised by
+ * a run, i.e. the machine waits for outside input or the next tick deadline
+ * (pdp8_api_next_deadline) and front ends may block until either. */
+int pdp8_api_is_waiting(const pdp8_t *cpu);
+/* Memory-mapped read hooks. A hooked address reads from its handler instead
+ * of memory (stores still go to memory); a NULL handler removes the hook.
+ * The wall clock at 07760 is installed this way by pdp8_api_create. */
+int pdp8_api_register_mmio_read(pdp8_t *cpu, uint16_t address, pdp8_mmio_read_handler handler, void *context);
+/* Read-only status words for front ends: reads of address return value until
+ * it is updated or cleared. Clearing fails unless address holds a status word. */
+int pdp8_api_set_status_word(pdp8_t *cpu, uint16_t address, uint16_t value);
+int pdp8_api_clear_status_word(pdp8_t *cpu, uint16_t address);
 void pdp8_api_request_skip(pdp8_t *cpu);
+
+/* Clock sources for tick handlers and timed devices. The host source reads
+ * CLOCK_MONOTONIC; the virtual sources advance emulated time by a fixed
+ * number of nanoseconds per instruction or per memory cycle (fetch, defer
+ * and execute), so timed behaviour is reproducible at any host speed. */
+typedef enum {
+    PDP8_CLOCK_HOST = 0,
+    PDP8_CLOCK_VIRTUAL_INSTRUCTION = 1,
+    PDP8_CLOCK_VIRTUAL_MEMORY_CYCLE = 2,
+} pdp8_clock_source;
+/* PDP-8/E core memory cycle time, a sensible ns_per_unit for the virtual sources. */
+#define PDP8_MEMORY_CYCLE_NS 1200u
+/* Select the clock source; ns_per_unit must be non-zero for virtual sources.
+ * Virtual time keeps counting across switches and resets. Returns 0 or -1. */
+int pdp8_api_set_clock(pdp8_t *cpu, int source, uint64_t ns_per_unit);
+int pdp8_api_get_clock_source(const pdp8_t *cpu);
+/* ns_per_unit from the last pdp8_api_set_clock (0 if never set). */
+uint64_t pdp8_api_get_clock_ns(const pdp8_t *cpu);
+/* Current time in ns from the selected clock source (the value tick handlers see). */
+uint64_t pdp8_api_now_ns(const pdp8_t *cpu);
+
+/* Values the program sees that do not come from the program or the image:
+ * host time, the wall clock, tape contents and typed input. The core and
+ * devices pass each one through pdp8_api_input, so an input hook (one per
+ * CPU, see journal.h) can record them or substitute recorded ones. */
+enum pdp8_input_source {
+    PDP8_INPUT_KEYBOARD = 0,   /* byte queued on the KL8E by the host */
+    PDP8_INPUT_CLOCK = 1,      /* host time read by an IOT */
+    PDP8_INPUT_CLOCK_TICK = 2, /* host time handed to tick handlers */
+    PDP8_INPUT_CLOCK_HOST = 3, /* host time read by the front end */
+    PDP8_INPUT_WALL_CLOCK = 4, /* minutes since midnight read at 07760 by AND/TAD */
+    PDP8_INPUT_PAPER_TAPE = 5, /* word read by the paper tape reader */
+    PDP8_INPUT_MAGTAPE = 6,    /* word read from a magtape record */
+    PDP8_INPUT_WALL_CLOCK_HOST = 7, /* 07760 read by the front end (read_mem, read_block) */
+    PDP8_INPUT_SOURCES = 8,
+};
+/* NULL removes the hook. Virtual clocks never reach it. */
+void pdp8_api_set_input_hook(pdp8_t *cpu, pdp8_input_hook hook, void *context);
+/* Hand *value to the input hook. Returns 0, or -1 if the hook refuses it. */
+int pdp8_api_input(const pdp8_t *cpu, int source, uint64_t *value);
+/* Instructions executed since creation, fast-forwarded ones included. */
+uint64_t pdp8_api_instruction_count(const pdp8_t *cpu);
 void pdp8_api_set_switch_register(pdp8_t *cpu, uint16_t value);
 uint16_t pdp8_api_get_switch_register(const pdp8_t *cpu);
 int pdp8_api_is_halted(const pdp8_t *cpu);
 
+/* Dirty-page tracking. Every memory store bumps a generation counter and
+ * stamps the 128-word page it landed in, so observers can ask which pages
+ * changed since the generation they last saw. */
+#define PDP8_DIRTY_PAGE_WORDS 128u
+uint64_t pdp8_api_memory_generation(const pdp8_t *cpu);
+/* Writes the numbers of pages modified after generation since into pages (up
+ * to max_pages) and returns the total number of such pages. */
+size_t pdp8_api_dirty_pages(const pdp8_t *cpu, uint64_t since, uint16_t *pages, size_t max_pages);
+size_t pdp8_api_page_count(const pdp8_t *cpu);
+/* Copy one page of memory as stored (read hooks bypassed) to or from words,
+ * PDP8_DIRTY_PAGE_WORDS long. Writing stamps the page dirty. */
+int pdp8_api_read_page(const pdp8_t *cpu, uint16_t page, uint16_t *words);
+int pdp8_api_write_page(pdp8_t *cpu, uint16_t page, const uint16_t *words);
+
 /* Interrupt support - PDP-8 single interrupt line model
  *
  * The PDP-8 has one hardware interrupt line shared by all devices.
@@ -1,11 +1,9 @@
-#define _POSIX_C_SOURCE 199309L
 #include "watchdog.h"
 
 #include "pdp8.h"
 
 #include <stdlib.h>
 #include <string.h>
-#include <time.h>
 
 /* control register layout: [11..9] = cmd (3 bits), [8..0] = count (9 bits) */
 #define WATCHDOG_COUNT_MASK 0x01FFu
@@ -25,7 +23,8 @@ struct pdp8_watchdog {
     uint8_t cmd;               /* 3 bits */
     int enabled;
     int expired;
-    uint64_t expiry_ns; /* monotonic time in ns */
+    uint64_t expiry_ns; /* time in ns on the attached CPU's clock */
+    pdp8_t *cpu;        /* clock source, set by attach */
 };
 
 static int watchdog_cmd_is_periodic(uint8_t cmd) {
@@ -37,12 +36,18 @@ static int watchdog_cmd_latches_flag(uint8_t cmd) {
     return cmd == WD_CMD_TICK_PERIODIC;
 }
 
-static uint64_t now_ns(void) {
-    struct timespec ts;
-    if (clock_gettime(CLOCK_MONOTONIC, &ts) != 0) {
-        return 0ull;
+static uint64_t now_ns(const pdp8_watchdog_t *wd) {
+    return pdp8_api_now_ns(wd->cpu);
+}
+
+/* Tell the core when the tick handler next has work, so idle loops can be
+ * fast-forwarded up to it. A zero count expires on the next step. */
+static void watchdog_publish_deadline(const pdp8_watchdog_t *wd) {
+    uint64_t deadline = PDP8_DEADLINE_NONE;
+    if (wd->enabled) {
+        deadline = wd->configured_count == 0 ? 0u : wd->expiry_ns;
     }
-    return (uint64_t)ts.tv_sec * 1000000000ull + (uint64_t)ts.tv_nsec;
+    pdp8_api_set_tick_deadline(wd->cpu, PDP8_WATCHDOG_DEVICE_CODE, deadline);
 }
 
 static void watchdog_fire(pdp8_t *cpu, pdp8_watchdog_t *wd) {
@@ -73,6 +78,7 @@ static void watchdog_tick(pdp8_t *cpu, void *context, uint64_t now) {
         /* treat zero as immediate expiry */
         if (!wd->expired) {
             watchdog_fire(cpu, wd);
+            watchdog_publish_deadline(wd);
         }
         return;
     }
@@ -86,6 +92,7 @@ static void watchdog_tick(pdp8_t *cpu, void *context, uint64_t now) {
                 wd->expired = 0; /* still active until next fire */
             }
         }
+        watchdog_publish_deadline(wd);
     }
 }
 
@@ -94,7 +101,6 @@ static void watchdog_iot(pdp8_t *cpu, uint16_t instruction, void *context) {
     if (!wd || !cpu) return;
 
     uint8_t func = (uint8_t)(instruction & 0x7u);
-    uint64_t now = now_ns();
 
     switch (func) {
     case 0x0u: /* NOP - do nothing */
@@ -118,8 +124,9 @@ static void watchdog_iot(pdp8_t *cpu, uint16_t instruction, void *context) {
             if (wd->enabled) {
                 /* start counting immediately */
                 uint64_t delta_ns = (uint64_t)wd->configured_count * 100000000ull;
-                wd->expiry_ns = now + delta_ns;
+                wd->expiry_ns = now_ns(wd) + delta_ns;
             }
+            watchdog_publish_deadline(wd);
         }
         break;
 
@@ -134,12 +141,13 @@ static void watchdog_iot(pdp8_t *cpu, uint16_t instruction, void *context) {
         wd->expired = 0;
         if (wd->configured_count == 0) {
             /* immediate expiry on restart if zero */
-            wd->expiry_ns = now;
+            wd->expiry_ns = now_ns(wd);
         } else {
             uint64_t delta_ns = (uint64_t)wd->configured_count * 100000000ull;
-            wd->expiry_ns = now + delta_ns;
+            wd->expiry_ns = now_ns(wd) + delta_ns;
         }
         wd->enabled = (wd->cmd != WD_CMD_DISABLE) ? 1 : 0;
+        watchdog_publish_deadline(wd);
         break;
 
     case 0x5u:
@@ -151,6 +159,47 @@ static void watchdog_iot(pdp8_t *cpu, uint16_t instruction, void *context) {
     }
 }
 
+/* Checkpoint state: everything but the CPU pointer. */
+struct watchdog_saved_state {
+    uint64_t expiry_ns;
+    uint16_t configured_count;
+    uint8_t cmd;
+    uint8_t enabled;
+    uint8_t expired;
+};
+
+static size_t watchdog_save_state(const pdp8_t *cpu, void *context, uint8_t *buffer, size_t size) {
+    (void)cpu;
+    const pdp8_watchdog_t *wd = (const pdp8_watchdog_t *)context;
+    struct watchdog_saved_state saved;
+    memset(&saved, 0, sizeof(saved));
+    saved.expiry_ns = wd->expiry_ns;
+    saved.configured_count = wd->configured_count;
+    saved.cmd = wd->cmd;
+    saved.enabled = (uint8_t)(wd->enabled != 0);
+    saved.expired = (uint8_t)(wd->expired != 0);
+    if (buffer && size >= sizeof(saved)) {
+        memcpy(buffer, &saved, sizeof(saved));
+    }
+    return sizeof(saved);
+}
+
+static void watchdog_restore_state(pdp8_t *cpu, void *context, const uint8_t *buffer, size_t size) {
+    (void)cpu;
+    pdp8_watchdog_t *wd = (pdp8_watchdog_t *)context;
+    struct watchdog_saved_state saved;
+    if (size != sizeof(saved)) {
+        return;
+    }
+    memcpy(&saved, buffer, sizeof(saved));
+    wd->expiry_ns = saved.expiry_ns;
+    wd->configured_count = saved.configured_count;
+    wd->cmd = saved.cmd;
+    wd->enabled = saved.enabled;
+    wd->expired = saved.expired;
+    watchdog_publish_deadline(wd);
+}
+
 pdp8_watchdog_t *pdp8_watchdog_create(void) {
     pdp8_watchdog_t *wd = (pdp8_watchdog_t *)calloc(1, sizeof(pdp8_watchdog_t));
     if (!wd) return NULL;
@@ -176,6 +225,10 @@ int pdp8_watchdog_attach(pdp8_t *cpu, pdp8_watchdog_t *wd) {
         pdp8_api_register_iot(cpu, PDP8_WATCHDOG_DEVICE_CODE, NULL, NULL);
         return -1;
     }
+    wd->cpu = cpu;
+    watchdog_publish_deadline(wd);
+    pdp8_api_set_idle_iot(cpu, PDP8_WATCHDOG_DEVICE_CODE, 1);
+    pdp8_api_register_state(cpu, PDP8_WATCHDOG_DEVICE_CODE, watchdog_save_state, watchdog_restore_state, wd);
     return 0;
 }
 
@@ -191,7 +244,7 @@ int pdp8_watchdog_get_status(const pdp8_watchdog_t *wd, struct pdp8_watchdog_sta
         return 0;
     }
 
-    uint64_t now = now_ns();
+    uint64_t now = now_ns(wd);
     if (wd->expiry_ns <= now) {
         out_status->remaining_ds = 0;
         return 0;
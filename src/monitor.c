@@ -299,6 +299,8 @@ static void show_devices(const struct monitor_runtime *runtime) {
         (config && config->line_printer_output) ? config->line_printer_output : "stdout";
     int line_printer_columns =
         (config && config->line_printer_column_limit > 0) ? config->line_printer_column_limit : 132;
+    const char *line_printer_flush =
+        (config && config->line_printer_flush) ? config->line_printer_flush : "char";
 
     const char *paper_tape_iot =
         (config && config->paper_tape_iot) ? config->paper_tape_iot : "667x";
@@ -310,6 +312,8 @@ static void show_devices(const struct monitor_runtime *runtime) {
     bool punch_enabled = (!config_loaded) || (config && config->paper_tape_punch_enabled);
     const char *punch_output =
         (config && config->paper_tape_punch_output) ? config->paper_tape_punch_output : "(discarded)";
+    const char *punch_flush =
+        (config && config->paper_tape_punch_flush) ? config->paper_tape_punch_flush : "char";
 
     monitor_console_printf("Configuration source: %s\n",
                            config_loaded ? "pdp8.config" : "built-in defaults");
@@ -325,6 +329,7 @@ static void show_devices(const struct monitor_runtime *runtime) {
     monitor_console_printf("    IOT              : %s\n", line_printer_iot);
     monitor_console_printf("    output           : %s\n", line_printer_output);
     monitor_console_printf("    column limit     : %d\n", line_printer_columns);
+    monitor_console_printf("    flush            : %s\n", line_printer_flush);
 
     monitor_console_puts("  Paper tape");
     monitor_console_printf("    IOT              : %s\n", paper_tape_iot);
@@ -340,6 +345,7 @@ static void show_devices(const struct monitor_runtime *runtime) {
     monitor_console_puts("  Paper tape punch");
     monitor_console_printf("    enabled          : %s\n", punch_enabled ? "yes" : "no");
     monitor_console_printf("    output           : %s\n", punch_output);
+    monitor_console_printf("    flush            : %s\n", punch_flush);
 
     /* Watchdog device (configured via pdp8.config)
      * Print only when the watchdog stanza is present; otherwise show not-configured.
@@ -1758,6 +1764,16 @@ static bool monitor_runtime_create(struct monitor_runtime *runtime,
     }
     pdp8_line_printer_set_column_limit(runtime->printer, (uint16_t)printer_columns);
 
+    if (runtime->config_loaded && runtime->config.line_printer_flush) {
+        pdp8_output_flush_policy policy;
+        if (pdp8_output_flush_policy_parse(runtime->config.line_printer_flush, &policy) != 0 ||
+            pdp8_line_printer_set_flush_policy(runtime->printer, policy,
+                                               (size_t)runtime->config.line_printer_flush_bytes) != 0) {
+            monitor_console_printf("Warning: invalid line printer flush policy '%s'.\n",
+                                   runtime->config.line_printer_flush);
+        }
+    }
+
     if (runtime->config_loaded && runtime->config.paper_tape_present) {
         const char *image_path = NULL;
         if (runtime->paper_tape_image_override && *runtime->paper_tape_image_override) {
@@ -1802,6 +1818,15 @@ static bool monitor_runtime_create(struct monitor_runtime *runtime,
                                        runtime->config.paper_tape_punch_output);
             }
         }
+        if (runtime->paper_tape_punch && runtime->config.paper_tape_punch_flush) {
+            pdp8_output_flush_policy policy;
+            if (pdp8_output_flush_policy_parse(runtime->config.paper_tape_punch_flush, &policy) != 0 ||
+                pdp8_paper_tape_punch_set_flush_policy(runtime->paper_tape_punch, policy,
+                                                       (size_t)runtime->config.paper_tape_punch_flush_bytes) != 0) {
+                monitor_console_printf("Warning: invalid paper tape punch flush policy '%s'.\n",
+                                       runtime->config.paper_tape_punch_flush);
+            }
+        }
     }
 
     /* Watchdog: create and attach if present in config */
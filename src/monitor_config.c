@@ -28,9 +28,11 @@ void monitor_config_clear(struct monitor_config *config) {
     free(config->kl8e_teleprinter_output);
     free(config->line_printer_iot);
     free(config->line_printer_output);
+    free(config->line_printer_flush);
     free(config->paper_tape_iot);
     free(config->paper_tape_image);
     free(config->paper_tape_punch_output);
+    free(config->paper_tape_punch_flush);
     free(config->watchdog_iot);
     free(config->watchdog_mode);
     monitor_config_init(config);
@@ -24,12 +24,16 @@ struct monitor_config {
     char *line_printer_iot;
     char *line_printer_output;
     int line_printer_column_limit;
+    char *line_printer_flush; /* "char", "line", "bytes", "halt" or "manual" */
+    int line_printer_flush_bytes;
 
     bool paper_tape_present;
     char *paper_tape_iot;
     char *paper_tape_image;
     bool paper_tape_punch_enabled;
     char *paper_tape_punch_output;
+    char *paper_tape_punch_flush;
+    int paper_tape_punch_flush_bytes;
 
     /* Watchdog device configuration */
     bool watchdog_present;
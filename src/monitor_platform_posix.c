@@ -205,6 +205,16 @@ static int monitor_config_load_file(const char *path, struct monitor_config *con
                 if (parsed > 0 && parsed <= INT32_MAX) {
                     config->line_printer_column_limit = (int)parsed;
                 }
+            } else if (strcmp(key, "flush") == 0) {
+                if (monitor_config_set_string(&config->line_printer_flush, value) != 0) {
+                    fclose(fp);
+                    return -1;
+                }
+            } else if (strcmp(key, "flush_bytes") == 0) {
+                long parsed = strtol(value, NULL, 10);
+                if (parsed > 0 && parsed <= INT32_MAX) {
+                    config->line_printer_flush_bytes = (int)parsed;
+                }
             }
         } else if (strcmp(current_device, "paper_tape") == 0) {
             config->paper_tape_present = true;
@@ -230,6 +240,16 @@ static int monitor_config_load_file(const char *path, struct monitor_config *con
                 if (parse_boolean(value, &flag)) {
                     config->paper_tape_punch_enabled = flag;
                 }
+            } else if (strcmp(key, "flush") == 0) {
+                if (monitor_config_set_string(&config->paper_tape_punch_flush, value) != 0) {
+                    fclose(fp);
+                    return -1;
+                }
+            } else if (strcmp(key, "flush_bytes") == 0) {
+                long parsed = strtol(value, NULL, 10);
+                if (parsed > 0 && parsed <= INT32_MAX) {
+                    config->paper_tape_punch_flush_bytes = (int)parsed;
+                }
             }
         } else if (strncmp(current_device, "magtape", 7) == 0) {
             struct monitor_magtape_unit_config *slot = current_magtape;
@@ -7,6 +7,7 @@
 #include <ctype.h>
 #include <stdbool.h>
 #include <errno.h>
+#include <fcntl.h>
 #include <sys/stat.h>
 #include <time.h>
 
@@ -14,10 +15,14 @@
 #include "../src/emulator/pdp8_board.h"
 #include "../src/emulator/kl8e_console.h"
 #include "../src/emulator/line_printer.h"
+#include "../src/emulator/output_ring.h"
 #include "../src/emulator/paper_tape.h"
 #include "../src/emulator/paper_tape_device.h"
 #include "../src/emulator/paper_tape_punch.h"
 #include "../src/emulator/magtape_device.h"
+#include "../src/emulator/mailbox.h"
+#include "../src/emulator/checkpoint.h"
+#include "../src/emulator/journal.h"
 #include "../src/emulator/watchdog.h"
 #include <unistd.h>
 
@@ -666,6 +671,19 @@ static int test_kl8e_console(void) {
     ASSERT_INT_EQ("pop output", 0, pdp8_kl8e_console_pop_output(console, &out_ch));
     ASSERT_EQ("output char", 'A' & 0x7F, out_ch);
 
+    const uint8_t block[] = {'B', 'C' | 0x80};
+    ASSERT_INT_EQ("queue block", 2, (int)pdp8_kl8e_console_queue_block(console, block, sizeof block));
+    ASSERT_INT_EQ("block pending", 2, (int)pdp8_kl8e_console_input_pending(console));
+    pdp8_api_set_pc(cpu, 0000);
+    for (int i = 0; i < 4; ++i) {
+        pdp8_api_step(cpu);
+    }
+    uint8_t out_block[4] = {0};
+    ASSERT_INT_EQ("pop output block", 1, (int)pdp8_kl8e_console_pop_output_block(console, out_block, sizeof out_block));
+    ASSERT_EQ("block output char", 'B', out_block[0]);
+    ASSERT_INT_EQ("output drained", 0, (int)pdp8_kl8e_console_output_pending(console));
+    ASSERT_INT_EQ("second key still queued", 1, (int)pdp8_kl8e_console_input_pending(console));
+
     pdp8_kl8e_console_destroy(console);
     fclose(sink);
     pdp8_api_destroy(cpu);
@@ -726,6 +744,221 @@ static int test_line_printer(void) {
     return 1;
 }
 
+static int test_output_flush_policy(void) {
+    pdp8_output_flush_policy policy = PDP8_OUTPUT_FLUSH_CHAR;
+    ASSERT_INT_EQ("parse line policy", 0, pdp8_output_flush_policy_parse("line", &policy));
+    ASSERT_INT_EQ("line policy value", PDP8_OUTPUT_FLUSH_LINE, policy);
+    ASSERT_INT_EQ("reject unknown policy", -1, pdp8_output_flush_policy_parse("sometimes", &policy));
+
+    pdp8_t *cpu = pdp8_api_create(4096);
+    if (!cpu) {
+        return 0;
+    }
+
+    FILE *sink = tmpfile();
+    if (!sink) {
+        pdp8_api_destroy(cpu);
+        return 0;
+    }
+
+    pdp8_line_printer_t *printer = pdp8_line_printer_create(sink);
+    ASSERT_TRUE("line printer created", printer != NULL);
+    ASSERT_INT_EQ("line printer attach", 0, pdp8_line_printer_attach(cpu, printer));
+    ASSERT_INT_EQ("manual policy", 0,
+                  pdp8_line_printer_set_flush_policy(printer, PDP8_OUTPUT_FLUSH_MANUAL, 0));
+
+    pdp8_api_write_mem(cpu, 0000, 07200); /* CLA */
+    pdp8_api_write_mem(cpu, 0001, 01010); /* TAD 0010 */
+    pdp8_api_write_mem(cpu, 0002,
+                       PDP8_LINE_PRINTER_INSTR(PDP8_LINE_PRINTER_BIT_CLEAR | PDP8_LINE_PRINTER_BIT_PRINT));
+    pdp8_api_write_mem(cpu, 0003, 07402); /* HLT */
+    pdp8_api_write_mem(cpu, 0010, 00101); /* ASCII 'A' */
+    pdp8_api_set_pc(cpu, 0000);
+
+    pdp8_api_run(cpu, 16);
+    ASSERT_INT_EQ("halted after print", 1, pdp8_api_is_halted(cpu));
+    ASSERT_TRUE("manual policy holds output", ftell(sink) == 0);
+    ASSERT_INT_EQ("manual flush", 0, pdp8_line_printer_flush(printer));
+    long manual_size = ftell(sink);
+    ASSERT_TRUE("manual flush wrote output", manual_size > 0);
+
+    ASSERT_INT_EQ("halt policy", 0,
+                  pdp8_line_printer_set_flush_policy(printer, PDP8_OUTPUT_FLUSH_HALT, 0));
+    pdp8_api_clear_halt(cpu);
+    pdp8_api_set_pc(cpu, 0000);
+    pdp8_api_run(cpu, 16);
+    ASSERT_INT_EQ("halted after second print", 1, pdp8_api_is_halted(cpu));
+    ASSERT_TRUE("halt policy flushed on HLT", ftell(sink) > manual_size);
+
+    pdp8_line_printer_destroy(printer);
+    fclose(sink);
+    pdp8_api_destroy(cpu);
+    return 1;
+}
+
+static int test_output_ring(void) {
+    pdp8_output_ring_t *ring = pdp8_output_ring_create(8);
+    ASSERT_TRUE("ring created", ring != NULL);
+
+    static const char text[] = "HELLO, WORLD";
+    for (size_t i = 0; i < sizeof(text) - 1u; ++i) {
+        pdp8_output_ring_push((uint8_t)text[i], ring);
+    }
+    ASSERT_TRUE("ring end offset", pdp8_output_ring_end(ring) == 12u);
+    ASSERT_TRUE("ring begin offset", pdp8_output_ring_begin(ring) == 4u);
+
+    uint8_t out[16] = {0};
+    uint64_t start = 0;
+    size_t count = pdp8_output_ring_read(ring, 0, out, sizeof(out), &start);
+    ASSERT_TRUE("stale offset clamps to oldest", start == 4u && count == 8u);
+    ASSERT_TRUE("wrapped read contents", memcmp(out, "O, WORLD", 8) == 0);
+
+    count = pdp8_output_ring_read(ring, 10, out, sizeof(out), &start);
+    ASSERT_TRUE("incremental read", start == 10u && count == 2u && memcmp(out, "LD", 2) == 0);
+
+    count = pdp8_output_ring_read(ring, 99, out, sizeof(out), &start);
+    ASSERT_TRUE("future offset clamps to end", start == 12u && count == 0u);
+
+    pdp8_output_ring_t *copy = pdp8_output_ring_create(8);
+    ASSERT_TRUE("copy created", copy != NULL);
+    count = pdp8_output_ring_read(ring, 0, out, sizeof(out), &start);
+    pdp8_output_ring_restore(copy, start, out, count);
+    ASSERT_TRUE("restored offsets", pdp8_output_ring_begin(copy) == 4u && pdp8_output_ring_end(copy) == 12u);
+    count = pdp8_output_ring_read(copy, 10, out, sizeof(out), &start);
+    ASSERT_TRUE("restored contents", start == 10u && count == 2u && memcmp(out, "LD", 2) == 0);
+    pdp8_output_ring_destroy(copy);
+
+    pdp8_t *cpu = pdp8_api_create(4096);
+    if (!cpu) {
+        pdp8_output_ring_destroy(ring);
+        return 0;
+    }
+    pdp8_output_ring_clear(ring);
+    pdp8_line_printer_t *printer = pdp8_line_printer_create(NULL);
+    ASSERT_TRUE("line printer created", printer != NULL);
+    ASSERT_INT_EQ("detach host stream", 0, pdp8_line_printer_set_stream(printer, NULL));
+    ASSERT_INT_EQ("ring callback", 0,
+                  pdp8_line_printer_set_output_callback(printer, pdp8_output_ring_push, ring));
+    ASSERT_INT_EQ("line printer attach", 0, pdp8_line_printer_attach(cpu, printer));
+
+    pdp8_api_write_mem(cpu, 0000, 07200); /* CLA */
+    pdp8_api_write_mem(cpu, 0001, 01010); /* TAD 0010 */
+    pdp8_api_write_mem(cpu, 0002, PDP8_LINE_PRINTER_INSTR(PDP8_LINE_PRINTER_BIT_PRINT));
+    pdp8_api_write_mem(cpu, 0003, 07402); /* HLT */
+    pdp8_api_write_mem(cpu, 0010, 00101); /* ASCII 'A' */
+    pdp8_api_set_pc(cpu, 0000);
+    pdp8_api_run(cpu, 16);
+
+    count = pdp8_output_ring_read(ring, 0, out, sizeof(out), &start);
+    ASSERT_TRUE("printer output captured", count == 1u && out[0] == 'A');
+
+    pdp8_line_printer_destroy(printer);
+    pdp8_api_destroy(cpu);
+    pdp8_output_ring_destroy(ring);
+    return 1;
+}
+
+static int test_memory_block_and_dirty_pages(void) {
+    pdp8_t *cpu = pdp8_api_create(4096);
+    if (!cpu) {
+        return 0;
+    }
+
+    uint64_t base = pdp8_api_memory_generation(cpu);
+    uint16_t pages[32];
+    ASSERT_TRUE("no dirty pages initially", pdp8_api_dirty_pages(cpu, base, pages, 32) == 0u);
+
+    static const uint16_t image[] = {07200, 01010, 03020, 07402};
+    ASSERT_INT_EQ("load program", 0, pdp8_api_load(cpu, image, 4, 00200));
+    pdp8_api_write_mem(cpu, 00010, 00042);
+    uint64_t loaded = pdp8_api_memory_generation(cpu);
+    ASSERT_TRUE("generation advanced", loaded > base);
+    size_t dirty = pdp8_api_dirty_pages(cpu, base, pages, 32);
+    ASSERT_TRUE("two pages dirty", dirty == 2u && pages[0] == 0u && pages[1] == 1u);
+
+    uint16_t words[4] = {0};
+    ASSERT_TRUE("block read", pdp8_api_read_block(cpu, 00200, words, 4) == 4u);
+    ASSERT_TRUE("block contents", memcmp(words, image, sizeof(image)) == 0);
+
+    uint16_t wrapped[2] = {0};
+    pdp8_api_write_mem(cpu, 07777, 01234);
+    pdp8_api_write_mem(cpu, 00000, 04321);
+    ASSERT_TRUE("wrapping block read", pdp8_api_read_block(cpu, 07777, wrapped, 2) == 2u);
+    ASSERT_TRUE("wrapped contents", wrapped[0] == 01234 && wrapped[1] == 04321);
+
+    uint64_t before_run = pdp8_api_memory_generation(cpu);
+    pdp8_api_set_pc(cpu, 00200);
+    pdp8_api_run(cpu, 8);
+    ASSERT_EQ("DCA stored", 00042, pdp8_api_read_mem(cpu, 00020));
+    dirty = pdp8_api_dirty_pages(cpu, before_run, pages, 32);
+    ASSERT_TRUE("only the DCA target page dirty", dirty == 1u && pages[0] == 0u);
+
+    pdp8_api_destroy(cpu);
+    return 1;
+}
+
+static int test_run_until_pc(void) {
+    pdp8_t *cpu = pdp8_api_create(4096);
+    if (!cpu) {
+        return 0;
+    }
+
+    pdp8_api_write_mem(cpu, 00200, 07001); /* IAC */
+    pdp8_api_write_mem(cpu, 00201, 07001); /* IAC */
+    pdp8_api_write_mem(cpu, 00202, 07001); /* IAC */
+    pdp8_api_write_mem(cpu, 00203, 05200); /* JMP 0200 */
+    pdp8_api_set_pc(cpu, 00200);
+
+    ASSERT_INT_EQ("stops at PC", 2, pdp8_api_run_until(cpu, 100, 00202));
+    ASSERT_EQ("PC at stop", 00202, pdp8_api_get_pc(cpu));
+    ASSERT_INT_EQ("runs past current PC", 4, pdp8_api_run_until(cpu, 100, 00202));
+    ASSERT_EQ("AC after loop", 00005, pdp8_api_get_ac(cpu));
+    ASSERT_INT_EQ("budget without stop", 10, pdp8_api_run_until(cpu, 10, -1));
+
+    pdp8_api_destroy(cpu);
+    return 1;
+}
+
+static int test_trace_columns(void) {
+    pdp8_t *cpu = pdp8_api_create(4096);
+    if (!cpu) {
+        return 0;
+    }
+
+    pdp8_api_write_mem(cpu, 00200, 07001); /* IAC */
+    pdp8_api_write_mem(cpu, 00201, 07020); /* CML */
+    pdp8_api_write_mem(cpu, 00202, 07402); /* HLT */
+    pdp8_api_set_pc(cpu, 00200);
+
+    uint16_t pcs[8] = {0};
+    uint16_t instructions[8] = {0};
+    uint16_t acs[8] = {0};
+    uint8_t links[8] = {0};
+    size_t count = pdp8_api_trace(cpu, 8, pcs, instructions, acs, links);
+    ASSERT_TRUE("trace stops at halt", count == 3u);
+    ASSERT_EQ("trace pc column", 00202, pcs[2]);
+    ASSERT_EQ("trace instruction column", 07020, instructions[1]);
+    ASSERT_EQ("trace ac before", 00001, acs[1]);
+    ASSERT_EQ("trace link before", 1, links[2]);
+    ASSERT_TRUE("trace after halt", pdp8_api_trace(cpu, 8, pcs, NULL, NULL, NULL) == 0u);
+
+    pdp8_api_write_mem(cpu, 00010, 00277);
+    pdp8_api_write_mem(cpu, 00300, 03410); /* DCA I 10 */
+    pdp8_api_write_mem(cpu, 00301, 01305); /* TAD 305 */
+    pdp8_api_write_mem(cpu, 00302, 07402); /* HLT */
+    pdp8_api_set_pc(cpu, 00300);
+    pdp8_api_clear_halt(cpu);
+    uint16_t addresses[8] = {0};
+    count = pdp8_api_trace_addresses(cpu, 8, NULL, NULL, NULL, NULL, addresses);
+    ASSERT_TRUE("address trace stops at halt", count == 3u);
+    ASSERT_EQ("auto-index effective address", 00300, addresses[0]);
+    ASSERT_EQ("direct effective address", 00305, addresses[1]);
+    ASSERT_EQ("operate has no address", PDP8_TRACE_NO_ADDRESS, addresses[2]);
+
+    pdp8_api_destroy(cpu);
+    return 1;
+}
+
 static int test_demo_core_fixture(void) {
     pdp8_t *cpu = pdp8_api_create(4096);
     if (!cpu) {
@@ -861,6 +1094,74 @@ static int test_paper_tape_parser(void) {
     return 1;
 }
 
+static int test_paper_tape_compiled(void) {
+    const char *path = "paper_tape_compiled.tmp";
+    const char *compiled = "paper_tape_compiled.tmp" PDP8_PAPER_TAPE_COMPILED_SUFFIX;
+    FILE *fp = fopen(path, "w");
+    if (!fp) {
+        return 0;
+    }
+    fprintf(fp, "AA007: 000000 000001 111111 000000\n");
+    fprintf(fp, "AA002: 101010 101010\n");
+    fclose(fp);
+
+    ASSERT_INT_EQ("compile tape", 0, pdp8_paper_tape_compile(path, NULL));
+
+    pdp8_paper_tape *image = NULL;
+    ASSERT_INT_EQ("load via compiled cache", 0, pdp8_paper_tape_load(path, &image));
+    ASSERT_TRUE("compiled image mapped", image->mapping != NULL);
+    ASSERT_STR_EQ("compiled label", "AA", image->label);
+    ASSERT_INT_EQ("compiled block count", 2, (int)image->block_count);
+    ASSERT_EQ("blocks sorted", 0002, image->blocks[0].block);
+    const pdp8_paper_tape_block *block = pdp8_paper_tape_find(image, 0007);
+    ASSERT_TRUE("block 007 present", block != NULL);
+    ASSERT_INT_EQ("block 007 word count", 2, (int)block->word_count);
+    ASSERT_EQ("block 007 word 1", 07700, block->words[1]);
+    ASSERT_TRUE("missing block", pdp8_paper_tape_find(image, 0003) == NULL);
+    pdp8_paper_tape_destroy(image);
+
+    image = NULL;
+    ASSERT_INT_EQ("load compiled image directly", 0, pdp8_paper_tape_load(compiled, &image));
+    ASSERT_TRUE("block 002 present", pdp8_paper_tape_find(image, 0002) != NULL);
+    pdp8_paper_tape_destroy(image);
+
+    /* A changed source invalidates the cache and falls back to the text. */
+    fp = fopen(path, "w");
+    if (!fp) {
+        return 0;
+    }
+    fprintf(fp, "AA001: 000000 000011\n");
+    fclose(fp);
+    image = NULL;
+    ASSERT_INT_EQ("load stale cache", 0, pdp8_paper_tape_load(path, &image));
+    ASSERT_TRUE("text parsed", image->mapping == NULL);
+    ASSERT_INT_EQ("text block count", 1, (int)image->block_count);
+    ASSERT_EQ("text block word", 000003, pdp8_paper_tape_find(image, 0001)->words[0]);
+    pdp8_paper_tape_destroy(image);
+
+    /* So does an edit within the same second that keeps the length. */
+    struct timespec times[2] = {{1700000000, 100}, {1700000000, 100}};
+    ASSERT_INT_EQ("stamp source", 0, utimensat(AT_FDCWD, path, times, 0));
+    ASSERT_INT_EQ("recompile tape", 0, pdp8_paper_tape_compile(path, NULL));
+    fp = fopen(path, "w");
+    if (!fp) {
+        return 0;
+    }
+    fprintf(fp, "AA001: 000000 000111\n");
+    fclose(fp);
+    times[0].tv_nsec = times[1].tv_nsec = 200;
+    ASSERT_INT_EQ("restamp source", 0, utimensat(AT_FDCWD, path, times, 0));
+    image = NULL;
+    ASSERT_INT_EQ("load same-second edit", 0, pdp8_paper_tape_load(path, &image));
+    ASSERT_TRUE("edit parsed", image->mapping == NULL);
+    ASSERT_EQ("edited block word", 000007, pdp8_paper_tape_find(image, 0001)->words[0]);
+    pdp8_paper_tape_destroy(image);
+
+    remove(path);
+    remove(compiled);
+    return 1;
+}
+
 static int test_paper_tape_device(void) {
     pdp8_t *cpu = pdp8_api_create(4096);
     if (!cpu) {
@@ -1021,6 +1322,526 @@ static int test_watchdog_tick_mode(void) {
     return 1;
 }
 
+static int test_watchdog_virtual_clock(void) {
+    pdp8_t *cpu = pdp8_api_create(4096);
+    ASSERT_TRUE("CPU created", cpu != NULL);
+    ASSERT_INT_EQ("reject zero step", -1, pdp8_api_set_clock(cpu, PDP8_CLOCK_VIRTUAL_INSTRUCTION, 0));
+    ASSERT_INT_EQ("virtual clock", 0, pdp8_api_set_clock(cpu, PDP8_CLOCK_VIRTUAL_INSTRUCTION, 1000000u));
+
+    pdp8_watchdog_t *wd = pdp8_watchdog_create();
+    ASSERT_TRUE("watchdog created", wd != NULL);
+    ASSERT_INT_EQ("attach watchdog", 0, pdp8_watchdog_attach(cpu, wd));
+
+    /* HALT one-shot after 2 deciseconds = 200 instructions at 1 ms each */
+    uint16_t control = (uint16_t)(((PDP8_WD_CMD_HALT_ONE_SHOT & 0x7) << 9) | 0002);
+    pdp8_api_set_ac(cpu, control);
+    pdp8_api_write_mem(cpu, 0, PDP8_WATCHDOG_WRITE);
+    pdp8_api_write_mem(cpu, 00200, 05200); /* JMP . */
+    pdp8_api_set_pc(cpu, 0);
+    ASSERT_INT_EQ("write control", 1, pdp8_api_step(cpu));
+    pdp8_api_set_pc(cpu, 00200);
+    ASSERT_INT_EQ("halts after emulated 200 ms", 199, pdp8_api_run(cpu, 100000));
+    ASSERT_INT_EQ("halted", 1, pdp8_api_is_halted(cpu));
+    ASSERT_TRUE("virtual time", pdp8_api_now_ns(cpu) == 200000000ull);
+
+    /* memory-cycle clock: JMP = 1 cycle, TAD I = 3 cycles */
+    ASSERT_INT_EQ("cycle clock", 0, pdp8_api_set_clock(cpu, PDP8_CLOCK_VIRTUAL_MEMORY_CYCLE, PDP8_MEMORY_CYCLE_NS));
+    pdp8_api_write_mem(cpu, 00300, 01700); /* TAD I 300 */
+    pdp8_api_write_mem(cpu, 00301, 07402); /* HLT */
+    pdp8_api_clear_halt(cpu);
+    pdp8_api_set_pc(cpu, 00300);
+    pdp8_api_register_iot(cpu, PDP8_WATCHDOG_DEVICE_CODE, NULL, NULL);
+    pdp8_api_register_tick(cpu, PDP8_WATCHDOG_DEVICE_CODE, NULL, NULL);
+    pdp8_watchdog_destroy(wd);
+    uint64_t before = pdp8_api_now_ns(cpu);
+    ASSERT_INT_EQ("run to halt", 2, pdp8_api_run(cpu, 10));
+    ASSERT_TRUE("memory cycles counted", pdp8_api_now_ns(cpu) - before == 4u * PDP8_MEMORY_CYCLE_NS);
+
+    pdp8_api_destroy(cpu);
+    return 1;
+}
+
+static uint16_t counting_mmio_read(const pdp8_t *cpu, uint16_t address, void *context) {
+    (void)cpu;
+    unsigned *calls = (unsigned *)context;
+    ++*calls;
+    return (uint16_t)(address + 1u);
+}
+
+static int test_mmio_read_hooks(void) {
+    pdp8_t *cpu = pdp8_api_create(4096);
+    ASSERT_TRUE("CPU created", cpu != NULL);
+
+    unsigned calls = 0;
+    ASSERT_INT_EQ("hook out of range", -1, pdp8_api_register_mmio_read(cpu, 010000, counting_mmio_read, &calls));
+    ASSERT_INT_EQ("register hook", 0, pdp8_api_register_mmio_read(cpu, 00400, counting_mmio_read, &calls));
+    pdp8_api_write_mem(cpu, 00010, 00400);
+    pdp8_api_write_mem(cpu, 00200, 01410); /* TAD I 10: auto-index to 0401 */
+    pdp8_api_write_mem(cpu, 00201, 01420); /* TAD I 20 */
+    pdp8_api_write_mem(cpu, 00020, 00400);
+    pdp8_api_write_mem(cpu, 00401, 00007);
+    pdp8_api_set_pc(cpu, 00200);
+    ASSERT_INT_EQ("run two TADs", 2, pdp8_api_run(cpu, 2));
+    ASSERT_EQ("unhooked neighbour reads memory", 00007 + 00401, pdp8_api_get_ac(cpu));
+    ASSERT_INT_EQ("hook called once", 1, (int)calls);
+
+    uint16_t block[3];
+    pdp8_api_read_block(cpu, 00377, block, 3);
+    ASSERT_EQ("block read uses hook", 00401, block[1]);
+    ASSERT_EQ("block read neighbour", 00007, block[2]);
+    ASSERT_INT_EQ("unregister hook", 0, pdp8_api_register_mmio_read(cpu, 00400, NULL, NULL));
+    pdp8_api_write_mem(cpu, 00400, 01234);
+    ASSERT_EQ("memory visible again", 01234, pdp8_api_read_mem(cpu, 00400));
+
+    ASSERT_INT_EQ("set status word", 0, pdp8_api_set_status_word(cpu, 07000, 04321));
+    pdp8_api_write_mem(cpu, 07000, 00001); /* stores do not change what reads see */
+    ASSERT_EQ("status word read", 04321, pdp8_api_read_mem(cpu, 07000));
+    ASSERT_INT_EQ("update status word", 0, pdp8_api_set_status_word(cpu, 07000, 00055));
+    ASSERT_EQ("status word updated", 00055, pdp8_api_read_mem(cpu, 07000));
+    ASSERT_INT_EQ("clear status word", 0, pdp8_api_clear_status_word(cpu, 07000));
+    ASSERT_EQ("memory behind status word", 00001, pdp8_api_read_mem(cpu, 07000));
+    ASSERT_INT_EQ("clear twice", -1, pdp8_api_clear_status_word(cpu, 07000));
+    ASSERT_INT_EQ("wall clock is not a status word", -1, pdp8_api_clear_status_word(cpu, 07760));
+
+    pdp8_api_destroy(cpu);
+    return 1;
+}
+
+/* ISZ delay loop at 0200 followed by HLT; returns instructions executed. */
+static int run_isz_delay(pdp8_t *cpu, int idle_skip, uint64_t *elapsed_ns) {
+    pdp8_api_set_idle_skip(cpu, idle_skip);
+    pdp8_api_set_clock(cpu, PDP8_CLOCK_VIRTUAL_MEMORY_CYCLE, PDP8_MEMORY_CYCLE_NS);
+    pdp8_api_write_mem(cpu, 00200, 02300); /* ISZ 300 */
+    pdp8_api_write_mem(cpu, 00201, 05200); /* JMP 200 */
+    pdp8_api_write_mem(cpu, 00202, 07402); /* HLT */
+    pdp8_api_write_mem(cpu, 00300, 07000);
+    pdp8_api_set_pc(cpu, 00200);
+    uint64_t before = pdp8_api_now_ns(cpu);
+    int executed = pdp8_api_run(cpu, 100000);
+    *elapsed_ns = pdp8_api_now_ns(cpu) - before;
+    return executed;
+}
+
+static int test_breakpoints(void) {
+    pdp8_t *cpu = pdp8_api_create(4096);
+    ASSERT_TRUE("CPU created", cpu != NULL);
+    const uint16_t program[] = {
+        07300, /* 0200 CLA CLL */
+        01210, /* 0201 TAD 0210 */
+        03211, /* 0202 DCA 0211 */
+        02212, /* 0203 ISZ 0212 */
+        05200, /* 0204 JMP 0200 */
+    };
+    ASSERT_INT_EQ("load program", 0, pdp8_api_load(cpu, program, 5, 00200));
+    pdp8_api_write_mem(cpu, 00210, 5);
+    pdp8_api_set_pc(cpu, 00200);
+
+    ASSERT_INT_EQ("set breakpoint", 0, pdp8_api_set_breakpoint(cpu, 00203, 1));
+    ASSERT_INT_EQ("out of range breakpoint", -1, pdp8_api_set_breakpoint(cpu, 010000, 1));
+    ASSERT_INT_EQ("stops before breakpoint", 3, pdp8_api_run(cpu, 1000));
+    ASSERT_INT_EQ("breakpoint reason", PDP8_STOP_BREAKPOINT, pdp8_api_get_stop_reason(cpu));
+    ASSERT_EQ("breakpoint address", 00203, pdp8_api_get_stop_address(cpu));
+    ASSERT_EQ("PC at breakpoint", 00203, pdp8_api_get_pc(cpu));
+    ASSERT_INT_EQ("resumes past it, stops next time round", 5, pdp8_api_run(cpu, 1000));
+    ASSERT_INT_EQ("budget runs out", 2, pdp8_api_run(cpu, 2));
+    ASSERT_INT_EQ("budget reason", PDP8_STOP_NONE, pdp8_api_get_stop_reason(cpu));
+    uint16_t listed[4];
+    ASSERT_TRUE("list breakpoints", pdp8_api_list_breakpoints(cpu, listed, 4) == 1u && listed[0] == 00203);
+    ASSERT_INT_EQ("clear breakpoint", 0, pdp8_api_set_breakpoint(cpu, 00203, 0));
+    ASSERT_TRUE("none listed", pdp8_api_list_breakpoints(cpu, listed, 4) == 0u);
+
+    /* watches stop after the accessing instruction; API access is invisible */
+    ASSERT_INT_EQ("write watch", 0, pdp8_api_set_watchpoint(cpu, 00211, PDP8_WATCH_WRITE));
+    ASSERT_INT_EQ("read watch", 0, pdp8_api_set_watchpoint(cpu, 00210, PDP8_WATCH_READ));
+    ASSERT_INT_EQ("bad watch mask", -1, pdp8_api_set_watchpoint(cpu, 00210, 4));
+    pdp8_api_write_mem(cpu, 00211, 1);
+    ASSERT_INT_EQ("api read is not watched", 5, pdp8_api_read_mem(cpu, 00210));
+    pdp8_api_set_pc(cpu, 00200);
+    ASSERT_INT_EQ("stops after TAD", 2, pdp8_api_run(cpu, 1000));
+    ASSERT_INT_EQ("read watch reason", PDP8_STOP_WATCH_READ, pdp8_api_get_stop_reason(cpu));
+    ASSERT_EQ("read watch address", 00210, pdp8_api_get_stop_address(cpu));
+    ASSERT_INT_EQ("stops after DCA", 1, pdp8_api_run(cpu, 1000));
+    ASSERT_INT_EQ("write watch reason", PDP8_STOP_WATCH_WRITE, pdp8_api_get_stop_reason(cpu));
+    ASSERT_EQ("PC after DCA", 00203, pdp8_api_get_pc(cpu));
+    uint8_t access[4];
+    ASSERT_TRUE("list watches",
+                pdp8_api_list_watchpoints(cpu, listed, access, 4) == 2u && listed[0] == 00210 &&
+                    access[0] == PDP8_WATCH_READ && listed[1] == 00211 && access[1] == PDP8_WATCH_WRITE);
+    pdp8_api_clear_breakpoints(cpu);
+    ASSERT_INT_EQ("runs freely once cleared", 1000, pdp8_api_run(cpu, 1000));
+
+    /* the idle fast-forward never jumps over a breakpoint */
+    pdp8_api_write_mem(cpu, 00300, 05300); /* JMP . */
+    pdp8_api_set_breakpoint(cpu, 00300, 1);
+    pdp8_api_set_pc(cpu, 00300);
+    ASSERT_INT_EQ("stops at once after set_pc", 0, pdp8_api_run(cpu, 1000));
+    ASSERT_INT_EQ("one pass per run", 1, pdp8_api_run(cpu, 1000));
+    ASSERT_INT_EQ("still a breakpoint stop", PDP8_STOP_BREAKPOINT, pdp8_api_get_stop_reason(cpu));
+    pdp8_api_clear_breakpoints(cpu);
+
+    ASSERT_INT_EQ("run_until stop", 1, pdp8_api_run_until(cpu, 1000, 00300));
+    ASSERT_INT_EQ("run_until reason", PDP8_STOP_PC, pdp8_api_get_stop_reason(cpu));
+    pdp8_api_write_mem(cpu, 00300, 07402); /* HLT */
+    ASSERT_INT_EQ("halt", 1, pdp8_api_run(cpu, 1000));
+    ASSERT_INT_EQ("halt reason", PDP8_STOP_HALT, pdp8_api_get_stop_reason(cpu));
+
+    pdp8_api_destroy(cpu);
+    return 1;
+}
+
+static int test_checkpoints(void) {
+    pdp8_t *cpu = pdp8_api_create(4096);
+    ASSERT_TRUE("CPU created", cpu != NULL);
+    pdp8_kl8e_console_t *console = pdp8_kl8e_console_create(NULL, NULL);
+    ASSERT_TRUE("console created", console != NULL);
+    ASSERT_INT_EQ("attach console", 0, pdp8_kl8e_console_attach(cpu, console));
+    const uint16_t program[] = {
+        07200, /* 0200 CLA */
+        01300, /* 0201 TAD 0300 */
+        07001, /* 0202 IAC */
+        03300, /* 0203 DCA 0300 */
+        01300, /* 0204 TAD 0300 */
+        03410, /* 0205 DCA I 0010: counter into the table at 2000 onwards */
+        05200, /* 0206 JMP 0200 */
+    };
+    ASSERT_INT_EQ("load program", 0, pdp8_api_load(cpu, program, 7, 00200));
+    pdp8_api_write_mem(cpu, 00010, 01777);
+    pdp8_api_set_pc(cpu, 00200);
+    pdp8_api_set_clock(cpu, PDP8_CLOCK_VIRTUAL_INSTRUCTION, 1000u);
+
+    pdp8_checkpoints_t *store = pdp8_checkpoints_create(cpu, 10, 0);
+    ASSERT_TRUE("store created", store != NULL);
+    ASSERT_INT_EQ("run half", 350, pdp8_checkpoints_run(store, 350));
+    uint64_t half_ns = pdp8_api_now_ns(cpu);
+    uint16_t half_pc = pdp8_api_get_pc(cpu);
+    ASSERT_EQ("counter at 350", 50, pdp8_api_read_mem(cpu, 00300));
+    ASSERT_INT_EQ("run rest", 350, pdp8_checkpoints_run(store, 350));
+    ASSERT_TRUE("position", pdp8_checkpoints_position(store) == 700u);
+    ASSERT_TRUE("checkpoint every interval", pdp8_checkpoints_count(store) == 71u);
+
+    /* stepping back restores memory, registers and time */
+    ASSERT_INT_EQ("reverse step", 0, pdp8_checkpoints_reverse_step(store, 350));
+    ASSERT_EQ("counter restored", 50, pdp8_api_read_mem(cpu, 00300));
+    ASSERT_EQ("table entry kept", 50, pdp8_api_read_mem(cpu, 02061));
+    ASSERT_EQ("later table entry undone", 0, pdp8_api_read_mem(cpu, 02062));
+    ASSERT_EQ("pc restored", half_pc, pdp8_api_get_pc(cpu));
+    ASSERT_TRUE("clock restored", pdp8_api_now_ns(cpu) == half_ns);
+    ASSERT_INT_EQ("seek forward replays", 0, pdp8_checkpoints_seek(store, 700));
+    ASSERT_EQ("counter replayed", 100, pdp8_api_read_mem(cpu, 00300));
+    ASSERT_EQ("table replayed", 100, pdp8_api_read_mem(cpu, 02143));
+    ASSERT_INT_EQ("step back two", 0, pdp8_checkpoints_reverse_step(store, 2));
+    ASSERT_EQ("last store undone", 0, pdp8_api_read_mem(cpu, 02143));
+    ASSERT_INT_EQ("seek", 0, pdp8_checkpoints_seek(store, 700));
+
+    /* reverse continue: after the last write, before the last breakpoint */
+    pdp8_api_set_watchpoint(cpu, 00300, PDP8_WATCH_WRITE);
+    ASSERT_INT_EQ("back to watch", PDP8_STOP_WATCH_WRITE, pdp8_checkpoints_reverse_continue(store));
+    ASSERT_TRUE("after the last DCA", pdp8_checkpoints_position(store) == 697u);
+    ASSERT_EQ("watch address", 00300, pdp8_checkpoints_stop_address(store));
+    ASSERT_EQ("pc after DCA", 00204, pdp8_api_get_pc(cpu));
+    ASSERT_INT_EQ("previous write", PDP8_STOP_WATCH_WRITE, pdp8_checkpoints_reverse_continue(store));
+    ASSERT_TRUE("one loop earlier", pdp8_checkpoints_position(store) == 690u);
+    pdp8_api_clear_breakpoints(cpu);
+    pdp8_api_set_breakpoint(cpu, 00205, 1);
+    ASSERT_INT_EQ("back to breakpoint", PDP8_STOP_BREAKPOINT, pdp8_checkpoints_reverse_continue(store));
+    ASSERT_TRUE("before the instruction", pdp8_checkpoints_position(store) == 684u);
+    ASSERT_EQ("pc at breakpoint", 00205, pdp8_api_get_pc(cpu));
+    ASSERT_INT_EQ("forward stops there too", 7, pdp8_checkpoints_run(store, 1000));
+    ASSERT_TRUE("forward position", pdp8_checkpoints_position(store) == 691u);
+    pdp8_api_clear_breakpoints(cpu);
+
+    /* outside changes start new history; queued input is rolled back */
+    pdp8_kl8e_console_queue_input(console, 'A');
+    ASSERT_INT_EQ("run after input", 20, pdp8_checkpoints_run(store, 20));
+    ASSERT_INT_EQ("input still pending", 1, (int)pdp8_kl8e_console_input_pending(console));
+    ASSERT_INT_EQ("step back past input", 0, pdp8_checkpoints_reverse_step(store, 30));
+    ASSERT_INT_EQ("input rolled back", 0, (int)pdp8_kl8e_console_input_pending(console));
+
+    /* the budget drops the oldest checkpoints */
+    size_t before = pdp8_checkpoints_bytes(store);
+    pdp8_checkpoints_set_budget(store, 1);
+    ASSERT_TRUE("one checkpoint left", pdp8_checkpoints_count(store) == 1u);
+    ASSERT_TRUE("bytes shrink", pdp8_checkpoints_bytes(store) < before);
+    ASSERT_INT_EQ("cannot go before oldest", -1,
+                  pdp8_checkpoints_seek(store, pdp8_checkpoints_oldest(store) - 1u));
+    ASSERT_INT_EQ("reset", 0, pdp8_checkpoints_reset(store));
+    ASSERT_TRUE("reset position", pdp8_checkpoints_position(store) == 0u);
+
+    pdp8_checkpoints_destroy(store);
+    pdp8_api_destroy(cpu);
+    pdp8_kl8e_console_destroy(console);
+    return 1;
+}
+
+static int test_counters(void) {
+    pdp8_t *cpu = pdp8_api_create(4096);
+    ASSERT_TRUE("CPU created", cpu != NULL);
+    pdp8_api_write_mem(cpu, 00200, 07401); /* ION */
+    pdp8_api_write_mem(cpu, 00020, 06046); /* TLS, no device attached */
+    pdp8_api_write_mem(cpu, 00021, 07402); /* HLT */
+    pdp8_api_set_pc(cpu, 00200);
+    pdp8_api_request_interrupt(cpu, 4);
+
+    ASSERT_INT_EQ("runs to HLT", 3, pdp8_api_run(cpu, 100));
+    pdp8_counters_t counters;
+    ASSERT_INT_EQ("get counters", 0, pdp8_api_get_counters(cpu, &counters));
+    ASSERT_TRUE("instructions", counters.instructions == 3u);
+    ASSERT_TRUE("halts", counters.halts == 1u);
+    ASSERT_TRUE("iot by device", counters.iots[4] == 1u && counters.iots[3] == 0u);
+    ASSERT_TRUE("requests and dispatches", counters.interrupt_requests == 1u && counters.interrupt_dispatches == 1u);
+    ASSERT_TRUE("latency of one instruction",
+                counters.interrupt_latency_sum == 1u && counters.interrupt_latency_max == 1u &&
+                    counters.interrupt_latency[1] == 1u);
+
+    /* fast-forwarded idle iterations count too; reset keeps the totals */
+    pdp8_api_write_mem(cpu, 00300, 05300); /* JMP . */
+    pdp8_api_set_pc(cpu, 00300);
+    pdp8_api_clear_halt(cpu);
+    ASSERT_INT_EQ("idle run", 1000, pdp8_api_run(cpu, 1000));
+    pdp8_api_reset(cpu);
+    pdp8_api_get_counters(cpu, &counters);
+    ASSERT_TRUE("idle instructions", counters.instructions == 1003u);
+    ASSERT_TRUE("skipped ones included", pdp8_api_idle_skipped(cpu) > 0u);
+    ASSERT_INT_EQ("null counters", -1, pdp8_api_get_counters(cpu, NULL));
+
+    pdp8_api_destroy(cpu);
+    return 1;
+}
+
+/* Watchdog tick on host time, a wall clock read and a typed key: recorded,
+ * then replayed on a fresh machine to the same state without waiting. */
+static const uint16_t journal_program[] = {
+    07200, /* 0200 CLA */
+    01240, /* 0201 TAD 240     tick every 100 ms */
+    06552, /* 0202 WRITE       (watchdog) */
+    07200, /* 0203 CLA */
+    06551, /* 0204 ISK */
+    05204, /* 0205 JMP 204 */
+    01641, /* 0206 TAD I 241   wall clock */
+    03242, /* 0207 DCA 242 */
+    06031, /* 0210 KSF */
+    05210, /* 0211 JMP 210 */
+    06036, /* 0212 KRB */
+    06046, /* 0213 TLS */
+    07402, /* 0214 HLT */
+};
+
+static pdp8_t *journal_machine(pdp8_kl8e_console_t **console, pdp8_watchdog_t **wd, FILE *sink) {
+    pdp8_t *cpu = pdp8_api_create(4096);
+    *console = pdp8_kl8e_console_create(NULL, sink);
+    *wd = pdp8_watchdog_create();
+    if (!cpu || !*console || !*wd || pdp8_kl8e_console_attach(cpu, *console) != 0 ||
+        pdp8_watchdog_attach(cpu, *wd) != 0) {
+        return NULL;
+    }
+    for (size_t i = 0; i < sizeof(journal_program) / sizeof(journal_program[0]); ++i) {
+        pdp8_api_write_mem(cpu, (uint16_t)(00200 + i), journal_program[i]);
+    }
+    pdp8_api_write_mem(cpu, 00240, (uint16_t)((PDP8_WD_CMD_TICK_PERIODIC << 9) | 1u));
+    pdp8_api_write_mem(cpu, 00241, 07760);
+    pdp8_api_set_pc(cpu, 00200);
+    return cpu;
+}
+
+static int test_journal(void) {
+    char path[] = "/tmp/pdp8_journal_XXXXXX";
+    int fd = mkstemp(path);
+    ASSERT_TRUE("temp journal", fd >= 0);
+    close(fd);
+    FILE *sink = tmpfile();
+    pdp8_kl8e_console_t *console = NULL;
+    pdp8_watchdog_t *wd = NULL;
+
+    pdp8_t *cpu = journal_machine(&console, &wd, sink);
+    ASSERT_TRUE("recording machine", cpu != NULL);
+    pdp8_journal_t *journal = pdp8_journal_record(cpu, path);
+    ASSERT_TRUE("recording", journal != NULL);
+    while (pdp8_api_get_pc(cpu) < 00210) {
+        ASSERT_TRUE("runs", pdp8_journal_run(journal, 1000) > 0);
+    }
+    ASSERT_INT_EQ("waits for a key", 1000, pdp8_journal_run(journal, 1000));
+    ASSERT_INT_EQ("key journaled", 0, pdp8_kl8e_console_queue_input(console, 'k'));
+    pdp8_journal_run(journal, 1000);
+    ASSERT_INT_EQ("halted", 1, pdp8_api_is_halted(cpu));
+    uint64_t length = pdp8_journal_position(journal);
+    uint16_t minutes = pdp8_api_read_mem(cpu, 00242);
+    ASSERT_TRUE("clock, wall clock and key", pdp8_journal_events(journal) >= 4u);
+    ASSERT_INT_EQ("closed", 0, pdp8_journal_close(journal));
+    pdp8_kl8e_console_destroy(console);
+    pdp8_watchdog_destroy(wd);
+    pdp8_api_destroy(cpu);
+
+    cpu = journal_machine(&console, &wd, sink);
+    ASSERT_TRUE("replaying machine", cpu != NULL);
+    journal = pdp8_journal_replay(cpu, path);
+    ASSERT_TRUE("replay loaded", journal != NULL);
+    ASSERT_TRUE("recorded length", pdp8_journal_end(journal) == length);
+    pdp8_journal_set_console(journal, console);
+    ASSERT_INT_EQ("host typing refused", -1, pdp8_kl8e_console_queue_input(console, 'x'));
+    int ran = pdp8_journal_run(journal, 1u << 30);
+    ASSERT_TRUE("replayed to the end", (uint64_t)ran == length && pdp8_api_is_halted(cpu));
+    ASSERT_INT_EQ("nothing more to replay", 0, pdp8_journal_run(journal, 1000));
+    ASSERT_EQ("same key", 'k', pdp8_api_get_ac(cpu));
+    ASSERT_EQ("same wall clock", minutes, pdp8_api_read_mem(cpu, 00242));
+    ASSERT_TRUE("every record used", pdp8_journal_remaining(journal) == 0u);
+    ASSERT_TRUE("no mismatches", pdp8_journal_mismatches(journal) == 0u);
+    pdp8_journal_close(journal);
+    pdp8_kl8e_console_destroy(console);
+    pdp8_watchdog_destroy(wd);
+    pdp8_api_destroy(cpu);
+
+    FILE *garbage = fopen(path, "wb");
+    fputs("not a journal", garbage);
+    fclose(garbage);
+    cpu = pdp8_api_create(4096);
+    ASSERT_TRUE("malformed log rejected", pdp8_journal_replay(cpu, path) == NULL);
+    pdp8_api_destroy(cpu);
+    fclose(sink);
+    unlink(path);
+    return 1;
+}
+
+static int test_idle_fast_forward(void) {
+    pdp8_t *cpu = pdp8_api_create(4096);
+    pdp8_t *reference = pdp8_api_create(4096);
+    ASSERT_TRUE("CPUs created", cpu != NULL && reference != NULL);
+
+    /* ISZ loops finish with the same count and time as stepping them */
+    uint64_t fast_ns = 0, slow_ns = 0;
+    int fast = run_isz_delay(cpu, 1, &fast_ns);
+    int slow = run_isz_delay(reference, 0, &slow_ns);
+    ASSERT_INT_EQ("ISZ loop instruction count", slow, fast);
+    ASSERT_INT_EQ("ISZ loop length", 2 * 01000, fast); /* 512 ISZ, 511 JMP, HLT */
+    ASSERT_TRUE("ISZ loop time", fast_ns == slow_ns && fast_ns == 3u * 01000 * PDP8_MEMORY_CYCLE_NS);
+    ASSERT_EQ("counter wrapped", 0, pdp8_api_read_mem(cpu, 00300));
+    ASSERT_INT_EQ("halted after loop", 1, pdp8_api_is_halted(cpu));
+    ASSERT_TRUE("ISZ iterations skipped", pdp8_api_idle_skipped(cpu) == 2u * 0776u);
+    ASSERT_TRUE("nothing skipped when disabled", pdp8_api_idle_skipped(reference) == 0u);
+    pdp8_api_destroy(reference);
+
+    /* KSF; JMP .-1 burns the whole budget at once and wakes on input */
+    FILE *sink = tmpfile();
+    pdp8_kl8e_console_t *console = pdp8_kl8e_console_create(NULL, sink);
+    ASSERT_TRUE("console created", console != NULL);
+    ASSERT_INT_EQ("attach console", 0, pdp8_kl8e_console_attach(cpu, console));
+    pdp8_api_clear_halt(cpu);
+    pdp8_api_write_mem(cpu, 00400, 06031); /* KSF */
+    pdp8_api_write_mem(cpu, 00401, 05200); /* JMP 400 (current page) */
+    pdp8_api_write_mem(cpu, 00402, 06036); /* KRB */
+    pdp8_api_write_mem(cpu, 00403, 07402); /* HLT */
+    pdp8_api_set_pc(cpu, 00400);
+    uint64_t skipped = pdp8_api_idle_skipped(cpu);
+    ASSERT_INT_EQ("idle budget consumed", 1000000, pdp8_api_run(cpu, 1000000));
+    ASSERT_TRUE("wait loop skipped", pdp8_api_idle_skipped(cpu) - skipped >= 1000000u - 2u);
+    ASSERT_TRUE("still waiting", pdp8_api_get_pc(cpu) == 00400 || pdp8_api_get_pc(cpu) == 00401);
+    ASSERT_INT_EQ("reported as waiting", 1, pdp8_api_is_waiting(cpu));
+    ASSERT_INT_EQ("run_until stop inside loop", 1, pdp8_api_run_until(cpu, 1000, pdp8_api_get_pc(cpu) == 00400 ? 00401 : 00400));
+    pdp8_kl8e_console_queue_input(console, 'A');
+    pdp8_api_run(cpu, 10);
+    ASSERT_INT_EQ("woke on input", 1, pdp8_api_is_halted(cpu));
+    ASSERT_INT_EQ("no longer waiting", 0, pdp8_api_is_waiting(cpu));
+    ASSERT_EQ("read the key", 'A', pdp8_api_get_ac(cpu));
+
+    /* a published tick deadline caps the skip: JMP . with a watchdog */
+    pdp8_watchdog_t *wd = pdp8_watchdog_create();
+    ASSERT_TRUE("watchdog created", wd != NULL);
+    ASSERT_INT_EQ("attach watchdog", 0, pdp8_watchdog_attach(cpu, wd));
+    ASSERT_TRUE("disabled watchdog has no deadline", pdp8_api_next_deadline(cpu) == PDP8_DEADLINE_NONE);
+    pdp8_api_set_clock(cpu, PDP8_CLOCK_VIRTUAL_INSTRUCTION, 1000u);
+    pdp8_api_clear_halt(cpu);
+    pdp8_api_set_ac(cpu, (uint16_t)(((PDP8_WD_CMD_HALT_ONE_SHOT & 0x7) << 9) | 0001));
+    pdp8_api_write_mem(cpu, 00500, PDP8_WATCHDOG_WRITE);
+    pdp8_api_write_mem(cpu, 00501, 05301); /* JMP . */
+    pdp8_api_set_pc(cpu, 00500);
+    uint64_t start = pdp8_api_now_ns(cpu);
+    ASSERT_INT_EQ("halts at the deadline", 100000, pdp8_api_run(cpu, 1000000));
+    ASSERT_TRUE("deadline reached exactly", pdp8_api_now_ns(cpu) - start == 100000000ull);
+
+    pdp8_api_register_iot(cpu, PDP8_WATCHDOG_DEVICE_CODE, NULL, NULL);
+    pdp8_api_register_tick(cpu, PDP8_WATCHDOG_DEVICE_CODE, NULL, NULL);
+    pdp8_watchdog_destroy(wd);
+    pdp8_api_register_iot(cpu, PDP8_KL8E_KEYBOARD_DEVICE_CODE, NULL, NULL);
+    pdp8_api_register_iot(cpu, PDP8_KL8E_TELEPRINTER_DEVICE_CODE, NULL, NULL);
+    pdp8_kl8e_console_destroy(console);
+    fclose(sink);
+    pdp8_api_destroy(cpu);
+    return 1;
+}
+
+static int test_mailbox(void) {
+    pdp8_t *cpu = pdp8_api_create(4096);
+    pdp8_mailbox_t *mailbox = pdp8_mailbox_create();
+    ASSERT_TRUE("CPU and mailbox created", cpu != NULL && mailbox != NULL);
+    ASSERT_INT_EQ("attach mailbox", 0, pdp8_mailbox_attach(cpu, mailbox, PDP8_MAILBOX_DEVICE_CODE));
+
+    /* echo loop: wait for a word, write it back plus one, latch the next in r3 */
+    pdp8_api_write_mem(cpu, 00200, 06501); /* SKI */
+    pdp8_api_write_mem(cpu, 00201, 05200); /* JMP 200 */
+    pdp8_api_write_mem(cpu, 00202, 06502); /* RDI */
+    pdp8_api_write_mem(cpu, 00203, 07001); /* IAC */
+    pdp8_api_write_mem(cpu, 00204, 06504); /* WRO */
+    pdp8_api_write_mem(cpu, 00205, 07200); /* CLA */
+    pdp8_api_write_mem(cpu, 00206, 01220); /* TAD 220 */
+    pdp8_api_write_mem(cpu, 00207, 06505); /* SEL */
+    pdp8_api_write_mem(cpu, 00210, 06502); /* RDI */
+    pdp8_api_write_mem(cpu, 00211, 06507); /* WRR */
+    pdp8_api_write_mem(cpu, 00212, 05200); /* JMP 200 */
+    pdp8_api_write_mem(cpu, 00220, 00003);
+    pdp8_api_set_pc(cpu, 00200);
+
+    ASSERT_INT_EQ("idle while empty", 1000, pdp8_api_run(cpu, 1000));
+    ASSERT_INT_EQ("waiting on the mailbox", 1, pdp8_api_is_waiting(cpu));
+
+    uint16_t batch[] = {0100, 0200};
+    ASSERT_TRUE("batch posted", pdp8_mailbox_post(mailbox, batch, 2) == 2u);
+    ASSERT_INT_EQ("no interrupt while disabled", 0, pdp8_api_peek_interrupt_pending(cpu));
+    pdp8_api_run(cpu, 100);
+    ASSERT_TRUE("inbound drained", pdp8_mailbox_inbound_pending(mailbox) == 0u);
+    uint16_t out[4] = {0};
+    ASSERT_TRUE("one word out", pdp8_mailbox_collect(mailbox, out, 4) == 1u);
+    ASSERT_EQ("echoed word", 0101, out[0]);
+    uint16_t regs[PDP8_MAILBOX_REGISTERS] = {0};
+    ASSERT_INT_EQ("read registers", 0, pdp8_mailbox_read_registers(mailbox, 0, regs, PDP8_MAILBOX_REGISTERS));
+    ASSERT_EQ("register 3 latched", 0200, regs[3]);
+    ASSERT_INT_EQ("span checked", -1, pdp8_mailbox_read_registers(mailbox, 6, regs, 3));
+
+    /* host-written registers are visible to RDR */
+    uint16_t level = 04321;
+    ASSERT_INT_EQ("write register", 0, pdp8_mailbox_write_registers(mailbox, 5, &level, 1));
+    pdp8_api_write_mem(cpu, 00300, 07200); /* CLA */
+    pdp8_api_write_mem(cpu, 00301, 01320); /* TAD 320 */
+    pdp8_api_write_mem(cpu, 00302, 06505); /* SEL */
+    pdp8_api_write_mem(cpu, 00303, 06506); /* RDR */
+    pdp8_api_write_mem(cpu, 00304, 07402); /* HLT */
+    pdp8_api_write_mem(cpu, 00320, 00005);
+    pdp8_api_set_pc(cpu, 00300);
+    pdp8_api_run(cpu, 10);
+    ASSERT_EQ("register read", 04321, pdp8_api_get_ac(cpu));
+
+    /* a post raises one interrupt per batch once SIE is set */
+    pdp8_api_clear_halt(cpu);
+    pdp8_api_write_mem(cpu, 00400, 07201); /* CLA IAC */
+    pdp8_api_write_mem(cpu, 00401, 06500); /* SIE */
+    pdp8_api_write_mem(cpu, 00402, 07402); /* HLT */
+    pdp8_api_set_pc(cpu, 00400);
+    pdp8_api_run(cpu, 10);
+    ASSERT_TRUE("posted with interrupt", pdp8_mailbox_post(mailbox, batch, 2) == 2u);
+    ASSERT_INT_EQ("interrupt requested", 1, pdp8_api_peek_interrupt_pending(cpu));
+
+    /* a full outbound ring drops words and counts them */
+    pdp8_api_clear_halt(cpu);
+    pdp8_api_write_mem(cpu, 00500, 06504); /* WRO */
+    pdp8_api_write_mem(cpu, 00501, 05300); /* JMP 500 */
+    pdp8_api_set_pc(cpu, 00500);
+    pdp8_api_run(cpu, 2 * (PDP8_MAILBOX_RING_WORDS + 1u));
+    ASSERT_TRUE("outbound full", pdp8_mailbox_outbound_pending(mailbox) == PDP8_MAILBOX_RING_WORDS);
+    ASSERT_TRUE("overflow counted", pdp8_mailbox_dropped(mailbox) == 1u);
+
+    pdp8_api_destroy(cpu);
+    pdp8_mailbox_destroy(mailbox);
+    return 1;
+}
+
 static int test_ion_ioff(void) {
     pdp8_t *cpu = pdp8_api_create(4096);
     ASSERT_TRUE("CPU created", cpu != NULL);
@@ -1137,9 +1958,23 @@ int main(int argc, char **argv) {
         {"clear halt", test_clear_halt},
         {"kl8e console", test_kl8e_console},
         {"line printer", test_line_printer},
+        {"output flush policy", test_output_flush_policy},
+        {"output ring", test_output_ring},
+        {"memory block and dirty pages", test_memory_block_and_dirty_pages},
+        {"run until pc", test_run_until_pc},
+        {"trace columns", test_trace_columns},
         //{"core fixture", test_demo_core_fixture},
         //{"paper tape parser", test_paper_tape_parser},
         //{"paper tape device", test_paper_tape_device},
+        {"watchdog virtual clock", test_watchdog_virtual_clock},
+        {"mmio read hooks", test_mmio_read_hooks},
+        {"idle fast-forward", test_idle_fast_forward},
+        {"mailbox", test_mailbox},
+        {"breakpoints and watchpoints", test_breakpoints},
+        {"checkpoints", test_checkpoints},
+        {"counters", test_counters},
+        {"input journal", test_journal},
+        {"paper tape compiled", test_paper_tape_compiled},
         {"paper tape punch device", test_paper_tape_punch_device},
         {"fruit jam board", test_board_spec},
         {"watchdog tick mode", test_watchdog_tick_mode},
@@ -7,15 +7,24 @@ page: the first row covers addresses base..base+0o077, and the second row
 covers base+0o100..base+0o177. A hash (#) marks an assembled word, while a dot
 (.) marks an unused location. An exclamation mark (!) marks an address that 
 has been written more than once (overallocation).
+
+With --run the program is also executed in the native core (factory/libpdp8.so)
+for a cycle budget, with optional scripted console input. Executed addresses
+are then drawn as heat levels 1-9 (log scale, 9 = hottest), or data-access
+levels with --heat data, and the report lists allocated code that never ran and
+hot indirect references whose target lies on another page.
 """
 
 from __future__ import annotations
 
 import argparse
+import ctypes
+import math
 import sys
+from dataclasses import dataclass, field
 from pathlib import Path
 from collections import defaultdict
-from typing import Dict, Iterable, List, Set, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 try:
     from pdp8_asm import AsmError, PDP8Assembler
@@ -26,10 +35,16 @@ except ImportError as exc:  # pragma: no cover - defensive path handling
 
 WORDS_PER_PAGE = 0o200
 HALF_PAGE = 0o100
+MEMORY_WORDS = 0o10000
+PAGE_MASK = 0o7600
+CODE_KINDS = {"mem", "iot", "operate"}
+HEAT_LEVELS = 9
+TRACE_BLOCK = 65536
+DEFAULT_RUN_CYCLES = 1_000_000
 
 
-def assemble_memory(source: Path) -> Tuple[Dict[int, int], Set[int], Dict[int, List[str]]]:
-    """Assemble source and return memory dict, duplicate addresses, and duplicate details."""
+def load_assembler(source: Path) -> PDP8Assembler:
+    """Read source and run the assembler's first pass."""
     try:
         lines = source.read_text().splitlines()
     except OSError as exc:
@@ -37,6 +52,12 @@ def assemble_memory(source: Path) -> Tuple[Dict[int, int], Set[int], Dict[int, L
 
     assembler = PDP8Assembler(lines)
     assembler.first_pass()
+    return assembler
+
+
+def assemble_memory(source: Path) -> Tuple[Dict[int, int], Set[int], Dict[int, List[str]]]:
+    """Assemble source and return memory dict, duplicate addresses, and duplicate details."""
+    assembler = load_assembler(source)
     
     # Track how many times each address is written and what source lines
     address_counts: Dict[int, int] = defaultdict(int)
@@ -58,7 +79,190 @@ def assemble_memory(source: Path) -> Tuple[Dict[int, int], Set[int], Dict[int, L
     return memory, duplicates, duplicate_sources
 
 
-def make_page_rows(memory: Dict[int, int], duplicates: Set[int], page: int) -> List[Tuple[int, str]]:
+@dataclass
+class RunProfile:
+    """Per-address counts collected by running the program in the native core."""
+
+    cycles: int = 0
+    halted: bool = False
+    final_pc: int = 0
+    executions: List[int] = field(default_factory=lambda: [0] * MEMORY_WORDS)
+    data_accesses: List[int] = field(default_factory=lambda: [0] * MEMORY_WORDS)
+    # (pc, pointer address, target) -> executions, for indirect off-page references
+    off_page_indirect: Dict[Tuple[int, int, int], int] = field(default_factory=dict)
+    output: bytes = b""
+
+
+def parse_input_text(text: str) -> bytes:
+    """Decode backslash escapes (\\n, \\r, \\x03...) in a scripted input string."""
+    return text.encode("latin-1", "backslashreplace").decode("unicode_escape").encode("latin-1")
+
+
+def profile_program(
+    memory: Dict[int, int],
+    start: int,
+    cycles: int,
+    console_input: bytes = b"",
+) -> RunProfile:
+    """Run the assembled image natively and count executions and data accesses.
+
+    Execution is traced in blocks through pdp8_api_trace_addresses; NumPy
+    turns each block's PC and effective-address columns into histograms.
+    """
+    try:
+        import numpy as np
+    except ImportError as exc:
+        raise RuntimeError("--run needs NumPy (pip install numpy)") from exc
+
+    root = Path(__file__).resolve().parents[1]
+    if str(root) not in sys.path:
+        sys.path.insert(0, str(root))
+    from factory import driver  # noqa: E402
+
+    lib = driver.load_library()
+    driver.configure_api(lib)
+    cpu = lib.pdp8_api_create(ctypes.c_size_t(MEMORY_WORDS))
+    if not cpu:
+        raise RuntimeError("Failed to create PDP-8 instance.")
+
+    console = None
+    printer = None
+    profile = RunProfile()
+    executions = np.zeros(MEMORY_WORDS, dtype=np.int64)
+    data_accesses = np.zeros(MEMORY_WORDS, dtype=np.int64)
+    chains: Dict[int, int] = defaultdict(int)
+    output = bytearray()
+    columns = {
+        "pc": np.zeros(TRACE_BLOCK, dtype=np.uint16),
+        "instr": np.zeros(TRACE_BLOCK, dtype=np.uint16),
+        "ac": np.zeros(TRACE_BLOCK, dtype=np.uint16),
+        "address": np.zeros(TRACE_BLOCK, dtype=np.uint16),
+        "link": np.zeros(TRACE_BLOCK, dtype=np.uint8),
+    }
+    pointers = {
+        name: column.ctypes.data_as(ctypes.POINTER(ctypes.c_uint8 if name == "link" else ctypes.c_uint16))
+        for name, column in columns.items()
+    }
+
+    try:
+        if hasattr(lib, "pdp8_interrupt_control_attach"):
+            lib.pdp8_interrupt_control_attach(cpu)
+        console = lib.pdp8_kl8e_console_create(None, None)
+        if console and lib.pdp8_kl8e_console_attach(cpu, console) == 0:
+            lib.pdp8_kl8e_console_set_output_stream(console, None)
+            for byte in console_input:
+                value = 0x0D if byte == 0x0A else (byte & 0x7F)
+                lib.pdp8_kl8e_console_queue_input(console, ctypes.c_uint8(value))
+        printer = lib.pdp8_line_printer_create(None)
+        if printer and lib.pdp8_line_printer_attach(cpu, printer) == 0:
+            lib.pdp8_line_printer_set_stream(printer, None)
+
+        lib.pdp8_api_reset(cpu)
+        driver.load_rom_into_memory(lib, cpu, sorted(memory.items()))
+        lib.pdp8_api_set_pc(cpu, ctypes.c_uint16(start & 0o7777))
+
+        remaining = max(0, cycles)
+        while remaining > 0 and not lib.pdp8_api_is_halted(cpu):
+            n = lib.pdp8_api_trace_addresses(
+                cpu,
+                min(remaining, TRACE_BLOCK),
+                pointers["pc"],
+                pointers["instr"],
+                pointers["ac"],
+                pointers["link"],
+                pointers["address"],
+            )
+            if n == 0:
+                break
+            remaining -= n
+            profile.cycles += n
+
+            pc = columns["pc"][:n].astype(np.int64)
+            instr = columns["instr"][:n].astype(np.int64)
+            address = columns["address"][:n].astype(np.int64)
+            opcode = instr >> 9
+            executions += np.bincount(pc, minlength=MEMORY_WORDS)[:MEMORY_WORDS]
+
+            # AND/TAD/ISZ/DCA/JMS touch their effective address as data.
+            operand = opcode <= 4
+            data_accesses += np.bincount(address[operand], minlength=MEMORY_WORDS)[:MEMORY_WORDS]
+
+            # Indirect references also read (and may auto-increment) the pointer.
+            indirect = (opcode < 6) & ((instr & 0o400) != 0)
+            pointer = np.where(instr & 0o200, pc & PAGE_MASK, 0) | (instr & 0o177)
+            data_accesses += np.bincount(pointer[indirect], minlength=MEMORY_WORDS)[:MEMORY_WORDS]
+
+            off_page = indirect & ((address & PAGE_MASK) != (pc & PAGE_MASK))
+            if off_page.any():
+                keys = (pc[off_page] << 24) | (pointer[off_page] << 12) | address[off_page]
+                unique, hits = np.unique(keys, return_counts=True)
+                for key, hit in zip(unique.tolist(), hits.tolist()):
+                    chains[key] += hit
+
+            if console:
+                byte = ctypes.c_uint8(0)
+                while lib.pdp8_kl8e_console_output_pending(console):
+                    if lib.pdp8_kl8e_console_pop_output(console, ctypes.byref(byte)) != 0:
+                        break
+                    output.append(byte.value)
+
+        profile.halted = bool(lib.pdp8_api_is_halted(cpu))
+        profile.final_pc = lib.pdp8_api_get_pc(cpu) & 0o7777
+    finally:
+        if console:
+            lib.pdp8_kl8e_console_destroy(console)
+        if printer:
+            lib.pdp8_line_printer_destroy(printer)
+        lib.pdp8_api_destroy(cpu)
+
+    profile.executions = executions.tolist()
+    profile.data_accesses = data_accesses.tolist()
+    profile.off_page_indirect = {
+        (key >> 24, (key >> 12) & 0o7777, key & 0o7777): hits for key, hits in chains.items()
+    }
+    profile.output = bytes(output)
+    return profile
+
+
+def heat_levels(counts: List[int]) -> Dict[int, str]:
+    """Map touched addresses to '1'..'9' on a log scale of their counts."""
+    peak = max(counts) if counts else 0
+    if peak <= 0:
+        return {}
+    scale = math.log(peak + 1)
+    levels: Dict[int, str] = {}
+    for address, count in enumerate(counts):
+        if count:
+            level = 1 + int((HEAT_LEVELS - 1) * math.log(count + 1) / scale) if scale else HEAT_LEVELS
+            levels[address] = str(min(HEAT_LEVELS, max(1, level)))
+    return levels
+
+
+def never_executed_ranges(
+    code_addresses: Dict[int, str], executions: List[int]
+) -> List[Tuple[int, int, str]]:
+    """Contiguous runs of assembled instructions that never executed.
+
+    Returns (first, last, source of first) for each run.
+    """
+    ranges: List[Tuple[int, int, str]] = []
+    for address in sorted(code_addresses):
+        if executions[address]:
+            continue
+        if ranges and ranges[-1][1] == address - 1:
+            first, _, text = ranges[-1]
+            ranges[-1] = (first, address, text)
+        else:
+            ranges.append((address, address, code_addresses[address]))
+    return ranges
+
+
+def make_page_rows(
+    memory: Dict[int, int],
+    duplicates: Set[int],
+    page: int,
+    heat: Optional[Dict[int, str]] = None,
+) -> List[Tuple[int, str]]:
     base_address = page * WORDS_PER_PAGE
     rows: List[Tuple[int, str]] = []
     for offset in (0, HALF_PAGE):
@@ -68,6 +272,8 @@ def make_page_rows(memory: Dict[int, int], duplicates: Set[int], page: int) -> L
             address = row_base + idx
             if address in duplicates:
                 chars.append("!")
+            elif heat and address in heat:
+                chars.append(heat[address])
             elif address in memory:
                 chars.append("#")
             else:
@@ -76,24 +282,29 @@ def make_page_rows(memory: Dict[int, int], duplicates: Set[int], page: int) -> L
     return rows
 
 
-def iter_pages(memory: Dict[int, int], duplicates: Set[int], show_all: bool) -> Iterable[Tuple[int, List[Tuple[int, str]]]]:
+def iter_pages(
+    memory: Dict[int, int],
+    duplicates: Set[int],
+    show_all: bool,
+    heat: Optional[Dict[int, str]] = None,
+) -> Iterable[Tuple[int, List[Tuple[int, str]]]]:
     if not memory:
         return []
 
-    max_address = max(memory)
+    max_address = max(list(memory) + list(heat or ()))
     max_page = max_address // WORDS_PER_PAGE
     pages: List[Tuple[int, List[Tuple[int, str]]]] = []
 
     for page in range(max_page + 1):
-        rows = make_page_rows(memory, duplicates, page)
-        if not show_all and all("#" not in row_text and "!" not in row_text for _, row_text in rows):
+        rows = make_page_rows(memory, duplicates, page, heat)
+        if not show_all and all(set(row_text) == {"."} for _, row_text in rows):
             continue
         pages.append((page, rows))
     return pages
 
 
-def render(memory: Dict[int, int], duplicates: Set[int], duplicate_sources: Dict[int, List[str]], show_all: bool, show_details: bool, source_file: Path) -> str:
-    pages = list(iter_pages(memory, duplicates, show_all))
+def render(memory: Dict[int, int], duplicates: Set[int], duplicate_sources: Dict[int, List[str]], show_all: bool, show_details: bool, source_file: Path, heat: Optional[Dict[int, str]] = None) -> str:
+    pages = list(iter_pages(memory, duplicates, show_all, heat))
     if not pages:
         return "No assembled output."
 
@@ -124,6 +335,58 @@ def render(memory: Dict[int, int], duplicates: Set[int], duplicate_sources: Dict
     return "\n".join(lines).rstrip()
 
 
+def render_profile(
+    profile: RunProfile,
+    code_addresses: Dict[int, str],
+    heat_kind: str,
+    top: int,
+    show_output: bool,
+) -> str:
+    counts = profile.executions if heat_kind == "exec" else profile.data_accesses
+    what = "executions" if heat_kind == "exec" else "data accesses"
+    stop = "HALT" if profile.halted else "cycle budget"
+    lines: List[str] = [
+        "=" * 40,
+        f"Ran {profile.cycles} cycle(s), stopped by {stop} at PC {profile.final_pc:04o}.",
+        f"Heat: 1-9 = {what} (log scale, 9 = hottest); # = allocated, not {'executed' if heat_kind == 'exec' else 'accessed'}.",
+        "",
+    ]
+
+    hottest = sorted((count, address) for address, count in enumerate(counts) if count)[::-1][:top]
+    if hottest:
+        lines.append(f"Hottest addresses ({what}):")
+        for count, address in hottest:
+            source = code_addresses.get(address, "")
+            lines.append(f"  {address:04o}  {count:10d}  {source}".rstrip())
+        lines.append("")
+
+    ranges = never_executed_ranges(code_addresses, profile.executions)
+    if ranges:
+        words = sum(last - first + 1 for first, last, _ in ranges)
+        lines.append(f"Allocated but never executed: {words} instruction word(s) in {len(ranges)} range(s)")
+        for first, last, source in ranges:
+            span = f"{first:04o}" if first == last else f"{first:04o}-{last:04o}"
+            lines.append(f"  {span:9s}  {source}")
+        lines.append("")
+
+    threshold = max(1, profile.cycles // 1000)
+    chains = sorted(
+        ((hits, key) for key, hits in profile.off_page_indirect.items() if hits >= threshold), reverse=True
+    )[:top]
+    if chains:
+        lines.append("Hot off-page indirect references (candidates for relayout):")
+        lines.append("  PC    Ptr   Target  Count       Source")
+        for hits, (pc, pointer, target) in chains:
+            source = code_addresses.get(pc, "")
+            lines.append(f"  {pc:04o}  {pointer:04o}  {target:04o}    {hits:10d}  {source}".rstrip())
+        lines.append("")
+
+    if show_output and profile.output:
+        lines.append("Console output:")
+        lines.append(profile.output.decode("ascii", errors="replace").replace("\r", ""))
+    return "\n".join(lines).rstrip()
+
+
 def parse_args(argv: List[str]) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Show PDP-8 page allocations from assembly source.")
     parser.add_argument("source", type=Path, help="PAL-style PDP-8 assembly source file")
@@ -137,6 +400,33 @@ def parse_args(argv: List[str]) -> argparse.Namespace:
         action="store_true",
         help="Show source lines for each duplicate address.",
     )
+    profile_group = parser.add_argument_group("execution heatmap")
+    profile_group.add_argument(
+        "--run",
+        action="store_true",
+        help="Run the program in the native core and overlay execution heat.",
+    )
+    profile_group.add_argument(
+        "--cycles",
+        type=int,
+        default=DEFAULT_RUN_CYCLES,
+        help="Cycle budget for --run (default: %(default)s).",
+    )
+    profile_group.add_argument("--start", help="Start address in octal (default: START label or lowest address).")
+    profile_group.add_argument(
+        "--input",
+        default="",
+        help="Scripted console input for --run; backslash escapes such as \\r are decoded.",
+    )
+    profile_group.add_argument("--input-file", type=Path, help="Read scripted console input from a file.")
+    profile_group.add_argument(
+        "--heat",
+        choices=("exec", "data"),
+        default="exec",
+        help="Draw execution counts or data-access counts (default: %(default)s).",
+    )
+    profile_group.add_argument("--top", type=int, default=10, help="Rows in the hot lists (default: %(default)s).")
+    profile_group.add_argument("--show-output", action="store_true", help="Print console output from the run.")
     return parser.parse_args(argv)
 
 
@@ -148,8 +438,32 @@ def main(argv: List[str]) -> int:
         print(exc, file=sys.stderr)
         return 1
 
-    output = render(memory, duplicates, duplicate_sources, args.all_pages, args.show_duplicates, args.source)
-    print(output)
+    if not args.run:
+        output = render(memory, duplicates, duplicate_sources, args.all_pages, args.show_duplicates, args.source)
+        print(output)
+        return 0
+
+    assembler = load_assembler(args.source)
+    code_addresses = {
+        stmt.address: stmt.raw.strip() for stmt in assembler.statements if stmt.kind in CODE_KINDS
+    }
+    try:
+        if args.start is not None:
+            start = int(args.start, 8)
+        else:
+            start = assembler.symbols.get("START", min(memory) if memory else 0)
+        console_input = parse_input_text(args.input)
+        if args.input_file:
+            console_input += args.input_file.read_bytes()
+        profile = profile_program(memory, start, args.cycles, console_input)
+    except (RuntimeError, ValueError, OSError) as exc:
+        print(exc, file=sys.stderr)
+        return 1
+
+    counts = profile.executions if args.heat == "exec" else profile.data_accesses
+    heat = heat_levels(counts)
+    print(render(memory, duplicates, duplicate_sources, args.all_pages, args.show_duplicates, args.source, heat))
+    print(render_profile(profile, code_addresses, args.heat, args.top, args.show_output))
     return 0
 
 
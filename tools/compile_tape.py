@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Compile text paper tapes into the binary image format used by the reader.
+
+The compiled image (``<tape>.ptc`` by default) holds a sorted block table and
+the packed 12-bit words, so the emulator can mmap it instead of re-parsing the
+bit strings. ``pdp8_paper_tape_load`` picks the image up automatically while
+the text source keeps the size and mtime recorded at compile time.
+
+Usage:
+    python3 tools/compile_tape.py tapes/tp_demo.tape [more.tape ...]
+    python3 tools/compile_tape.py tapes/2025.tape -o /tmp/2025.ptc
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Sequence
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from factory.driver import EmulatorError, configure_api, load_library  # noqa: E402
+
+COMPILED_SUFFIX = ".ptc"  # matches PDP8_PAPER_TAPE_COMPILED_SUFFIX
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compile PDP-8 paper tapes to mmap-able images.")
+    parser.add_argument("tapes", nargs="+", type=Path, help="Text tape file(s) to compile.")
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        help=f"Output path (single tape only; default: <tape>{COMPILED_SUFFIX}).",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str]) -> int:
+    args = parse_args(argv)
+    if args.output and len(args.tapes) != 1:
+        print("--output requires exactly one tape", file=sys.stderr)
+        return 2
+
+    try:
+        lib = load_library()
+    except EmulatorError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    configure_api(lib)
+
+    failures = 0
+    for tape in args.tapes:
+        output = args.output or tape.with_name(tape.name + COMPILED_SUFFIX)
+        rc = lib.pdp8_paper_tape_compile(str(tape).encode("utf-8"), str(output).encode("utf-8"))
+        if rc != 0:
+            print(f"{tape}: compile failed", file=sys.stderr)
+            failures += 1
+            continue
+        print(f"{tape} -> {output} ({output.stat().st_size} bytes)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -8,6 +8,7 @@ Supports both SIXBIT (binary) and ASCII (octal) tape formats with auto-detection
 
 import sys
 import argparse
+import itertools
 import os
 
 def six_bit_to_ascii(bit_string):
@@ -79,159 +80,181 @@ def detect_tape_format(line):
     
     return None
 
-def parse_tape_line(line, format_type='sixbit'):
-    """Parse a single tape line and extract characters.
-    
-    Args:
-        line: The tape line to parse
-        format_type: Either 'sixbit' (binary) or 'ascii' (octal)
-    
-    Returns:
-        List of decoded characters
+# Precomputed SIXBIT decode table so the per-chunk cost is a single dict lookup.
+SIXBIT_TABLE = {format(v, '06b'): six_bit_to_ascii(format(v, '06b')) for v in range(64)}
+
+# Lines read looking for the first labelled data line before giving up, so a
+# file that is not a tape is not read in full just to be rejected.
+SNIFF_LINES = 64
+
+class TapeStats:
+    """Running counters collected while a tape is streamed."""
+
+    def __init__(self):
+        self.lines = 0
+        self.characters = 0
+
+def iter_tape_lines(f):
+    """Yield stripped, non-empty lines from an open tape file one at a time."""
+    for line in f:
+        line = line.strip()
+        if line:
+            yield line
+
+def sniff_tape_format(lines):
+    """Detect the tape format from a line iterator.
+
+    Returns (format_type, lines) where the returned iterator replays any lines
+    consumed during detection, so callers can keep streaming from the start.
+    Only the first SNIFF_LINES lines are examined.
     """
-    # Remove tape identifier (2-3 char label + 3-digit octal block, e.g., "TP001:", "MAN001:")
+    seen = []
+    format_type = None
+    for line in itertools.islice(lines, SNIFF_LINES):
+        seen.append(line)
+        if ':' in line:
+            format_type = detect_tape_format(line)
+            if format_type:
+                break
+    return format_type, itertools.chain(seen, lines)
+
+def decode_tape_line(line, format_type):
+    """Decode one tape line (SIXBIT or ASCII octal chunks) to a string."""
     if ':' in line:
         _, data_part = line.split(':', 1)
     else:
         data_part = line
-    
-    chunks = data_part.strip().split()
-    decoded_chars = []
-    
+    chunks = data_part.split()
     if format_type == 'sixbit':
-        # SIXBIT format: 6-bit binary strings
-        for chunk in chunks:
-            if len(chunk) == 6 and all(c in '01' for c in chunk):
-                decoded_chars.append(six_bit_to_ascii(chunk))
-    
-    elif format_type == 'ascii':
-        # ASCII format: 3-digit octal values
-        for chunk in chunks:
-            if len(chunk) == 3 and chunk.isdigit():
-                try:
-                    char_code = int(chunk, 8)
-                    if 0 <= char_code <= 127:
-                        decoded_chars.append(chr(char_code))
-                except ValueError:
-                    pass
-    
-    return decoded_chars
+        return ''.join([SIXBIT_TABLE.get(chunk, '') for chunk in chunks])
+    decoded = []
+    for chunk in chunks:
+        if len(chunk) == 3 and chunk.isdigit():
+            try:
+                char_code = int(chunk, 8)
+            except ValueError:
+                continue
+            if 0 <= char_code <= 127:
+                decoded.append(chr(char_code))
+    return ''.join(decoded)
 
-def read_tape_file(filename, records_only=False):
-    """Read and decode a papertape file (SIXBIT or ASCII format)."""
+def iter_tape_records(lines, format_type, stats=None):
+    """Yield (label, text) for each tape line that decodes to something.
+
+    Lines are consumed lazily so arbitrarily large tapes stream in constant
+    memory. When stats is given it is updated as records are produced.
+    """
+    for line in lines:
+        if stats is not None:
+            stats.lines += 1
+        text = decode_tape_line(line, format_type)
+        if not text:
+            continue
+        if stats is not None:
+            stats.characters += len(text)
+        label = line.split(':', 1)[0].strip() if ':' in line else ''
+        yield label, text
+
+def open_tape(filename):
+    """Open a tape file and detect its format.
+
+    Returns (file, format_type, lines) or None after printing an error. The
+    caller owns the returned file object.
+    """
     if not os.path.exists(filename):
         print(f"Error: File '{filename}' not found.")
         return None
-    
+
     try:
-        with open(filename, 'r') as f:
-            lines = f.readlines()
+        f = open(filename, 'r')
     except IOError as e:
         print(f"Error reading file '{filename}': {e}")
         return None
-    
-    # Auto-detect format from first valid line
-    format_type = None
-    for line in lines:
-        line = line.strip()
-        if line and ':' in line:
-            format_type = detect_tape_format(line)
-            if format_type:
-                break
-    
+
+    format_type, lines = sniff_tape_format(iter_tape_lines(f))
     if not format_type:
+        f.close()
         print(f"Error: Could not detect tape format (expected SIXBIT or ASCII)")
         return None
-    
+    return f, format_type, lines
+
+def read_tape_file(filename, records_only=False):
+    """Read and decode a papertape file (SIXBIT or ASCII format).
+
+    Convenience wrapper that materialises the whole tape; the command line
+    tool streams through iter_tape_records instead.
+    """
+    opened = open_tape(filename)
+    if opened is None:
+        return None
+    f, format_type, lines = opened
+    with f:
+        if records_only:
+            return list(iter_tape_records(lines, format_type))
+        return ''.join(text for _, text in iter_tape_records(lines, format_type))
+
+def print_codes(filename, fmt):
+    """Print character codes for the whole tape, 16 per row, streaming."""
+    opened = open_tape(filename)
+    if opened is None:
+        return
+    f, format_type, lines = opened
+    with f:
+        index = 0
+        for _, text in iter_tape_records(lines, format_type):
+            for char in text:
+                if index > 0 and index % 16 == 0:
+                    print()
+                print(fmt.format(ord(char)), end=" ")
+                index += 1
+    print("\n")
+
+def display_tape_stream(filename, show_raw=False, show_hex=False):
+    """Stream the decoded tape to stdout, then print statistics.
+
+    Returns False if the tape could not be opened or decoded.
+    """
+    opened = open_tape(filename)
+    if opened is None:
+        return False
+    f, format_type, lines = opened
     format_name = "SIXBIT (binary)" if format_type == 'sixbit' else "ASCII (octal)"
-    
-    if records_only:
-        # For records-only mode, return list of (label, content) tuples
-        records = []
-        for line_num, line in enumerate(lines, 1):
-            line = line.strip()
-            if not line:
-                continue
-                
-            # Parse tape line to extract label and decode content
-            if ':' in line:
-                label_part, _ = line.split(':', 1)
-                decoded_chars = parse_tape_line(line, format_type)
-                
-                if decoded_chars:
-                    line_text = ''.join(decoded_chars)
-                    records.append((label_part.strip(), line_text))
-        return records
-    
-    decoded_text = ""
-    total_chunks = 0
-    line_count = 0
-    
-    if not records_only:
-        print(f"Reading tape file: {filename}")
-        print(f"Format: {format_name}")
-        print("=" * 60)
-    
-    for line_num, line in enumerate(lines, 1):
-        line = line.strip()
-        if not line:
-            continue
-            
-        line_count += 1
-        decoded_chars = parse_tape_line(line, format_type)
-        
-        if not decoded_chars:
-            continue
-            
-        total_chunks += len(decoded_chars)
-        
-        # Append decoded characters
-        for char in decoded_chars:
-            decoded_text += char
-    
-    if not records_only:
-        print(f"Tape statistics:")
-        print(f"  Lines processed: {line_count}")
-        chunk_label = "6-bit chunks" if format_type == 'sixbit' else "ASCII characters"
-        print(f"  Total {chunk_label}: {total_chunks}")
-        print(f"  Decoded characters: {len(decoded_text)}")
-        print()
-    
-    return decoded_text
 
-def display_tape_content(content, show_raw=False, show_hex=False):
-    """Display the decoded tape content in various formats."""
-    if not content:
+    print(f"Reading tape file: {filename}")
+    print(f"Format: {format_name}")
+    print("=" * 60)
+
+    stats = TapeStats()
+    out = sys.stdout
+    with f:
+        for _, text in iter_tape_records(lines, format_type, stats):
+            if stats.characters == len(text):
+                print("Decoded tape content:")
+                print("-" * 40)
+            # Clean up the content for display
+            out.write(text.replace('\r', ''))
+
+    if stats.characters == 0:
         print("No content to display.")
-        return
-    
-    print("Decoded tape content:")
-    print("-" * 40)
-    
-    # Clean up the content for display
-    display_content = content.replace('\r', '')  # Remove carriage returns
-    
-    # Show readable text
-    print(display_content)
+    else:
+        print()
+        print()
+
+    print(f"Tape statistics:")
+    print(f"  Lines processed: {stats.lines}")
+    print(f"  Decoded characters: {stats.characters}")
     print()
-    
-    if show_raw:
+
+    if stats.characters and show_raw:
         print("Raw character codes:")
         print("-" * 40)
-        for i, char in enumerate(content):
-            if i > 0 and i % 16 == 0:
-                print()
-            print(f"{ord(char):3d}", end=" ")
-        print("\n")
-    
-    if show_hex:
+        print_codes(filename, "{:3d}")
+
+    if stats.characters and show_hex:
         print("Hexadecimal representation:")
         print("-" * 40)
-        for i, char in enumerate(content):
-            if i > 0 and i % 16 == 0:
-                print()
-            print(f"{ord(char):02x}", end=" ")
-        print("\n")
+        print_codes(filename, "{:02x}")
+    return True
 
 def main():
     parser = argparse.ArgumentParser(
@@ -260,24 +283,22 @@ def main():
     args = parser.parse_args()
     
     if args.records:
-        # Records-only mode
-        records = read_tape_file(args.tape_file, records_only=True)
-        if records is not None:
-            for label, content in records:
+        # Records-only mode, streamed one line at a time
+        opened = open_tape(args.tape_file)
+        if opened is None:
+            sys.exit(1)
+        f, format_type, lines = opened
+        with f:
+            for label, content in iter_tape_records(lines, format_type):
                 # Clean up content and replace control characters
                 clean_content = content.replace('\n', ' ').replace('\r', ' ').strip()
                 # Remove excessive spaces
                 clean_content = ' '.join(clean_content.split())
                 print(f"{label}: {clean_content}")
-        else:
-            sys.exit(1)
     else:
         # Regular mode
-        content = read_tape_file(args.tape_file)
-        if content is not None:
-            display_tape_content(content, show_raw=args.raw, show_hex=args.hex)
-        else:
+        if not display_tape_stream(args.tape_file, show_raw=args.raw, show_hex=args.hex):
             sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""Post-mortem analysis of .p8t instruction traces written by the factory.
+
+Record a trace with:
+
+  python3 -m factory -r --trace-out run.p8t demo/cal3.srec
+
+then, for example:
+
+  python3 tools/trace_analyze.py run.p8t summary
+  python3 tools/trace_analyze.py run.p8t hot --top 20
+  python3 tools/trace_analyze.py run.p8t loops
+  python3 tools/trace_analyze.py run.p8t iot --device 66
+  python3 tools/trace_analyze.py run.p8t first-write 0150
+  python3 tools/trace_analyze.py run.p8t before-halt --count 32
+  python3 tools/trace_analyze.py run.p8t steps --from 1000000 --count 200
+
+The file is memory-mapped and processed one chunk at a time with NumPy, so
+traces of hundreds of millions of instructions need only one chunk in memory.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from factory.disasm import disassemble  # noqa: E402
+from factory.tracefile import (  # noqa: E402
+    TRACE_NO_ADDRESS,
+    TraceFile,
+    TraceFormatError,
+    column_layout,
+)
+
+MEMORY_WORDS = 4096
+OP_ISZ = 2
+OP_DCA = 3
+OP_JMS = 4
+OP_IOT = 6
+WRITE_OPS = (OP_ISZ, OP_DCA, OP_JMS)
+
+
+def parse_octal(text: str) -> int:
+    return int(text, 8) & 0o7777
+
+
+def chunk_columns(trace: TraceFile) -> Iterator[Tuple[int, Dict[str, np.ndarray]]]:
+    """Yield (first_step, columns) for each chunk as NumPy views."""
+    for chunk, payload in trace:
+        columns = {
+            name: np.frombuffer(payload, dtype=dtype, count=chunk.count, offset=offset)
+            for name, offset, dtype in column_layout(chunk.count)
+        }
+        yield chunk.first_step, columns
+
+
+def with_next_pc(trace: TraceFile) -> Iterator[Tuple[int, Dict[str, np.ndarray], np.ndarray]]:
+    """Like chunk_columns, plus the PC after each step.
+
+    The PC after the last step of a chunk is the first PC of the next one, or
+    the final PC from the end record. Without an end record the last step is
+    dropped.
+    """
+    pending: Optional[Tuple[int, Dict[str, np.ndarray]]] = None
+    for first_step, columns in chunk_columns(trace):
+        if pending is not None:
+            yield (*pending, np.append(pending[1]["pc"][1:], columns["pc"][0]))
+        pending = (first_step, columns)
+    if pending is None:
+        return
+    first_step, columns = pending
+    if trace.end is not None:
+        yield first_step, columns, np.append(columns["pc"][1:], trace.end.pc)
+    else:
+        trimmed = {name: values[:-1] for name, values in columns.items()}
+        yield first_step, trimmed, columns["pc"][1:]
+
+
+def pc_histogram(trace: TraceFile) -> np.ndarray:
+    counts = np.zeros(MEMORY_WORDS, dtype=np.int64)
+    for _, columns in chunk_columns(trace):
+        counts += np.bincount(columns["pc"], minlength=MEMORY_WORDS)[:MEMORY_WORDS]
+    return counts
+
+
+def write_mask(columns: Dict[str, np.ndarray], address: int) -> np.ndarray:
+    """Steps that store to `address`: DCA/ISZ/JMS targets and auto-index bumps."""
+    instr = columns["instr"]
+    opcode = instr >> 9
+    mask = np.isin(opcode, WRITE_OPS) & (columns["address"] == address)
+    if 0o10 <= address <= 0o17:
+        mask |= (opcode < OP_IOT) & ((instr & 0o600) == 0o400) & ((instr & 0o177) == address)
+    return mask
+
+
+def command_summary(trace: TraceFile, args: argparse.Namespace) -> int:
+    stored = sum(chunk.length for chunk in trace.chunks)
+    print(f"Trace: {trace.path}")
+    print(f"  Steps: {trace.total_steps}")
+    print(f"  Chunks: {len(trace.chunks)} (up to {trace.chunk_steps} steps each)")
+    print(f"  Payload bytes: {stored}")
+    if trace.end is not None:
+        end = trace.end
+        print(
+            f"  Final state: PC {end.pc:04o}  AC {end.ac:04o}  LINK {end.link}  "
+            f"HALT {'yes' if end.halted else 'no'}"
+        )
+    if trace.truncated:
+        print("  Warning: no end record; the trace was cut short.")
+    return 0
+
+
+def command_hot(trace: TraceFile, args: argparse.Namespace) -> int:
+    counts = pc_histogram(trace)
+    total = int(counts.sum())
+    if not total:
+        print("(empty trace)")
+        return 0
+    order = np.argsort(counts)[::-1][: args.top]
+    print("PC     Count        Share")
+    print("----   -----------  ------")
+    for pc in order:
+        if not counts[pc]:
+            break
+        print(f"{pc:04o}   {counts[pc]:11d}  {100.0 * counts[pc] / total:5.1f}%")
+    return 0
+
+
+def command_loops(trace: TraceFile, args: argparse.Namespace) -> int:
+    edges: Counter = Counter()
+    counts = np.zeros(MEMORY_WORDS, dtype=np.int64)
+    total = 0
+    for _, columns, next_pc in with_next_pc(trace):
+        pc = columns["pc"].astype(np.int32)
+        counts += np.bincount(pc, minlength=MEMORY_WORDS)[:MEMORY_WORDS]
+        total += len(pc)
+        backward = next_pc <= pc
+        if not backward.any():
+            continue
+        keys = pc[backward] * MEMORY_WORDS + next_pc[backward]
+        unique, hits = np.unique(keys, return_counts=True)
+        edges.update(dict(zip(unique.tolist(), hits.tolist())))
+
+    loops = [(hits, key // MEMORY_WORDS, key % MEMORY_WORDS) for key, hits in edges.items() if hits >= args.min_iterations]
+    if not loops:
+        print("(no loops found)")
+        return 0
+    loops.sort(reverse=True)
+    print("Target  Source  Iterations   Body  Steps in body  Share")
+    print("------  ------  -----------  ----  -------------  ------")
+    for hits, source, target in loops[: args.top]:
+        in_body = int(counts[target : source + 1].sum())
+        share = 100.0 * in_body / total if total else 0.0
+        print(f"{target:04o}    {source:04o}    {hits:11d}  {source - target + 1:4d}  {in_body:13d}  {share:5.1f}%")
+    return 0
+
+
+def command_iot(trace: TraceFile, args: argparse.Namespace) -> int:
+    device = None if args.device is None else int(args.device, 8) & 0o77
+    shown = 0
+    per_device: Counter = Counter()
+    header = False
+    for first_step, columns in chunk_columns(trace):
+        instr = columns["instr"]
+        mask = (instr >> 9) == OP_IOT
+        if device is not None:
+            mask &= ((instr >> 3) & 0o77) == device
+        steps = np.flatnonzero(mask)
+        if not len(steps):
+            continue
+        per_device.update(((instr[steps] >> 3) & 0o77).tolist())
+        for i in steps[: max(0, args.limit - shown)]:
+            if not header:
+                print("Step          PC    IOT   Dev  Fn  AC")
+                print("------------  ----  ----  ---  --  ----")
+                header = True
+            word = int(instr[i])
+            print(
+                f"{first_step + int(i):12d}  {int(columns['pc'][i]):04o}  {word:04o}  "
+                f"{(word >> 3) & 0o77:02o}   {word & 7}   {int(columns['ac'][i]):04o}"
+            )
+            shown += 1
+    if not per_device:
+        print("(no IOT instructions)")
+        return 0
+    print()
+    print("IOTs per device: " + ", ".join(f"{dev:02o}={n}" for dev, n in sorted(per_device.items())))
+    return 0
+
+
+def command_first_write(trace: TraceFile, args: argparse.Namespace) -> int:
+    address = parse_octal(args.address)
+    for first_step, columns in chunk_columns(trace):
+        hits = np.flatnonzero(write_mask(columns, address))
+        if len(hits):
+            i = int(hits[0])
+            pc, word = int(columns["pc"][i]), int(columns["instr"][i])
+            print(
+                f"First write to {address:04o}: step {first_step + i}  PC {pc:04o}  "
+                f"instr {word:04o} ({disassemble(word, pc)})  AC {int(columns['ac'][i]):04o}"
+            )
+            return 0
+    print(f"No write to {address:04o} in {trace.total_steps} steps.")
+    return 1
+
+
+def print_step_header() -> None:
+    print("Step          PC    Instr  Instruction       AC    L  Addr")
+    print("------------  ----  -----  ----------------  ----  -  ----")
+
+
+def format_step(step: int, pc: int, word: int, ac: int, link: int, address: int) -> str:
+    address_text = "" if address == TRACE_NO_ADDRESS else f"{address:04o}"
+    return f"{step:12d}  {pc:04o}  {word:04o}   {disassemble(word, pc):<16}  {ac:04o}  {link}  {address_text}".rstrip()
+
+
+def step_rows(columns: Dict[str, np.ndarray], begin: int, end: int) -> Iterator[Tuple[int, int, int, int, int]]:
+    """(pc, instr, ac, link, address) for steps begin..end-1 of a chunk, as Python ints."""
+    return zip(*(columns[name][begin:end].tolist() for name in ("pc", "instr", "ac", "link", "address")))
+
+
+def command_steps(trace: TraceFile, args: argparse.Namespace) -> int:
+    first, remaining = max(0, args.first), max(0, args.count)
+    shown = 0
+    for first_step, columns in chunk_columns(trace):
+        count = len(columns["pc"])
+        if first_step + count <= first:
+            continue
+        if shown >= remaining:
+            break
+        if shown == 0:
+            print_step_header()
+        begin = max(0, first - first_step)
+        end = min(count, begin + remaining - shown)
+        for offset, row in enumerate(step_rows(columns, begin, end)):
+            print(format_step(first_step + begin + offset, *row))
+        shown += end - begin
+    if shown == 0:
+        print(f"(no steps from {first})")
+    return 0
+
+
+def command_before_halt(trace: TraceFile, args: argparse.Namespace) -> int:
+    wanted = max(1, args.count)
+    tail: List[Tuple[int, Dict[str, np.ndarray]]] = []
+    collected = 0
+    for chunk in reversed(trace.chunks):
+        payload = trace.payload(chunk)
+        columns = {
+            name: np.frombuffer(payload, dtype=dtype, count=chunk.count, offset=offset)
+            for name, offset, dtype in column_layout(chunk.count)
+        }
+        tail.insert(0, (chunk.first_step, columns))
+        collected += chunk.count
+        if collected >= wanted:
+            break
+    if not tail:
+        print("(empty trace)")
+        return 0
+
+    end = trace.end
+    if end is None or not end.halted:
+        print("Note: the run did not end in HALT; showing the final steps.")
+    rows = []
+    for first_step, columns in tail:
+        rows.extend((first_step + i, *row) for i, row in enumerate(step_rows(columns, 0, len(columns["pc"]))))
+    print_step_header()
+    for row in rows[-wanted:]:
+        print(format_step(*row))
+    if end is not None:
+        print(f"Final: PC {end.pc:04o}  AC {end.ac:04o}  LINK {end.link}  HALT {'yes' if end.halted else 'no'}")
+    return 0
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Analyse a .p8t execution trace")
+    parser.add_argument("trace", type=Path, help="Trace file written by python3 -m factory --trace-out")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    summary_parser = subparsers.add_parser("summary", help="Step count, chunks and final registers")
+    summary_parser.set_defaults(func=command_summary)
+
+    hot_parser = subparsers.add_parser("hot", help="Most executed addresses")
+    hot_parser.add_argument("--top", type=int, default=20, help="Rows to show (default: %(default)s)")
+    hot_parser.set_defaults(func=command_hot)
+
+    loops_parser = subparsers.add_parser("loops", help="Backward branches ranked by iteration count")
+    loops_parser.add_argument("--top", type=int, default=20, help="Rows to show (default: %(default)s)")
+    loops_parser.add_argument(
+        "--min-iterations", type=int, default=2, help="Ignore branches taken fewer times (default: %(default)s)"
+    )
+    loops_parser.set_defaults(func=command_loops)
+
+    iot_parser = subparsers.add_parser("iot", help="Timeline of IOT instructions")
+    iot_parser.add_argument("--device", help="Only this device code (octal)")
+    iot_parser.add_argument("--limit", type=int, default=100, help="Timeline rows to show (default: %(default)s)")
+    iot_parser.set_defaults(func=command_iot)
+
+    write_parser = subparsers.add_parser("first-write", help="First instruction that stores to an address")
+    write_parser.add_argument("address", help="Address (octal)")
+    write_parser.set_defaults(func=command_first_write)
+
+    halt_parser = subparsers.add_parser("before-halt", help="PC history leading up to the end of the run")
+    halt_parser.add_argument("--count", type=int, default=32, help="Steps to show (default: %(default)s)")
+    halt_parser.set_defaults(func=command_before_halt)
+
+    steps_parser = subparsers.add_parser("steps", help="Disassembled listing of a range of steps")
+    steps_parser.add_argument("--from", dest="first", type=int, default=0, help="First step (default: %(default)s)")
+    steps_parser.add_argument("--count", type=int, default=100, help="Steps to show (default: %(default)s)")
+    steps_parser.set_defaults(func=command_steps)
+
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    try:
+        trace = TraceFile(args.trace)
+    except (OSError, TraceFormatError) as exc:
+        print(f"trace_analyze: {exc}", file=sys.stderr)
+        return 2
+    try:
+        return args.func(trace, args)
+    finally:
+        trace.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,17 @@
+from array import array
+import argparse
+import base64
+from collections import OrderedDict
 from datetime import datetime
-from flask import Flask, jsonify, render_template, request
+from flask import Flask, Response, g, jsonify, render_template, request
 import ctypes
-import ctypes.util
+import os
 from pathlib import Path
-import tempfile
+import re
 import sys
+import threading
+import time
+import zlib
 
 # Ensure the repository root is on sys.path so 'factory' (a sibling package)
 # can be imported when running this script directly (python tools/webdp8.py).
@@ -13,7 +20,19 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 # Use the S-record loader from the factory helper
-from factory.driver import load_srec
+from factory.disasm import disassemble
+from factory.driver import (
+    STOP_REASONS,
+    WATCH_ACCESSES,
+    Counters,
+    latency_histogram,
+    list_breakpoints,
+    list_watchpoints,
+    parse_srec,
+    read_counters,
+    stop_reason,
+    word_runs,
+)
 from factory.ui import STATIC_DIR, TEMPLATES_DIR
 
 app = Flask(
@@ -22,7 +41,7 @@ app = Flask(
     template_folder=str(TEMPLATES_DIR),
 )
 
-# --- emulator init (singleton for now) ---
+# --- emulator library ---
 # Prefer the packaged library under `./factory/libpdp8.so` so the web
 # front-end can be run from the project root without copying the shared
 # object into the top-level directory.
@@ -43,12 +62,100 @@ lib.pdp8_api_get_ac.argtypes = [ctypes.c_void_p]
 lib.pdp8_api_get_ac.restype = ctypes.c_uint16
 lib.pdp8_api_get_link.argtypes = [ctypes.c_void_p]
 lib.pdp8_api_get_link.restype = ctypes.c_bool
+lib.pdp8_api_set_ac.argtypes = [ctypes.c_void_p, ctypes.c_uint16]
+lib.pdp8_api_set_ac.restype = None
+lib.pdp8_api_set_link.argtypes = [ctypes.c_void_p, ctypes.c_uint8]
+lib.pdp8_api_set_link.restype = None
 lib.pdp8_api_read_mem.argtypes = [ctypes.c_void_p, ctypes.c_uint16]
 lib.pdp8_api_read_mem.restype = ctypes.c_uint16
+lib.pdp8_api_read_block.argtypes = [ctypes.c_void_p, ctypes.c_uint16, ctypes.POINTER(ctypes.c_uint16), ctypes.c_size_t]
+lib.pdp8_api_read_block.restype = ctypes.c_size_t
+lib.pdp8_api_load.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_uint16), ctypes.c_size_t, ctypes.c_uint16]
+lib.pdp8_api_load.restype = ctypes.c_int
+lib.pdp8_api_read_page.argtypes = [ctypes.c_void_p, ctypes.c_uint16, ctypes.POINTER(ctypes.c_uint16)]
+lib.pdp8_api_read_page.restype = ctypes.c_int
+lib.pdp8_api_write_page.argtypes = [ctypes.c_void_p, ctypes.c_uint16, ctypes.POINTER(ctypes.c_uint16)]
+lib.pdp8_api_write_page.restype = ctypes.c_int
+lib.pdp8_api_save_state.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t]
+lib.pdp8_api_save_state.restype = ctypes.c_size_t
+lib.pdp8_api_restore_state.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t]
+lib.pdp8_api_restore_state.restype = ctypes.c_int
+lib.pdp8_api_set_clock.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_uint64]
+lib.pdp8_api_set_clock.restype = ctypes.c_int
+lib.pdp8_api_get_clock_source.argtypes = [ctypes.c_void_p]
+lib.pdp8_api_get_clock_source.restype = ctypes.c_int
+lib.pdp8_api_get_clock_ns.argtypes = [ctypes.c_void_p]
+lib.pdp8_api_get_clock_ns.restype = ctypes.c_uint64
+lib.pdp8_api_set_idle_skip.argtypes = [ctypes.c_void_p, ctypes.c_int]
+lib.pdp8_api_set_idle_skip.restype = None
+lib.pdp8_api_get_idle_skip.argtypes = [ctypes.c_void_p]
+lib.pdp8_api_get_idle_skip.restype = ctypes.c_int
+lib.pdp8_api_memory_generation.argtypes = [ctypes.c_void_p]
+lib.pdp8_api_memory_generation.restype = ctypes.c_uint64
+lib.pdp8_api_dirty_pages.argtypes = [ctypes.c_void_p, ctypes.c_uint64, ctypes.POINTER(ctypes.c_uint16), ctypes.c_size_t]
+lib.pdp8_api_dirty_pages.restype = ctypes.c_size_t
 lib.pdp8_api_write_mem.argtypes = [ctypes.c_void_p, ctypes.c_uint16, ctypes.c_uint16]
 lib.pdp8_api_write_mem.restype = ctypes.c_int
 lib.pdp8_api_step.argtypes = [ctypes.c_void_p]
 lib.pdp8_api_step.restype = ctypes.c_int
+lib.pdp8_api_run_until.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int]
+lib.pdp8_api_run_until.restype = ctypes.c_int
+lib.pdp8_api_set_breakpoint.argtypes = [ctypes.c_void_p, ctypes.c_uint16, ctypes.c_int]
+lib.pdp8_api_set_breakpoint.restype = ctypes.c_int
+lib.pdp8_api_set_watchpoint.argtypes = [ctypes.c_void_p, ctypes.c_uint16, ctypes.c_int]
+lib.pdp8_api_set_watchpoint.restype = ctypes.c_int
+lib.pdp8_api_clear_breakpoints.argtypes = [ctypes.c_void_p]
+lib.pdp8_api_clear_breakpoints.restype = None
+lib.pdp8_api_list_breakpoints.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_uint16), ctypes.c_size_t]
+lib.pdp8_api_list_breakpoints.restype = ctypes.c_size_t
+lib.pdp8_api_list_watchpoints.argtypes = [
+    ctypes.c_void_p,
+    ctypes.POINTER(ctypes.c_uint16),
+    ctypes.POINTER(ctypes.c_uint8),
+    ctypes.c_size_t,
+]
+lib.pdp8_api_list_watchpoints.restype = ctypes.c_size_t
+lib.pdp8_api_get_stop_reason.argtypes = [ctypes.c_void_p]
+lib.pdp8_api_get_stop_reason.restype = ctypes.c_int
+lib.pdp8_api_get_stop_address.argtypes = [ctypes.c_void_p]
+lib.pdp8_api_get_stop_address.restype = ctypes.c_uint16
+lib.pdp8_api_get_counters.argtypes = [ctypes.c_void_p, ctypes.POINTER(Counters)]
+lib.pdp8_api_get_counters.restype = ctypes.c_int
+
+# Checkpoint store for reverse execution (src/emulator/checkpoint.h)
+lib.pdp8_checkpoints_create.argtypes = [ctypes.c_void_p, ctypes.c_uint64, ctypes.c_size_t]
+lib.pdp8_checkpoints_create.restype = ctypes.c_void_p
+lib.pdp8_checkpoints_destroy.argtypes = [ctypes.c_void_p]
+lib.pdp8_checkpoints_destroy.restype = None
+lib.pdp8_checkpoints_reset.argtypes = [ctypes.c_void_p]
+lib.pdp8_checkpoints_reset.restype = ctypes.c_int
+lib.pdp8_checkpoints_run_until.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int]
+lib.pdp8_checkpoints_run_until.restype = ctypes.c_int
+lib.pdp8_checkpoints_seek.argtypes = [ctypes.c_void_p, ctypes.c_uint64]
+lib.pdp8_checkpoints_seek.restype = ctypes.c_int
+lib.pdp8_checkpoints_reverse_step.argtypes = [ctypes.c_void_p, ctypes.c_uint64]
+lib.pdp8_checkpoints_reverse_step.restype = ctypes.c_int
+lib.pdp8_checkpoints_reverse_continue.argtypes = [ctypes.c_void_p]
+lib.pdp8_checkpoints_reverse_continue.restype = ctypes.c_int
+lib.pdp8_checkpoints_stop_address.argtypes = [ctypes.c_void_p]
+lib.pdp8_checkpoints_stop_address.restype = ctypes.c_uint16
+lib.pdp8_checkpoints_position.argtypes = [ctypes.c_void_p]
+lib.pdp8_checkpoints_position.restype = ctypes.c_uint64
+lib.pdp8_checkpoints_oldest.argtypes = [ctypes.c_void_p]
+lib.pdp8_checkpoints_oldest.restype = ctypes.c_uint64
+lib.pdp8_checkpoints_count.argtypes = [ctypes.c_void_p]
+lib.pdp8_checkpoints_count.restype = ctypes.c_size_t
+lib.pdp8_checkpoints_bytes.argtypes = [ctypes.c_void_p]
+lib.pdp8_checkpoints_bytes.restype = ctypes.c_size_t
+lib.pdp8_api_trace.argtypes = [
+    ctypes.c_void_p,
+    ctypes.c_size_t,
+    ctypes.POINTER(ctypes.c_uint16),
+    ctypes.POINTER(ctypes.c_uint16),
+    ctypes.POINTER(ctypes.c_uint16),
+    ctypes.POINTER(ctypes.c_uint8),
+]
+lib.pdp8_api_trace.restype = ctypes.c_size_t
 lib.pdp8_api_set_halt.argtypes = [ctypes.c_void_p]
 lib.pdp8_api_set_halt.restype = None
 lib.pdp8_api_clear_halt.argtypes = [ctypes.c_void_p]
@@ -56,24 +163,66 @@ lib.pdp8_api_clear_halt.restype = None
 
 # Extra device / console APIs (optional). These mirror signatures used by
 # `factory.driver.configure_api` so we can create and attach the KL8E console
-# and line-printer and capture their output in temporary files for the web UI.
+# and line-printer and capture their output in native ring buffers for the web UI.
 lib.pdp8_kl8e_console_create.argtypes = [ctypes.c_void_p, ctypes.c_void_p]
 lib.pdp8_kl8e_console_create.restype = ctypes.c_void_p
 lib.pdp8_kl8e_console_attach.argtypes = [ctypes.c_void_p, ctypes.c_void_p]
 lib.pdp8_kl8e_console_attach.restype = ctypes.c_int
+lib.pdp8_kl8e_console_destroy.argtypes = [ctypes.c_void_p]
+lib.pdp8_kl8e_console_destroy.restype = None
 lib.pdp8_kl8e_console_output_pending.argtypes = [ctypes.c_void_p]
 lib.pdp8_kl8e_console_output_pending.restype = ctypes.c_size_t
+lib.pdp8_kl8e_console_input_pending.argtypes = [ctypes.c_void_p]
+lib.pdp8_kl8e_console_input_pending.restype = ctypes.c_size_t
+lib.pdp8_kl8e_console_input_count.argtypes = [ctypes.c_void_p]
+lib.pdp8_kl8e_console_input_count.restype = ctypes.c_uint64
+lib.pdp8_kl8e_console_output_count.argtypes = [ctypes.c_void_p]
+lib.pdp8_kl8e_console_output_count.restype = ctypes.c_uint64
 lib.pdp8_kl8e_console_pop_output.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_uint8)]
 lib.pdp8_kl8e_console_pop_output.restype = ctypes.c_int
 lib.pdp8_kl8e_console_queue_input.argtypes = [ctypes.c_void_p, ctypes.c_uint8]
 lib.pdp8_kl8e_console_queue_input.restype = ctypes.c_int
+lib.pdp8_kl8e_console_set_output_stream.argtypes = [ctypes.c_void_p, ctypes.c_void_p]
+lib.pdp8_kl8e_console_set_output_stream.restype = ctypes.c_int
+lib.pdp8_kl8e_console_set_output_callback.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p]
+lib.pdp8_kl8e_console_set_output_callback.restype = ctypes.c_int
 
 lib.pdp8_line_printer_create.argtypes = [ctypes.c_void_p]
 lib.pdp8_line_printer_create.restype = ctypes.c_void_p
 lib.pdp8_line_printer_attach.argtypes = [ctypes.c_void_p, ctypes.c_void_p]
 lib.pdp8_line_printer_attach.restype = ctypes.c_int
+lib.pdp8_line_printer_destroy.argtypes = [ctypes.c_void_p]
+lib.pdp8_line_printer_destroy.restype = None
 lib.pdp8_line_printer_set_column_limit.argtypes = [ctypes.c_void_p, ctypes.c_uint16]
 lib.pdp8_line_printer_set_column_limit.restype = ctypes.c_int
+lib.pdp8_line_printer_set_stream.argtypes = [ctypes.c_void_p, ctypes.c_void_p]
+lib.pdp8_line_printer_set_stream.restype = ctypes.c_int
+lib.pdp8_line_printer_set_output_callback.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p]
+lib.pdp8_line_printer_set_output_callback.restype = ctypes.c_int
+lib.pdp8_line_printer_pending.argtypes = [ctypes.c_void_p]
+lib.pdp8_line_printer_pending.restype = ctypes.c_size_t
+lib.pdp8_line_printer_output_count.argtypes = [ctypes.c_void_p]
+lib.pdp8_line_printer_output_count.restype = ctypes.c_uint64
+
+# Output capture rings (src/emulator/output_ring.c)
+lib.pdp8_output_ring_create.argtypes = [ctypes.c_size_t]
+lib.pdp8_output_ring_create.restype = ctypes.c_void_p
+lib.pdp8_output_ring_destroy.argtypes = [ctypes.c_void_p]
+lib.pdp8_output_ring_destroy.restype = None
+lib.pdp8_output_ring_end.argtypes = [ctypes.c_void_p]
+lib.pdp8_output_ring_end.restype = ctypes.c_uint64
+lib.pdp8_output_ring_begin.argtypes = [ctypes.c_void_p]
+lib.pdp8_output_ring_begin.restype = ctypes.c_uint64
+lib.pdp8_output_ring_restore.argtypes = [ctypes.c_void_p, ctypes.c_uint64, ctypes.c_char_p, ctypes.c_size_t]
+lib.pdp8_output_ring_restore.restype = None
+lib.pdp8_output_ring_read.argtypes = [
+    ctypes.c_void_p,
+    ctypes.c_uint64,
+    ctypes.c_void_p,
+    ctypes.c_size_t,
+    ctypes.POINTER(ctypes.c_uint64),
+]
+lib.pdp8_output_ring_read.restype = ctypes.c_size_t
 
 class MagtapeUnitParams(ctypes.Structure):
     _fields_ = [
@@ -105,104 +254,590 @@ lib.pdp8_api_get_switch_register.restype = ctypes.c_uint16
 lib.pdp8_api_is_halted.argtypes = [ctypes.c_void_p]
 lib.pdp8_api_is_halted.restype = ctypes.c_int
 
-cpu = lib.pdp8_api_create(0x1000)  # 4K core, matches debug_cal3.py :contentReference[oaicite:2]{index=2}
-lib.pdp8_api_set_halt(cpu)  # Start with HALT asserted
-cycles_counter = 0
+# Read-only status words (memory-mapped reads served by the core)
+lib.pdp8_api_set_status_word.argtypes = [ctypes.c_void_p, ctypes.c_uint16, ctypes.c_uint16]
+lib.pdp8_api_set_status_word.restype = ctypes.c_int
+lib.pdp8_api_clear_status_word.argtypes = [ctypes.c_void_p, ctypes.c_uint16]
+lib.pdp8_api_clear_status_word.restype = ctypes.c_int
+
+MEMORY_WORDS = 0x1000  # 4K core, matches debug_cal3.py
+PAGE_WORDS = 128  # PDP8_DIRTY_PAGE_WORDS
+
+# Console / printer output goes straight from the C callbacks into bounded
+# in-memory rings; no Python runs per character.
+OUTPUT_RING_BYTES = 1 << 16
+OUTPUT_READ_LIMIT = 1 << 16
+_ring_push = ctypes.cast(lib.pdp8_output_ring_push, ctypes.c_void_p)
+
+# Memory each machine may spend on checkpoints for POST /reverse; 0 turns
+# reverse execution off.
+CHECKPOINT_BUDGET = int(os.environ.get("WEBDP8_CHECKPOINT_KB", "1024")) << 10
+
+# Rough native footprint of one live machine (core + capture rings), used,
+# with its checkpoint budget, to turn a memory budget into a machine count.
+MACHINE_FOOTPRINT = MEMORY_WORDS * 2 + 2 * OUTPUT_RING_BYTES
 
 magtape_dir = ROOT / "magtape"
-_magtape_obj = None
-_magtape_path_bytes: bytes | None = None
 
 try:
     magtape_dir.mkdir(parents=True, exist_ok=True)
 except OSError:
     pass
 
-try:
-    _magtape_obj = lib.pdp8_magtape_device_create()
-except AttributeError:
-    _magtape_obj = None
 
-if _magtape_obj:
-    try:
-        attach_rc = lib.pdp8_magtape_device_attach(cpu, _magtape_obj)
-    except Exception:
-        attach_rc = -1
-    if attach_rc != 0:
+class Machine:
+    """One PDP-8 with its own console, line printer, magtape and capture rings.
+
+    Optional devices are skipped silently if a symbol is missing or creation
+    fails, as before.
+    """
+
+    def __init__(self):
+        self.cpu = lib.pdp8_api_create(MEMORY_WORDS)
+        if not self.cpu:
+            raise MemoryError("pdp8_api_create failed")
+        lib.pdp8_api_set_halt(self.cpu)  # Start with HALT asserted
+        self.cycles = 0
+        self.run_seconds = 0.0  # wall time spent inside POST /run
+        self.run_cycles = 0
+        self.last_mips = 0.0  # rate of the most recent POST /run
+        self.trace = None  # paging state for /trace?format=columnar
+        self.trace_serial = 0
+        self.status_words = {}  # address -> value published via /status-word
+        self.lock = threading.Lock()
+        self.pins = 0  # requests holding or waiting for this machine
+        self.last_used = time.monotonic()
+        self.printer_ring = None
+        self.tele_ring = None
+        self.printer_last_pos = 0
+        self.tele_last_pos = 0
+        self.console = None
+        self.printer = None
+        self.magtape = None
+        self._magtape_path_bytes: bytes | None = None
+        self._attach_magtape()
+        self._attach_capture()
+        # created after the devices so their state is in the first checkpoint
+        self.history = lib.pdp8_checkpoints_create(self.cpu, 0, CHECKPOINT_BUDGET) if CHECKPOINT_BUDGET else None
+
+    def _attach_magtape(self):
+        try:
+            magtape = lib.pdp8_magtape_device_create()
+        except AttributeError:
+            return
+        if not magtape:
+            return
         try:
-            lib.pdp8_magtape_device_destroy(_magtape_obj)
+            attach_rc = lib.pdp8_magtape_device_attach(self.cpu, magtape)
+        except Exception:
+            attach_rc = -1
+        if attach_rc == 0:
+            self._magtape_path_bytes = str(magtape_dir.resolve()).encode("utf-8")
+            params = MagtapeUnitParams(0, self._magtape_path_bytes, False)
+            if lib.pdp8_magtape_device_configure_unit(magtape, ctypes.byref(params)) == 0:
+                self.magtape = magtape
+                return
+        try:
+            lib.pdp8_magtape_device_destroy(magtape)
         except Exception:
             pass
-        _magtape_obj = None
-        _magtape_path_bytes = None
+        self._magtape_path_bytes = None
+
+    def _attach_capture(self):
+        try:
+            self.printer_ring = lib.pdp8_output_ring_create(OUTPUT_RING_BYTES)
+            self.tele_ring = lib.pdp8_output_ring_create(OUTPUT_RING_BYTES)
+
+            if self.printer_ring:
+                printer = lib.pdp8_line_printer_create(None)
+                if printer and lib.pdp8_line_printer_attach(self.cpu, printer) == 0:
+                    # capture only: keep the native printer off the server's stdout
+                    lib.pdp8_line_printer_set_stream(printer, None)
+                    lib.pdp8_line_printer_set_output_callback(printer, _ring_push, self.printer_ring)
+                    # set a reasonable column limit
+                    lib.pdp8_line_printer_set_column_limit(printer, ctypes.c_uint16(132))
+                    self.printer = printer
+                elif printer:
+                    lib.pdp8_line_printer_destroy(printer)
+
+            if self.tele_ring:
+                console = lib.pdp8_kl8e_console_create(None, None)
+                if console and lib.pdp8_kl8e_console_attach(self.cpu, console) == 0:
+                    lib.pdp8_kl8e_console_set_output_stream(console, None)
+                    lib.pdp8_kl8e_console_set_output_callback(console, _ring_push, self.tele_ring)
+                    self.console = console
+                elif console:
+                    lib.pdp8_kl8e_console_destroy(console)
+        except Exception:
+            # non-fatal: continue without devices attached
+            self.console = None
+            self.printer = None
+
+    def snapshot(self):
+        """Capture the machine so it can be rebuilt later.
+
+        Memory is copied page by page as stored, so hooked addresses (the
+        wall clock, status words) are not written into RAM on restore.
+        pdp8_api_save_state covers the registers, interrupt and skip flags,
+        virtual clock and each attached device (queued keyboard input, device
+        flags). Captured output with its cursors, clock and idle-skip
+        settings, status words and break/watchpoints are kept alongside. The
+        reverse-execution history is not, and magtape units start again from
+        their first record.
+        """
+        page = (ctypes.c_uint16 * PAGE_WORDS)()
+        memory = bytearray()
+        for number in range(MEMORY_WORDS // PAGE_WORDS):
+            lib.pdp8_api_read_page(self.cpu, number, page)
+            memory += bytes(page)
+        state = ctypes.create_string_buffer(lib.pdp8_api_save_state(self.cpu, None, 0))
+        lib.pdp8_api_save_state(self.cpu, state, len(state))
+        return {
+            "memory": bytes(memory),
+            "state": state.raw,
+            "clock": (lib.pdp8_api_get_clock_source(self.cpu), lib.pdp8_api_get_clock_ns(self.cpu)),
+            "idle_skip": bool(lib.pdp8_api_get_idle_skip(self.cpu)),
+            "cycles": self.cycles,
+            "status_words": dict(self.status_words),
+            "breakpoints": list_breakpoints(lib, self.cpu),
+            "watchpoints": list_watchpoints(lib, self.cpu),
+            "printer": save_output_ring(self.printer_ring, self.printer_last_pos),
+            "teleprinter": save_output_ring(self.tele_ring, self.tele_last_pos),
+        }
+
+    def restore(self, snap):
+        page_bytes = PAGE_WORDS * 2
+        for number in range(MEMORY_WORDS // PAGE_WORDS):
+            chunk = snap["memory"][number * page_bytes:(number + 1) * page_bytes]
+            lib.pdp8_api_write_page(self.cpu, number, (ctypes.c_uint16 * PAGE_WORDS).from_buffer_copy(chunk))
+        # settings first: restoring the state sets the virtual time they count on
+        lib.pdp8_api_set_clock(self.cpu, *snap["clock"])
+        lib.pdp8_api_set_idle_skip(self.cpu, 1 if snap["idle_skip"] else 0)
+        state = snap["state"]
+        if lib.pdp8_api_restore_state(self.cpu, state, len(state)) != 0:
+            raise RuntimeError("pdp8_api_restore_state rejected a session snapshot")
+        self.cycles = snap["cycles"]
+        for addr, value in snap["status_words"].items():
+            lib.pdp8_api_set_status_word(self.cpu, addr, value)
+        self.status_words = dict(snap["status_words"])
+        for addr in snap["breakpoints"]:
+            lib.pdp8_api_set_breakpoint(self.cpu, addr, 1)
+        for addr, access in snap["watchpoints"]:
+            lib.pdp8_api_set_watchpoint(self.cpu, addr, access)
+        self.printer_last_pos = restore_output_ring(self.printer_ring, snap["printer"])
+        self.tele_last_pos = restore_output_ring(self.tele_ring, snap["teleprinter"])
+        self.reset_history()
+
+    def reset_history(self):
+        """Start reverse execution afresh from the current state."""
+        if self.history:
+            lib.pdp8_checkpoints_reset(self.history)
+
+    def close(self):
+        if self.history:
+            lib.pdp8_checkpoints_destroy(self.history)
+        if self.console:
+            lib.pdp8_kl8e_console_destroy(self.console)
+        if self.printer:
+            lib.pdp8_line_printer_destroy(self.printer)
+        if self.magtape:
+            lib.pdp8_magtape_device_destroy(self.magtape)
+        if self.printer_ring:
+            lib.pdp8_output_ring_destroy(self.printer_ring)
+        if self.tele_ring:
+            lib.pdp8_output_ring_destroy(self.tele_ring)
+        lib.pdp8_api_destroy(self.cpu)
+        self.cpu = None
+
+
+class MachinePool:
+    """Sessions keyed by ID, each backed by its own Machine.
+
+    At most `max_live` machines exist at once. When another is needed the
+    least recently used idle machine is snapshotted and destroyed; its session
+    is rebuilt from the snapshot on next use. Up to `max_snapshots` snapshots
+    are kept, oldest dropped first.
+    """
+
+    def __init__(self, max_live=8, max_snapshots=64):
+        self.max_live = max(1, max_live)
+        self.max_snapshots = max(0, max_snapshots)
+        self.live: "OrderedDict[str, Machine]" = OrderedDict()
+        self.snapshots: "OrderedDict[str, dict]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.evictions = 0
+
+    def acquire(self, session_id):
+        """Return the session's machine, pinned so it cannot be evicted."""
+        with self.lock:
+            machine = self.live.get(session_id)
+            if machine is None:
+                self._make_room()
+                machine = Machine()
+                snap = self.snapshots.pop(session_id, None)
+                if snap is not None:
+                    machine.restore(snap)
+                self.live[session_id] = machine
+            self.live.move_to_end(session_id)
+            machine.pins += 1
+            machine.last_used = time.monotonic()
+            return machine
+
+    def release(self, machine):
+        with self.lock:
+            machine.pins -= 1
+            machine.last_used = time.monotonic()
+
+    def _make_room(self):
+        # Walk from least to most recently used, skipping machines in use.
+        # If every machine is busy the pool briefly exceeds max_live.
+        for session_id in list(self.live):
+            if len(self.live) < self.max_live:
+                break
+            machine = self.live[session_id]
+            if machine.pins:
+                continue
+            del self.live[session_id]
+            if self.max_snapshots:
+                self.snapshots[session_id] = machine.snapshot()
+                while len(self.snapshots) > self.max_snapshots:
+                    self.snapshots.popitem(last=False)
+            machine.close()
+            self.evictions += 1
+
+    def drop(self, session_id):
+        """Forget a session entirely. Returns False if it is in use."""
+        with self.lock:
+            machine = self.live.get(session_id)
+            # DELETE /session takes no pin itself, so any pin is another request
+            if machine is not None and machine.pins:
+                return False
+            self.snapshots.pop(session_id, None)
+            if machine is None:
+                return True
+            del self.live[session_id]
+        with machine.lock:
+            machine.close()
+        return True
+
+    def describe(self):
+        with self.lock:
+            now = time.monotonic()
+            sessions = [
+                {"id": sid, "state": "live", "idle_s": round(now - m.last_used, 3), "cycles": m.cycles}
+                for sid, m in self.live.items()
+            ]
+            sessions += [
+                {"id": sid, "state": "snapshot", "cycles": snap["cycles"]}
+                for sid, snap in self.snapshots.items()
+            ]
+            return {
+                "max_live": self.max_live,
+                "max_snapshots": self.max_snapshots,
+                "evictions": self.evictions,
+                "sessions": sessions,
+            }
+
+
+def pool_limit(max_sessions, memory_budget_mb):
+    """Live machine limit from a session cap and an optional memory budget."""
+    limit = max_sessions
+    if memory_budget_mb:
+        limit = min(limit, max(1, (memory_budget_mb << 20) // (MACHINE_FOOTPRINT + CHECKPOINT_BUDGET)))
+    return limit
+
+
+pool = MachinePool(
+    max_live=pool_limit(
+        int(os.environ.get("WEBDP8_MAX_SESSIONS", "8")),
+        int(os.environ.get("WEBDP8_MEMORY_BUDGET_MB", "0")),
+    ),
+    max_snapshots=int(os.environ.get("WEBDP8_MAX_SNAPSHOTS", "64")),
+)
+
+SESSION_HEADER = "X-PDP8-Session"
+SESSION_COOKIE = "pdp8_session"
+DEFAULT_SESSION = "default"
+_SESSION_ID_RE = re.compile(r"^[A-Za-z0-9_.-]{1,64}$")
+
+
+def session_id_for_request():
+    """Session from the X-PDP8-Session header, ?session= or the cookie."""
+    sid = (
+        request.headers.get(SESSION_HEADER)
+        or request.args.get("session")
+        or request.cookies.get(SESSION_COOKIE)
+        or DEFAULT_SESSION
+    )
+    if not _SESSION_ID_RE.match(sid):
+        raise ValueError("bad session id")
+    return sid
+
+
+# Request latency histogram for GET /metrics, per method and route.
+HTTP_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+
+class RequestTimes:
+    """Cumulative-bucket latency histograms keyed by (method, route)."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.series = {}  # (method, route) -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, method, route, seconds):
+        with self.lock:
+            row = self.series.get((method, route))
+            if row is None:
+                row = self.series[(method, route)] = [0] * (len(HTTP_BUCKETS) + 1) + [0.0]
+            for index, bound in enumerate(HTTP_BUCKETS):
+                if seconds <= bound:
+                    row[index] += 1
+            row[len(HTTP_BUCKETS)] += 1
+            row[-1] += seconds
+
+    def rows(self):
+        with self.lock:
+            return [(key, list(row)) for key, row in sorted(self.series.items())]
+
+
+request_times = RequestTimes()
+
+
+# Registered before bind_machine so the time spent waiting for a busy
+# machine is part of the request's latency.
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+
+@app.teardown_request
+def record_request_time(exc):
+    started = g.pop("request_started", None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        request_times.observe(request.method, route, time.perf_counter() - started)
+
+
+@app.before_request
+def bind_machine():
+    """Pin and lock the caller's machine for the duration of the request."""
+    if request.endpoint in (None, "static", "index", "get_sessions", "delete_session", "get_metrics"):
+        return None
+    try:
+        sid = session_id_for_request()
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    machine = pool.acquire(sid)
+    machine.lock.acquire()
+    g.machine = machine
+    return None
+
+
+@app.teardown_request
+def unbind_machine(exc):
+    machine = g.pop("machine", None)
+    if machine is not None:
+        machine.lock.release()
+        pool.release(machine)
+
+
+@app.get("/sessions")
+def get_sessions():
+    """List live and snapshotted sessions."""
+    return jsonify(pool.describe())
+
+
+@app.delete("/session")
+def delete_session():
+    """Discard the caller's session (machine and snapshot)."""
+    try:
+        sid = session_id_for_request()
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    if not pool.drop(sid):
+        return jsonify({"error": "session busy"}), 409
+    return jsonify({"deleted": sid})
+
+
+def machine_metrics(machine):
+    """Counter snapshot for one live machine; the caller holds pool.lock."""
+    counters = read_counters(lib, machine.cpu)
+    stats = {
+        "counters": counters,
+        "mips": machine.last_mips,
+        "average_mips": machine.run_cycles / machine.run_seconds / 1e6 if machine.run_seconds > 0 else 0.0,
+        "output": {},
+        "input": {},
+        "queues": {},
+    }
+    if machine.console:
+        stats["output"]["teleprinter"] = lib.pdp8_kl8e_console_output_count(machine.console)
+        stats["input"]["keyboard"] = lib.pdp8_kl8e_console_input_count(machine.console)
+        stats["queues"]["keyboard"] = lib.pdp8_kl8e_console_input_pending(machine.console)
+        stats["queues"]["teleprinter_log"] = lib.pdp8_kl8e_console_output_pending(machine.console)
+    if machine.printer:
+        stats["output"]["printer"] = lib.pdp8_line_printer_output_count(machine.printer)
+        stats["queues"]["printer_buffer"] = lib.pdp8_line_printer_pending(machine.printer)
+    return stats
+
+
+def prometheus_labels(**labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in labels.items()) + "}"
+
+
+def prometheus_number(value):
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+@app.get("/metrics")
+def get_metrics():
+    """Prometheus text exposition of emulator, pool and HTTP metrics.
+
+    Machine metrics cover live sessions only; a session's counters start
+    again from zero when it is rebuilt from a snapshot.
+    """
+    with pool.lock:
+        # reading counters does not touch CPU state, so running machines
+        # are sampled without waiting for their request locks
+        sessions = [(sid, machine_metrics(m)) for sid, m in pool.live.items()]
+        pool_stats = (len(pool.live), len(pool.snapshots), pool.evictions)
+
+    lines = []
+
+    def family(name, kind, text, samples):
+        lines.append(f"# HELP {name} {text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for suffix, labels, value in samples:
+            lines.append(f"{name}{suffix}{prometheus_labels(**labels)} {prometheus_number(value)}")
+
+    def per_session(name, kind, text, value_of):
+        family(name, kind, text, [("", {"session": sid}, value_of(stats)) for sid, stats in sessions])
+
+    per_session("pdp8_instructions_total", "counter", "Instructions executed, idle-loop skips and replays included.",
+                lambda s: s["counters"].instructions)
+    per_session("pdp8_halts_total", "counter", "HLT instructions executed.", lambda s: s["counters"].halts)
+    per_session("pdp8_mips", "gauge", "Instruction rate of the most recent POST /run.", lambda s: s["mips"])
+    per_session("pdp8_average_mips", "gauge", "Instruction rate over all POST /run calls.",
+                lambda s: s["average_mips"])
+    family("pdp8_iot_total", "counter", "IOT instructions executed per device code.", [
+        ("", {"session": sid, "device": f"{device:02o}"}, count)
+        for sid, stats in sessions
+        for device, count in enumerate(stats["counters"].iots)
+        if count
+    ])
+    per_session("pdp8_interrupt_requests_total", "counter", "Interrupt requests raised while none was pending.",
+                lambda s: s["counters"].interrupt_requests)
+    per_session("pdp8_interrupt_dispatches_total", "counter", "Interrupts taken.",
+                lambda s: s["counters"].interrupt_dispatches)
+    latency = []
+    for sid, stats in sessions:
+        counters = stats["counters"]
+        for bound, count in latency_histogram(counters):
+            latency.append(("_bucket", {"session": sid, "le": prometheus_number(bound)}, count))
+        latency.append(("_sum", {"session": sid}, counters.interrupt_latency_sum))
+        latency.append(("_count", {"session": sid}, counters.interrupt_dispatches))
+    family("pdp8_interrupt_latency_instructions", "histogram",
+           "Instructions from an interrupt request to its dispatch.", latency)
+    family("pdp8_output_bytes_total", "counter", "Characters printed per output device.", [
+        ("", {"session": sid, "device": device}, count)
+        for sid, stats in sessions
+        for device, count in sorted(stats["output"].items())
+    ])
+    family("pdp8_input_bytes_total", "counter", "Characters queued per input device.", [
+        ("", {"session": sid, "device": device}, count)
+        for sid, stats in sessions
+        for device, count in sorted(stats["input"].items())
+    ])
+    family("pdp8_queue_depth", "gauge", "Bytes waiting in device queues.", [
+        ("", {"session": sid, "queue": queue}, depth)
+        for sid, stats in sessions
+        for queue, depth in sorted(stats["queues"].items())
+    ])
+
+    family("webdp8_sessions_live", "gauge", "Sessions with a live machine.", [("", {}, pool_stats[0])])
+    family("webdp8_sessions_snapshotted", "gauge", "Evicted sessions kept as snapshots.", [("", {}, pool_stats[1])])
+    family("webdp8_evictions_total", "counter", "Machines snapshotted and destroyed to make room.",
+           [("", {}, pool_stats[2])])
+    http = []
+    for (method, route), row in request_times.rows():
+        for bound, count in zip(HTTP_BUCKETS + (float("inf"),), row):
+            http.append(("_bucket", {"method": method, "route": route, "le": prometheus_number(bound)}, count))
+        http.append(("_sum", {"method": method, "route": route}, row[-1]))
+        http.append(("_count", {"method": method, "route": route}, row[len(HTTP_BUCKETS)]))
+    family("webdp8_http_request_duration_seconds", "histogram",
+           "Request latency including the wait for a busy machine.", http)
+
+    return Response("\n".join(lines) + "\n", mimetype="text/plain; version=0.0.4")
+
+
+def read_output_ring(ring, since):
+    """Read bytes from a capture ring starting at offset `since`.
+
+    Returns (chunk, start, end) where `start` is the offset of the first byte
+    returned (later than `since` if older output was already overwritten) and
+    `end` is the offset to pass as `since` on the next call.
+    """
+    end = lib.pdp8_output_ring_end(ring)
+    if since >= end:
+        return b"", end, end
+    # size the buffer to what is there rather than the read limit
+    size = min(OUTPUT_READ_LIMIT, end - since)
+    buf = ctypes.create_string_buffer(size)
+    start = ctypes.c_uint64()
+    count = lib.pdp8_output_ring_read(ring, since, buf, size, ctypes.byref(start))
+    return buf.raw[:count], start.value, start.value + count
+
+
+def save_output_ring(ring, cursor):
+    """(begin, retained bytes, cursor) for a capture ring, or None."""
+    if not ring:
+        return None
+    begin = lib.pdp8_output_ring_begin(ring)
+    end = lib.pdp8_output_ring_end(ring)
+    buf = ctypes.create_string_buffer(max(1, end - begin))
+    start = ctypes.c_uint64()
+    count = lib.pdp8_output_ring_read(ring, begin, buf, end - begin, ctypes.byref(start))
+    return start.value, buf.raw[:count], cursor
+
+
+def restore_output_ring(ring, saved):
+    """Refill a capture ring from save_output_ring; returns the cursor."""
+    if not ring or saved is None:
+        return 0
+    begin, data, cursor = saved
+    lib.pdp8_output_ring_restore(ring, begin, data, len(data))
+    return cursor
+
+
+def output_response(ring, cursor, peek=False):
+    """Serve an /output/* request from `ring`.
+
+    With `?since=<offset>` the read is stateless. Without it the server-side
+    cursor is used (and advanced unless `peek`) so older clients keep getting
+    deltas. Returns (response, new_cursor).
+    """
+    since_raw = request.args.get("since")
+    if since_raw is not None:
+        since = max(0, parse_num(since_raw))
     else:
-        _magtape_path_bytes = str(magtape_dir.resolve()).encode("utf-8")
-        params = MagtapeUnitParams(0, _magtape_path_bytes, False)
-        rc = lib.pdp8_magtape_device_configure_unit(_magtape_obj, ctypes.byref(params))
-        if rc != 0:
-            try:
-                lib.pdp8_magtape_device_destroy(_magtape_obj)
-            except Exception:
-                pass
-            _magtape_obj = None
-            _magtape_path_bytes = None
-
-# Console / printer capture state
-_libc = None
-_printer_fp = None
-_tele_fp = None
-_printer_tmp: Path | None = None
-_tele_tmp: Path | None = None
-_printer_last_pos = 0
-_console_obj = None
-_printer_obj = None
-_tele_last_pos = 0
-
-# Attempt to create and attach a KL8E console and a line-printer which write
-# into temporary files we can expose through HTTP endpoints. This is optional
-# and will silently skip if any symbol is missing or creation fails.
-try:
-    # libc fopen to create FILE* objects for the native C code
-    libc_name = ctypes.util.find_library("c") or "libc.so.6"
-    _libc = ctypes.CDLL(libc_name)
-    _libc.fopen.argtypes = [ctypes.c_char_p, ctypes.c_char_p]
-    _libc.fopen.restype = ctypes.c_void_p
-
-    # create temp files
-    tprinter = tempfile.NamedTemporaryFile(prefix="pdp8_printer_", delete=False)
-    tprinter.close()
-    _printer_tmp = Path(tprinter.name)
-    ttele = tempfile.NamedTemporaryFile(prefix="pdp8_tele_", delete=False)
-    ttele.close()
-    _tele_tmp = Path(ttele.name)
-
-    # open FILE* for C library
-    _printer_fp = _libc.fopen(str(_printer_tmp).encode("utf-8"), b"w+")
-    _tele_fp = _libc.fopen(str(_tele_tmp).encode("utf-8"), b"w+")
-
-    if _printer_fp:
-        _printer_obj = lib.pdp8_line_printer_create(_printer_fp)
-        if _printer_obj and lib.pdp8_line_printer_attach(cpu, _printer_obj) == 0:
-            # set a reasonable column limit
-            try:
-                lib.pdp8_line_printer_set_column_limit(_printer_obj, ctypes.c_uint16(132))
-            except Exception:
-                pass
-
-    if _tele_fp:
-        _console_obj = lib.pdp8_kl8e_console_create(None, _tele_fp)
-        if _console_obj and lib.pdp8_kl8e_console_attach(cpu, _console_obj) != 0:
-            # attach failed
-            _console_obj = None
-except Exception:
-    # non-fatal: fail silently and continue without devices attached
-    _libc = None
-    _printer_fp = None
-    _tele_fp = None
-    _printer_tmp = None
-    _tele_tmp = None
-    _console_obj = None
-    _printer_obj = None
+        since = cursor
+    chunk, start, end = read_output_ring(ring, since)
+    if since_raw is None and not peek:
+        cursor = end
+    return jsonify({
+        "text": chunk.decode("utf-8", errors="replace"),
+        "bytes": [f"{b:03o}" for b in chunk],
+        "start": start,
+        "next": end,
+        "truncated": start > since,
+    }), cursor
 
 @app.get("/")
 def index():
@@ -228,61 +863,66 @@ def post_loader():
     """Load an uploaded S-record into the emulator memory.
 
     Accepts a multipart file upload with field name 'file', or raw body
-    content. Uses `factory.driver.load_srec` to parse the S-record and then
-    writes decoded words into emulator memory. If the S-record contains a
-    start address (S9/S8/S7), the PC will be set to that word address.
+    content. The S-record is parsed in memory with `factory.driver.parse_srec`
+    and each contiguous run of words is written with one native call. If the
+    S-record contains a start address (S9/S8/S7), the PC will be set to that
+    word address.
+
+    The response summarises what was loaded (ranges, word count, CRC-32 of the
+    words as little-endian 16-bit values, as /mem.bin returns them). Add
+    `?echo=1` to also get the per-word `written` list.
     """
-    # Acquire uploaded file or raw body
-    upload = None
+    cpu = g.machine.cpu
     if 'file' in request.files:
-        upload = request.files['file']
-        data = upload.read()
+        data = request.files['file'].read()
     else:
         data = request.get_data()
 
     if not data:
         return jsonify({"error": "no S-record data provided"}), 400
 
-    # Write to a temporary file so we can reuse the factory loader
     try:
-        with tempfile.NamedTemporaryFile(mode='wb', delete=False) as tf:
-            tf.write(data)
-            tf.flush()
-            temp_path = Path(tf.name)
-
-        rom_words, start_word = load_srec(temp_path)
+        rom_words, start_word = parse_srec(data.decode("ascii", errors="replace"), source="upload")
     except Exception as exc:
         return jsonify({"error": str(exc)}), 400
-    finally:
-        try:
-            if 'temp_path' in locals() and temp_path.exists():
-                temp_path.unlink()
-        except Exception:
-            pass
 
-    written = []
-    for address, value in rom_words:
-        rc = lib.pdp8_api_write_mem(cpu, address & 0o7777, value & 0x0FFF)
-        if rc != 0:
-            return jsonify({"error": f"write failed at {address:04o}"}), 500
-        written.append({"addr": to_octal(address), "val": to_octal(value)})
+    ranges = []
+    crc = 0
+    for run_start, values in word_runs([(address & 0o7777, value) for address, value in rom_words]):
+        buf = (ctypes.c_uint16 * len(values))(*values)
+        if lib.pdp8_api_load(cpu, buf, len(values), run_start) != 0:
+            return jsonify({"error": f"write failed at {to_octal(run_start)}"}), 500
+        crc = zlib.crc32(words_to_le(values), crc)
+        ranges.append({
+            "start": to_octal(run_start),
+            "end": to_octal(run_start + len(values) - 1),
+            "words": len(values),
+        })
 
     # If the S-record provided a start address, set PC there
     if start_word is not None:
         lib.pdp8_api_set_pc(cpu, start_word & 0o7777)
 
     # Clear any previous HALT so the loaded program can run
-    try:
-        lib.pdp8_api_clear_halt(cpu)
-    except Exception:
-        pass
-
-    return jsonify({"written": written, "start": to_octal(start_word) if start_word is not None else None})
+    lib.pdp8_api_clear_halt(cpu)
+    # a new program starts a new history
+    g.machine.reset_history()
+
+    result = {
+        "start": to_octal(start_word) if start_word is not None else None,
+        "words": len(rom_words),
+        "ranges": ranges,
+        "crc32": f"{crc:08x}",
+    }
+    if request.args.get("echo", "0") in ("1", "true", "True"):
+        result["written"] = [{"addr": to_octal(a), "val": to_octal(v)} for a, v in rom_words]
+    return jsonify(result)
 
 # ---------- /halt ----------
 @app.post("/halt")
 def post_halt():
     """Assert the HALT flag (sticky until cleared)."""
+    cpu = g.machine.cpu
     try:
         lib.pdp8_api_set_halt(cpu)
         return jsonify({"halted": True})
@@ -293,6 +933,7 @@ def post_halt():
 @app.post("/continue")
 def post_continue():
     """Clear the HALT flag to resume execution."""
+    cpu = g.machine.cpu
     try:
         lib.pdp8_api_clear_halt(cpu)
         return jsonify({"halted": False})
@@ -302,6 +943,7 @@ def post_continue():
 # ---------- /regs ----------
 @app.get("/regs")
 def get_regs():
+    cpu = g.machine.cpu
     pc = lib.pdp8_api_get_pc(cpu)
     ac = lib.pdp8_api_get_ac(cpu)
     lk = lib.pdp8_api_get_link(cpu)
@@ -313,13 +955,14 @@ def get_regs():
         "link": 1 if lk else 0,
         "switch": to_octal(sw),
         "halted": bool(halted),
-        "cycles": cycles_counter  # local counter
+        "cycles": g.machine.cycles  # local counter
     })
 
 
 @app.get("/switch")
 def get_switch():
     """Read the PDP-8 switch register (S)."""
+    cpu = g.machine.cpu
     try:
         sval = lib.pdp8_api_get_switch_register(cpu)
         return jsonify({"switch": to_octal(sval)})
@@ -333,6 +976,7 @@ def put_switch():
 
     This lets programs that use `OSR` read values from S.
     """
+    cpu = g.machine.cpu
     try:
         body = request.get_json(force=True, silent=False)
     except Exception as exc:
@@ -353,9 +997,134 @@ def put_switch():
 
     return jsonify({"written": to_octal(v)})
 
+@app.get("/status-words")
+def get_status_words():
+    """List the read-only status words published on this machine."""
+    words = sorted(g.machine.status_words.items())
+    return jsonify({"words": [{"addr": to_octal(a), "val": to_octal(v)} for a, v in words]})
+
+
+@app.put("/status-word")
+def put_status_word():
+    """Publish a read-only status word. JSON: {"addr": "07000", "val": "0042"}.
+
+    AND/TAD and /mem reads of addr return val until it is replaced or
+    deleted; program stores to addr land in memory underneath.
+    """
+    body = request.get_json(force=True, silent=True)
+    if not body or "addr" not in body or "val" not in body:
+        return jsonify({"error": "need {addr, val}"}), 400
+    try:
+        addr = parse_num(body["addr"])
+        val = parse_num(body["val"]) & 0x0FFF
+    except Exception as exc:
+        return jsonify({"error": f"bad value: {exc}"}), 400
+    if addr >= MEMORY_WORDS or lib.pdp8_api_set_status_word(g.machine.cpu, addr, val) != 0:
+        return jsonify({"error": f"cannot map {to_octal(addr)}"}), 400
+    g.machine.status_words[addr] = val
+    return jsonify({"addr": to_octal(addr), "val": to_octal(val)})
+
+
+@app.delete("/status-word")
+def delete_status_word():
+    """Remove a status word: DELETE /status-word?addr=07000."""
+    try:
+        addr = parse_num(request.args.get("addr", ""))
+    except Exception as exc:
+        return jsonify({"error": f"bad addr: {exc}"}), 400
+    if g.machine.status_words.pop(addr, None) is None:
+        return jsonify({"error": f"no status word at {to_octal(addr)}"}), 404
+    lib.pdp8_api_clear_status_word(g.machine.cpu, addr)
+    return jsonify({"removed": to_octal(addr)})
+
+
+ACCESS_NAMES = {mask: name for name, mask in WATCH_ACCESSES.items()}
+
+
+@app.get("/breakpoints")
+def get_breakpoints():
+    """List breakpoints and watchpoints, in ascending address order."""
+    cpu = g.machine.cpu
+    return jsonify({
+        "breakpoints": [to_octal(a) for a in list_breakpoints(lib, cpu)],
+        "watchpoints": [
+            {"addr": to_octal(a), "access": ACCESS_NAMES[mask]} for a, mask in list_watchpoints(lib, cpu)
+        ],
+    })
+
+
+@app.put("/breakpoint")
+def put_breakpoint():
+    """Stop /run before executing addr. JSON: {"addr": "0200"}."""
+    body = request.get_json(force=True, silent=True)
+    if not body or "addr" not in body:
+        return jsonify({"error": "need {addr}"}), 400
+    try:
+        addr = parse_num(body["addr"])
+    except Exception as exc:
+        return jsonify({"error": f"bad value: {exc}"}), 400
+    if addr >= MEMORY_WORDS or lib.pdp8_api_set_breakpoint(g.machine.cpu, addr, 1) != 0:
+        return jsonify({"error": f"cannot break at {to_octal(addr)}"}), 400
+    return jsonify({"addr": to_octal(addr)})
+
+
+@app.delete("/breakpoint")
+def delete_breakpoint():
+    """Remove a breakpoint: DELETE /breakpoint?addr=0200, or every breakpoint
+    and watchpoint with ?all=1."""
+    cpu = g.machine.cpu
+    if request.args.get("all") in ("1", "true"):
+        lib.pdp8_api_clear_breakpoints(cpu)
+        return jsonify({"removed": "all"})
+    try:
+        addr = parse_num(request.args.get("addr", ""))
+    except Exception as exc:
+        return jsonify({"error": f"bad addr: {exc}"}), 400
+    if addr not in list_breakpoints(lib, cpu):
+        return jsonify({"error": f"no breakpoint at {to_octal(addr)}"}), 404
+    lib.pdp8_api_set_breakpoint(cpu, addr, 0)
+    return jsonify({"removed": to_octal(addr)})
+
+
+@app.put("/watchpoint")
+def put_watchpoint():
+    """Stop /run after an instruction touches addr.
+    JSON: {"addr": "0100", "access": "write"}; access is read, write or rw
+    (default write). Reads are AND/TAD operands and indirect pointers; writes
+    are DCA, ISZ, JMS, auto-index increments and interrupt context saves.
+    """
+    body = request.get_json(force=True, silent=True)
+    if not body or "addr" not in body:
+        return jsonify({"error": "need {addr}"}), 400
+    access = body.get("access", "write")
+    if access not in WATCH_ACCESSES:
+        return jsonify({"error": "access must be read, write or rw"}), 400
+    try:
+        addr = parse_num(body["addr"])
+    except Exception as exc:
+        return jsonify({"error": f"bad value: {exc}"}), 400
+    if addr >= MEMORY_WORDS or lib.pdp8_api_set_watchpoint(g.machine.cpu, addr, WATCH_ACCESSES[access]) != 0:
+        return jsonify({"error": f"cannot watch {to_octal(addr)}"}), 400
+    return jsonify({"addr": to_octal(addr), "access": access})
+
+
+@app.delete("/watchpoint")
+def delete_watchpoint():
+    """Remove a watchpoint: DELETE /watchpoint?addr=0100."""
+    cpu = g.machine.cpu
+    try:
+        addr = parse_num(request.args.get("addr", ""))
+    except Exception as exc:
+        return jsonify({"error": f"bad addr: {exc}"}), 400
+    if addr not in dict(list_watchpoints(lib, cpu)):
+        return jsonify({"error": f"no watchpoint at {to_octal(addr)}"}), 404
+    lib.pdp8_api_set_watchpoint(cpu, addr, 0)
+    return jsonify({"removed": to_octal(addr)})
+
 # ---------- /mem GET ----------
 @app.get("/mem")
 def get_mem():
+    cpu = g.machine.cpu
     try:
         addr_raw = request.args.get("addr", None)
         if addr_raw is None:
@@ -366,12 +1135,11 @@ def get_mem():
         length = parse_num(length_raw)
 
         words = []
-        for i in range(length):
-            a = (start + i) & 0o7777
-            val = lib.pdp8_api_read_mem(cpu, a)
+        for i, val in enumerate(read_words(cpu, start, length)):
             words.append({
-                "addr": to_octal(a),
+                "addr": to_octal(start + i),
                 "val": to_octal(val),
+                "disasm": disassemble(val, start + i),
             })
 
         return jsonify({
@@ -383,85 +1151,127 @@ def get_mem():
         return jsonify({"error": str(e)}), 400
 
 
-# ---------- teleprinter output (KL8E) ----------
-@app.get("/output/teleprinter")
-def get_teleprinter_output():
-    """Return and consume available teleprinter output recorded by the KL8E console."""
-    global _tele_last_pos
-    # Prefer reading the teleprinter temp file if available (non-destructive
-    # read). If not present, fall back to popping the console internal buffer.
-    peek = request.args.get("peek", "0") in ("1", "true", "True")
+def read_words(cpu, start, count):
+    """Read `count` words from `start` (wrapping) in one native call."""
+    count = max(0, min(count, MEMORY_WORDS))
+    buf = (ctypes.c_uint16 * max(count, 1))()
+    got = lib.pdp8_api_read_block(cpu, start & 0o7777, buf, count)
+    return buf[:got]
 
-    if _tele_tmp is not None:
-        try:
-            with open(_tele_tmp, "rb") as f:
-                f.seek(_tele_last_pos)
-                chunk = f.read()
-                if not peek:
-                    # advance the last-pos so subsequent calls return only new
-                    # data
-                    _tele_last_pos = f.tell()
-        except Exception as exc:
-            return jsonify({"error": str(exc)}), 500
 
-        try:
-            text = chunk.decode("utf-8", errors="replace")
-        except Exception:
-            text = ""
+def words_to_le(words):
+    """Pack 12-bit words as little-endian 16-bit values."""
+    packed = array("H", words)
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return packed.tobytes()
 
-        return jsonify({"text": text, "bytes": [f"{b:03o}" for b in chunk]})
 
-    if _console_obj is None:
-        return jsonify({"error": "no console attached"}), 404
+# ---------- /mem.bin GET ----------
+@app.get("/mem.bin")
+def get_mem_bin():
+    """Return raw memory as little-endian 16-bit words (12 bits used).
 
-    out_bytes = bytearray()
-    # Pop until empty (pop returns non-zero when no data)
+    `addr` and `len` default to the whole of memory. The memory generation at
+    the time of the read is returned in `X-PDP8-Generation` so a client can
+    follow up with /mem/delta?since=<generation>.
+    """
+    cpu = g.machine.cpu
     try:
-        while True:
-            ch = ctypes.c_uint8()
-            rc = lib.pdp8_kl8e_console_pop_output(_console_obj, ctypes.byref(ch))
-            if rc != 0:
-                break
-            out_bytes.append(ch.value)
-    except Exception as exc:
-        return jsonify({"error": str(exc)}), 500
+        start = parse_num(request.args.get("addr", "0"))
+        length = parse_num(request.args.get("len", str(MEMORY_WORDS)))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
+    generation = lib.pdp8_api_memory_generation(cpu)
+    payload = words_to_le(read_words(cpu, start, length))
+    return Response(
+        payload,
+        mimetype="application/octet-stream",
+        headers={
+            "X-PDP8-Start": to_octal(start),
+            "X-PDP8-Generation": str(generation),
+        },
+    )
+
+
+# ---------- /mem/delta GET ----------
+@app.get("/mem/delta")
+def get_mem_delta():
+    """Return the 128-word pages written since generation `since`.
+
+    Each page carries its words as base64 of little-endian 16-bit values.
+    Pass the returned `generation` as `since` on the next poll.
+    """
+    cpu = g.machine.cpu
     try:
-        text = out_bytes.decode("utf-8", errors="replace")
-    except Exception:
-        text = ""
+        since = max(0, parse_num(request.args.get("since", "0")))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    generation = lib.pdp8_api_memory_generation(cpu)
+    max_pages = MEMORY_WORDS // PAGE_WORDS
+    page_buf = (ctypes.c_uint16 * max_pages)()
+    count = lib.pdp8_api_dirty_pages(cpu, since, page_buf, max_pages)
+    pages = []
+    for page in page_buf[:min(count, max_pages)]:
+        start = page * PAGE_WORDS
+        data = words_to_le(read_words(cpu, start, PAGE_WORDS))
+        pages.append({
+            "page": page,
+            "start": to_octal(start),
+            "data": base64.b64encode(data).decode("ascii"),
+        })
+    return jsonify({
+        "generation": generation,
+        "page_words": PAGE_WORDS,
+        "pages": pages,
+    })
+
+
+# ---------- teleprinter output (KL8E) ----------
+@app.get("/output/teleprinter")
+def get_teleprinter_output():
+    """Return teleprinter output captured from the KL8E console.
 
-    return jsonify({"text": text, "bytes": [f"{b:03o}" for b in out_bytes]})
+    `?since=<offset>` reads from an absolute offset; otherwise returns what
+    arrived since the previous call (`?peek=1` leaves the cursor alone).
+    """
+    m = g.machine
+    peek = request.args.get("peek", "0") in ("1", "true", "True")
+
+    if m.tele_ring is None or m.console is None:
+        return jsonify({"error": "no console attached"}), 404
+
+    try:
+        response, m.tele_last_pos = output_response(m.tele_ring, m.tele_last_pos, peek)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    return response
 
 
 # ---------- line printer output (PRN) ----------
 @app.get("/output/printer")
 def get_printer_output():
-    """Return incremental output written by the native line-printer to its temp file."""
-    global _printer_last_pos
-    if _printer_tmp is None:
-        return jsonify({"error": "no printer attached"}), 404
+    """Return line-printer output captured in memory (see /output/teleprinter)."""
+    m = g.machine
+    peek = request.args.get("peek", "0") in ("1", "true", "True")
 
-    try:
-        with open(_printer_tmp, "rb") as f:
-            f.seek(_printer_last_pos)
-            chunk = f.read()
-            _printer_last_pos = f.tell()
-    except Exception as exc:
-        return jsonify({"error": str(exc)}), 500
+    if m.printer_ring is None or m.printer is None:
+        return jsonify({"error": "no printer attached"}), 404
 
     try:
-        text = chunk.decode("utf-8", errors="replace")
-    except Exception:
-        text = ""
-
-    return jsonify({"text": text, "bytes": [f"{b:03o}" for b in chunk]})
+        response, m.printer_last_pos = output_response(m.printer_ring, m.printer_last_pos, peek)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    return response
 
 
 # ---------- keyboard input (queue to KL8E console) ----------
 @app.post("/input/keyboard")
 def post_keyboard_input():
-    if _console_obj is None:
+    console = g.machine.console
+    if console is None:
         return jsonify({"error": "no console attached"}), 404
     body = request.get_json(force=True, silent=False)
     if not body or "chars" not in body:
@@ -470,7 +1280,7 @@ def post_keyboard_input():
     queued = 0
     for ch in text:
         code = ord(ch) & 0x7F
-        rc = lib.pdp8_kl8e_console_queue_input(_console_obj, ctypes.c_uint8(code))
+        rc = lib.pdp8_kl8e_console_queue_input(console, ctypes.c_uint8(code))
         if rc == 0:
             queued += 1
     return jsonify({"queued": queued})
@@ -478,6 +1288,7 @@ def post_keyboard_input():
 # ---------- /mem PUT ----------
 @app.put("/mem")
 def put_mem():
+    cpu = g.machine.cpu
     body = request.get_json(force=True, silent=False)
 
     written = []
@@ -492,86 +1303,438 @@ def put_mem():
 
     elif "start" in body and "values" in body:
         start = parse_num(body["start"])
-        for offset, vraw in enumerate(body["values"]):
+        values = [parse_num(vraw) & 0o7777 for vraw in body["values"]]
+        if values:
+            buf = (ctypes.c_uint16 * len(values))(*values)
+            if lib.pdp8_api_load(cpu, buf, len(values), start & 0o7777) != 0:
+                return jsonify({"error": "write failed"}), 500
+        for offset, v in enumerate(values):
             a = (start + offset) & 0o7777
-            v = parse_num(vraw)
-            rc = lib.pdp8_api_write_mem(cpu, a, v & 0o7777)
-            if rc != 0:
-                return jsonify({"error": f"write failed at {to_octal(a)}"}), 500
             written.append({"addr": to_octal(a), "val": to_octal(v)})
     else:
         return jsonify({"error": "need {addr,val} or {start,values}"}), 400
 
     return jsonify({"written": written})
 
+# ---------- /run POST ----------
+RUN_MAX_CYCLES = 100_000_000
+RUN_MAX_TIMEOUT = 300.0
+RUN_SLICE_CYCLES = 1 << 16
+
+
+def regs_snapshot(cpu):
+    return {
+        "pc": to_octal(lib.pdp8_api_get_pc(cpu)),
+        "ac": to_octal(lib.pdp8_api_get_ac(cpu)),
+        "link": 1 if lib.pdp8_api_get_link(cpu) else 0,
+        "switch": to_octal(lib.pdp8_api_get_switch_register(cpu)),
+        "halted": bool(lib.pdp8_api_is_halted(cpu)),
+    }
+
+
+@app.post("/run")
+def post_run():
+    """Run natively until a stop condition, in a single request.
+
+    JSON body (all optional):
+      cycles        instruction budget (default 1000000)
+      timeout       wall-clock limit in seconds (default 10)
+      start         PC to start from
+      clear_halt    clear HALT before running (default true)
+      stop_pc       stop once PC reaches this address
+      stop_output   regex searched in output produced during this run
+      output_device "printer" (default) or "teleprinter" for stop_output
+
+    The CPU runs in native slices; timeout and stop_output are checked
+    between slices, so they may overshoot by up to one slice. Breakpoints and
+    watchpoints (PUT /breakpoint, /watchpoint) are checked natively on every
+    instruction; a run that stops on one reports reason "breakpoint" or
+    "watch" and a "stop" object naming the address (and the watch access).
+    Running again from a breakpoint executes it before stopping there again.
+    Runs are checkpointed so POST /reverse can go back over them.
+    """
+    m = g.machine
+    cpu = m.cpu
+    body = request.get_json(force=True, silent=True) or {}
+    try:
+        budget = min(max(1, parse_num(body.get("cycles", 1_000_000))), RUN_MAX_CYCLES)
+        timeout = min(max(0.0, float(body.get("timeout", 10.0))), RUN_MAX_TIMEOUT)
+        stop_pc = parse_num(body["stop_pc"]) & 0o7777 if body.get("stop_pc") is not None else -1
+        pattern = re.compile(body["stop_output"]) if body.get("stop_output") else None
+        if "start" in body:
+            lib.pdp8_api_set_pc(cpu, parse_num(body["start"]) & 0o7777)
+    except (ValueError, TypeError, re.error) as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    device = body.get("output_device", "printer")
+    if device not in ("printer", "teleprinter"):
+        return jsonify({"error": "output_device must be printer or teleprinter"}), 400
+    watch_ring = m.printer_ring if device == "printer" else m.tele_ring
+    if pattern is not None and watch_ring is None:
+        return jsonify({"error": f"no {device} attached"}), 404
+
+    if body.get("clear_halt", True):
+        lib.pdp8_api_clear_halt(cpu)
+
+    def ring_end(ring):
+        return lib.pdp8_output_ring_end(ring) if ring else 0
+
+    output_begin = {"printer": ring_end(m.printer_ring), "teleprinter": ring_end(m.tele_ring)}
+    watched = bytearray()
+    watch_pos = output_begin[device]
+    slice_cycles = RUN_SLICE_CYCLES if pattern is None else 4096
+
+    executed = 0
+    reason = "cycles"
+    stop = None
+    match = None
+    begin = time.monotonic()
+    deadline = begin + timeout
+    while executed < budget:
+        request_cycles = min(slice_cycles, budget - executed)
+        if m.history:
+            ran = lib.pdp8_checkpoints_run_until(m.history, request_cycles, stop_pc)
+        else:
+            ran = lib.pdp8_api_run_until(cpu, request_cycles, stop_pc)
+        if ran < 0:
+            return jsonify({"error": "native run failed"}), 500
+        executed += ran
+        native_reason, stop_addr = stop_reason(lib, cpu)
+        if native_reason == "breakpoint":
+            reason, stop = "breakpoint", {"addr": to_octal(stop_addr)}
+            break
+        if native_reason.startswith("watch-"):
+            reason = "watch"
+            stop = {
+                "addr": to_octal(stop_addr),
+                "access": native_reason[len("watch-"):],
+                "pc": to_octal(lib.pdp8_api_get_pc(cpu)),
+            }
+            break
+        if lib.pdp8_api_is_halted(cpu):
+            reason = "halt"
+            break
+        if stop_pc >= 0 and ran > 0 and lib.pdp8_api_get_pc(cpu) == stop_pc:
+            reason = "pc"
+            break
+        if pattern is not None:
+            chunk, _, watch_pos = read_output_ring(watch_ring, watch_pos)
+            watched += chunk
+            if len(watched) > OUTPUT_READ_LIMIT:
+                del watched[:-OUTPUT_READ_LIMIT]
+            found = pattern.search(watched.decode("utf-8", errors="replace"))
+            if found:
+                reason = "output"
+                match = found.group(0)
+                break
+        if ran < request_cycles:
+            break
+        if time.monotonic() >= deadline:
+            reason = "timeout"
+            break
+    m.cycles += executed
+    elapsed = time.monotonic() - begin
+    m.run_cycles += executed
+    m.run_seconds += elapsed
+    if elapsed > 0:
+        m.last_mips = executed / elapsed / 1e6
+
+    return jsonify({
+        "reason": reason,
+        "cycles": executed,
+        "elapsed": round(elapsed, 6),
+        "regs": regs_snapshot(cpu),
+        "output": {
+            name: {"start": output_begin[name], "end": ring_end(ring)}
+            for name, ring in (("printer", m.printer_ring), ("teleprinter", m.tele_ring))
+        },
+        "match": match,
+        "stop": stop,
+    })
+
+
+def history_snapshot(history):
+    return {
+        "position": lib.pdp8_checkpoints_position(history),
+        "oldest": lib.pdp8_checkpoints_oldest(history),
+        "checkpoints": lib.pdp8_checkpoints_count(history),
+        "bytes": lib.pdp8_checkpoints_bytes(history),
+    }
+
+
+@app.get("/history")
+def get_history():
+    """How far back POST /reverse can go.
+
+    Positions count instructions run by /run since the last /loader (or
+    session restore); "oldest" is the earliest one still reachable within the
+    checkpoint budget.
+    """
+    history = g.machine.history
+    if not history:
+        return jsonify({"error": "reverse execution is disabled"}), 404
+    return jsonify({**history_snapshot(history), "budget": CHECKPOINT_BUDGET})
+
+
+@app.post("/reverse")
+def post_reverse():
+    """Run backwards by restoring a checkpoint and replaying forward natively.
+
+    JSON body, one of:
+      steps     go back this many instructions (default 1)
+      continue  true: go back to the most recent breakpoint or watchpoint hit
+
+    A reverse continue stops before the instruction at a breakpoint, or just
+    after the instruction whose access hit a watchpoint; with no hit left in
+    the history it stops at the oldest position and reports reason "oldest".
+    Keyboard input queued after the target is dropped; output already
+    captured stays in the /output rings. Magtape is not rewound.
+    """
+    m = g.machine
+    if not m.history:
+        return jsonify({"error": "reverse execution is disabled"}), 404
+    body = request.get_json(force=True, silent=True) or {}
+    stop = None
+    if body.get("continue"):
+        result = lib.pdp8_checkpoints_reverse_continue(m.history)
+        if result < 0:
+            return jsonify({"error": "native replay failed"}), 500
+        native_reason = STOP_REASONS.get(result, "budget")
+        addr = to_octal(lib.pdp8_checkpoints_stop_address(m.history))
+        if native_reason == "breakpoint":
+            reason, stop = "breakpoint", {"addr": addr}
+        elif native_reason.startswith("watch-"):
+            reason = "watch"
+            stop = {"addr": addr, "access": native_reason[len("watch-"):], "pc": to_octal(lib.pdp8_api_get_pc(m.cpu))}
+        else:
+            reason = "oldest"
+    else:
+        try:
+            steps = max(0, parse_num(body.get("steps", 1)))
+        except (ValueError, TypeError) as exc:
+            return jsonify({"error": str(exc)}), 400
+        if lib.pdp8_checkpoints_reverse_step(m.history, steps) != 0:
+            return jsonify({"error": f"cannot go back {steps} instructions", **history_snapshot(m.history)}), 409
+        reason = "steps"
+    return jsonify({"reason": reason, "stop": stop, "regs": regs_snapshot(m.cpu), **history_snapshot(m.history)})
+
+
+@app.post("/seek")
+def post_seek():
+    """Move to an instruction position, forwards or backwards. JSON: {"position": 1234}.
+
+    Replays run past breakpoints and watchpoints; a HALT before the target
+    ends the replay there (409). Going forward is limited like /run cycles.
+    """
+    m = g.machine
+    if not m.history:
+        return jsonify({"error": "reverse execution is disabled"}), 404
+    body = request.get_json(force=True, silent=True) or {}
+    try:
+        position = int(body["position"])
+    except (KeyError, ValueError, TypeError):
+        return jsonify({"error": "need {position}"}), 400
+    if position > lib.pdp8_checkpoints_position(m.history) + RUN_MAX_CYCLES:
+        return jsonify({"error": f"at most {RUN_MAX_CYCLES} instructions forward per seek"}), 400
+    if position < 0 or lib.pdp8_checkpoints_seek(m.history, position) != 0:
+        return jsonify({"error": f"cannot reach position {position}", **history_snapshot(m.history)}), 409
+    return jsonify({"regs": regs_snapshot(m.cpu), **history_snapshot(m.history)})
+
+
 # ---------- /trace GET ----------
+TRACE_JSON_MAX_CYCLES = 1024
+TRACE_MAX_CYCLES = 10_000_000
+TRACE_MAX_PAGE = 1 << 16
+
+
+def native_trace(cpu, count):
+    """Step up to `count` instructions natively, returning per-step columns.
+
+    Columns hold the state before each step; the *_after columns are derived
+    from the next step (or the final registers for the last one).
+    """
+    pcs = (ctypes.c_uint16 * max(count, 1))()
+    instrs = (ctypes.c_uint16 * max(count, 1))()
+    acs = (ctypes.c_uint16 * max(count, 1))()
+    links = (ctypes.c_uint8 * max(count, 1))()
+    n = lib.pdp8_api_trace(cpu, count, pcs, instrs, acs, links)
+    final_pc = lib.pdp8_api_get_pc(cpu)
+    final_ac = lib.pdp8_api_get_ac(cpu)
+    final_link = 1 if lib.pdp8_api_get_link(cpu) else 0
+    halted = bool(lib.pdp8_api_is_halted(cpu))
+    cols = {
+        "pc": pcs[:n],
+        "instr": instrs[:n],
+        "ac": acs[:n],
+        "link": links[:n],
+    }
+    cols["pc_after"] = cols["pc"][1:] + [final_pc] if n else []
+    cols["ac_after"] = cols["ac"][1:] + [final_ac] if n else []
+    cols["link_after"] = cols["link"][1:] + [final_link] if n else []
+    cols["halted"] = [0] * (n - 1) + [1] if n and halted else [0] * n
+    return n, cols, halted
+
+
+def parse_octal_set(raw):
+    """Comma-separated addresses / words (octal with leading 0, like parse_num)."""
+    if not raw:
+        return None
+    return {parse_num(item.strip()) & 0o7777 for item in raw.split(",") if item.strip()}
+
+
+def filter_rows(cols, pcs, instrs, halted_only):
+    """Indices of rows that pass the server-side filters."""
+    rows = range(len(cols["pc"]))
+    if pcs is not None:
+        rows = [i for i in rows if cols["pc"][i] in pcs]
+    if instrs is not None:
+        rows = [i for i in rows if cols["instr"][i] in instrs]
+    if halted_only:
+        rows = [i for i in rows if cols["halted"][i]]
+    return list(rows)
+
+
+def pack_column(values, typecode):
+    packed = array(typecode, values)
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return base64.b64encode(packed.tobytes()).decode("ascii")
+
+
+COLUMN_TYPES = {
+    "step": "I",
+    "pc": "H",
+    "instr": "H",
+    "ac": "H",
+    "link": "B",
+    "pc_after": "H",
+    "ac_after": "H",
+    "link_after": "B",
+    "halted": "B",
+}
+
+
 @app.get("/trace")
 def get_trace():
-    global cycles_counter
+    """Execute and trace instructions.
 
-    try:
-        # optional start PC override
-        if "start" in request.args:
-            start_pc = parse_num(request.args["start"]) & 0o7777
-            lib.pdp8_api_set_pc(cpu, start_pc)
-
-        # cycles to execute
-        if "cycles" in request.args:
-            ncycles = parse_num(request.args["cycles"])
-        else:
-            ncycles = 1
-
-        # clamp
-        if ncycles < 1:
-            ncycles = 1
-        if ncycles > 1024:
-            ncycles = 1024
-
-        steps = []
-        halted = False
-
-        begin_pc = lib.pdp8_api_get_pc(cpu)
-
-        for step_i in range(ncycles):
-            pc_before = lib.pdp8_api_get_pc(cpu)
-            ac_before = lib.pdp8_api_get_ac(cpu)
-            lk_before = lib.pdp8_api_get_link(cpu)
-            instr = lib.pdp8_api_read_mem(cpu, pc_before)
-
-            rc = lib.pdp8_api_step(cpu)
-            if rc == 0:
-                halted = True
-
-            pc_after = lib.pdp8_api_get_pc(cpu)
-            ac_after = lib.pdp8_api_get_ac(cpu)
-            lk_after = lib.pdp8_api_get_link(cpu)
-
-            steps.append({
-                "step": step_i,
-                "pc_before": to_octal(pc_before),
-                "ac_before": to_octal(ac_before),
-                "link_before": 1 if lk_before else 0,
-                "instr": to_octal(instr),
-                "pc_after": to_octal(pc_after),
-                "ac_after": to_octal(ac_after),
-                "link_after": 1 if lk_after else 0,
-                "halted": (rc == 0)
-            })
+    Default (JSON) format: up to 1024 steps as a list of per-step dicts.
 
-            cycles_counter += 1
+    `format=columnar` returns base64 little-endian packed columns and pages
+    through long traces: `cycles` is the total (up to 10M), `page` the steps
+    executed per request (up to 65536). While steps remain the response has a
+    `cursor`; pass `?cursor=<cursor>` to continue. Filters `pc=` and `instr=`
+    (comma-separated octal) and `halted=1` are applied on the server and are
+    remembered by the cursor.
+    """
+    m = g.machine
+    cpu = m.cpu
 
-            if rc == 0:
-                break
+    try:
+        columnar = request.args.get("format", "json") == "columnar"
+        cursor = request.args.get("cursor")
+        if cursor is not None:
+            state = m.trace
+            if not columnar or state is None or cursor != state["cursor"]:
+                return jsonify({"error": "stale or unknown cursor"}), 409
+        else:
+            # optional start PC override
+            if "start" in request.args:
+                start_pc = parse_num(request.args["start"]) & 0o7777
+                lib.pdp8_api_set_pc(cpu, start_pc)
+
+            # cycles to execute
+            ncycles = parse_num(request.args.get("cycles", "1"))
+            limit = TRACE_MAX_CYCLES if columnar else TRACE_JSON_MAX_CYCLES
+            ncycles = max(1, min(ncycles, limit))
+            m.trace_serial += 1
+            state = {
+                "serial": m.trace_serial,
+                "next_step": 0,
+                "remaining": ncycles,
+                "page": max(1, min(parse_num(request.args.get("page", str(TRACE_MAX_PAGE))), TRACE_MAX_PAGE)),
+                "pcs": parse_octal_set(request.args.get("pc")),
+                "instrs": parse_octal_set(request.args.get("instr")),
+                "halted_only": request.args.get("halted", "0") in ("1", "true", "True"),
+                "cursor": None,
+            }
+            m.trace = state
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
+    begin_pc = lib.pdp8_api_get_pc(cpu)
+    first_step = state["next_step"]
+    count = state["remaining"] if not columnar else min(state["page"], state["remaining"])
+    n, cols, halted = native_trace(cpu, count)
+    m.cycles += n
+    state["next_step"] += n
+    state["remaining"] -= n
+
+    if not columnar:
+        m.trace = None
+        steps = [{
+            "step": first_step + i,
+            "pc_before": to_octal(cols["pc"][i]),
+            "ac_before": to_octal(cols["ac"][i]),
+            "link_before": cols["link"][i],
+            "instr": to_octal(cols["instr"][i]),
+            "disasm": disassemble(cols["instr"][i], cols["pc"][i]),
+            "pc_after": to_octal(cols["pc_after"][i]),
+            "ac_after": to_octal(cols["ac_after"][i]),
+            "link_after": cols["link_after"][i],
+            "halted": bool(cols["halted"][i]),
+        } for i in range(n)]
         return jsonify({
             "begin_pc": to_octal(begin_pc),
             "steps": steps,
             "halted": halted
         })
 
-    except ValueError as e:
-        return jsonify({"error": str(e)}), 400
+    rows = filter_rows(cols, state["pcs"], state["instrs"], state["halted_only"])
+    out = {name: [cols[name][i] for i in rows] for name in COLUMN_TYPES if name != "step"}
+    out["step"] = [first_step + i for i in rows]
+
+    done = halted or state["remaining"] <= 0 or n < count
+    if done:
+        m.trace = None
+        next_cursor = None
+    else:
+        next_cursor = f"{state['serial']}:{state['next_step']}"
+        state["cursor"] = next_cursor
+
+    return jsonify({
+        "format": "columnar",
+        "encoding": "base64-le",
+        "types": COLUMN_TYPES,
+        "begin_pc": to_octal(begin_pc),
+        "first_step": first_step,
+        "executed": n,
+        "count": len(rows),
+        "columns": {name: pack_column(out[name], COLUMN_TYPES[name]) for name in COLUMN_TYPES},
+        "halted": halted,
+        "cursor": next_cursor,
+    })
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="HTTP front-end for the PDP-8 emulator")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--max-sessions", type=int, default=pool.max_live,
+                        help="Maximum live machines (default: %(default)s, env WEBDP8_MAX_SESSIONS)")
+    parser.add_argument("--memory-budget-mb", type=int, default=0,
+                        help="Cap live machines by approximate native memory use")
+    parser.add_argument("--max-snapshots", type=int, default=pool.max_snapshots,
+                        help="Evicted sessions kept as snapshots (default: %(default)s)")
+    parser.add_argument("--checkpoint-kb", type=int, default=CHECKPOINT_BUDGET >> 10,
+                        help="Checkpoint memory per machine for reverse execution, 0 to disable "
+                             "(default: %(default)s, env WEBDP8_CHECKPOINT_KB)")
+    return parser.parse_args()
+
 
-# (run with app.run(host="0.0.0.0", port=5000, debug=True))
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    args = parse_args()
+    CHECKPOINT_BUDGET = max(0, args.checkpoint_kb) << 10
+    pool.max_live = pool_limit(max(1, args.max_sessions), args.memory_budget_mb)
+    pool.max_snapshots = max(0, args.max_snapshots)
+    app.run(host=args.host, port=args.port, debug=True, threaded=True)
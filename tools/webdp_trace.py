@@ -2,52 +2,126 @@
 """
 Pretty-print PDP-8 trace output from the webdp8 REST front-end.
 
+The trace is fetched in pages using the columnar `/trace` format, so long
+traces stream through in constant memory. PC, instruction and halted filters
+are applied by the server; step filters and --limit are applied as pages
+arrive.
+
 Example:
   python3 tools/webdp_trace.py --start 0200 --cycles 512 --pc 0320 --instr 4076
+  python3 tools/webdp_trace.py --start 0200 --cycles 1000000 --halted-only
 """
 
 from __future__ import annotations
 
 import argparse
+import base64
 import json
 import sys
 import urllib.parse
 import urllib.request
-from typing import Dict, Iterable, List, Sequence, Tuple
-
-
-FIELD_DEFS: Dict[str, Tuple[str, str]] = {
-    "step": ("Step", "step"),
-    "pc": ("PC", "pc_before"),
-    "instr": ("Instr", "instr"),
-    "pc_after": ("PC'", "pc_after"),
-    "ac_before": ("AC", "ac_before"),
-    "ac_after": ("AC'", "ac_after"),
-    "link_before": ("L", "link_before"),
-    "link_after": ("L'", "link_after"),
-    "halted": ("Halt", "halted"),
-    "cycles": ("Cycles", "cycles"),
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from factory.disasm import disassemble  # noqa: E402
+
+# name -> (column title, columnar field, display width)
+FIELD_DEFS: Dict[str, Tuple[str, str, int]] = {
+    "step": ("Step", "step", 7),
+    "pc": ("PC", "pc", 4),
+    "instr": ("Instr", "instr", 4),
+    "disasm": ("Disassembly", "disasm", 16),
+    "pc_after": ("PC'", "pc_after", 4),
+    "ac_before": ("AC", "ac", 4),
+    "ac_after": ("AC'", "ac_after", 4),
+    "link_before": ("L", "link", 1),
+    "link_after": ("L'", "link_after", 1),
+    "halted": ("Halt", "halted", 1),
 }
 
-DEFAULT_FIELDS = ("step", "pc", "instr", "ac_before", "ac_after", "link_before", "halted")
+OCTAL_COLUMNS = {"pc", "instr", "pc_after", "ac", "ac_after"}
+
+DEFAULT_FIELDS = ("step", "pc", "instr", "disasm", "ac_before", "ac_after", "link_before", "halted")
+DEFAULT_PAGE = 65536
 
 
-def fetch_trace(server: str, start: str, cycles: int) -> Dict:
-    params = urllib.parse.urlencode({"start": start, "cycles": cycles})
-    url = f"{server.rstrip('/')}/trace?{params}"
+def fetch_json(url: str) -> Dict:
     request = urllib.request.Request(url)
-    with urllib.request.urlopen(request, timeout=30) as resp:
+    with urllib.request.urlopen(request, timeout=60) as resp:
         try:
-            payload = json.loads(resp.read().decode("utf-8"))
+            return json.loads(resp.read().decode("utf-8"))
         except json.JSONDecodeError as exc:
             raise RuntimeError(f"Invalid JSON from {url}: {exc}") from exc
-    return payload
 
 
-def select_fields(field_names: Sequence[str]) -> List[Tuple[str, str]]:
+def unpack_columns(page: Dict) -> Dict[str, array]:
+    """Decode the base64 little-endian columns of one trace page."""
+    columns: Dict[str, array] = {}
+    for name, typecode in page["types"].items():
+        values = array(typecode)
+        values.frombytes(base64.b64decode(page["columns"][name]))
+        if sys.byteorder != "little":
+            values.byteswap()
+        columns[name] = values
+    return columns
+
+
+def iter_trace_pages(
+    server: str,
+    start: str,
+    cycles: int,
+    page_size: int = DEFAULT_PAGE,
+    pcs: Sequence[str] = (),
+    instrs: Sequence[str] = (),
+    halted_only: bool = False,
+    session: Optional[str] = None,
+) -> Iterator[Tuple[Dict, Dict[str, array]]]:
+    """Yield (page metadata, decoded columns) until the trace is exhausted."""
+    base = f"{server.rstrip('/')}/trace"
+    common = {"format": "columnar"}
+    if session:
+        common["session"] = session
+    params = dict(common, start=start, cycles=cycles, page=page_size)
+    if pcs:
+        params["pc"] = ",".join(pcs)
+    if instrs:
+        params["instr"] = ",".join(instrs)
+    if halted_only:
+        params["halted"] = 1
+    url = f"{base}?{urllib.parse.urlencode(params)}"
+    while url:
+        page = fetch_json(url)
+        if "error" in page:
+            raise RuntimeError(page["error"])
+        yield page, unpack_columns(page)
+        cursor = page.get("cursor")
+        url = f"{base}?{urllib.parse.urlencode(dict(common, cursor=cursor))}" if cursor else ""
+
+
+def iter_rows(
+    pages: Iterable[Tuple[Dict, Dict[str, array]]],
+    step_ids: Sequence[int],
+) -> Iterator[Dict[str, int]]:
+    """Flatten pages into row dicts, applying the client-side step filter."""
+    wanted = set(step_ids)
+    for _, columns in pages:
+        names = list(columns)
+        for values in zip(*(columns[name] for name in names)):
+            row = dict(zip(names, values))
+            if wanted and row["step"] not in wanted:
+                continue
+            yield row
+
+
+def select_fields(field_names: Sequence[str]) -> List[Tuple[str, str, int]]:
     if not field_names:
         field_names = DEFAULT_FIELDS
-    selected: List[Tuple[str, str]] = []
+    selected: List[Tuple[str, str, int]] = []
     for name in field_names:
         key = name.strip().lower()
         if key not in FIELD_DEFS:
@@ -57,67 +131,40 @@ def select_fields(field_names: Sequence[str]) -> List[Tuple[str, str]]:
     return selected
 
 
-def match_one(value: str, candidates: Iterable[str]) -> bool:
-    reference = value.upper()
-    return any(reference == candidate.upper() for candidate in candidates)
+def format_cell(source: str, value: int) -> str:
+    if source in OCTAL_COLUMNS:
+        return f"{value:04o}"
+    return str(value)
 
 
-def filter_steps(
-    steps: Sequence[Dict],
-    pcs: Sequence[str],
-    instrs: Sequence[str],
-    halted_only: bool,
-    step_ids: Sequence[int],
-) -> List[Dict]:
-    filtered = list(steps)
-    if pcs:
-        filtered = [step for step in filtered if match_one(step.get("pc_before", ""), pcs)]
-    if instrs:
-        filtered = [step for step in filtered if match_one(step.get("instr", ""), instrs)]
-    if halted_only:
-        filtered = [step for step in filtered if bool(step.get("halted"))]
-    if step_ids:
-        wanted = set(step_ids)
-        filtered = [step for step in filtered if int(step.get("step", -1)) in wanted]
-    return filtered
-
-
-def render_table(steps: Sequence[Dict], fields: Sequence[Tuple[str, str]]) -> str:
-    if not steps:
-        return "(no steps to display)"
-
-    headers = [title for title, _ in fields]
-    columns: List[List[str]] = []
-    for _, source in fields:
-        column: List[str] = []
-        for step in steps:
-            value = step.get(source, "")
-            if isinstance(value, bool):
-                column.append("1" if value else "0")
-            else:
-                column.append(str(value))
-        columns.append(column)
-
-    widths = []
-    for header, column in zip(headers, columns):
-        widths.append(max(len(header), *(len(cell) for cell in column)))
-
-    lines = []
-    header_line = "  ".join(header.ljust(width) for header, width in zip(headers, widths))
+def row_value(row: Dict[str, int], source: str) -> str:
+    if source == "disasm":
+        # the instruction column is always fetched; decode it against the PC
+        return disassemble(row["instr"], row["pc"])
+    return format_cell(source, row[source])
+
+
+def render_header(fields: Sequence[Tuple[str, str, int]]) -> str:
+    widths = [max(len(title), width) for title, _, width in fields]
+    header_line = "  ".join(title.ljust(width) for (title, _, _), width in zip(fields, widths)).rstrip()
     divider = "  ".join("-" * width for width in widths)
-    lines.extend([header_line, divider])
+    return f"{header_line}\n{divider}"
+
 
-    for row_values in zip(*columns):
-        line = "  ".join(cell.ljust(width) for cell, width in zip(row_values, widths))
-        lines.append(line)
-    return "\n".join(lines)
+def render_row(row: Dict[str, int], fields: Sequence[Tuple[str, str, int]]) -> str:
+    cells = []
+    for title, source, width in fields:
+        cells.append(row_value(row, source).ljust(max(len(title), width)))
+    return "  ".join(cells).rstrip()
 
 
 def parse_args(argv: Sequence[str]) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Inspect a PDP-8 execution trace from webdp8.")
     parser.add_argument("--server", default="http://127.0.0.1:5000", help="Base URL of webdp8 (default: %(default)s)")
+    parser.add_argument("--session", help="webdp8 session ID (default: the shared session)")
     parser.add_argument("--start", default="0100", help="Starting PC (octal string)")
     parser.add_argument("--cycles", type=int, default=512, help="Cycles to execute (default: %(default)s)")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE, help="Steps per page (default: %(default)s)")
     parser.add_argument("--pc", action="append", default=[], help="Filter by pc_before (octal string). Repeatable.")
     parser.add_argument("--instr", action="append", default=[], help="Filter by opcode word (octal). Repeatable.")
     parser.add_argument("--step", action="append", type=int, default=[], help="Filter by step index. Repeatable.")
@@ -127,6 +174,12 @@ def parse_args(argv: Sequence[str]) -> argparse.Namespace:
     return parser.parse_args(argv)
 
 
+def as_octal_arg(value: str) -> str:
+    """Server filters use parse_num, which treats a leading 0 as octal."""
+    value = value.strip()
+    return value if value.startswith("0") else "0" + value
+
+
 def main(argv: Sequence[str]) -> int:
     args = parse_args(argv)
     try:
@@ -135,27 +188,47 @@ def main(argv: Sequence[str]) -> int:
         print(exc, file=sys.stderr)
         return 2
 
+    pages_meta: List[Dict] = []
+
+    def tracked(pages):
+        for page, columns in pages:
+            pages_meta.append({k: page.get(k) for k in ("begin_pc", "executed", "halted")})
+            yield page, columns
+
+    pages = iter_trace_pages(
+        args.server,
+        as_octal_arg(args.start),
+        args.cycles,
+        page_size=args.page_size,
+        pcs=[as_octal_arg(pc) for pc in args.pc],
+        instrs=[as_octal_arg(instr) for instr in args.instr],
+        halted_only=args.halted_only,
+        session=args.session,
+    )
+
+    shown = 0
+    limit = None if args.limit is None else max(args.limit, 0)
     try:
-        payload = fetch_trace(args.server, args.start, args.cycles)
-    except Exception as exc:  # pragma: no cover - network failures
+        for row in iter_rows(tracked(pages), args.step):
+            if limit is not None and shown >= limit:
+                break
+            if shown == 0:
+                print(render_header(fields))
+            print(render_row(row, fields))
+            shown += 1
+    except (OSError, RuntimeError) as exc:
         print(f"Trace request failed: {exc}", file=sys.stderr)
         return 3
 
-    steps = payload.get("steps", [])
-    filtered = filter_steps(steps, args.pc, args.instr, args.halted_only, args.step)
-    if args.limit is not None:
-        filtered = filtered[: max(args.limit, 0)]
+    if shown == 0:
+        print("(no steps to display)")
 
-    summary = (
-        f"Trace begin_pc={payload.get('begin_pc','????')} "
-        f"halted={payload.get('halted')} "
-        f"steps={len(steps)} filtered={len(filtered)}"
-    )
-    print(summary)
-    print(render_table(filtered, fields))
+    executed = sum(meta["executed"] or 0 for meta in pages_meta)
+    begin_pc = pages_meta[0]["begin_pc"] if pages_meta else "????"
+    halted = pages_meta[-1]["halted"] if pages_meta else None
+    print(f"Trace begin_pc={begin_pc} halted={halted} steps={executed} shown={shown}")
     return 0
 
 
 if __name__ == "__main__":
     sys.exit(main(sys.argv[1:]))
-